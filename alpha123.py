@@ -5,14 +5,40 @@ Alpha123稳定度数据模块
 Alpha123 Stability Data Module for Binance Auto Trade System
 """
 
+import hashlib
+import threading
 import requests
-from bs4 import BeautifulSoup
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 from logger import Logger
+# 导入稳定度页面浏览器模块（Selenium 和 BeautifulSoup 在其中按需导入，避免拖慢程序启动）
+from stability_browser import StabilityPageBrowser
+
+
+# 稳定度数据接口
+STABILITY_FEED_URL = "https://alpha123.uk/stability/stability_feed_v2.json"
+
+# 请求头
+STABILITY_FEED_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'application/json, text/plain, */*',
+    'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
+    'Referer': 'https://alpha123.uk/zh/stability.html'
+}
+
+# 稳定度状态（st/status）对应的中文
+STABILITY_LABELS = {
+    'green:stable': '稳定',
+    'yellow:general': '一般',
+    'yellow:moderate': '一般',
+    'red:unstable': '不稳定',
+    'stable': '稳定',
+    'unstable': '不稳定',
+    'general': '一般',
+    'moderate': '一般',
+    'unknown': '未知'
+}
+
+# 缺少或无法解析价差基点时使用的值（排在最后，不会被选中）
+STABILITY_SPREAD_UNKNOWN = 999999.0
 
 
 class Alpha123Client:
@@ -28,6 +54,13 @@ class Alpha123Client:
         """
         self.logger = logger or Logger()
         self.alpha_id_map = alpha_id_map or {}
+        # 后台刷新的稳定度数据（StabilityFeed），未设置时每次读取都直接请求
+        self.feed = None
+        # 候选代币排名索引缓存 (稳定度数据, 价差阈值, ID映射, 索引)
+        self.candidate_index_cache = None
+        self.index_lock = threading.Lock()
+        # 备用的稳定度页面浏览器（第一次使用时创建）
+        self.page_browser = None
     
     def set_alpha_id_map(self, alpha_id_map):
         """
@@ -38,6 +71,26 @@ class Alpha123Client:
         """
         self.alpha_id_map = alpha_id_map
     
+    def set_feed(self, feed):
+        """
+        设置后台刷新的稳定度数据
+        
+        Args:
+            feed: StabilityFeed实例
+        """
+        self.feed = feed
+    
+    def get_stability_data(self):
+        """
+        读取稳定度数据：设置了后台刷新时读取最新快照（不发请求），否则直接获取
+        
+        Returns:
+            list|tuple: 稳定度数据，失败返回空列表
+        """
+        if self.feed is not None:
+            return self.feed.get_items()
+        return self.fetch_stability_data()
+    
     def fetch_stability_data(self):
         """
         获取稳定度看板数据（尝试多种方式）
@@ -64,196 +117,7 @@ class Alpha123Client:
             list: 稳定度数据列表
         """
         try:
-            # 直接调用API接口
-            api_url = "https://alpha123.uk/stability/stability_feed_v2.json"
-            
-            # 简化的请求头
-            headers = {
-                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                'Accept': 'application/json, text/plain, */*',
-                'Accept-Language': 'zh-CN,zh;q=0.9,en;q=0.8',
-                'Referer': 'https://alpha123.uk/zh/stability.html'
-            }
-            
-            response = requests.get(api_url, headers=headers, timeout=15)
-            response.raise_for_status()
-            
-            # 解析JSON数据
-            api_data = response.json()
-            stability_data = []
-            
-            # 根据新的JSON结构解析数据
-            if isinstance(api_data, dict) and 'items' in api_data:
-                items = api_data['items']
-                self.logger.log_message(f"找到 {len(items)} 个项目")
-                
-                for item in items:
-                    if isinstance(item, dict):
-                        # 从n字段提取项目名称（去掉/USDT后缀）
-                        project_name = item.get('n', '')
-                        project = project_name.replace('/USDT', '') if project_name else ''
-                        
-                        # 获取最新价格
-                        last_price = item.get('p', 0)
-                        
-                        # 获取稳定度状态
-                        stability_text = item.get('st', 'unknown')
-                        
-                        # 转换稳定度为中文
-                        stability_map = {
-                            'green:stable': '稳定',
-                            'yellow:general': '一般',
-                            'yellow:moderate': '一般',
-                            'red:unstable': '不稳定',
-                            'stable': '稳定',
-                            'unstable': '不稳定',
-                            'general': '一般',
-                            'moderate': '一般',
-                            'unknown': '未知'
-                        }
-                        stability = stability_map.get(stability_text.lower(), '未知')
-                        
-                        # 获取4倍剩余天数
-                        multiplier_days = item.get('md', 0)
-                        
-                        # 获取价差基点（越小越稳定）
-                        spread = item.get('spr', 0)
-                        
-                        # 过滤条件：排除KOGE，且4倍天数必须大于0
-                        if project.upper() == 'KOGE':
-                            # KOGE始终添加（用于显示）
-                            parsed_item = {
-                                'project': project,
-                                'stability': stability,
-                                'stability_status': stability_text,  # 保存原始st值
-                                'price': str(last_price),
-                                'remaining_days': str(multiplier_days),
-                                'spread': str(spread)
-                            }
-                            stability_data.append(parsed_item)
-                        elif multiplier_days > 0:
-                            # 其他代币：4倍天数必须大于0
-                            parsed_item = {
-                                'project': project,
-                                'stability': stability,
-                                'stability_status': stability_text,  # 保存原始st值
-                                'price': str(last_price),
-                                'remaining_days': str(multiplier_days),
-                                'spread': str(spread)
-                            }
-                            stability_data.append(parsed_item)
-            
-            # 如果API返回的是数组格式（保持向后兼容）
-            elif isinstance(api_data, list):
-                for item in api_data:
-                    if isinstance(item, dict):
-                        # 检查是否为新格式
-                        if 'n' in item and 'p' in item and 'st' in item:
-                            # 新格式解析
-                            project_name = item.get('n', '')
-                            project = project_name.replace('/USDT', '') if project_name else ''
-                            
-                            last_price = item.get('p', 0)
-                            stability_text = item.get('st', 'unknown')
-                            
-                            stability_map = {
-                                'green:stable': '稳定',
-                                'yellow:general': '一般',
-                                'yellow:moderate': '一般',
-                                'red:unstable': '不稳定',
-                                'stable': '稳定',
-                                'unstable': '不稳定',
-                                'general': '一般',
-                                'moderate': '一般',
-                                'unknown': '未知'
-                            }
-                            stability = stability_map.get(stability_text.lower(), '未知')
-                            
-                            multiplier_days = item.get('md', 0)
-                            spread = item.get('spr', 0)
-                            
-                            # 过滤条件：排除KOGE，且4倍天数必须大于0
-                            if project.upper() == 'KOGE':
-                                stability_data.append({
-                                    'project': project,
-                                    'stability': stability,
-                                    'stability_status': stability_text,  # 保存原始st值
-                                    'price': str(last_price),
-                                    'remaining_days': str(multiplier_days),
-                                    'spread': str(spread)
-                                })
-                            elif multiplier_days > 0:
-                                stability_data.append({
-                                    'project': project,
-                                    'stability': stability,
-                                    'stability_status': stability_text,  # 保存原始st值
-                                    'price': str(last_price),
-                                    'remaining_days': str(multiplier_days),
-                                    'spread': str(spread)
-                                })
-                        else:
-                            # 旧格式解析（向后兼容）
-                            display = item.get('display', '')
-                            project = display.replace('/USDT', '') if display else item.get('key', '')
-                            
-                            metrics = item.get('metrics', {})
-                            last_price = metrics.get('lastPrice', 0)
-                            
-                            status = item.get('status', {})
-                            status_text = status.get('text', 'unknown')
-                            
-                            stability_map = {
-                                'stable': '稳定',
-                                'unstable': '不稳定',
-                                'general': '一般',
-                                'moderate': '一般',
-                                'unknown': '未知'
-                            }
-                            stability = stability_map.get(status_text.lower(), '未知')
-                            
-                            multiplier_days = item.get('multiplier_days', 0)
-                            spread = item.get('spread', 999999)  # 旧格式可能没有spread字段
-                            
-                            # 过滤条件：排除KOGE，且4倍天数必须大于0
-                            if project.upper() == 'KOGE':
-                                stability_data.append({
-                                    'project': project,
-                                    'stability': stability,
-                                    'stability_status': status_text,  # 保存原始status值
-                                    'price': str(last_price),
-                                    'remaining_days': str(multiplier_days),
-                                    'spread': str(spread)
-                                })
-                            elif multiplier_days > 0:
-                                stability_data.append({
-                                    'project': project,
-                                    'stability': stability,
-                                    'stability_status': status_text,  # 保存原始status值
-                                    'price': str(last_price),
-                                    'remaining_days': str(multiplier_days),
-                                    'spread': str(spread)
-                                })
-            
-            # 对数据进行排序：KOGE固定排第一位，其他按价差基点（spr）升序排序
-            def sort_key(item):
-                project = item['project']
-                spread_str = item.get('spread', '999999')
-                
-                # KOGE固定排第一位
-                if project.upper() == 'KOGE':
-                    return (0, 0)
-                
-                # 其他按价差基点排序：spr越小越稳定，排在前面
-                try:
-                    spread = float(spread_str)
-                except (ValueError, TypeError):
-                    spread = 999999  # 如果无法转换，设为一个很大的值排在后面
-                
-                return (1, spread)
-            
-            stability_data.sort(key=sort_key)
-            
-            self.logger.log_message(f"从API获取到 {len(stability_data)} 个稳定度项目")
+            stability_data, _ = self.fetch_stability_feed()
             return stability_data
             
         except Exception as e:
@@ -261,87 +125,85 @@ class Alpha123Client:
             # 不使用备用数据，返回空列表
             return []
     
+    def fetch_stability_feed(self, validators=None):
+        """
+        请求稳定度数据接口（条件请求），数据有变化时解析
+        
+        Args:
+            validators: 上次请求返回的校验信息 {'etag', 'last_modified', 'digest'}
+        
+        Returns:
+            tuple: (稳定度数据列表, 新的校验信息)，数据未变化时列表为None
+        """
+        validators = validators or {}
+        headers = dict(STABILITY_FEED_HEADERS)
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        response = requests.get(STABILITY_FEED_URL, headers=headers, timeout=15)
+        if response.status_code == 304:
+            return None, validators
+        response.raise_for_status()
+        
+        # 服务器不支持条件请求时，用内容摘要判断数据是否变化
+        new_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'digest': hashlib.sha1(response.content).hexdigest()
+        }
+        if new_validators['digest'] == validators.get('digest'):
+            return None, new_validators
+        
+        return self.parse_stability_feed(response.json()), new_validators
+    
+    def parse_stability_feed(self, api_data):
+        """
+        解析稳定度数据接口返回的JSON（每个数据版本只解析一次）
+        
+        兼容三种格式：{'items': [新格式项目]}、[新格式项目]、[旧格式项目]，
+        统一转换为数值字段已解析好的记录，之后筛选和排序不再做字符串转换。
+        
+        Args:
+            api_data: 接口返回的JSON数据
+        
+        Returns:
+            list: 稳定度记录列表（KOGE排第一，其他按价差基点升序），每条记录包含
+                project, stability, stability_status, price, remaining_days, spread
+        """
+        if isinstance(api_data, dict) and 'items' in api_data:
+            raw_items = api_data['items']
+            self.logger.log_message(f"找到 {len(raw_items)} 个项目")
+        elif isinstance(api_data, list):
+            raw_items = api_data
+        else:
+            raw_items = []
+        
+        stability_data = []
+        for raw_item in raw_items:
+            item = normalize_stability_item(raw_item)
+            # KOGE始终保留（用于显示），其他代币4倍天数必须大于0
+            if item and (item['project'].upper() == 'KOGE' or item['remaining_days'] > 0):
+                stability_data.append(item)
+        
+        # KOGE固定排第一位，其他按价差基点（spr）升序排序：spr越小越稳定，排在前面
+        stability_data.sort(key=lambda item: (item['project'].upper() != 'KOGE', item['spread']))
+        
+        self.logger.log_message(f"从API获取到 {len(stability_data)} 个稳定度项目")
+        return stability_data
+    
     def fetch_stability_data_selenium(self):
         """
-        使用Selenium获取稳定度数据
+        使用Selenium获取稳定度数据（常驻浏览器，第一次使用时启动）
         
         Returns:
             list: 稳定度数据列表
         """
-        driver = None
-        try:
-            # 配置Chrome选项
-            chrome_options = Options()
-            chrome_options.add_argument('--headless')  # 无头模式
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-gpu')
-            chrome_options.add_argument('--window-size=1920,1080')
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
-            
-            # 启动浏览器
-            driver = webdriver.Chrome(options=chrome_options)
-            driver.get("https://alpha123.uk/zh/stability.html")
-            
-            # 等待页面加载完成
-            wait = WebDriverWait(driver, 10)
-            
-            # 等待表格数据加载完成
-            try:
-                wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
-                # 等待数据加载（不是"加载中..."）
-                wait.until(lambda driver: "加载中" not in driver.page_source)
-            except:
-                self.logger.log_message("等待数据加载超时")
-            
-            # 获取页面源码
-            page_source = driver.page_source
-            soup = BeautifulSoup(page_source, 'html.parser')
-            
-            # 解析表格数据
-            stability_data = []
-            table = soup.find('table')
-            
-            if table:
-                rows = table.find_all('tr')[1:]  # 跳过表头
-                
-                for row in rows:
-                    cells = row.find_all('td')
-                    if len(cells) >= 4:
-                        project = cells[0].get_text(strip=True)
-                        stability_text = cells[1].get_text(strip=True)
-                        latest_price = cells[2].get_text(strip=True)
-                        remaining_days = cells[3].get_text(strip=True)
-                        
-                        # 跳过"加载中..."行
-                        if project == "加载中..." or not project:
-                            continue
-                        
-                        # 确定稳定度状态
-                        stability_status = "未知"
-                        if "稳定" in stability_text:
-                            stability_status = "稳定"
-                        elif "一般" in stability_text:
-                            stability_status = "一般"
-                        elif "不稳定" in stability_text:
-                            stability_status = "不稳定"
-                        
-                        stability_data.append({
-                            'project': project,
-                            'stability': stability_status,
-                            'price': latest_price,
-                            'remaining_days': remaining_days
-                        })
-            
-            self.logger.log_message(f"通过Selenium获取了 {len(stability_data)} 个稳定度项目")
-            return stability_data
-            
-        except Exception as e:
-            self.logger.log_message(f"Selenium获取稳定度数据失败: {str(e)}")
-            return []
-        finally:
-            if driver:
-                driver.quit()
+        with self.index_lock:
+            if self.page_browser is None:
+                self.page_browser = StabilityPageBrowser(self.logger)
+        return self.page_browser.read_stability_table()
     
     def fetch_stability_data_api(self):
         """
@@ -385,7 +247,30 @@ class Alpha123Client:
             self.logger.log_message(f"API获取稳定度数据失败: {str(e)}")
             return []
     
-    def get_top_stability_token(self):
+    def get_candidate_index(self, max_spread=0.2):
+        """
+        获取候选代币排名索引（同一份稳定度数据、同一阈值只构建一次）
+        
+        Args:
+            max_spread: 允许的最大价差基点
+        
+        Returns:
+            CandidateIndex: 候选代币排名索引
+        """
+        stability_data = self.get_stability_data()
+        alpha_id_map = self.alpha_id_map
+        with self.index_lock:
+            cached = self.candidate_index_cache
+            if cached and cached[0] is stability_data and cached[1] == max_spread and cached[2] is alpha_id_map:
+                return cached[3]
+        
+        index = CandidateIndex.build(stability_data, alpha_id_map, max_spread)
+        self.logger.log_message(f"候选代币索引已更新: {len(stability_data)} 个项目中 {len(index)} 个符合条件（st=green:stable 且 md>0 且 spr<{max_spread}）")
+        with self.index_lock:
+            self.candidate_index_cache = (stability_data, max_spread, alpha_id_map, index)
+        return index
+    
+    def get_top_stability_token(self, max_spread=0.2, exclude=()):
         """
         获取除KOGE外价差基点最小的代币（最稳定）
         
@@ -393,87 +278,190 @@ class Alpha123Client:
         - 排除KOGE
         - 4倍天数(md)必须大于0
         - 稳定度状态(st)必须为 "green:stable"
-        - 价差基点(spr)必须 < 0.2
+        - 价差基点(spr)必须 < max_spread（默认0.2）
         - 按价差基点(spr)升序排序，取最小值
         
+        Args:
+            max_spread: 允许的最大价差基点
+            exclude: 要跳过的交易对符号（如正在被其他交易线程使用的代币）
+        
         Returns:
             dict: 代币信息字典，包含symbol、display_name、price、stability、spread，失败返回None
         """
         try:
-            stability_data = self.fetch_stability_data()
-            if not stability_data:
-                self.logger.log_message("未获取到稳定度数据")
+            index = self.get_candidate_index(max_spread)
+            candidate = index.next_best(exclude)
+            if candidate is None:
+                self.logger.log_message(f"没有找到符合条件的稳定代币（st=green:stable 且 md>0 且 spr<{max_spread}，{len(index)} 个候选，排除 {len(exclude)} 个）")
                 return None
             
-            # 数据已经按spr排序（越小越稳定），过滤掉KOGE，找到第一个符合条件的代币
-            for item in stability_data:
-                project = item.get('project', '')
-                if project and project.upper() != 'KOGE':
-                    # 获取稳定度状态
-                    stability_status = item.get('stability_status', '').lower()
-                    
-                    # 条件1：st必须为 green:stable
-                    if stability_status != 'green:stable':
-                        self.logger.log_message(f"代币 {project} 稳定度状态 {stability_status} != green:stable，不符合条件")
-                        continue
-                    
-                    # 条件2：md必须大于0
-                    md_str = item.get('md', '0')
-                    try:
-                        md_value = float(md_str)
-                    except (ValueError, TypeError):
-                        self.logger.log_message(f"代币 {project} 4倍天数无效: {md_str}")
-                        continue
-                    
-                    if md_value <= 0:
-                        self.logger.log_message(f"代币 {project} 4倍天数 {md_value} <= 0，不符合条件")
-                        continue
-                    
-                    # 获取价差基点
-                    spread_str = item.get('spread', 'N/A')
-                    
-                    # 条件3：spr必须 < 0.2
-                    try:
-                        spread_value = float(spread_str)
-                    except (ValueError, TypeError):
-                        self.logger.log_message(f"代币 {project} 价差基点无效: {spread_str}")
-                        continue
-                    
-                    if spread_value >= 0.2:
-                        self.logger.log_message(f"代币 {project} 价差基点 {spread_value} >= 0.2，不符合稳定条件")
-                        continue
-                    
-                    # 两个条件都满足，检查alpha_id
-                    alpha_id = self.alpha_id_map.get(project)
-                    if alpha_id:
-                        # 安全解析价格
-                        try:
-                            price_value = item.get('price', 0)
-                            price = float(price_value) if price_value else 0.0
-                        except (ValueError, TypeError):
-                            price = 0.0
-                        
-                        # 获取稳定度信息（用于显示）
-                        stability_info = item.get('stability', '未知')
-                        
-                        self.logger.log_message(f"[OK] 选中最稳定代币: {project}, st={stability_status}, md={md_value}>0, spr={spread_value}<0.2")
-                        
-                        return {
-                            'symbol': f"{alpha_id}USDT",
-                            'display_name': project,
-                            'price': price,
-                            'stability': stability_info,
-                            'spread': spread_str
-                        }
-            
-            self.logger.log_message("没有找到符合条件的稳定代币（st=green:stable 且 md>0 且 spr<0.2）")
-            return None
+            self.logger.log_message(f"[OK] 选中最稳定代币: {candidate['display_name']}, spr={candidate['spread']}<{max_spread}")
+            return dict(candidate)
             
         except Exception as e:
             self.logger.log_message(f"获取最稳定代币失败: {str(e)}")
             return None
 
 
+class CandidateIndex:
+    """候选代币排名索引类 - 每份稳定度数据构建一次，按价差基点从小到大排列可交易的代币"""
+    
+    def __init__(self, candidates):
+        """
+        初始化候选代币排名索引
+        
+        Args:
+            candidates: 按排名排列的候选代币信息（symbol、display_name、price、stability、spread）
+        """
+        self.candidates = tuple(candidates)
+        self.ranks = {candidate['symbol']: rank for rank, candidate in enumerate(self.candidates)}
+    
+    @classmethod
+    def build(cls, stability_data, alpha_id_map, max_spread):
+        """
+        从已排序的稳定度记录构建索引
+        
+        Args:
+            stability_data: 稳定度记录（KOGE排第一，其他按价差基点升序）
+            alpha_id_map: ALPHA代币ID映射字典
+            max_spread: 允许的最大价差基点
+        
+        Returns:
+            CandidateIndex: 候选代币排名索引
+        """
+        candidates = []
+        for item in stability_data:
+            project = item['project']
+            if project.upper() == 'KOGE':
+                continue  # KOGE固定排第一，不参与选币
+            if item.get('spread', STABILITY_SPREAD_UNKNOWN) >= max_spread:
+                break  # 之后的代币价差基点只会更大
+            if item.get('stability_status') != 'green:stable' or item.get('remaining_days', 0) <= 0:
+                continue
+            alpha_id = alpha_id_map.get(project)
+            if not alpha_id:
+                continue
+            candidates.append({
+                'symbol': f"{alpha_id}USDT",
+                'display_name': project,
+                'price': item.get('price', 0.0),
+                'stability': item.get('stability', '未知'),
+                'spread': item['spread']
+            })
+        return cls(candidates)
+    
+    def __len__(self):
+        return len(self.candidates)
+    
+    def next_best(self, exclude=()):
+        """
+        获取排名最高且不在排除列表中的候选代币
+        
+        Args:
+            exclude: 要跳过的交易对符号集合
+        
+        Returns:
+            dict: 候选代币信息，没有时返回None
+        """
+        for candidate in self.candidates:
+            if candidate['symbol'] not in exclude:
+                return candidate
+        return None
+    
+    def top(self, k, exclude=()):
+        """
+        获取排名前k的候选代币（跳过排除列表中的代币）
+        
+        Args:
+            k: 数量
+            exclude: 要跳过的交易对符号集合
+        
+        Returns:
+            list: 候选代币信息列表
+        """
+        result = []
+        for candidate in self.candidates:
+            if len(result) >= k:
+                break
+            if candidate['symbol'] not in exclude:
+                result.append(candidate)
+        return result
+    
+    def rank(self, symbol):
+        """
+        获取代币的排名（从0开始）
+        
+        Args:
+            symbol: 交易对符号
+        
+        Returns:
+            int: 排名，不是候选代币时返回None
+        """
+        return self.ranks.get(symbol)
+
+
+def to_number(value, default=0.0):
+    """
+    把接口返回的数值（数字或数字字符串）转换为float
+    
+    Args:
+        value: 原始值
+        default: 无法转换时的默认值
+    
+    Returns:
+        float: 转换后的数值
+    """
+    try:
+        return float(value)
+    except (ValueError, TypeError):
+        return default
+
+
+def normalize_stability_item(raw_item):
+    """
+    把一条接口数据（新格式或旧格式）转换为统一的稳定度记录
+    
+    新格式: {'n': 'XXX/USDT', 'p': 价格, 'st': 'green:stable', 'md': 4倍剩余天数, 'spr': 价差基点}
+    旧格式: {'display': 'XXX/USDT', 'key', 'metrics': {'lastPrice'}, 'status': {'text'}, 'multiplier_days', 'spread'}
+    
+    Args:
+        raw_item: 接口返回的单个项目
+    
+    Returns:
+        dict: 稳定度记录，无法识别时返回None
+    """
+    if not isinstance(raw_item, dict):
+        return None
+    
+    if 'n' in raw_item and 'p' in raw_item and 'st' in raw_item:
+        project = (raw_item.get('n') or '').replace('/USDT', '')
+        price = raw_item.get('p', 0)
+        status_text = raw_item.get('st') or 'unknown'
+        remaining_days = raw_item.get('md', 0)
+        spread = raw_item.get('spr', 0)
+    elif 'items' not in raw_item:
+        display = raw_item.get('display', '')
+        project = display.replace('/USDT', '') if display else raw_item.get('key', '')
+        price = (raw_item.get('metrics') or {}).get('lastPrice', 0)
+        status_text = (raw_item.get('status') or {}).get('text') or 'unknown'
+        remaining_days = raw_item.get('multiplier_days', 0)
+        spread = raw_item.get('spread', STABILITY_SPREAD_UNKNOWN)  # 旧格式可能没有spread字段
+    else:
+        return None
+    
+    if not project:
+        return None
+    
+    return {
+        'project': project,
+        'stability': STABILITY_LABELS.get(str(status_text).lower(), '未知'),
+        'stability_status': str(status_text).lower(),  # 原始st/status值
+        'price': to_number(price),
+        'remaining_days': to_number(remaining_days),
+        'spread': to_number(spread, STABILITY_SPREAD_UNKNOWN)
+    }
+
+
 # 创建全局Alpha123客户端实例（可选）
 _global_alpha123_client = None
 
@@ -8,7 +8,6 @@ Authentication Module for Binance Auto Trade System
 import sys
 import uuid
 import hashlib
-import tkinter as tk
 
 
 class AuthManager:
@@ -80,23 +79,34 @@ class AuthManager:
             return hashlib.md5(mac.encode()).hexdigest()
         return None
     
-    def check_mac_permission(self):
+    def verify_mac_permission(self):
         """
-        检查MAC地址权限
+        校验MAC地址权限（不弹出对话框，无界面模式也可使用）
         
         Returns:
-            bool: 权限验证通过返回True，否则返回False
+            tuple: (是否通过, 错误信息)，通过时错误信息为None
         """
         current_mac_hash = self.get_mac_hash()
         if not current_mac_hash:
-            self.show_permission_error("无法获取设备信息")
-            return False
+            return False, "无法获取设备信息"
         
         if current_mac_hash not in self.allowed_mac_hashes:
-            self.show_permission_error(f"设备未授权\n当前设备哈希: {current_mac_hash}")
-            return False
+            return False, f"设备未授权\n当前设备哈希: {current_mac_hash}"
         
         print(f"MAC地址校验通过: {current_mac_hash}")
+        return True, None
+    
+    def check_mac_permission(self):
+        """
+        检查MAC地址权限
+        
+        Returns:
+            bool: 权限验证通过返回True，否则返回False
+        """
+        allowed, error_message = self.verify_mac_permission()
+        if not allowed:
+            self.show_permission_error(error_message)
+            return False
         return True
     
     def show_permission_error(self, message):
@@ -106,6 +116,9 @@ class AuthManager:
         Args:
             message: 错误信息
         """
+        # 只有GUI模式才需要tkinter，延迟导入以便无界面模式不加载它
+        import tkinter as tk
+        
         root = tk.Tk()
         root.withdraw()  # 隐藏主窗口
         
@@ -9,12 +9,14 @@ import requests
 import json
 from decimal import Decimal, ROUND_DOWN
 from logger import Logger
+# 导入时钟模块
+from clock import get_clock
 
 
 class BinanceAPI:
     """币安API接口类 - 负责与币安API进行交互"""
     
-    def __init__(self, base_url=None, csrf_token=None, cookie=None, logger=None, extra_headers=None):
+    def __init__(self, base_url=None, csrf_token=None, cookie=None, logger=None, extra_headers=None, clock=None):
         """
         初始化币安API接口
         
@@ -24,12 +26,15 @@ class BinanceAPI:
             cookie: Cookie字符串
             logger: Logger实例，用于记录日志
             extra_headers: 额外的 header 字段（device-info, fvideo-id 等）
+            clock: 时钟对象（默认全局时钟）
         """
         self.base_url = base_url or "https://www.binance.com/bapi/defi/v1/public/alpha-trade"
         self.csrf_token = csrf_token
         self.cookie = cookie
         self.logger = logger or Logger()
         self.extra_headers = extra_headers or {}
+        self.clock = clock or get_clock()
+        self.symbol_resolver = None  # SymbolResolver实例（反查ALPHA代币ID对应的代币名称）
     
     def get_token_price(self, symbol):
         """
@@ -48,11 +53,36 @@ class BinanceAPI:
                     'is_buyer_maker': bool  # 是否为买方主动
                 }
         """
+        trades = self.get_agg_trades(symbol, limit=1)  # 只获取1条最新交易记录
+        if not trades:
+            return None
+        
+        # 解析聚合成交数据，返回格式化的价格数据
+        trade = trades[0]
+        return {
+            'price': trade.get('p'),  # 最新成交价格
+            'quantity': trade.get('q'),  # 成交数量
+            'timestamp': trade.get('T'),  # 成交时间戳
+            'trade_id': trade.get('a'),  # 聚合交易ID
+            'is_buyer_maker': trade.get('m')  # 是否为买方主动
+        }
+    
+    def get_agg_trades(self, symbol, limit=1):
+        """
+        获取最近的聚合成交记录（原始格式，也用于录制离线回放数据）
+        
+        Args:
+            symbol: 代币符号，如 "ALPHA_1USDT"
+            limit: 获取条数
+            
+        Returns:
+            list: 聚合成交列表，每条包含 a(ID)、p(价格)、q(数量)、T(毫秒时间戳)、m(是否买方挂单)，失败返回None
+        """
         try:
             url = "https://www.binance.com/bapi/defi/v1/public/alpha-trade/agg-trades"
             params = {
                 'symbol': symbol,
-                'limit': 1  # 只获取1条最新交易记录
+                'limit': limit
             }
             
             # 使用公开接口的请求头
@@ -68,19 +98,7 @@ class BinanceAPI:
             data = response.json()
             
             if data.get('code') == '000000':
-                trades = data.get('data', [])
-                if trades and len(trades) > 0:
-                    # 解析聚合成交数据，返回格式化的价格数据
-                    trade = trades[0]
-                    return {
-                        'price': trade.get('p'),  # 最新成交价格
-                        'quantity': trade.get('q'),  # 成交数量
-                        'timestamp': trade.get('T'),  # 成交时间戳
-                        'trade_id': trade.get('a'),  # 聚合交易ID
-                        'is_buyer_maker': trade.get('m')  # 是否为买方主动
-                    }
-                else:
-                    return None
+                return data.get('data', [])
             else:
                 self.logger.log_message(f"API调用失败: {data.get('message', '未知错误')}")
                 return None
@@ -390,12 +408,11 @@ class BinanceAPI:
         Returns:
             str: 订单ID，失败返回None
         """
-        from datetime import datetime
         import json
         
         # 记录交易详情
         trade_detail = {
-            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'timestamp': self.clock.now().strftime('%Y-%m-%d %H:%M:%S'),
             'symbol': symbol,
             'side': side,
             'price': price,
@@ -573,10 +590,10 @@ class BinanceAPI:
             str: 订单状态（FILLED/PARTIALLY_FILLED等），失败返回None
         """
         try:
-            from datetime import datetime, timedelta
+            from datetime import timedelta
             
             # 获取今天和明天的时间戳
-            now = datetime.now()
+            now = self.clock.now()
             today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
             tomorrow_start = today_start + timedelta(days=1)
             
@@ -631,6 +648,50 @@ class BinanceAPI:
             self.logger.log_message(f"查询订单历史异常: {str(e)}")
             return None
     
+    def get_order_history(self, rows=20):
+        """
+        获取今天最新的订单历史（不含未成交的挂单）
+        
+        Args:
+            rows: 获取的订单条数
+            
+        Returns:
+            list: 订单字典列表（最新的在前），失败返回None
+        """
+        try:
+            from datetime import timedelta
+            
+            # 获取今天的时间范围
+            today = self.clock.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            tomorrow_start = today + timedelta(days=1)
+            
+            url = "https://www.binance.com/bapi/defi/v1/private/alpha-trade/order/get-order-history-web"
+            params = {
+                'page': 1,
+                'rows': rows,
+                'orderStatus': 'FILLED,PARTIALLY_FILLED,EXPIRED,CANCELED,REJECTED',
+                'startTime': int(today.timestamp() * 1000),
+                'endTime': int(tomorrow_start.timestamp() * 1000)
+            }
+            
+            headers = BinanceAPI.build_request_headers(self.csrf_token, self.cookie, self.extra_headers)
+            
+            response = requests.get(url, params=params, headers=headers, timeout=10)
+            if response.status_code != 200:
+                self.logger.log_message(f"查询订单历史失败 - HTTP状态码: {response.status_code}")
+                return None
+            
+            data = response.json()
+            if data.get('code') == '000000':
+                return data.get('data') or []
+            
+            self.logger.log_message(f"查询订单历史失败: {data.get('message', '未知错误')}")
+            return None
+                
+        except Exception as e:
+            self.logger.log_message(f"查询订单历史异常: {str(e)}")
+            return None
+    
     def get_order_details(self, order_id=None):
         """
         获取订单详细信息（获取最新一条订单）
@@ -642,10 +703,10 @@ class BinanceAPI:
             dict: 订单详情字典，失败返回None
         """
         try:
-            from datetime import datetime, timedelta
+            from datetime import timedelta
             
             # 获取今天的时间范围
-            today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            today = self.clock.now().replace(hour=0, minute=0, second=0, microsecond=0)
             tomorrow_start = today + timedelta(days=1)
             
             start_time = int(today.timestamp() * 1000)
@@ -690,7 +751,7 @@ class BinanceAPI:
         
         Args:
             symbol: 原始代币符号（例如 "MERL"）。
-                   若传入类似 "ALPHA_195"，将尝试从 alphaIdMap.json 反查为原始符号。
+                   若传入类似 "ALPHA_195"，将尝试反查为原始符号。
         
         Returns:
             float: 代币数量，未找到或失败返回0
@@ -698,18 +759,8 @@ class BinanceAPI:
         try:
             # 若传入的是 ALPHA_###，尝试反查为原始代币名（如 MERL）
             search_asset = symbol
-            try:
-                if isinstance(symbol, str) and symbol.startswith("ALPHA_"):
-                    with open('alphaIdMap.json', 'r', encoding='utf-8') as f:
-                        alpha_map = json.load(f)
-                    # 反向映射
-                    for k, v in alpha_map.items():
-                        if v == symbol:
-                            search_asset = k
-                            break
-            except Exception:
-                # 反查失败时忽略，按原值查询
-                pass
+            if isinstance(symbol, str) and symbol.startswith("ALPHA_"):
+                search_asset = self.lookup_token_name(symbol) or symbol
 
             url = "https://www.binance.com/bapi/asset/v2/private/asset-service/wallet/asset"
             params = {
@@ -745,6 +796,29 @@ class BinanceAPI:
             self.logger.log_message(f"获取钱包余额异常: {str(e)}")
             return 0
 
+    def lookup_token_name(self, alpha_id):
+        """
+        反查ALPHA代币ID对应的代币名称（优先使用内存中的映射，没有时读取 alphaIdMap.json）
+
+        Args:
+            alpha_id: ALPHA代币ID（如 "ALPHA_195"）
+
+        Returns:
+            str: 代币名称，找不到返回None
+        """
+        if self.symbol_resolver is not None:
+            return self.symbol_resolver.name_for(alpha_id)
+        try:
+            with open('alphaIdMap.json', 'r', encoding='utf-8') as f:
+                alpha_map = json.load(f)
+        except Exception:
+            # 反查失败时忽略，按原值查询
+            return None
+        for name, mapped_id in alpha_map.items():
+            if mapped_id == alpha_id:
+                return name
+        return None
+
     def get_funding_balance(self):
         """
         获取资金账户余额（Funding账户的USDT余额）
@@ -7,41 +7,25 @@ Binance Auto Trade System
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-import requests
-import json
-import threading
-import time
-import random
-from datetime import datetime, timedelta
+from datetime import datetime
 import sys
 import os
-import uuid
-import hashlib
-from bs4 import BeautifulSoup
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import multiprocessing
 
-# 导入日志模块
-from logger import Logger
-# 导入币安API模块
-from binance_api import BinanceAPI
 # 导入认证模块
 from auth import AuthManager
-# 导入Alpha123稳定度数据模块
-from alpha123 import Alpha123Client
-# 导入订单处理模块
-from order_handler import OrderHandler
-# 导入配置管理模块
-from config_manager import ConfigManager
-# 导入交易引擎模块
-from trading_engine import TradingEngine
+# 导入交易核心模块
+from trader_core import TraderCore
+# 导入交易引擎进程模块
+from engine_process import EngineClient
+# 导入代币表格模块
+from token_table import TokenTable
 
-class BinanceTrader:
-    def __init__(self):
+# 界面轮询交易引擎事件的间隔（毫秒）
+ENGINE_POLL_INTERVAL_MS = 50
+
+class BinanceTrader(TraderCore):
+    def __init__(self, engine_in_process=False):
         self.root = tk.Tk()
         self.root.title("Binance Auto Trade - 币安量化交易系统")
         self.root.geometry("1000x700")
@@ -57,92 +41,32 @@ class BinanceTrader:
         if not self.auth_manager.check_mac_permission():
             return  # 权限校验失败，不继续初始化
         
-        # 创建log文件夹并初始化日志管理器
-        self.log_dir = "log"
-        if not os.path.exists(self.log_dir):
-            os.makedirs(self.log_dir)
-        
-        # 初始化日志管理器（GUI控件稍后设置）
-        self.logger = Logger(log_dir=self.log_dir)
-        
-        # 初始化配置管理器（先加载配置以获取认证信息）
-        self.config_manager = ConfigManager(config_file="config.json", logger=self.logger)
-        self.config_manager.load_config()
-        
-        # 从配置管理器获取认证信息（保留本地引用以便快速访问）
-        self.csrf_token = self.config_manager.csrf_token
-        self.cookie = self.config_manager.cookie
-        
-        # 币安ALPHA API基础URL
-        self.base_url = "https://www.binance.com/bapi/defi/v1/public/alpha-trade"
-        
-        # 初始化币安API接口（直接传入认证信息）
-        self.api = BinanceAPI(
-            base_url=self.base_url, 
-            csrf_token=self.csrf_token,
-            cookie=self.cookie,
-            logger=self.logger,
-            extra_headers=self.config_manager.extra_headers
-        )
-        
-        # 存储代币数据
-        self.tokens = {}
+        # 初始化交易核心（日志、配置、API、交易状态）
+        super().__init__(config_file="config.json", log_dir="log")
         
-        # 稳定度看板数据
-        self.stability_data = []
-        self.stability_window = None  # 稳定度看板窗口引用
+        # 代币表格（界面对象不放进代币状态存储）
+        self.token_table = None
+        self.tree_view_pending = False  # 是否已安排刷新表格（多次变化合并为一次刷新）
         
-        # 从配置管理器获取统计数据（保留本地引用以便快速访问）
-        self.daily_total_amount = self.config_manager.daily_total_amount
-        self.daily_trade_loss = self.config_manager.daily_trade_loss
-        self.daily_completed_trades = self.config_manager.daily_completed_trades
-        self.last_trade_date = self.config_manager.last_trade_date
+        # 稳定度看板窗口引用
+        self.stability_window = None
         
-        # 当前买卖交易跟踪
-        self.current_sell_amount = 0.0  # 当前买卖交易中卖单的总成交额
-        
-        # 自动交易状态
-        self.auto_trading = {}  # 存储每个代币的自动交易状态
-        self.trading_threads = {}  # 存储交易线程
-        
-        # 4倍自动交易状态
-        self.trading_4x_active = False  # 4倍自动交易是否激活
-        self.trading_4x_thread = None  # 4倍自动交易线程
-        
-        # 定时交易状态
-        self.scheduled_trading_enabled = False  # 定时交易是否启用
-        self.scheduled_trading_thread = None  # 定时交易检查线程
-        self.last_scheduled_date = None  # 上次执行定时交易的日期
-        
-        # 今日交易次数统计
-        # daily_completed_trades 现在由 config_manager 管理
-        self.alarm_played_today = False  # 今日是否已播放过闹钟
-        
-        # 闹钟播放状态
-        self.alarm_is_playing = False  # 闹钟是否正在播放
-        
-        # 交易成功标识
-        self.trade_success_flag = True  # 标识当前交易是否成功
-        
-        # 存储输入框和按钮的引用
+        # 交易引擎客户端（交易引擎在独立进程中运行时使用）
+        self.engine_client = None
         
         # 创建界面
         self.create_widgets()
         
-        # 加载ALPHA代币ID映射（在GUI日志控件设置之后）
-        self.alpha_id_map = self.load_alpha_id_map()
-        
-        # 初始化Alpha123稳定度数据客户端
-        self.alpha123_client = Alpha123Client(logger=self.logger, alpha_id_map=self.alpha_id_map)
-        
-        # 初始化订单处理器
-        self.order_handler = OrderHandler(self)
-        
-        # 初始化交易引擎
-        self.trading_engine = TradingEngine(self)
-        
-        # 从稳定度看板添加常驻代币
-        self.add_permanent_tokens_from_stability()
+        if engine_in_process:
+            # 初始化交易组件（在GUI日志控件设置之后，加载ALPHA代币ID映射）
+            self.init_trading_components()
+            # 从稳定度看板添加常驻代币
+            self.add_permanent_tokens_from_stability()
+            # 延迟获取当天初始资金（确保认证信息已设置）
+            self.root.after(500, self.init_daily_balance)
+        else:
+            # 交易引擎进程负责交易组件、常驻代币、初始资金和所有交易，界面进程只负责显示
+            self.start_engine_process()
         
         # 延迟更新统计数据显示，确保界面已完全创建
         self.root.after(100, self.update_daily_total_display)
@@ -150,198 +74,146 @@ class BinanceTrader:
         self.root.after(100, self.update_daily_trade_count_display)
         self.root.after(100, self.update_daily_initial_balance_display)
         self.root.after(100, self.update_daily_end_balance_display)
-        
-        # 延迟获取当天初始资金（确保认证信息已设置）
-        self.root.after(500, self.init_daily_balance)
     
-    def load_alpha_id_map(self):
-        """加载ALPHA代币ID映射，每天只更新一次，如果当天已更新则直接读取文件"""
-        from datetime import datetime
-        
-        # 检查是否需要更新（每天一次）
-        need_update = False
-        today = datetime.now().strftime('%Y-%m-%d')
-        
-        # 检查alphaIdMap.json是否存在
-        if not os.path.exists('alphaIdMap.json'):
-            need_update = True
-            print("未找到alphaIdMap.json文件，需要从API获取...")
-            self.logger.log_message("未找到alphaIdMap.json文件，需要从API获取...")
-        else:
-            # 检查文件修改时间是否为今天
-            try:
-                file_mtime = datetime.fromtimestamp(os.path.getmtime('alphaIdMap.json'))
-                file_date = file_mtime.strftime('%Y-%m-%d')
-                
-                if file_date != today:
-                    need_update = True
-                    print(f"Alpha ID映射文件不是今天的（文件日期: {file_date}），需要更新...")
-                    self.logger.log_message(f"Alpha ID映射文件不是今天的（文件日期: {file_date}），需要更新...")
-                else:
-                    print("Alpha ID映射文件是今天的，直接加载...")
-                    self.logger.log_message("Alpha ID映射文件是今天的，直接加载...")
-            except Exception as e:
-                print(f"检查文件时间失败: {e}，尝试从API获取...")
-                self.logger.log_message(f"检查文件时间失败: {e}，尝试从API获取...")
-                need_update = True
+    # ==================== 界面通知钩子（覆盖TraderCore） ====================
+    
+    def run_on_ui(self, func):
+        """把函数转交给tkinter主线程执行"""
+        self.root.after(0, func)
+    
+    def notify_tokens_changed(self):
+        """代币数据变化时刷新表格（界面线程执行前的多次变化只刷新一次）"""
+        if self.tree_view_pending:
+            return
+        self.tree_view_pending = True
+        self.run_on_ui(self.update_tree_view)
+    
+    def notify_statistics_changed(self):
+        """统计数据变化时刷新统计标签"""
+        self.run_on_ui(self.update_daily_total_display)
+        self.run_on_ui(self.update_daily_loss_display)
+        self.run_on_ui(self.update_daily_trade_count_display)
+        self.run_on_ui(self.update_daily_initial_balance_display)
+        self.run_on_ui(self.update_daily_end_balance_display)
+    
+    def notify_4x_trading_started(self):
+        """4倍自动交易启动时切换按钮状态"""
+        self.run_on_ui(lambda: self.trading_4x_btn.config(text="停止4倍交易", bg='#e74c3c'))
+    
+    def notify_4x_trading_finished(self):
+        """4倍自动交易结束时恢复按钮状态"""
+        self.run_on_ui(lambda: self.trading_4x_btn.config(text="4倍自动交易", bg='#27ae60'))
+    
+    def notify_alarm(self):
+        """需要人工介入时播放闹钟"""
+        self.run_on_ui(self.play_alarm)
+    
+    def show_error(self, title, message):
+        """弹出错误对话框"""
+        self.run_on_ui(lambda: messagebox.showerror(title, message))
+    
+    def notify_stability_updated(self, items, fetched_at):
+        """稳定度数据刷新后更新看板"""
+        self.run_on_ui(lambda: self.show_stability_data(items, fetched_at))
+    
+    # ==================== 交易引擎进程 ====================
+    
+    def start_engine_process(self):
+        """在独立进程中启动交易引擎，界面只负责显示和发送命令"""
+        # 配置文件由引擎进程负责保存，界面进程写入已加载的修改后不再写入（如跨天归零），避免覆盖引擎的统计数据
+        self.config_manager.writer.close()
+        # 统计数据只显示引擎进程发来的数值，跨天归零和跨天回调只在引擎进程中执行
+        self.statistics.set_mirror()
+        self.engine_client = EngineClient(config_file=self.config_manager.config_file, log_dir=self.log_dir)
+        # 之后的日志交给引擎进程写入文件；写完已记录的日志后关闭界面进程的日志文件
+        self.logger.set_forwarder(lambda *line: self.engine_client.send('write_log', *line))
+        self.logger.close()
+        self.engine_client.start()
+        self.log_message("交易引擎已在独立进程中启动")
+        
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        self.root.after(ENGINE_POLL_INTERVAL_MS, self.poll_engine_events)
+    
+    def dispatch(self, command, *args, background=False):
+        """
+        执行会修改交易状态的操作
         
-        # 如果需要更新，从API获取最新数据
-        if need_update:
-            try:
-                print("正在从币安API获取最新代币列表...")
-                self.logger.log_message("正在从币安API获取最新代币列表...")
-                token_data = self.api.get_binance_token_list()
-                alpha_id_map = self.api.create_alpha_id_map(token_data)
-                
-                # 保存映射到文件
-                with open('alphaIdMap.json', 'w', encoding='utf-8') as f:
-                    json.dump(alpha_id_map, f, indent=2, ensure_ascii=False)
-                
-                success_msg = f"✅ 成功从API获取并保存Alpha ID映射，包含 {len(alpha_id_map)} 个代币"
-                print(success_msg)
-                self.logger.log_message(success_msg)
-                return alpha_id_map
-                
-            except Exception as e:
-                error_msg = f"从API获取代币列表失败: {e}"
-                print(error_msg)
-                self.logger.log_message(error_msg)
-                print("尝试加载现有文件作为备用...")
-                self.logger.log_message("尝试加载现有文件作为备用...")
-                
-                # 如果API调用失败，尝试加载现有文件
-                if os.path.exists('alphaIdMap.json'):
-                    try:
-                        with open('alphaIdMap.json', 'r', encoding='utf-8') as f:
-                            existing_map = json.load(f)
-                            backup_msg = f"已加载现有Alpha ID映射作为备用，包含 {len(existing_map)} 个代币"
-                            print(backup_msg)
-                            self.logger.log_message(backup_msg)
-                            return existing_map
-                    except Exception as file_e:
-                        print(f"加载现有文件失败: {file_e}")
-                        self.logger.log_message(f"加载现有文件失败: {file_e}")
-                        print("使用默认映射")
-                        self.logger.log_message("使用默认映射")
-                        return {"KOGE": "ALPHA_22"}
-                else:
-                    print("未找到现有文件，使用默认映射")
-                    self.logger.log_message("未找到现有文件，使用默认映射")
-                    return {"KOGE": "ALPHA_22"}
+        交易引擎在独立进程中运行时把命令发送给引擎进程，否则直接调用TraderCore的同名方法。
+        
+        Args:
+            command: 命令名（见 engine_process.ENGINE_COMMANDS）
+            *args: 命令参数
+            background: 进程内运行时是否放到后台线程执行
+        """
+        if self.engine_client:
+            self.engine_client.send(command, *args)
+        elif background:
+            self.clock.start_thread(getattr(self, command), args=args)
         else:
-            # 直接加载现有文件
+            getattr(self, command)(*args)
+    
+    def poll_engine_events(self):
+        """处理交易引擎进程发来的事件"""
+        for kind, payload in self.engine_client.poll_events():
             try:
-                with open('alphaIdMap.json', 'r', encoding='utf-8') as f:
-                    existing_map = json.load(f)
-                    load_msg = f"✅ 已加载现有Alpha ID映射，包含 {len(existing_map)} 个代币"
-                    print(load_msg)
-                    self.logger.log_message(load_msg)
-                    return existing_map
+                self.handle_engine_event(kind, payload)
             except Exception as e:
-                error_msg = f"加载现有文件失败: {e}"
-                print(error_msg)
-                self.logger.log_message(error_msg)
-                print("使用默认映射")
-                self.logger.log_message("使用默认映射")
-                return {"KOGE": "ALPHA_22"}
-    
-    def add_permanent_tokens_from_stability(self):
-        """从稳定度看板添加常驻代币"""
-        try:
-            # 获取稳定度看板数据
-            stability_data = self.alpha123_client.fetch_stability_data()
-            if not stability_data:
-                self.log_message("无法获取稳定度看板数据，将只添加KOGE代币")
-                self.add_koge_token()
-                return
-            
-            added_count = 0
-            for item in stability_data:
-                project = item.get('project', '')
-                if not project:
-                    continue
-                
-                # 查找对应的ALPHA ID
-                alpha_id = self.alpha_id_map.get(project)
-                if not alpha_id:
-                    continue
-                
-                alpha_symbol = f"{alpha_id}USDT"
-                
-                # 检查代币是否已在监控列表中
-                if alpha_symbol in self.tokens:
-                    continue
-                
-                # 获取稳定度看板返回的价格
-                stability_price = float(item.get('price', 0))
-                
-                # 添加代币到监控列表，直接使用稳定度看板的价格
-                self.tokens[alpha_symbol] = {
-                    'price': stability_price,
-                    'last_update': datetime.now(),
-                    'display_name': project,
-                    'trade_count': 1,
-                    'trade_amount': 0.0,
-                    'auto_trading': False,
-                    'change_24h': 0.0,  # 稳定度看板没有24h变化数据，设为0
-                    'last_buy_quantity': 0.0,  # 存储上一个买单的份额
-                    'last_buy_amount': 0.0,  # 存储上一个买单的成交额
-                    'last_sell_amount': 0.0  # 存储上一个卖单的成交额
-                }
-                added_count += 1
-            
-            # 更新表格显示
-            self.update_tree_view()
-            
-            # 记录日志
-            if hasattr(self, 'log_text'):
-                self.log_message(f"已从稳定度看板添加 {added_count} 个常驻代币")
-            else:
-                print(f"已从稳定度看板添加 {added_count} 个常驻代币")
-            
-        except Exception as e:
-            self.log_message(f"从稳定度看板添加常驻代币失败: {str(e)}")
-            # 如果失败，至少添加KOGE代币
-            self.add_koge_token()
-    
-    def add_koge_token(self):
-        """添加常驻的KOGE代币（备用方法）"""
-        koge_symbol = "ALPHA_22USDT"  # KOGE的ALPHA ID
-        self.tokens[koge_symbol] = {
-            'price': 0.0,
-            'last_update': datetime.now(),
-            'display_name': 'KOGE',
-            'trade_count': 1,
-            'trade_amount': 0.0,
-            'auto_trading': False,
-            'last_buy_quantity': 0.0,  # 存储上一个买单的份额
-            'last_buy_amount': 0.0,  # 存储上一个买单的成交额
-            'last_sell_amount': 0.0  # 存储上一个卖单的成交额
-        }
-        # 更新表格显示
-        self.update_tree_view()
-        # 检查log_text是否已创建
-        if hasattr(self, 'log_text'):
-            self.log_message("已添加常驻代币: KOGE (ALPHA_22USDT)")
-        else:
-            print("已添加常驻代币: KOGE (ALPHA_22USDT)")
+                print(f"处理交易引擎事件 {kind} 失败: {str(e)}")
         
-        # 立即获取KOGE的价格数据
-        self.fetch_koge_price()
-    
+        if self.engine_client.is_alive():
+            self.root.after(ENGINE_POLL_INTERVAL_MS, self.poll_engine_events)
+        else:
+            self.log_message("⚠️ 交易引擎进程已退出，请重新启动程序")
+            self.update_status("交易引擎已退出", 'red')
     
-    def fetch_koge_price(self):
-        """获取KOGE代币的价格数据"""
-        def fetch_data():
-            koge_symbol = "ALPHA_22USDT"
-            price_data = self.get_token_price(koge_symbol)
-            if price_data:
-                stats_data = self.get_token_24h_stats(koge_symbol)
-                self.root.after(0, lambda: self.update_token_data(koge_symbol, price_data, stats_data, 'KOGE'))
-            else:
-                self.root.after(0, lambda: self.log_message("获取KOGE价格失败（请先设置认证信息）"))
+    def handle_engine_event(self, kind, payload):
+        """
+        处理单个交易引擎事件
         
-        threading.Thread(target=fetch_data, daemon=True).start()
+        Args:
+            kind: 事件类型
+            payload: 事件内容
+        """
+        if kind == 'log':
+            # 引擎进程已写入日志文件，这里只显示
+            self.logger.display_message(payload)
+        elif kind == 'tokens':
+            changed, removed = payload
+            self.tokens.apply_changes(changed, removed)
+            self.update_tree_view()
+        elif kind == 'stability':
+            self.show_stability_data(*payload)
+        elif kind == 'stats':
+            self.apply_statistics(payload)
+            self.update_daily_total_display()
+            self.update_daily_loss_display()
+            self.update_daily_trade_count_display()
+            self.update_daily_initial_balance_display()
+            self.update_daily_end_balance_display()
+        elif kind == '4x_started':
+            self.trading_4x_active = True
+            self.trading_4x_btn.config(text="停止4倍交易", bg='#e74c3c')
+        elif kind == '4x_finished':
+            self.trading_4x_active = False
+            self.trading_4x_btn.config(text="4倍自动交易", bg='#27ae60')
+        elif kind == 'alarm':
+            self.play_alarm()
+        elif kind == 'error':
+            title, message = payload
+            messagebox.showerror(title, message)
+    
+    def on_close(self):
+        """关闭窗口：通知交易引擎进程在进行中的交易完成后退出"""
+        if self.engine_client and self.engine_client.is_alive():
+            busy = self.trading_4x_active or any(data.get('auto_trading') for data in self.tokens.values())
+            if busy and not messagebox.askyesno(
+                "确认退出",
+                "仍有进行中的自动交易。\n关闭界面后，交易引擎会在进行中的交易完成后退出。\n\n确定要关闭吗？"
+            ):
+                return
+            self.engine_client.shutdown()
+        self.config_manager.flush_config()
+        self.root.destroy()
     
     def create_widgets(self):
         """创建GUI界面组件"""
@@ -400,7 +272,7 @@ class BinanceTrader:
         )
         self.daily_initial_balance_label.pack(side='left', padx=2)
         
-        # 今日结束余额
+        # 今日结束余额（可点击，立即用资金账户余额对账）
         tk.Label(stats_frame, text="今日结束余额:", font=('Arial', 10, 'bold'), bg='#f0f0f0', fg='#2c3e50').pack(side='left', padx=(10, 5))
         self.daily_end_balance_label = tk.Label(
             stats_frame,
@@ -411,9 +283,11 @@ class BinanceTrader:
             relief='raised',
             bd=1,
             padx=8,
-            pady=2
+            pady=2,
+            cursor='hand2'
         )
         self.daily_end_balance_label.pack(side='left', padx=2)
+        self.daily_end_balance_label.bind('<Button-1>', lambda e: self.dispatch('reconcile_balance', background=True))
         
         # 今日交易总额
         tk.Label(stats_frame, text="今日总额:", font=('Arial', 10, 'bold'), bg='#f0f0f0', fg='#2c3e50').pack(side='left', padx=(10, 5))
@@ -607,43 +481,8 @@ class BinanceTrader:
         self.status_label.pack(fill='both', expand=True)
     
     def create_custom_table(self, parent):
-        """创建自定义表格"""
-        # 创建表头
-        header_frame = tk.Frame(parent, bg='#e0e0e0', height=30)
-        header_frame.pack(fill='x')
-        header_frame.pack_propagate(False)
-        
-        # 表头标签
-        headers = ['代币', '最新价格 (USDT)', '更新时间', '交易次数', '成交额 (USDT)', '自动交易']
-        widths = [120, 200, 120, 100, 120, 100]
-        
-        for i, (header, width) in enumerate(zip(headers, widths)):
-            label = tk.Label(header_frame, text=header, bg='#e0e0e0', font=('Arial', 10, 'bold'))
-            label.place(x=sum(widths[:i]), y=0, width=width, height=30)
-        
-        # 创建表格内容区域
-        self.table_content_frame = tk.Frame(parent, bg='white')
-        self.table_content_frame.pack(fill='both', expand=True)
-        
-        # 添加滚动条
-        self.scrollbar = ttk.Scrollbar(self.table_content_frame, orient='vertical')
-        self.scrollbar.pack(side='right', fill='y')
-        
-        # 创建画布用于滚动
-        self.canvas = tk.Canvas(self.table_content_frame, yscrollcommand=self.scrollbar.set, bg='white')
-        self.canvas.pack(side='left', fill='both', expand=True)
-        self.scrollbar.config(command=self.canvas.yview)
-        
-        # 创建表格内容框架
-        self.table_items_frame = tk.Frame(self.canvas, bg='white')
-        self.canvas.create_window((0, 0), window=self.table_items_frame, anchor='nw')
-        
-        # 绑定滚动事件
-        self.table_items_frame.bind('<Configure>', self.on_frame_configure)
-        self.canvas.bind('<Configure>', self.on_canvas_configure)
-        
-        # 存储表格行
-        self.table_rows = []
+        """创建代币表格（只为可见区域创建行组件，见 token_table 模块）"""
+        self.token_table = TokenTable(parent, self)
         
         # 兼容性：创建虚拟的tree对象
         class VirtualTree:
@@ -652,14 +491,11 @@ class BinanceTrader:
                 self.selection = []
             
             def get_children(self):
-                return [f"row_{i}" for i in range(len(self.table.table_rows))]
+                return [f"row_{i}" for i in range(len(self.table.token_table.model))]
             
             def delete(self, item):
-                if item.startswith("row_"):
-                    index = int(item.split("_")[1])
-                    if 0 <= index < len(self.table.table_rows):
-                        self.table.table_rows[index].destroy()
-                        del self.table.table_rows[index]
+                """删除行 - 虚拟方法，表格行由代币数据决定（删除代币后刷新表格）"""
+                pass
             
             def selection_remove(self, item):
                 if item in self.selection:
@@ -675,15 +511,6 @@ class BinanceTrader:
         
         self.tree = VirtualTree(self)
     
-    def on_frame_configure(self, event):
-        """表格框架大小变化时更新滚动区域"""
-        self.canvas.configure(scrollregion=self.canvas.bbox("all"))
-    
-    def on_canvas_configure(self, event):
-        """画布大小变化时调整内容框架宽度"""
-        canvas_width = event.width
-        self.canvas.itemconfig(self.canvas.find_all()[0], width=canvas_width)
-    
     def create_context_menu(self):
         """创建右键菜单"""
         self.context_menu = tk.Menu(self.root, tearoff=0)
@@ -987,28 +814,12 @@ class BinanceTrader:
                 'user-agent': parsed_headers.get('user-agent', ''),
             }
             
-            # 使用config_manager设置认证信息
-            self.config_manager.set_credentials(csrf_token, cookie, extra_headers)
-            
-            # 更新本地认证信息
-            self.csrf_token = csrf_token
-            self.cookie = cookie
-            self.config_manager.extra_headers = extra_headers
-            
-            # 重新创建API实例（使用新的认证信息）
-            self.api = BinanceAPI(
-                base_url=self.base_url,
-                csrf_token=self.csrf_token,
-                cookie=self.cookie,
-                logger=self.logger,
-                extra_headers=extra_headers
-            )
-            
-            # 更新依赖组件的API引用
-            if hasattr(self, 'trading_engine'):
-                self.trading_engine.api = self.api
-            if hasattr(self, 'order_handler'):
-                self.order_handler.api = self.api
+            if self.engine_client:
+                # 交易引擎进程负责保存配置，界面进程只更新本地副本（用于查询价格和显示过期时间）
+                self.engine_client.send('set_credentials', csrf_token, cookie, extra_headers)
+                self.set_credentials(csrf_token, cookie, extra_headers, save=False)
+            else:
+                self.set_credentials(csrf_token, cookie, extra_headers)
             
             self.log_message("认证信息设置成功并已保存")
             self.log_message(f"已提取: cookie, csrftoken, device-info, fvideo-id, bnc-uuid 等字段")
@@ -1045,47 +856,11 @@ class BinanceTrader:
         # 聚焦到文本框
         headers_text.focus()
     
-    def log_message(self, message):
-        """添加日志消息 - 调用logger模块记录日志"""
-        self.logger.log_message(message)
-    
     def update_status(self, message, color='green'):
         """更新状态标签"""
         self.status_label.config(text=message, fg=color)
         self.root.update_idletasks()
     
-    def get_token_price(self, symbol, max_retries=5):
-        """
-        获取代币价格 - 调用API模块，带重试机制
-        
-        Args:
-            symbol: 代币符号，如 "ALPHA_1USDT"
-            max_retries: 最大重试次数，默认5次
-            
-        Returns:
-            dict: 包含价格和交易信息的字典，失败返回None
-        """
-        import time
-        import random
-        
-        for attempt in range(max_retries):
-            result = self.api.get_token_price(symbol)
-            if result:
-                return result
-            
-            # 如果获取失败且还有重试机会
-            if attempt < max_retries - 1:
-                self.log_message(f"获取 {symbol} 价格失败，第{attempt + 1}次重试")
-                time.sleep(random.uniform(0.5, 1.5))
-        
-        # 所有重试都失败
-        self.log_message(f"获取 {symbol} 价格失败，已重试{max_retries}次")
-        return None
-    
-    def get_token_24h_stats(self, symbol):
-        """获取代币24小时统计 - 调用API模块"""
-        return self.api.get_token_24h_stats(symbol)
-    
     def add_token(self):
         """添加代币"""
         if not self.csrf_token or not self.cookie:
@@ -1098,88 +873,18 @@ class BinanceTrader:
             messagebox.showwarning("警告", "请输入代币名称")
             return
         
-        # 查找对应的ALPHA ID
-        alpha_id = self.alpha_id_map.get(symbol)
-        if not alpha_id:
-            # 如果找不到代币，尝试更新Alpha ID映射
-            print(f"未找到代币 {symbol} 的ALPHA ID，尝试更新代币列表...")
-            self.logger.log_message(f"未找到代币 {symbol} 的ALPHA ID，尝试更新代币列表...")
-            
-            try:
-                # 强制更新Alpha ID映射
-                token_data = self.api.get_binance_token_list()
-                updated_alpha_id_map = self.api.create_alpha_id_map(token_data)
-                
-                # 更新内存中的映射
-                self.alpha_id_map = updated_alpha_id_map
-                
-                # 保存到文件
-                with open('alphaIdMap.json', 'w', encoding='utf-8') as f:
-                    json.dump(updated_alpha_id_map, f, indent=2, ensure_ascii=False)
-                
-                update_msg = f"✅ 已更新Alpha ID映射，包含 {len(updated_alpha_id_map)} 个代币"
-                print(update_msg)
-                self.logger.log_message(update_msg)
-                
-                # 再次查找代币
-                alpha_id = self.alpha_id_map.get(symbol)
-                if not alpha_id:
-                    messagebox.showerror("错误", f"更新后仍未找到代币 {symbol} 的ALPHA ID，请检查代币名称是否正确")
-                    return
-                else:
-                    print(f"更新后找到代币 {symbol} 的ALPHA ID: {alpha_id}")
-                    self.logger.log_message(f"更新后找到代币 {symbol} 的ALPHA ID: {alpha_id}")
-                    
-            except Exception as e:
-                error_msg = f"更新Alpha ID映射失败: {e}"
-                print(error_msg)
-                self.logger.log_message(error_msg)
-                messagebox.showerror("错误", f"未找到代币 {symbol} 的ALPHA ID，且更新失败: {e}")
-                return
-        
-        alpha_symbol = f"{alpha_id}USDT"
-        
-        if alpha_symbol in self.tokens:
-            messagebox.showwarning("警告", f"代币 {symbol} ({alpha_symbol}) 已存在")
-            return
-        
-        self.update_status("正在获取代币信息...", 'orange')
-        self.log_message(f"正在添加代币: {symbol} -> {alpha_symbol}")
-        
-        # 在新线程中获取价格
-        def fetch_data():
-            price_data = self.get_token_price(alpha_symbol)
-            if price_data:
-                stats_data = self.get_token_24h_stats(alpha_symbol)
-                
-                # 在主线程中更新UI
-                self.root.after(0, lambda: self.update_token_data(alpha_symbol, price_data, stats_data, symbol))
-            else:
-                self.root.after(0, lambda: self.handle_add_token_error(symbol))
-        
-        threading.Thread(target=fetch_data, daemon=True).start()
+        # 查找ALPHA ID和获取价格会阻塞，在后台执行（交易引擎在独立进程中运行时由引擎进程执行）
+        self.update_status(f"正在添加代币: {symbol}", 'orange')
+        self.dispatch('add_token_by_name', symbol, background=True)
     
     def update_token_data(self, symbol, price_data, stats_data, display_name=None):
         """更新代币数据"""
         try:
             price = float(price_data['price'])
             
-            # 如果是新代币，初始化交易相关数据
-            if symbol not in self.tokens:
-                self.tokens[symbol] = {
-                    'trade_count': 1,  # 默认交易次数
-                    'trade_amount': 0.0,  # 默认成交额
-                    'auto_trading': False,  # 默认不自动交易
-                    'last_buy_quantity': 0.0,  # 存储上一个买单的份额
-                    'last_buy_amount': 0.0,  # 存储上一个买单的成交额
-                    'last_sell_amount': 0.0  # 存储上一个卖单的成交额
-                }
-            
-            self.tokens[symbol]['price'] = price
-            self.tokens[symbol]['last_update'] = datetime.now()
-            self.tokens[symbol]['display_name'] = display_name or symbol
+            # 新代币会同时初始化交易相关数据
+            self.dispatch('set_token_price', symbol, price, display_name or symbol)
             
-            self.update_tree_view()
             display = display_name or symbol
             self.update_status(f"成功添加代币: {display}", 'green')
             self.log_message(f"代币 {display} ({symbol}) 更新成功，价格: ${price:.8f}")
@@ -1188,124 +893,21 @@ class BinanceTrader:
             self.log_message(f"解析 {symbol} 数据失败: {str(e)}")
             self.update_status("数据解析失败", 'red')
     
-    def handle_add_token_error(self, symbol):
-        """处理添加代币错误"""
-        self.update_status("添加代币失败", 'red')
-        messagebox.showerror("错误", f"无法获取代币 {symbol} 的信息，请检查代币名称是否正确")
-    
     def update_tree_view(self):
-        """更新表格显示"""
-        # 清空现有数据
-        for row in self.table_rows:
-            row.destroy()
-        self.table_rows.clear()
-        
-        # 添加代币数据
-        for symbol, data in self.tokens.items():
-            price = data['price']
-            last_update = data['last_update'].strftime("%H:%M:%S")
-            display_name = data.get('display_name', symbol)
-            
-            # 在价格文本后添加可点击的刷新标识
-            price_text = f"${price:.8f} 🔄"
-            
-            # 获取交易相关数据
-            trade_count = data.get('trade_count', 1)
-            trade_amount = data.get('trade_amount', 0.0)
-            auto_trading = data.get('auto_trading', False)
-            
-            # 创建表格行
-            row_frame = self.create_table_row(symbol, display_name, price_text, last_update, trade_count, trade_amount, auto_trading)
-            self.table_rows.append(row_frame)
-            
-            # 存储行引用
-            if 'row_ref' not in self.tokens[symbol]:
-                self.tokens[symbol]['row_ref'] = {}
-            self.tokens[symbol]['row_ref'] = row_frame
-    
-    def create_table_row(self, symbol, display_name, price_text, last_update, trade_count, trade_amount, auto_trading):
-        """创建表格行"""
-        # 创建行框架
-        row_frame = tk.Frame(self.table_items_frame, bg='white', height=30)
-        row_frame.pack(fill='x')
-        row_frame.pack_propagate(False)
-        
-        # 列宽度
-        widths = [120, 200, 120, 100, 120, 100]
-        
-        # 代币名称
-        token_label = tk.Label(row_frame, text=display_name, bg='white', font=('Arial', 9))
-        token_label.place(x=0, y=0, width=widths[0], height=30)
-        
-        # 价格（可点击）
-        price_label = tk.Label(row_frame, text=price_text, bg='white', font=('Arial', 9), cursor='hand2')
-        price_label.place(x=widths[0], y=0, width=widths[1], height=30)
-        price_label.bind('<Button-1>', lambda e: self.refresh_single_token(symbol))
-        
-        # 更新时间
-        time_label = tk.Label(row_frame, text=last_update, bg='white', font=('Arial', 9))
-        time_label.place(x=widths[0]+widths[1], y=0, width=widths[2], height=30)
-        
-        # 交易次数输入框
-        count_entry = tk.Entry(row_frame, width=8, font=('Arial', 9), justify='center')
-        count_entry.insert(0, str(trade_count))
-        count_entry.place(x=widths[0]+widths[1]+widths[2], y=2, width=widths[3]-4, height=26)
-        count_entry.bind('<Return>', lambda e: self.update_trade_count_from_entry(symbol, count_entry.get()))
-        count_entry.bind('<FocusOut>', lambda e: self.update_trade_count_from_entry(symbol, count_entry.get()))
-        
-        # 成交额输入框
-        amount_entry = tk.Entry(row_frame, width=10, font=('Arial', 9), justify='center')
-        amount_entry.insert(0, f"{trade_amount:.2f}")
-        amount_entry.place(x=widths[0]+widths[1]+widths[2]+widths[3], y=2, width=widths[4]-4, height=26)
-        amount_entry.bind('<Return>', lambda e: self.update_trade_amount_from_entry(symbol, amount_entry.get()))
-        amount_entry.bind('<FocusOut>', lambda e: self.update_trade_amount_from_entry(symbol, amount_entry.get()))
-        
-        # 自动交易按钮
-        if auto_trading:
-            button_text = "停止"
-            button_color = '#e74c3c'
-        else:
-            button_text = "开始"
-            button_color = '#27ae60'
-        
-        auto_button = tk.Button(
-            row_frame, 
-            text=button_text, 
-            width=6, 
-            font=('Arial', 9, 'bold'),
-            bg=button_color,
-            fg='white',
-            relief='raised',
-            bd=2
-        )
-        auto_button.place(x=widths[0]+widths[1]+widths[2]+widths[3]+widths[4], y=2, width=widths[5]-4, height=26)
-        
-        # 添加按钮按下效果
-        auto_button.bind('<Button-1>', lambda e: self.on_button_press(auto_button))
-        auto_button.bind('<ButtonRelease-1>', lambda e: self.on_button_release(auto_button, symbol))
-        
-        # 存储组件引用
-        if 'widgets' not in self.tokens[symbol]:
-            self.tokens[symbol]['widgets'] = {}
-        self.tokens[symbol]['widgets'] = {
-            'count_entry': count_entry,
-            'amount_entry': amount_entry,
-            'auto_button': auto_button
-        }
-        
-        return row_frame
-    
-    
+        """
+        更新表格显示：只更新可见行中发生变化的字段（价格、时间、次数、成交额、按钮状态），
+        排序和筛选在表格的数据模型中完成
+        """
+        self.tree_view_pending = False
+        # 读取只读快照，不阻塞交易线程
+        self.token_table.refresh(self.tokens.snapshot())
     
     def update_trade_count_from_entry(self, symbol, value):
         """从输入框更新交易次数"""
         try:
             count = int(value)
             if count > 0:
-                self.tokens[symbol]['trade_count'] = count
-                self.log_message(f"{symbol} 交易次数设置为: {count}")
-                # 更新表格显示
-                self.update_tree_view()
+                self.dispatch('set_token_trade_count', symbol, count)
             else:
                 messagebox.showerror("错误", "交易次数必须大于0")
         except ValueError:
@@ -1316,11 +918,7 @@ class BinanceTrader:
         try:
             amount = float(value)
             if amount >= 0:
-                self.tokens[symbol]['trade_amount'] = amount
-                display_name = self.tokens[symbol].get('display_name', symbol)
-                self.log_message(f"{display_name} 成交额设置为: {amount} USDT")
-                # 更新表格显示
-                self.update_tree_view()
+                self.dispatch('set_token_trade_amount', symbol, amount)
             else:
                 messagebox.showerror("错误", "成交额不能为负数")
         except ValueError:
@@ -1403,29 +1001,24 @@ class BinanceTrader:
     
     def toggle_auto_trading_from_dialog(self, symbol, dialog):
         """从对话框切换自动交易状态"""
-        self.trading_engine.toggle_auto_trading(symbol)
+        self.dispatch('toggle_auto_trading', symbol)
         dialog.destroy()
     
     def save_trade_settings(self, symbol, count_str, amount_str, dialog):
         """保存交易设置"""
         try:
-            # 验证并更新交易次数
+            # 验证交易次数
             count = int(count_str)
             if count <= 0:
                 raise ValueError("交易次数必须大于0")
-            self.tokens[symbol]['trade_count'] = count
-            self.log_message(f"{symbol} 交易次数设置为:{count}")
             
-            # 验证并更新成交额
+            # 验证成交额
             amount = float(amount_str)
             if amount < 0:
                 raise ValueError("成交额不能为负数")
-            self.tokens[symbol]['trade_amount'] = amount
-            display_name = self.tokens[symbol].get('display_name', symbol)
-            self.log_message(f"{display_name} 成交额设置为:{amount:.2f} USDT")
             
-            # 更新表格显示
-            self.update_tree_view()
+            self.dispatch('set_token_trade_count', symbol, count)
+            self.dispatch('set_token_trade_amount', symbol, amount)
             dialog.destroy()
             
         except ValueError as e:
@@ -1439,7 +1032,7 @@ class BinanceTrader:
         """按钮松开效果"""
         button.configure(relief='raised')
         # 延迟执行实际功能，让用户看到按下效果
-        self.root.after(100, lambda: self.trading_engine.toggle_auto_trading(symbol))
+        self.root.after(100, lambda: self.dispatch('toggle_auto_trading', symbol))
     
     
     def delete_selected_token(self):
@@ -1464,21 +1057,8 @@ class BinanceTrader:
             return
         
         if messagebox.askyesno("确认", f"确定要删除代币 {display_name} 吗？"):
-            if symbol_to_delete in self.auto_trading:
-                del self.auto_trading[symbol_to_delete]
-            if symbol_to_delete in self.trading_threads:
-                del self.trading_threads[symbol_to_delete]
-            
-            # 清理嵌入的组件
-            if symbol_to_delete in self.tokens and 'widgets' in self.tokens[symbol_to_delete]:
-                widgets = self.tokens[symbol_to_delete]['widgets']
-                for widget in widgets.values():
-                    if widget.winfo_exists():
-                        widget.destroy()
-            
-            del self.tokens[symbol_to_delete]
-            self.update_tree_view()
-            self.log_message(f"已删除代币: {display_name}")
+            # 代币删除后刷新表格时移除对应的行
+            self.dispatch('remove_token', symbol_to_delete)
     
     def refresh_selected_token(self):
         """刷新选中代币的价格"""
@@ -1516,71 +1096,13 @@ class BinanceTrader:
             else:
                 self.root.after(0, lambda: self.log_message(f"刷新 {display_name} 失败"))
         
-        threading.Thread(target=refresh_data, daemon=True).start()
+        self.clock.start_thread(refresh_data)
     
     def clear_tokens(self):
         """清空所有代币（保留稳定度看板中的代币）"""
         if messagebox.askyesno("确认", "确定要清空所有代币吗？（稳定度看板中的代币将保留）"):
-            # 获取稳定度看板中的代币列表和价格
-            stability_tokens = {}
-            try:
-                stability_data = self.fetch_stability_data()
-                if stability_data:
-                    for item in stability_data:
-                        project = item.get('project', '')
-                        if project:
-                            alpha_id = self.alpha_id_map.get(project)
-                            if alpha_id:
-                                alpha_symbol = f"{alpha_id}USDT"
-                                stability_price = float(item.get('price', 0))
-                                stability_tokens[alpha_symbol] = {
-                                    'price': stability_price,
-                                    'display_name': project,
-                                    'change_24h': 0.0
-                                }
-            except Exception as e:
-                self.log_message(f"获取稳定度看板代币列表失败: {str(e)}")
-                # 如果失败，至少保留KOGE
-                stability_tokens["ALPHA_22USDT"] = {
-                    'price': 0.0,
-                    'display_name': 'KOGE',
-                    'change_24h': 0.0
-                }
-            
-            # 保留稳定度看板中的代币，使用稳定度看板的价格
-            permanent_tokens = {}
-            for symbol, stability_data in stability_tokens.items():
-                if symbol in self.tokens:
-                    token_data = self.tokens[symbol]
-                    permanent_tokens[symbol] = {
-                        'price': stability_data.get('price', token_data.get('price', 0.0)),
-                        'last_update': token_data.get('last_update', datetime.now()),
-                        'display_name': stability_data.get('display_name', token_data.get('display_name', '')),
-                        'trade_count': 1,
-                        'trade_amount': 0.0,
-                        'auto_trading': False,
-                        'change_24h': stability_data.get('change_24h', 0.0),
-                        'last_buy_quantity': token_data.get('last_buy_quantity', 0.0),  # 保留上一个买单份额
-                        'last_buy_amount': token_data.get('last_buy_amount', 0.0),  # 保留上一个买单成交额
-                        'last_sell_amount': token_data.get('last_sell_amount', 0.0)  # 保留上一个卖单成交额
-                    }
-            
-            # 清理所有相关组件
-            for symbol, data in self.tokens.items():
-                if 'widgets' in data:
-                    widgets = data['widgets']
-                    for widget in widgets.values():
-                        if widget.winfo_exists():
-                            widget.destroy()
-            
-            self.auto_trading.clear()
-            self.trading_threads.clear()
-            
-            self.tokens.clear()
-            self.tokens.update(permanent_tokens)
-            
-            self.update_tree_view()
-            self.log_message(f"已清空所有代币（保留了 {len(permanent_tokens)} 个稳定度看板代币）")
+            # 保留稳定度看板中的代币（刷新表格时移除其他代币的行），使用稳定度看板的价格
+            self.dispatch('retain_stability_tokens', background=True)
     
     def cancel_all_orders(self):
         """取消所有订单并清理持仓"""
@@ -1600,65 +1122,8 @@ class BinanceTrader:
         
         self.log_message("开始执行取消所有订单并清理持仓...")
         
-        # 在新线程中执行，避免阻塞UI
-        def cleanup_all():
-            try:
-                # 1. 取消所有未成交订单
-                self.log_message("正在取消所有未成交订单...")
-                cancel_success = self.api.cancel_all_orders()
-                if cancel_success:
-                    self.log_message("✅ 已取消所有未成交订单")
-                else:
-                    self.log_message("❌ 取消订单失败，继续执行清理...")
-                
-                # 等待一下，确保订单取消生效
-                time.sleep(2)
-                
-                # 2. 清理所有持仓
-                tokens_with_holdings = []
-                for symbol, token_data in self.tokens.items():
-                    last_buy_quantity = token_data.get('last_buy_quantity', 0)
-                    if last_buy_quantity > 0:
-                        tokens_with_holdings.append((symbol, token_data, last_buy_quantity))
-                
-                if tokens_with_holdings:
-                    self.log_message(f"发现 {len(tokens_with_holdings)} 个代币有持仓，开始清仓...")
-                    
-                    for symbol, token_data, quantity in tokens_with_holdings:
-                        display_name = token_data.get('display_name', symbol)
-                        self.log_message(f"{display_name} 检测到持有份额: {quantity}，正在清仓卖出...")
-                        
-                        # 使用交易引擎的清仓卖单逻辑（全局清理模式）
-                        self.trading_engine.execute_cleanup_sell_order(symbol, display_name, quantity, is_global_cleanup=True)
-                        
-                        # 每个代币之间稍微等待一下
-                        time.sleep(1)
-                else:
-                    self.log_message("✅ 无持仓代币，无需清仓")
-                
-                # 3. 停止所有自动交易
-                active_trading = []
-                for symbol in list(self.auto_trading.keys()):
-                    if self.auto_trading.get(symbol, False):
-                        active_trading.append(symbol)
-                
-                if active_trading:
-                    self.log_message(f"停止 {len(active_trading)} 个代币的自动交易...")
-                    for symbol in active_trading:
-                        self.auto_trading[symbol] = False
-                        if symbol in self.tokens:
-                            self.tokens[symbol]['auto_trading'] = False
-                    
-                    # 更新UI
-                    self.root.after(0, self.update_tree_view)
-                
-                self.log_message("✅ 取消所有订单并清理持仓完成")
-                
-            except Exception as e:
-                self.log_message(f"❌ 清理过程中出现异常: {str(e)}")
-        
-        # 启动清理线程
-        threading.Thread(target=cleanup_all, daemon=True).start()
+        # 在后台执行，避免阻塞UI
+        self.dispatch('cleanup_all_positions', background=True)
     
     def refresh_single_token(self, symbol):
         """刷新单个代币价格"""
@@ -1683,31 +1148,26 @@ class BinanceTrader:
                 self.root.after(0, lambda: self.log_message(f"刷新 {display_name} 失败"))
                 self.root.after(0, lambda: self.update_status("刷新失败", 'red'))
         
-        threading.Thread(target=refresh_data, daemon=True).start()
+        self.clock.start_thread(refresh_data)
     
     def start_4x_trading(self):
         """开始4倍自动交易"""
         if self.trading_4x_active:
             # 停止4倍自动交易
+            self.dispatch('stop_4x_trading')
             self.trading_4x_active = False
             self.trading_4x_btn.config(text="4倍自动交易", bg='#27ae60')
-            self.log_message("4倍自动交易已停止")
         else:
-            # 开始4倍自动交易
+            # 开始4倍自动交易（启动成功后由 notify_4x_trading_started 切换按钮）
             try:
                 trading_count = int(self.trading_count_var.get())
                 if trading_count <= 0:
                     self.log_message("交易次数必须大于0")
                     return
                 
-                self.trading_4x_active = True
-                self.trading_4x_btn.config(text="停止4倍交易", bg='#e74c3c')
+                self.dispatch('begin_4x_trading', trading_count)
                 self.log_message(f"开始4倍自动交易，计划交易 {trading_count} 次")
                 
-                # 启动4倍自动交易线程
-                self.trading_4x_thread = threading.Thread(target=self.trading_engine.run_4x_trading, args=(trading_count,), daemon=True)
-                self.trading_4x_thread.start()
-                
             except ValueError:
                 self.log_message("请输入有效的交易次数")
     
@@ -1715,143 +1175,32 @@ class BinanceTrader:
         """定时交易复选框状态改变时的处理"""
         if self.scheduled_trading_var.get():
             # 启用定时交易
-            self.scheduled_trading_enabled = True
-            self.log_message("定时交易已启用")
-            self.start_scheduled_trading_checker()
+            try:
+                hour, minute = self.get_scheduled_time()
+                trading_count = self.get_planned_trading_count()
+            except ValueError:
+                self.log_message("定时交易时间格式错误，请检查输入")
+                return
+            self.dispatch('configure_scheduled_trading', True, hour, minute, trading_count, bool(self.is_alarm_enabled()))
         else:
             # 禁用定时交易
-            self.scheduled_trading_enabled = False
-            self.log_message("定时交易已禁用")
-            if self.scheduled_trading_thread and self.scheduled_trading_thread.is_alive():
-                # 注意：线程无法强制停止，只能设置标志位让它自然结束
-                pass
+            self.dispatch('configure_scheduled_trading', False)
     
-    def start_scheduled_trading_checker(self):
-        """启动定时交易检查线程"""
-        if self.scheduled_trading_thread and self.scheduled_trading_thread.is_alive():
-            return  # 如果已经在运行，不重复启动
-        
-        self.scheduled_trading_thread = threading.Thread(
-            target=self.scheduled_trading_worker, 
-            daemon=True
-        )
-        self.scheduled_trading_thread.start()
+    def get_scheduled_time(self):
+        """从界面输入框读取定时交易时间"""
+        return int(self.scheduled_hour_var.get()), int(self.scheduled_minute_var.get())
     
-    def scheduled_trading_worker(self):
-        """定时交易检查工作线程"""
-        while self.scheduled_trading_enabled:
-            try:
-                current_time = datetime.now()
-                current_date = current_time.date()
-                current_hour = current_time.hour
-                current_minute = current_time.minute
-                
-                # 获取设定的时间
-                try:
-                    scheduled_hour = int(self.scheduled_hour_var.get())
-                    scheduled_minute = int(self.scheduled_minute_var.get())
-                except ValueError:
-                    self.log_message("定时交易时间格式错误，请检查输入")
-                    time.sleep(60)  # 等待1分钟后重试
-                    continue
-                
-                # 检查是否到达设定时间
-                if (current_hour == scheduled_hour and 
-                    current_minute == scheduled_minute and 
-                    self.last_scheduled_date != current_date and
-                    not self.trading_4x_active):
-                    
-                    # 执行定时交易
-                    self.last_scheduled_date = current_date
-                    self.log_message(f"到达定时交易时间 {scheduled_hour:02d}:{scheduled_minute:02d}，开始执行4倍自动交易")
-                    
-                    # 获取默认交易次数
-                    try:
-                        trading_count = int(self.trading_count_var.get())
-                    except ValueError:
-                        trading_count = 8  # 默认8次
-                    
-                    # 在GUI线程中执行交易
-                    self.root.after(0, lambda: self.execute_scheduled_trading(trading_count))
-                
-                # 检查超时提醒（超过设定时间30分钟）
-                self.check_timeout_alarm(current_hour, current_minute, scheduled_hour, scheduled_minute, current_date)
-                
-                # 每分钟检查一次
-                time.sleep(60)
-                
-            except Exception as e:
-                self.log_message(f"定时交易检查出错: {str(e)}")
-                time.sleep(60)  # 出错后等待1分钟再重试
+    def get_planned_trading_count(self):
+        """从界面输入框读取计划交易次数"""
+        return int(self.trading_count_var.get())
     
-    def execute_scheduled_trading(self, trading_count):
-        """执行定时交易"""
-        try:
-            if trading_count <= 0:
-                self.log_message("交易次数必须大于0")
-                return
-            
-            self.trading_4x_active = True
-            self.trading_4x_btn.config(text="停止4倍交易", bg='#e74c3c')
-            self.log_message(f"定时交易启动，计划交易 {trading_count} 次")
-            
-            # 启动4倍自动交易线程
-            self.trading_4x_thread = threading.Thread(
-                target=self.trading_engine.run_4x_trading, 
-                args=(trading_count,), 
-                daemon=True
-            )
-            self.trading_4x_thread.start()
-                    
-        except Exception as e:
-            self.log_message(f"定时交易执行失败: {str(e)}")
-    
-    def check_timeout_alarm(self, current_hour, current_minute, scheduled_hour, scheduled_minute, current_date):
-        """检查超时提醒"""
-        try:
-            # 计算当前时间与设定时间的差值（分钟）
-            current_time_minutes = current_hour * 60 + current_minute
-            scheduled_time_minutes = scheduled_hour * 60 + scheduled_minute
-            
-            # 如果当前时间超过设定时间30分钟，但不超过1小时
-            if scheduled_time_minutes + 30 <= current_time_minutes < scheduled_time_minutes + 60:
-                # 检查今日是否已播放过闹钟
-                if not self.alarm_played_today:
-                    # 获取设定的交易次数
-                    try:
-                        expected_count = int(self.trading_count_var.get())
-                    except ValueError:
-                        expected_count = 8
-                    
-                    # 如果实际交易次数不等于设定次数，且启用了闹钟，播放闹钟
-                    enable_alarm = hasattr(self, 'enable_alarm_var') and self.enable_alarm_var.get()
-                    if self.daily_completed_trades != expected_count and enable_alarm:
-                        self.play_alarm()
-                        self.alarm_played_today = True
-                        self.log_message(f"⚠️ 超时警告：设定时间 {scheduled_hour:02d}:{scheduled_minute:02d} 已过30分钟，今日交易次数 {self.daily_completed_trades} 不等于设定次数 {expected_count}，播放闹钟提醒！")
-                    elif self.daily_completed_trades != expected_count and not enable_alarm:
-                        self.log_message(f"⚠️ 超时警告：设定时间 {scheduled_hour:02d}:{scheduled_minute:02d} 已过30分钟，今日交易次数 {self.daily_completed_trades} 不等于设定次数 {expected_count}，但闹钟未启用")
-                    else:
-                        self.log_message(f"今日交易次数已达到设定目标 {expected_count} 次，无需播放闹钟")
-            elif current_time_minutes >= scheduled_time_minutes + 60:
-                # 如果超过设定时间1小时，不再播放闹钟
-                if not self.alarm_played_today:
-                    try:
-                        expected_count = int(self.trading_count_var.get())
-                    except ValueError:
-                        expected_count = 8
-                    
-                    if self.daily_completed_trades != expected_count:
-                        self.log_message(f"⚠️ 超时警告：设定时间 {scheduled_hour:02d}:{scheduled_minute:02d} 已过1小时，今日交易次数 {self.daily_completed_trades} 不等于设定次数 {expected_count}，但已超过闹钟提醒时限")
-                        self.alarm_played_today = True  # 标记为已处理，避免重复提醒
-                        
-        except Exception as e:
-            self.log_message(f"超时检查出错: {str(e)}")
+    def is_alarm_enabled(self):
+        """闹钟复选框是否勾选"""
+        return hasattr(self, 'enable_alarm_var') and self.enable_alarm_var.get()
     
     def play_alarm(self):
         """播放闹钟音频"""
         try:
-            import os
             import subprocess
             
             # 检查alarm.mp3文件是否存在
@@ -1892,10 +1241,10 @@ class BinanceTrader:
                         self.log_message(f"闹钟播放进度: 第{i+1}/{total_cycles}次播放")
                         
                         # 等待7秒让音频播放
-                        time.sleep(7)
+                        self.clock.sleep(7)
                         
                         # 等待3秒后继续下一次播放
-                        time.sleep(3)
+                        self.clock.sleep(3)
                     
                     # 播放结束，更新状态
                     self.alarm_is_playing = False
@@ -1908,8 +1257,7 @@ class BinanceTrader:
                     self.root.after(0, self.update_alarm_button_color)
             
             # 启动播放线程
-            alarm_thread = threading.Thread(target=alarm_worker, daemon=True)
-            alarm_thread.start()
+            self.clock.start_thread(alarm_worker)
             
         except Exception as e:
             self.log_message(f"播放闹钟失败: {str(e)}")
@@ -1940,14 +1288,6 @@ class BinanceTrader:
         except Exception as e:
             self.log_message(f"更新闹钟按钮颜色失败: {str(e)}")
     
-    def reset_daily_alarm_flag(self):
-        """重置每日闹钟标志（在每日重置时调用）"""
-        self.alarm_played_today = False
-        self.config_manager.daily_completed_trades = 0
-        self.daily_completed_trades = 0
-        self.log_message("每日闹钟标志已重置")
-    
-    
     def show_stability_dashboard(self):
         """显示稳定度看板窗口"""
         # 检查是否已经存在稳定度看板窗口
@@ -2069,18 +1409,24 @@ class BinanceTrader:
         self.refresh_stability_data(stability_window)
     
     def refresh_stability_data(self, window):
-        """刷新稳定度数据"""
-        def fetch_data():
-            window.status_label.config(text="正在获取数据...", fg='orange')
-            
-            data = self.alpha123_client.fetch_stability_data()
-            
-            # 在主线程中更新UI
-            window.after(0, lambda: self.update_stability_table(window, data))
+        """刷新稳定度数据（在后台请求，完成后通过 notify_stability_updated 或 'stability' 事件更新看板）"""
+        window.status_label.config(text="正在获取数据...", fg='orange')
+        self.dispatch('refresh_stability', background=True)
+    
+    def show_stability_data(self, data, fetched_at):
+        """
+        把稳定度数据显示到看板（看板已关闭时忽略）
         
-        threading.Thread(target=fetch_data, daemon=True).start()
+        Args:
+            data: 稳定度数据列表
+            fetched_at: 获取时间戳（秒），从未获取成功时为None
+        """
+        window = self.stability_window
+        if window is None or not window.winfo_exists():
+            return
+        self.update_stability_table(window, data, datetime.fromtimestamp(fetched_at) if fetched_at else None)
     
-    def update_stability_table(self, window, data):
+    def update_stability_table(self, window, data, fetched_at=None):
         """更新稳定度表格"""
         # 清空现有数据
         for item in window.tree.get_children():
@@ -2096,6 +1442,8 @@ class BinanceTrader:
             stability = item['stability']
             price = item['price']
             remaining_days = item['remaining_days']
+            if isinstance(remaining_days, float):
+                remaining_days = f"{remaining_days:g}"  # 接口数据解析后是数值，显示为 10 而不是 10.0
             
             # 根据稳定度设置颜色标签和样式
             stability_display = stability
@@ -2120,7 +1468,10 @@ class BinanceTrader:
                 "添加"
             ), tags=(tag_name,))
         
-        window.status_label.config(text=f"已加载 {len(data)} 个项目", fg='green')
+        status_text = f"已加载 {len(data)} 个项目"
+        if fetched_at:
+            status_text += f"（更新于 {fetched_at.strftime('%H:%M:%S')}）"
+        window.status_label.config(text=status_text, fg='green')
         
         # 绑定添加按钮事件
         window.tree.bind('<Button-1>', lambda e: self.on_stability_item_click(e, window))
@@ -2138,34 +1489,9 @@ class BinanceTrader:
             self.add_token_from_stability(project)
     
     def add_token_from_stability(self, project):
-        """从稳定度看板添加代币到监控列表"""
-        # 查找对应的ALPHA ID
-        alpha_id = self.alpha_id_map.get(project)
-        if not alpha_id:
-            messagebox.showerror("错误", f"未找到代币 {project} 的ALPHA ID")
-            return
-        
-        alpha_symbol = f"{alpha_id}USDT"
-        
-        # 检查代币是否已在监控列表中
-        if alpha_symbol in self.tokens:
-            messagebox.showinfo("提示", f"代币 {project} ({alpha_symbol}) 已在监控列表中")
-            return
-        
-        try:
-            # 检查代币是否存在
-            price_data = self.get_token_price(alpha_symbol)
-            if price_data:
-                # 代币存在，添加到监控列表
-                stats_data = self.get_token_24h_stats(alpha_symbol)
-                self.update_token_data(alpha_symbol, price_data, stats_data, project)
-                self.log_message(f"从稳定度看板添加代币: {project} -> {alpha_symbol}")
-                messagebox.showinfo("成功", f"代币 {project} 已添加到监控列表")
-            else:
-                messagebox.showwarning("警告", f"无法获取代币 {project} 的价格数据")
-        except Exception as e:
-            self.log_message(f"添加代币 {project} 失败: {str(e)}")
-            messagebox.showerror("错误", f"添加代币 {project} 失败: {str(e)}")
+        """从稳定度看板添加代币到监控列表（在后台查找ALPHA ID并获取价格，结果写入日志）"""
+        self.log_message(f"从稳定度看板添加代币: {project}")
+        self.dispatch('add_token_by_name', project, background=True)
 
     def load_config(self):
         """加载配置文件 - 配置已在__init__中加载"""
@@ -2173,56 +1499,12 @@ class BinanceTrader:
         # 此方法保留用于接口兼容性
         pass
     
-    def save_config(self):
-        """保存配置文件 - 调用配置管理器"""
-        # 同步本地数据到配置管理器
-        self.config_manager.csrf_token = self.csrf_token
-        self.config_manager.cookie = self.cookie
-        self.config_manager.daily_total_amount = self.daily_total_amount
-        self.config_manager.daily_trade_loss = self.daily_trade_loss
-        self.config_manager.daily_completed_trades = self.daily_completed_trades
-        self.config_manager.last_trade_date = self.last_trade_date
-        
-        # 保存配置
-        self.config_manager.save_config()
-    
-    def init_daily_balance(self):
-        """初始化当天初始资金"""
-        if not self.csrf_token or not self.cookie:
-            self.log_message("认证信息未设置，跳过获取初始资金")
-            return
-        
-        # 检查是否已经设置过当天的初始资金
-        today = datetime.now().strftime('%Y-%m-%d')
-        if (self.config_manager.daily_initial_balance is not None and 
-            self.config_manager.last_trade_date == today):
-            self.log_message(f"当天初始资金已设置: {self.config_manager.daily_initial_balance} USDT")
-            return
-        
-        # 在新线程中获取初始资金，避免阻塞UI
-        def fetch_initial_balance():
-            try:
-                self.log_message("正在获取当天初始资金...")
-                balance = self.api.get_funding_balance()
-                
-                if balance is not None:
-                    self.config_manager.set_daily_initial_balance(balance)
-                    self.log_message(f"✅ 当天初始资金已设置: {balance} USDT")
-                    # 更新显示
-                    self.root.after(0, self.update_daily_initial_balance_display)
-                else:
-                    self.log_message("⚠️ 获取初始资金失败，请稍后重试")
-            except Exception as e:
-                self.log_message(f"获取初始资金异常: {str(e)}")
-        
-        threading.Thread(target=fetch_initial_balance, daemon=True).start()
-    
     def update_daily_total_display(self):
         """更新今日交易总额显示"""
         try:
             if hasattr(self, 'daily_total_label') and self.daily_total_label:
                 self.daily_total_label.config(text=f"{self.daily_total_amount:.2f} USDT")
-                self.log_message(f"今日交易总额显示已更新: {self.daily_total_amount:.2f} USDT")
+                self.log_debug("今日交易总额显示已更新: %.2f USDT", self.daily_total_amount, module='binance_trader')
             else:
                 self.log_message("今日交易总额标签尚未创建，将在界面完全加载后重试")
                 # 如果标签还没创建，延迟100ms后重试
@@ -2240,41 +1522,12 @@ class BinanceTrader:
         self.root.mainloop()
     
 
-    def update_trade_amount(self, symbol, price):
-        """更新成交额"""
-        try:
-            # 根据代币类型设置交易金额：KOGE使用1025，其他代币使用1030
-            trade_amount = 1025.0 if symbol == "ALPHA_22USDT" else 4120.0
-            # trade_amount = 1.0  # 测试模式：统一使用1 USDT
-            current_amount = self.tokens[symbol].get('trade_amount', 0.0)
-            new_amount = current_amount + trade_amount
-            
-            # 更新单个代币成交额
-            self.tokens[symbol]['trade_amount'] = new_amount
-            
-            # 更新今日交易总额
-            self.daily_total_amount += trade_amount
-            self.last_trade_date = datetime.now().strftime('%Y-%m-%d')
-            
-            # 保存配置
-            self.save_config()
-            
-            # 更新界面
-            self.root.after(0, self.update_tree_view)
-            self.root.after(0, self.update_daily_total_display)
-            self.root.after(0, self.update_daily_loss_display)
-            
-            display_name = self.tokens[symbol].get('display_name', symbol)
-            self.log_message(f"{display_name} 成交额更新: {current_amount:.2f} -> {new_amount:.2f} USDT，今日总额: {self.daily_total_amount:.2f} USDT")
-        except Exception as e:
-            self.log_message(f"更新成交额失败: {str(e)}")
-
     def update_daily_loss_display(self):
         """更新今日损耗显示"""
         try:
             if hasattr(self, 'daily_loss_label') and self.daily_loss_label:
                 self.daily_loss_label.config(text=f"{self.daily_trade_loss:.2f} USDT")
-                self.log_message(f"今日损耗显示已更新: {self.daily_trade_loss:.2f} USDT")
+                self.log_debug("今日损耗显示已更新: %.2f USDT", self.daily_trade_loss, module='binance_trader')
             else:
                 self.log_message("今日损耗标签尚未创建，将在界面完全加载后重试")
                 # 如果标签还没创建，延迟100ms后重试
@@ -2287,7 +1540,7 @@ class BinanceTrader:
         try:
             if hasattr(self, 'daily_trade_count_label') and self.daily_trade_count_label:
                 self.daily_trade_count_label.config(text=f"{self.daily_completed_trades}")
-                self.log_message(f"今日交易次数显示已更新: {self.daily_completed_trades}")
+                self.log_debug("今日交易次数显示已更新: %d", self.daily_completed_trades, module='binance_trader')
             else:
                 self.log_message("今日交易次数标签尚未创建，将在界面完全加载后重试")
                 # 如果标签还没创建，延迟100ms后重试
@@ -2295,12 +1548,6 @@ class BinanceTrader:
         except Exception as e:
             self.log_message(f"更新今日交易次数显示失败: {str(e)}")
             
-    def increment_daily_trade_count(self):
-        """增加今日交易次数"""
-        self.daily_completed_trades = self.config_manager.increment_trade_count()
-        self.root.after(0, self.update_daily_trade_count_display)
-        self.log_message(f"今日已完成交易次数: {self.daily_completed_trades}")
-    
     def update_daily_initial_balance_display(self):
         """更新今日初始余额显示"""
         try:
@@ -2361,8 +1608,14 @@ class BinanceTrader:
 
 def main():
     """主函数"""
+    # 打包为exe后，交易引擎子进程也从这里启动
+    multiprocessing.freeze_support()
+    
+    # --in-process: 交易引擎与界面在同一进程中运行（调试用）
+    engine_in_process = '--in-process' in sys.argv[1:]
+    
     try:
-        app = BinanceTrader()
+        app = BinanceTrader(engine_in_process=engine_in_process)
         app.run()
     except KeyboardInterrupt:
         print("\n程序被用户中断")
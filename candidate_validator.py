@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+候选代币实时校验模块
+Candidate Validator Module for Binance Auto Trade System
+
+稳定度数据中的价格可能是几分钟前的，死币或价格跳动的代币要等买单挂出去之后才会暴露。
+4倍交易选币时同时请求排名前K个候选代币的最近成交，计算成交频率、相对稳定度数据价格的偏离和
+短时间振幅，返回排名最靠前且当前确实在正常成交的代币。所有请求并发发出，耗时约等于一次请求。
+"""
+
+import threading
+
+
+class CandidateValidator:
+    """候选代币校验类 - 并发检查前K个候选代币的最近成交"""
+
+    def __init__(self, trader):
+        """
+        初始化候选代币校验器
+
+        Args:
+            trader: TraderCore实例
+        """
+        self.trader = trader
+        self.clock = trader.clock
+        self.lock = threading.Lock()
+
+    def select(self, max_spread, exclude=()):
+        """
+        选出排名最靠前且通过实时校验的候选代币
+
+        Args:
+            max_spread: 最大价差基点
+            exclude: 需要跳过的交易对符号集合
+
+        Returns:
+            dict: 与 Alpha123Client.get_top_stability_token 相同的代币信息，没有合格代币返回None
+        """
+        params = self.trader.trading_params
+        top_k = int(params['validate_top_k'])
+        client = self.trader.alpha123_client
+        if top_k <= 0:
+            return client.get_top_stability_token(max_spread=max_spread, exclude=exclude)
+
+        candidates = client.get_candidate_index(max_spread).top(top_k, exclude)
+        if not candidates:
+            return None
+
+        results = self.check_all(candidates)
+        for candidate, (passed, summary) in zip(candidates, results):
+            if passed:
+                self.trader.log_message(f"候选代币 {candidate['display_name']} 校验通过: {summary}")
+                return dict(candidate)
+            self.trader.log_message(f"跳过候选代币 {candidate['display_name']}: {summary}")
+        return None
+
+    def check_all(self, candidates):
+        """
+        并发校验候选代币
+
+        Args:
+            candidates: 候选代币列表
+
+        Returns:
+            list: 与 candidates 对应的 (是否通过, 说明)
+        """
+        results = [(False, "未完成校验")] * len(candidates)
+
+        def check(index, candidate):
+            try:
+                result = self.check(candidate)
+            except Exception as e:
+                result = (False, f"校验异常: {str(e)}")
+            with self.lock:
+                results[index] = result
+
+        threads = [self.clock.start_thread(check, args=(index, candidate))
+                   for index, candidate in enumerate(candidates)]
+        # 用时钟等待，虚拟时钟下时间可以继续前进
+        while any(thread.is_alive() for thread in threads):
+            self.clock.sleep(0.05)
+        return results
+
+    def check(self, candidate):
+        """
+        校验单个候选代币的最近成交
+
+        Args:
+            candidate: 候选代币信息（symbol, price 等）
+
+        Returns:
+            tuple: (是否通过, 说明)
+        """
+        params = self.trader.trading_params
+        trades = self.trader.api.get_agg_trades(candidate['symbol'], limit=params['validation_trade_limit'])
+        if not trades:
+            return False, "获取最近成交失败或没有成交"
+
+        metrics = measure_trades(trades, self.clock.time(), params['validation_window'])
+        if metrics is None:
+            return False, f"最近 {params['validation_window']:g} 秒没有成交"
+
+        drift = abs(metrics['last_price'] - candidate['price']) / candidate['price'] if candidate['price'] > 0 else 0.0
+        summary = (f"成交频率 {metrics['trade_rate']:.2f} 笔/秒，价格偏离 {drift:.3%}，"
+                   f"振幅 {metrics['volatility']:.3%}")
+
+        if metrics['trade_rate'] < params['min_trade_rate']:
+            return False, summary + "（成交太少）"
+        if drift > params['max_price_drift']:
+            return False, summary + "（价格偏离稳定度数据）"
+        if metrics['volatility'] > params['max_volatility']:
+            return False, summary + "（价格波动过大）"
+        return True, summary
+
+
+def measure_trades(trades, now, window):
+    """
+    统计最近窗口内的成交
+
+    Args:
+        trades: agg-trades格式的成交列表（T为毫秒时间戳，p为价格）
+        now: 当前时间戳（秒）
+        window: 统计窗口（秒）
+
+    Returns:
+        dict: {trade_rate, last_price, volatility}，窗口内没有成交返回None
+            - trade_rate: 窗口内的成交笔数 / 窗口秒数
+            - last_price: 最新成交价
+            - volatility: 窗口内价格振幅（最高价 - 最低价）/ 最新成交价
+    """
+    recent = sorted(
+        (float(trade['T']) / 1000.0, float(trade['p']))
+        for trade in trades
+        if float(trade['T']) / 1000.0 >= now - window
+    )
+    if not recent:
+        return None
+
+    prices = [price for _, price in recent]
+    last_price = prices[-1]
+    return {
+        'trade_rate': len(recent) / window,
+        'last_price': last_price,
+        'volatility': (max(prices) - min(prices)) / last_price if last_price > 0 else float('inf')
+    }
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+全局清仓模块
+Cleanup Orchestrator Module for Binance Auto Trade System
+
+紧急清仓时同时为所有持仓下清仓卖单（限制并发数并错开下单时间，避免触发接口限频），
+再用一个轮询统一查询订单历史跟踪全部卖单，清仓总耗时约等于最慢的一笔卖单，而不是随持仓数线性增长。
+"""
+
+import random
+import threading
+
+
+# 订单历史中表示订单已结束但未完全成交的状态
+CLOSED_STATUSES = ('CANCELED', 'REJECTED', 'EXPIRED')
+
+
+class CleanupOrchestrator:
+    """全局清仓类 - 并发下清仓卖单并统一轮询成交状态"""
+
+    def __init__(self, trader):
+        """
+        初始化全局清仓器
+
+        Args:
+            trader: TraderCore实例
+        """
+        self.trader = trader
+        self.clock = trader.clock
+        self.lock = threading.Lock()
+
+    def flatten(self, positions):
+        """
+        卖出所有持仓（调用前应已取消所有挂单），阻塞直到全部卖单结束
+
+        Args:
+            positions: [(交易对符号, 显示名称, 卖出数量), ...]
+
+        Returns:
+            dict: 清仓结果
+                - flattened: {交易对符号: 从开始清仓到该代币卖单成交的秒数}
+                - failed: 未能清仓的交易对符号列表
+                - time_to_flat: 从开始清仓到最后一笔卖单结束的秒数
+        """
+        started = self.clock.time()
+        params = self.trader.trading_params
+        result = {'flattened': {}, 'failed': [], 'time_to_flat': 0.0}
+        pending = {}  # {订单ID: (交易对符号, 显示名称)}
+
+        # 1. 并发下单：限制同时下单的线程数，每个线程错开启动
+        semaphore = threading.Semaphore(max(1, int(params['cleanup_concurrency'])))
+
+        def place(symbol, display_name, quantity):
+            with semaphore:
+                try:
+                    order_id = self.trader.trading_engine.place_cleanup_sell_order(symbol, display_name, quantity)
+                except Exception as e:
+                    self.trader.log_message(f"{display_name} 清仓卖单下单异常: {str(e)}", symbol=symbol)
+                    order_id = None
+            with self.lock:
+                if order_id:
+                    pending[str(order_id)] = (symbol, display_name)
+                else:
+                    result['failed'].append(symbol)
+
+        threads = []
+        for index, (symbol, display_name, quantity) in enumerate(positions):
+            if index > 0:
+                self.clock.sleep(params['cleanup_stagger'])
+            threads.append(self.clock.start_thread(place, args=(symbol, display_name, quantity)))
+        self.wait_for_threads(threads)
+
+        # 2. 统一轮询订单历史，直到全部卖单结束或达到检查次数上限
+        self.trader.log_message(f"已下 {len(pending)} 个清仓卖单，开始统一查询成交状态")
+        for _ in range(params['status_check_limit']):
+            if not pending:
+                break
+            self.clock.sleep(random.uniform(*params['poll_interval']))
+            self.poll_orders(pending, result, started)
+
+        # 3. 仍未成交的卖单：取消后再查一次，部分成交的份额照常结算
+        if pending:
+            self.trader.log_message(f"{len(pending)} 个清仓卖单未在限定时间内成交，取消订单")
+            self.trader.api.cancel_all_orders()
+            self.clock.sleep(2)
+            self.poll_orders(pending, result, started)
+            for symbol, display_name in pending.values():
+                self.trader.log_message(f"{display_name} 清仓卖单确认未成交", symbol=symbol)
+                result['failed'].append(symbol)
+
+        result['time_to_flat'] = self.clock.time() - started
+        self.trader.notify_tokens_changed()
+        self.trader.log_message(
+            f"清仓结束: 成功 {len(result['flattened'])} 个，失败 {len(result['failed'])} 个，"
+            f"用时 {result['time_to_flat']:.1f} 秒"
+        )
+        return result
+
+    def wait_for_threads(self, threads):
+        """等待下单线程结束（用时钟等待，虚拟时钟下时间可以继续前进）"""
+        while any(thread.is_alive() for thread in threads):
+            self.clock.sleep(0.05)
+
+    def poll_orders(self, pending, result, started):
+        """
+        查询一次订单历史，结算已结束的清仓卖单
+
+        Args:
+            pending: 未结束的卖单 {订单ID: (交易对符号, 显示名称)}，结算后从中移除
+            result: flatten 的结果字典
+            started: 开始清仓的时间戳
+        """
+        orders = self.trader.api.get_order_history(rows=max(20, len(pending) * 4))
+        if orders is None:
+            return
+
+        orders_by_id = {str(order.get('orderId')): order for order in orders}
+        for order_id in list(pending):
+            order = orders_by_id.get(order_id)
+            if not order:
+                continue  # 挂单尚未成交，不在订单历史中
+
+            status = order.get('status')
+            if status != 'FILLED' and status not in CLOSED_STATUSES:
+                continue
+
+            symbol, display_name = pending.pop(order_id)
+            self.settle(symbol, display_name, order)
+            if status == 'FILLED':
+                result['flattened'][symbol] = self.clock.time() - started
+                self.trader.log_message(f"{display_name} 清仓完成，已清零持有份额", symbol=symbol)
+            else:
+                self.trader.log_message(f"{display_name} 清仓卖单失败，状态: {status}", symbol=symbol)
+                result['failed'].append(symbol)
+
+    def settle(self, symbol, display_name, order):
+        """
+        结算清仓卖单的成交：记入成交账本和交易历史并更新持有份额
+
+        Args:
+            symbol: 交易对符号
+            display_name: 显示名称
+            order: 订单历史中的订单字典
+        """
+        executed_qty = float(order.get('executedQty', 0) or 0)
+        cum_quote = float(order.get('cumQuote', 0) or 0)
+        self.trader.fill_ledger.record_fill(symbol, "SELL", executed_qty, cum_quote)
+        self.trader.history.record_fill(self.clock.time(), symbol, "SELL", executed_qty, cum_quote, order.get('orderId'))
+
+        tokens = self.trader.tokens
+        if order.get('status') == 'FILLED':
+            tokens.set_fields(symbol, last_buy_quantity=0, last_buy_amount=0)
+        elif executed_qty > 0 and symbol in tokens:
+            with tokens.lock:
+                remaining = max(0.0, tokens[symbol].get('last_buy_quantity', 0.0) - executed_qty)
+                tokens[symbol]['last_buy_quantity'] = remaining
+            self.trader.log_message(f"{display_name} 清仓卖单部分成交 {executed_qty}，剩余份额 {remaining}", symbol=symbol)
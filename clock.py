@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+时钟模块
+Clock Module for Binance Auto Trade System
+
+交易引擎通过时钟对象获取当前时间、等待和启动工作线程：
+- RealClock: 真实时间（默认）
+- VirtualClock: 虚拟时间，所有参与线程都在等待时直接跳到最早的唤醒时间，
+  用于离线回放，几小时的交易流程几秒内即可跑完
+"""
+
+import time
+import heapq
+import itertools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+
+class RealClock:
+    """真实时钟类 - 直接使用系统时间"""
+
+    def time(self):
+        """当前时间戳（秒）"""
+        return time.time()
+
+    def now(self):
+        """当前时间（datetime）"""
+        return datetime.now()
+
+    def sleep(self, seconds):
+        """等待指定秒数"""
+        time.sleep(seconds)
+
+    def start_thread(self, target, args=(), daemon=True):
+        """
+        启动工作线程
+
+        Args:
+            target: 线程函数
+            args: 线程函数参数
+            daemon: 是否为守护线程
+
+        Returns:
+            threading.Thread: 已启动的线程
+        """
+        thread = threading.Thread(target=target, args=args, daemon=daemon)
+        thread.start()
+        return thread
+
+    @contextmanager
+    def paused(self):
+        """真实时间无法暂停，仅为与 VirtualClock 接口一致"""
+        yield self
+
+
+class VirtualClock:
+    """
+    虚拟时钟类 - 时间只在所有参与线程都处于sleep时才前进
+
+    参与线程必须通过 start_thread 启动；线程中除sleep外不能有其他需要等待其他参与线程的阻塞操作，
+    否则虚拟时间无法前进。
+    """
+
+    def __init__(self, start_time=0.0):
+        """
+        初始化虚拟时钟
+
+        Args:
+            start_time: 起始时间戳（秒）
+        """
+        self.current_time = float(start_time)
+        self.lock = threading.Lock()
+        self.sleepers = []  # 堆: (唤醒时间, 序号, 事件)
+        self.sequence = itertools.count()
+        self.running = 0  # 正在运行（未sleep）的参与线程数
+        self.participants = set()
+
+    def time(self):
+        """当前虚拟时间戳（秒）"""
+        return self.current_time
+
+    def now(self):
+        """当前虚拟时间（datetime）"""
+        return datetime.fromtimestamp(self.current_time)
+
+    def sleep(self, seconds):
+        """
+        等待指定的虚拟秒数
+
+        Args:
+            seconds: 等待秒数（小于0按0处理）
+        """
+        if threading.get_ident() not in self.participants:
+            raise RuntimeError("虚拟时钟只能在 start_thread 启动的线程中 sleep")
+
+        event = threading.Event()
+        with self.lock:
+            wake_time = self.current_time + max(0.0, seconds)
+            heapq.heappush(self.sleepers, (wake_time, next(self.sequence), event))
+            self.running -= 1
+            self.advance()
+        event.wait()
+
+    def advance(self):
+        """所有参与线程都在sleep时，把时间推进到最早的唤醒时间并唤醒到期线程（需持有锁）"""
+        if self.running > 0 or not self.sleepers:
+            return
+
+        self.current_time = max(self.current_time, self.sleepers[0][0])
+        while self.sleepers and self.sleepers[0][0] <= self.current_time:
+            _, _, event = heapq.heappop(self.sleepers)
+            self.running += 1
+            event.set()
+
+    def start_thread(self, target, args=(), daemon=True):
+        """
+        启动参与虚拟时间的工作线程
+
+        Args:
+            target: 线程函数
+            args: 线程函数参数
+            daemon: 是否为守护线程
+
+        Returns:
+            threading.Thread: 已启动的线程
+        """
+        def run():
+            self.participants.add(threading.get_ident())
+            try:
+                target(*args)
+            finally:
+                with self.lock:
+                    self.participants.discard(threading.get_ident())
+                    self.running -= 1
+                    self.advance()
+
+        # 在启动前计数，保证新线程开始运行之前时间不会前进
+        with self.lock:
+            self.running += 1
+        thread = threading.Thread(target=run, daemon=daemon)
+        thread.start()
+        return thread
+
+    @contextmanager
+    def paused(self):
+        """
+        暂停虚拟时间（with块内时间不会前进），用于同时启动多个参与线程
+
+        Example:
+            with clock.paused():
+                clock.start_thread(worker_a)
+                clock.start_thread(worker_b)
+        """
+        with self.lock:
+            self.running += 1
+        try:
+            yield self
+        finally:
+            with self.lock:
+                self.running -= 1
+                self.advance()
+
+
+# 全局时钟（未显式传入时钟的组件使用）
+_global_clock = None
+
+
+def get_clock():
+    """
+    获取全局时钟（默认真实时钟）
+
+    Returns:
+        RealClock 或 VirtualClock
+    """
+    global _global_clock
+    if _global_clock is None:
+        _global_clock = RealClock()
+    return _global_clock
+
+
+def set_global_clock(clock):
+    """
+    设置全局时钟
+
+    Args:
+        clock: RealClock 或 VirtualClock 实例
+    """
+    global _global_clock
+    _global_clock = clock
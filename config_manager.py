@@ -9,20 +9,29 @@ import os
 import json
 from datetime import datetime
 
+# 导入时钟模块
+from clock import get_clock
+# 导入配置文件写入模块
+from config_store import DebouncedWriter, register_writer
+# 导入交易统计模块
+from trade_statistics import TradeStatistics, AMOUNT, LOSS, TRADES
+
 
 class ConfigManager:
     """配置管理类 - 负责配置文件的加载、保存和统计数据管理"""
     
-    def __init__(self, config_file='config.json', logger=None):
+    def __init__(self, config_file='config.json', logger=None, clock=None):
         """
         初始化配置管理器
         
         Args:
             config_file: 配置文件路径
             logger: Logger实例
+            clock: 时钟对象（默认全局时钟），用于判断交易日期
         """
         self.config_file = config_file
         self.logger = logger
+        self.clock = clock or get_clock()
         
         # 认证信息
         self.csrf_token = None
@@ -30,15 +39,16 @@ class ConfigManager:
         self.csrf_token_updated_time = None  # CSRF token更新时间
         self.extra_headers = {}  # 额外的 header 字段
         
-        # 统计数据
-        self.daily_total_amount = 0.0  # 今日交易总额
-        self.daily_trade_loss = 0.0    # 今日交易损耗
-        self.daily_completed_trades = 0  # 今日已完成交易次数
-        self.last_trade_date = None    # 最后交易日期
+        # 统计数据（今日交易总额、损耗、完成次数，跨天自动归零）
+        self.statistics = TradeStatistics(clock=self.clock)
+        self.statistics.add_rollover_listener(self.on_daily_rollover)
         
         # 资金账户余额相关
         self.daily_initial_balance = None  # 当天初始资金（USDT）
         self.daily_end_balance = None     # 当天结束资金（USDT）
+        
+        # 配置文件由后台线程合并写入（程序退出时写入未写入的修改）
+        self.writer = register_writer(DebouncedWriter(config_file, self.build_config, logger=logger))
     
     def load_config(self):
         """
@@ -58,23 +68,22 @@ class ConfigManager:
                     self.csrf_token_updated_time = config.get('csrf_token_updated_time')
                     self.extra_headers = config.get('extra_headers', {})
                     
-                    # 加载统计数据
-                    self.daily_total_amount = config.get('daily_total_amount', 0.0)
-                    self.daily_trade_loss = config.get('daily_trade_loss', 0.0)
-                    self.daily_completed_trades = config.get('daily_completed_trades', 0)
-                    self.last_trade_date = config.get('last_trade_date')
-                    
                     # 加载资金账户余额
                     self.daily_initial_balance = config.get('daily_initial_balance')
                     self.daily_end_balance = config.get('daily_end_balance')
                     
-                    print(f"已加载今日交易总额: {self.daily_total_amount:.2f} USDT")
-                    print(f"已加载今日交易损耗: {self.daily_trade_loss:.2f} USDT")
-                    print(f"已加载今日完成交易次数: {self.daily_completed_trades}")
-                    print(f"最后交易日期: {self.last_trade_date}")
+                    print(f"已加载今日交易总额: {config.get('daily_total_amount', 0.0):.2f} USDT")
+                    print(f"已加载今日交易损耗: {config.get('daily_trade_loss', 0.0):.2f} USDT")
+                    print(f"已加载今日完成交易次数: {config.get('daily_completed_trades', 0)}")
+                    print(f"最后交易日期: {config.get('last_trade_date')}")
                     
-                    # 检查是否需要每日归零
-                    self.check_daily_reset()
+                    # 加载统计数据（日期不是今天时归零）
+                    self.statistics.restore(
+                        config.get('last_trade_date'),
+                        config.get('daily_total_amount', 0.0),
+                        config.get('daily_trade_loss', 0.0),
+                        config.get('daily_completed_trades', 0)
+                    )
                     
                     if self.csrf_token and self.cookie:
                         print(f"已加载配置: CSRF Token: {self.csrf_token[:10]}..., Cookie: {self.cookie[:50]}...")
@@ -91,95 +100,134 @@ class ConfigManager:
     
     def save_config(self):
         """
-        保存配置文件
+        保存配置文件（只标记需要写入，由后台线程在防抖间隔后原子写入，不等待磁盘）
+        
+        Returns:
+            bool: 总是返回True，写入失败时由后台线程记录错误并在下次保存时重试
+        """
+        self.writer.schedule()
+        return True
+    
+    def flush_config(self):
+        """
+        立即写入未写入的修改（退出前调用）
         
         Returns:
             bool: 成功返回True，失败返回False
         """
-        try:
-            config = {
-                'csrf_token': self.csrf_token,
-                'cookie': self.cookie,
-                'csrf_token_updated_time': self.csrf_token_updated_time,
-                'extra_headers': self.extra_headers,
-                'daily_total_amount': self.daily_total_amount,
-                'daily_trade_loss': self.daily_trade_loss,
-                'daily_completed_trades': self.daily_completed_trades,
-                'last_trade_date': self.last_trade_date,
-                'daily_initial_balance': self.daily_initial_balance,
-                'daily_end_balance': self.daily_end_balance
-            }
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, ensure_ascii=False, indent=2)
-            print("配置已保存")
-            return True
-        except Exception as e:
-            print(f"保存配置文件失败: {e}")
-            if self.logger:
-                self.logger.log_error(f"保存配置文件失败: {e}")
-            return False
+        return self.writer.flush()
+    
+    def build_config(self):
+        """
+        生成要写入配置文件的内容
+        
+        Returns:
+            dict: 配置字典
+        """
+        stats = self.statistics.snapshot()
+        return {
+            'csrf_token': self.csrf_token,
+            'cookie': self.cookie,
+            'csrf_token_updated_time': self.csrf_token_updated_time,
+            'extra_headers': self.extra_headers,
+            'daily_total_amount': stats[AMOUNT],
+            'daily_trade_loss': stats[LOSS],
+            'daily_completed_trades': stats[TRADES],
+            'last_trade_date': stats['date'],
+            'daily_initial_balance': self.daily_initial_balance,
+            'daily_end_balance': self.daily_end_balance
+        }
+    
+    # 统计数据属性（读写 self.statistics，只保存一份）
+    
+    @property
+    def daily_total_amount(self):
+        """今日交易总额"""
+        return self.statistics.get(AMOUNT)
+    
+    @daily_total_amount.setter
+    def daily_total_amount(self, value):
+        self.statistics.set_value(AMOUNT, value)
+    
+    @property
+    def daily_trade_loss(self):
+        """今日交易损耗"""
+        return self.statistics.get(LOSS)
+    
+    @daily_trade_loss.setter
+    def daily_trade_loss(self, value):
+        self.statistics.set_value(LOSS, value)
+    
+    @property
+    def daily_completed_trades(self):
+        """今日已完成交易次数"""
+        return self.statistics.get(TRADES)
+    
+    @daily_completed_trades.setter
+    def daily_completed_trades(self, value):
+        self.statistics.set_value(TRADES, value)
+    
+    @property
+    def last_trade_date(self):
+        """统计数据所属日期（总是今天）"""
+        return self.statistics.get_date()
     
     def check_daily_reset(self):
         """
-        检查是否需要每日归零
+        检查是否需要每日归零（每次读写统计数据时也会自动检查）
         
         Returns:
             bool: 如果执行了归零返回True，否则返回False
         """
-        try:
-            today = datetime.now().strftime('%Y-%m-%d')
-            if self.last_trade_date != today:
-                # 日期不同，需要归零
-                if self.last_trade_date:
-                    message = f"检测到日期变化: {self.last_trade_date} -> {today}，今日交易总额和损耗已归零"
-                    print(message)
-                    if self.logger:
-                        self.logger.log_message(message)
-                
-                self.daily_total_amount = 0.0
-                self.daily_trade_loss = 0.0
-                self.daily_completed_trades = 0
-                self.last_trade_date = today
-                self.daily_initial_balance = None
-                self.daily_end_balance = None
-                self.save_config()
-                return True
-            return False
-        except Exception as e:
-            error_msg = f"检查每日归零失败: {str(e)}"
-            print(error_msg)
+        return self.statistics.check_rollover()
+    
+    def on_daily_rollover(self, previous_date, previous):
+        """
+        跨天回调：清空前一天的资金数据并保存
+        
+        Args:
+            previous_date: 前一天的日期（未知时为None）
+            previous: 前一天的统计快照
+        """
+        if previous_date:
+            message = f"检测到日期变化: {previous_date} -> {self.statistics.date}，今日交易总额和损耗已归零"
+            print(message)
             if self.logger:
-                self.logger.log_message(error_msg)
-            return False
+                self.logger.log_message(message)
+        
+        self.daily_initial_balance = None
+        self.daily_end_balance = None
+        self.save_config()
     
-    def update_trade_amount(self, trade_amount):
+    def update_trade_amount(self, trade_amount, symbol=None):
         """
         更新今日交易总额
         
         Args:
             trade_amount: 交易金额
+            symbol: 交易对符号（可选，同时计入该代币的统计）
             
         Returns:
             float: 更新后的总额
         """
-        self.daily_total_amount += trade_amount
-        self.last_trade_date = datetime.now().strftime('%Y-%m-%d')
+        total = self.statistics.add_amount(trade_amount, symbol)
         self.save_config()
-        return self.daily_total_amount
+        return total
     
-    def update_trade_loss(self, loss_amount):
+    def update_trade_loss(self, loss_amount, symbol=None):
         """
-        更新今日交易损耗（旧方法，保留兼容性）
+        更新今日交易损耗
         
         Args:
             loss_amount: 损耗金额
+            symbol: 交易对符号（可选，同时计入该代币的统计）
             
         Returns:
             float: 更新后的损耗
         """
-        self.daily_trade_loss += loss_amount
+        total = self.statistics.add_loss(loss_amount, symbol)
         self.save_config()
-        return self.daily_trade_loss
+        return total
     
     def set_daily_initial_balance(self, balance):
         """
@@ -188,8 +236,8 @@ class ConfigManager:
         Args:
             balance: 初始资金余额（USDT）
         """
+        self.check_daily_reset()  # 先完成跨天归零，避免刚设置的初始资金被清空
         self.daily_initial_balance = balance
-        self.last_trade_date = datetime.now().strftime('%Y-%m-%d')
         self.save_config()
         if self.logger:
             self.logger.log_message(f"设置当天初始资金: {balance} USDT")
@@ -211,9 +259,8 @@ class ConfigManager:
         
         # 计算损耗：初始资金 - 当前余额
         loss = self.daily_initial_balance - current_balance
-        self.daily_trade_loss = loss
+        self.statistics.set_value(LOSS, loss)
         self.daily_end_balance = current_balance
-        self.last_trade_date = datetime.now().strftime('%Y-%m-%d')
         self.save_config()
         
         if self.logger:
@@ -221,18 +268,21 @@ class ConfigManager:
         
         return loss
     
-    def increment_trade_count(self):
+    def increment_trade_count(self, symbol=None):
         """
         增加交易次数
         
+        Args:
+            symbol: 交易对符号（可选，同时计入该代币的统计）
+        
         Returns:
             int: 更新后的交易次数
         """
-        self.daily_completed_trades += 1
+        count = self.statistics.increment_trades(symbol)
         self.save_config()
-        return self.daily_completed_trades
+        return count
     
-    def set_credentials(self, csrf_token, cookie, extra_headers=None):
+    def set_credentials(self, csrf_token, cookie, extra_headers=None, save=True):
         """
         设置认证信息
         
@@ -240,13 +290,15 @@ class ConfigManager:
             csrf_token: CSRF令牌
             cookie: Cookie字符串
             extra_headers: 额外的 header 字段字典
+            save: 是否写入配置文件（交易引擎在独立进程中运行时由引擎进程负责保存）
         """
         self.csrf_token = csrf_token
         self.cookie = cookie
-        self.csrf_token_updated_time = datetime.now().isoformat()  # 记录更新时间
+        self.csrf_token_updated_time = self.clock.now().isoformat()  # 记录更新时间
         if extra_headers:
             self.extra_headers = extra_headers
-        self.save_config()
+        if save:
+            self.save_config()
     
     def get_auth_expiry_info(self):
         """
@@ -261,7 +313,7 @@ class ConfigManager:
         try:
             # 解析更新时间
             updated_time = datetime.fromisoformat(self.csrf_token_updated_time)
-            current_time = datetime.now()
+            current_time = self.clock.now()
             
             # 计算天数差
             days_passed = (current_time - updated_time).days
@@ -302,19 +354,19 @@ class ConfigManager:
         Returns:
             dict: 统计数据字典
         """
+        stats = self.statistics.snapshot()
         return {
-            'daily_total_amount': self.daily_total_amount,
-            'daily_trade_loss': self.daily_trade_loss,
-            'last_trade_date': self.last_trade_date
+            'daily_total_amount': stats[AMOUNT],
+            'daily_trade_loss': stats[LOSS],
+            'last_trade_date': stats['date']
         }
     
     def reset_statistics(self):
         """
         手动重置统计数据
         """
-        self.daily_total_amount = 0.0
-        self.daily_trade_loss = 0.0
-        self.last_trade_date = datetime.now().strftime('%Y-%m-%d')
+        self.statistics.set_value(AMOUNT, 0.0)
+        self.statistics.set_value(LOSS, 0.0)
         self.save_config()
         
         message = "统计数据已手动重置"
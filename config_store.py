@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+配置文件写入模块
+Config Store Module for Binance Auto Trade System
+
+保存配置时只标记“需要写入”，由后台线程在防抖间隔内把多次修改合并为一次写入，
+交易线程不等待磁盘。写入时先写临时文件并 fsync，再用 os.replace 替换原文件，
+写入中途崩溃也不会留下不完整的配置文件（认证信息和统计数据不会损坏）。
+程序退出时把未写入的修改全部写入。
+"""
+
+import os
+import json
+import time
+import atexit
+import weakref
+import threading
+
+
+# 默认设置
+DEFAULT_DEBOUNCE = 0.5  # 第一次修改后最多等待多久写入（秒）
+
+
+def write_json_atomic(path, data):
+    """
+    原子地写入JSON文件（临时文件 + fsync + 替换）
+
+    Args:
+        path: 文件路径
+        data: 可序列化为JSON的数据
+    """
+    temp_path = path + '.tmp'
+    try:
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        # 删除写了一半的临时文件，原文件保持不变
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    # 同步目录项，确保替换本身也已落盘（Windows不支持打开目录，跳过）
+    if hasattr(os, 'O_DIRECTORY'):
+        try:
+            fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+class DebouncedWriter:
+    """防抖写入类 - 合并短时间内的多次保存，由后台线程原子写入"""
+
+    def __init__(self, path, snapshot, debounce=DEFAULT_DEBOUNCE, logger=None):
+        """
+        初始化防抖写入器（后台线程在第一次保存时启动）
+
+        Args:
+            path: 文件路径
+            snapshot: 返回要写入的数据的函数（在写入时调用，总是写入最新的数据）
+            debounce: 第一次修改后最多等待多久写入（秒）
+            logger: Logger实例（可选），写入失败时记录错误
+        """
+        self.path = path
+        self.snapshot = snapshot
+        self.debounce = debounce
+        self.logger = logger
+        self.condition = threading.Condition()
+        self.dirty = False
+        self.closed = False
+        self.write_lock = threading.Lock()  # 后台写入和立即写入不同时进行
+        self.thread = None
+        self.write_count = 0  # 实际写入次数
+
+    def schedule(self):
+        """标记需要写入（不等待磁盘，立即返回）"""
+        with self.condition:
+            if self.closed:
+                return
+            self.dirty = True
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+            self.condition.notify()
+
+    def run(self):
+        """后台写入循环：收到修改后等待防抖间隔，再把期间的修改一次写入"""
+        while True:
+            with self.condition:
+                while not self.dirty and not self.closed:
+                    self.condition.wait()
+                # 防抖间隔内的修改合并到这一次写入（关闭时提前结束等待）
+                deadline = time.monotonic() + self.debounce
+                while not self.closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self.condition.wait(remaining)
+                if self.closed:
+                    return
+            self.flush()
+
+    def flush(self):
+        """
+        立即写入未写入的修改
+
+        Returns:
+            bool: 没有需要写入的修改或写入成功返回True
+        """
+        with self.write_lock:
+            with self.condition:
+                if not self.dirty:
+                    return True
+                self.dirty = False
+            if not os.path.isdir(os.path.dirname(os.path.abspath(self.path))):
+                return False  # 所在目录已被删除（如临时目录），不再写入
+            try:
+                write_json_atomic(self.path, self.snapshot())
+                self.write_count += 1
+                return True
+            except Exception as e:
+                # 写入失败时保留标记，下一个防抖间隔或退出时重试（如文件被其他程序暂时占用）
+                with self.condition:
+                    self.dirty = True
+                print(f"保存配置文件失败: {e}")
+                if self.logger:
+                    self.logger.log_error(f"保存配置文件失败: {e}")
+                return False
+
+    def close(self):
+        """写入未写入的修改并停止后台线程"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+        if self.thread is not None:
+            self.thread.join(5.0)
+        return self.flush()
+
+
+# 所有防抖写入器，程序退出时写入未写入的修改
+_writers = weakref.WeakSet()
+_writers_lock = threading.Lock()
+
+
+def register_writer(writer):
+    """
+    注册防抖写入器（程序退出时自动写入）
+
+    Args:
+        writer: DebouncedWriter实例
+
+    Returns:
+        DebouncedWriter: 传入的写入器
+    """
+    with _writers_lock:
+        _writers.add(writer)
+    return writer
+
+
+def flush_all_writers():
+    """程序退出时写入所有未写入的修改"""
+    with _writers_lock:
+        writers = list(_writers)
+    for writer in writers:
+        writer.flush()
+
+
+atexit.register(flush_all_writers)
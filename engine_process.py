@@ -0,0 +1,346 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+交易引擎进程模块
+Engine Process Module for Binance Auto Trade System
+
+GUI模式下交易引擎运行在独立子进程中，界面进程只负责显示，
+tkinter重绘和日志控件不再与下单、订单状态轮询争抢GIL；
+界面崩溃时，进行中的订单也会在子进程中继续处理完。
+界面进程不创建交易组件，代币ID映射、稳定度数据、配置、交易历史和日志文件都只由引擎进程写入。
+
+两个进程之间通过队列传递简短的消息元组:
+
+    界面 -> 引擎（命令）: (命令名, 参数元组)，命令名见 ENGINE_COMMANDS，
+                         另有 ('shutdown', ()) 让引擎在进行中的交易完成后退出
+    引擎 -> 界面（事件）:
+        ('log', 日志行)
+        ('tokens', ({交易对符号: 代币数据}, [删除的交易对符号]))  # 合并发送上次发送后变化的代币
+        ('stats', {字段: 值})                 # 只包含发生变化的统计字段
+        ('stability', (稳定度数据列表, 获取时间戳))  # 稳定度看板数据
+        ('4x_started', None) / ('4x_finished', None)
+        ('alarm', None)
+        ('error', (标题, 内容))
+        ('exited', None)
+"""
+
+import time
+import queue
+import signal
+import threading
+import multiprocessing
+
+# 导入交易核心模块
+from trader_core import TraderCore
+
+
+# 界面可以发送的命令，值表示是否在后台线程中执行（会阻塞的命令不能占用命令循环）
+ENGINE_COMMANDS = {
+    'toggle_auto_trading': True,
+    'begin_4x_trading': False,
+    'stop_4x_trading': False,
+    'cleanup_all_positions': True,
+    'reconcile_balance': True,
+    'set_token_price': False,
+    'set_token_trade_count': False,
+    'set_token_trade_amount': False,
+    'remove_token': False,
+    'add_token_by_name': True,
+    'retain_stability_tokens': True,
+    'refresh_stability': True,
+    'set_credentials': False,
+    'configure_scheduled_trading': False,
+    'write_log': False,
+}
+
+# 代币变化和统计数据的最短发送间隔（秒），期间的多次变化合并为一条消息
+PUBLISH_INTERVAL = 0.2
+
+
+class EngineHost(TraderCore):
+    """交易引擎宿主类 - 在子进程中运行交易核心，把界面通知转换为事件消息"""
+
+    def __init__(self, event_queue, config_file="config.json", log_dir="log"):
+        """
+        初始化交易引擎宿主
+
+        Args:
+            event_queue: 发送给界面进程的事件队列
+            config_file: 配置文件路径
+            log_dir: 日志目录
+        """
+        super().__init__(config_file=config_file, log_dir=log_dir)
+        self.event_queue = event_queue
+
+        # 日志照常写入文件，显示部分转发给界面进程
+        self.logger.set_listener(lambda log_msg: self.emit('log', log_msg))
+
+        # 合并发送状态（代币变化由代币状态存储记录）
+        self.stats_dirty = True
+        self.last_stats = {}
+        self.last_publish = 0.0
+
+        # 后台执行的命令线程和退出状态
+        self.command_threads = []
+        self.shutting_down = False
+
+    def start(self):
+        """初始化交易组件并加载常驻代币（与GUI进程内运行时的启动步骤一致）"""
+        self.init_trading_components()
+        self.add_permanent_tokens_from_stability()
+        self.init_daily_balance()
+
+    # ==================== 界面通知钩子 ====================
+
+    def emit(self, kind, payload=None):
+        """发送一条事件消息给界面进程"""
+        try:
+            self.event_queue.put((kind, payload))
+        except Exception as e:
+            print(f"发送界面事件失败: {str(e)}")
+
+    def notify_tokens_changed(self):
+        """代币数据变化，代币状态存储已记录变化的代币，等待下一次合并发送"""
+        pass
+
+    def notify_statistics_changed(self):
+        """统计数据变化，等待下一次合并发送"""
+        self.stats_dirty = True
+
+    def notify_4x_trading_started(self):
+        """4倍自动交易启动通知"""
+        self.emit('4x_started')
+
+    def notify_4x_trading_finished(self):
+        """4倍自动交易结束通知"""
+        self.publish(force=True)
+        self.emit('4x_finished')
+
+    def notify_alarm(self):
+        """需要人工介入时让界面进程播放闹钟"""
+        self.emit('alarm')
+
+    def show_error(self, title, message):
+        """让界面进程弹出错误对话框"""
+        self.log_message(f"[{title}] {message}")
+        self.emit('error', (title, message))
+
+    def notify_stability_updated(self, items, fetched_at):
+        """把稳定度看板数据发送给界面进程（只读快照转换为普通字典）"""
+        self.emit('stability', ([dict(item) for item in items], fetched_at))
+
+    def publish(self, force=False):
+        """
+        发送积累的代币变化和统计变化
+
+        Args:
+            force: 为True时忽略最短发送间隔
+        """
+        now = time.time()
+        if not force and now - self.last_publish < PUBLISH_INTERVAL:
+            return
+        self.last_publish = now
+
+        changed, removed = self.tokens.drain_changes()
+        if changed or removed:
+            self.emit('tokens', (changed, removed))
+
+        if self.stats_dirty:
+            self.stats_dirty = False
+            stats = self.get_statistics_snapshot()
+            delta = {key: value for key, value in stats.items() if self.last_stats.get(key, object()) != value}
+            if delta:
+                self.last_stats.update(delta)
+                self.emit('stats', delta)
+
+    # ==================== 命令处理 ====================
+
+    def execute(self, command, args=()):
+        """
+        执行界面进程发来的命令
+
+        Args:
+            command: 命令名，必须在 ENGINE_COMMANDS 中
+            args: 命令参数元组
+        """
+        if command not in ENGINE_COMMANDS:
+            self.log_message(f"未知的交易引擎命令: {command}")
+            return
+
+        if self.shutting_down and command != 'write_log':
+            self.log_message(f"交易进程正在退出，忽略命令: {command}")
+            return
+
+        method = getattr(self, command)
+        if ENGINE_COMMANDS[command]:
+            thread = threading.Thread(target=self.run_command, args=(method, args), daemon=True)
+            thread.start()
+            self.command_threads = [t for t in self.command_threads if t.is_alive()] + [thread]
+        else:
+            self.run_command(method, args)
+
+    def run_command(self, method, args):
+        """执行单个命令，异常只记录日志"""
+        try:
+            method(*args)
+        except Exception as e:
+            self.log_message(f"执行交易引擎命令 {method.__name__} 失败: {str(e)}")
+
+    def write_log(self, filename, now, text, symbol=None):
+        """
+        写入界面进程转发来的日志行（界面进程已自己显示）
+
+        Args:
+            filename: 日期目录下的文件名
+            now: 日志时间（datetime）
+            text: 日志文本
+            symbol: 日志涉及的交易对符号
+        """
+        self.logger.sink.write(filename, now, text, symbol)
+
+    def begin_shutdown(self, reason):
+        """
+        停止开始新的交易，等待进行中的交易完成后退出
+
+        Args:
+            reason: 退出原因（写入日志）
+        """
+        if self.shutting_down:
+            return
+        self.shutting_down = True
+        self.scheduled_trading_enabled = False
+        self.trading_4x_active = False  # 4倍交易在当前这一轮结束后退出
+
+        if self.has_running_workers():
+            self.log_message(f"{reason}，交易进程将在进行中的交易完成后退出")
+        else:
+            self.log_message(f"{reason}，交易进程退出")
+
+    def has_running_workers(self):
+        """是否还有进行中的交易线程或后台命令"""
+        threads = list(self.trading_threads.values()) + self.command_threads
+        if self.trading_4x_thread:
+            threads.append(self.trading_4x_thread)
+        return any(thread.is_alive() for thread in threads)
+
+    def serve(self, command_queue):
+        """
+        命令循环：处理命令、合并发送状态、检测界面进程是否存活
+
+        Args:
+            command_queue: 界面进程发来的命令队列
+        """
+        parent = multiprocessing.parent_process()
+
+        while True:
+            try:
+                command, args = command_queue.get(timeout=PUBLISH_INTERVAL)
+            except queue.Empty:
+                command, args = None, ()
+            except (EOFError, OSError):
+                # 管道已断开，说明界面进程已经不在了
+                command, args = 'shutdown', ()
+
+            if command == 'shutdown':
+                self.begin_shutdown("界面已关闭")
+            elif command:
+                self.execute(command, args)
+
+            if not self.shutting_down and parent is not None and not parent.is_alive():
+                self.begin_shutdown("界面进程已退出")
+
+            self.publish()
+
+            if self.shutting_down and not self.has_running_workers():
+                break
+
+        self.publish(force=True)
+        self.emit('exited')
+
+
+def run_engine_process(command_queue, event_queue, config_file="config.json", log_dir="log"):
+    """
+    交易引擎子进程入口
+
+    Args:
+        command_queue: 命令队列（界面 -> 引擎）
+        event_queue: 事件队列（引擎 -> 界面）
+        config_file: 配置文件路径
+        log_dir: 日志目录
+    """
+    # Ctrl+C 由界面进程处理，引擎进程通过界面的退出消息或存活检测退出
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    host = EngineHost(event_queue, config_file=config_file, log_dir=log_dir)
+    host.start()
+    host.serve(command_queue)
+    host.config_manager.flush_config()
+    host.logger.close()
+
+    # 界面进程已不在时不等待事件队列刷新，避免退出时阻塞
+    parent = multiprocessing.parent_process()
+    if parent is not None and not parent.is_alive():
+        event_queue.cancel_join_thread()
+
+
+class EngineClient:
+    """交易引擎客户端 - 在界面进程中启动引擎子进程并收发消息"""
+
+    def __init__(self, config_file="config.json", log_dir="log"):
+        """
+        初始化交易引擎客户端
+
+        Args:
+            config_file: 配置文件路径
+            log_dir: 日志目录
+        """
+        # 使用spawn方式启动，避免在有tkinter线程的进程中fork，Windows和打包后的exe行为一致
+        context = multiprocessing.get_context('spawn')
+        self.command_queue = context.Queue()
+        self.event_queue = context.Queue()
+        self.process = context.Process(
+            target=run_engine_process,
+            args=(self.command_queue, self.event_queue, config_file, log_dir),
+            name="TradingEngine",
+            daemon=False  # 界面退出后子进程仍需处理完进行中的订单
+        )
+
+    def start(self):
+        """启动交易引擎子进程"""
+        self.process.start()
+
+    def is_alive(self):
+        """交易引擎子进程是否在运行"""
+        return self.process.is_alive()
+
+    def send(self, command, *args):
+        """
+        发送命令给交易引擎
+
+        Args:
+            command: 命令名（见 ENGINE_COMMANDS）
+            *args: 命令参数
+        """
+        self.command_queue.put((command, args))
+
+    def shutdown(self):
+        """通知交易引擎在进行中的交易完成后退出"""
+        self.send('shutdown')
+
+    def poll_events(self, max_events=500):
+        """
+        取出已到达的事件（不阻塞）
+
+        Args:
+            max_events: 单次最多取出的事件数
+
+        Returns:
+            list: [(事件类型, 内容), ...]
+        """
+        events = []
+        while len(events) < max_events:
+            try:
+                events.append(self.event_queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
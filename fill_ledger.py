@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+成交账本模块
+Fill Ledger Module for Binance Auto Trade System
+
+订单处理器每确认一笔成交就记入账本，成交额、手续费和损耗按代币、按天在内存中累计，
+每次买卖完成后直接从账本更新今日损耗，不再为此请求资金账户余额；
+资金账户余额只在定时对账或手动对账时获取，用于校正账本的误差。
+
+损耗按平均成本计算：买入（扣除代币手续费后）的持仓带着买入成本，卖出时按卖出比例结转成本，
+卖出净额（扣除USDT手续费）与结转成本之差计入卖出当天的损耗。持仓跨天也能正确结算。
+按天的统计只保留最近几天，累计损耗单独按代币累加。
+"""
+
+import threading
+
+# 导入时钟模块
+from clock import get_clock
+
+
+# 手续费率（与 BinanceAPI.calculate_order_quantity 中的手续费一致）
+DEFAULT_FEE_RATE = 0.0001
+# 按天统计保留的天数（含今天）
+DEFAULT_KEEP_DAYS = 7
+
+
+class FillLedger:
+    """成交账本类 - 线程安全地累计每笔成交的数量和成交额"""
+
+    def __init__(self, clock=None, fee_rate=DEFAULT_FEE_RATE, keep_days=DEFAULT_KEEP_DAYS):
+        """
+        初始化成交账本
+
+        Args:
+            clock: 时钟对象（默认全局时钟），用于确定成交所属日期
+            fee_rate: 手续费率
+            keep_days: 按天统计保留的天数（含今天）
+        """
+        self.clock = clock or get_clock()
+        self.fee_rate = fee_rate
+        self.keep_days = keep_days
+        self.lock = threading.Lock()
+        self.days = {}  # {日期: {交易对符号: 统计数据}}，只保留最近keep_days天
+        self.positions = {}  # {交易对符号: [持仓数量, 持仓成本]}
+        self.loss_totals = {}  # 所有日期累计的损耗 {交易对符号: 损耗}
+
+    @staticmethod
+    def new_symbol_stats():
+        """创建单个代币的统计数据"""
+        return {
+            'fills': 0,
+            'buy_quantity': 0.0,
+            'buy_quote': 0.0,
+            'sell_quantity': 0.0,
+            'sell_quote': 0.0,
+            'fees': 0.0,
+            'loss': 0.0,
+        }
+
+    def record_fill(self, symbol, side, quantity, quote):
+        """
+        记录一笔成交
+
+        Args:
+            symbol: 交易对符号，如 "ALPHA_22USDT"
+            side: 订单方向（BUY/SELL）
+            quantity: 成交数量
+            quote: 成交额（USDT）
+        """
+        quantity = float(quantity or 0)
+        quote = float(quote or 0)
+        if quantity <= 0 or quote <= 0:
+            return
+
+        date = self.clock.now().strftime('%Y-%m-%d')
+        with self.lock:
+            if date not in self.days:
+                # 进入新的一天时删除过期的按天统计
+                self.days[date] = {}
+                for old_date in sorted(self.days)[:-self.keep_days]:
+                    del self.days[old_date]
+            stats = self.days[date].setdefault(symbol, self.new_symbol_stats())
+            position = self.positions.setdefault(symbol, [0.0, 0.0])
+            stats['fills'] += 1
+            stats['fees'] += quote * self.fee_rate
+
+            if side == "BUY":
+                stats['buy_quantity'] += quantity
+                stats['buy_quote'] += quote
+                position[0] += quantity * (1 - self.fee_rate)
+                position[1] += quote
+                return
+
+            stats['sell_quantity'] += quantity
+            stats['sell_quote'] += quote
+
+            # 只结算账本中有记录的持仓，账本之外的持仓（如重启前买入）留给对账处理
+            matched = min(quantity, position[0])
+            if matched <= 0:
+                return
+            cost = position[1] * matched / position[0]
+            proceeds = quote * matched / quantity * (1 - self.fee_rate)
+            position[0] -= matched
+            position[1] -= cost
+            stats['loss'] += cost - proceeds
+            self.loss_totals[symbol] = self.loss_totals.get(symbol, 0.0) + cost - proceeds
+
+    def get_symbol_summary(self, date=None):
+        """
+        获取按代币统计的数据
+
+        Args:
+            date: 日期字符串 YYYY-MM-DD（默认今天）
+
+        Returns:
+            dict: {交易对符号: 统计数据（含 volume）}
+        """
+        date = date or self.clock.now().strftime('%Y-%m-%d')
+        with self.lock:
+            symbols = {symbol: dict(stats) for symbol, stats in self.days.get(date, {}).items()}
+
+        for stats in symbols.values():
+            stats['volume'] = stats['buy_quote'] + stats['sell_quote']
+        return symbols
+
+    def get_daily_summary(self, date=None):
+        """
+        获取某一天的汇总数据
+
+        Args:
+            date: 日期字符串 YYYY-MM-DD（默认今天）
+
+        Returns:
+            dict: fills, volume, fees, loss 汇总
+        """
+        symbols = self.get_symbol_summary(date)
+        return {
+            'fills': sum(stats['fills'] for stats in symbols.values()),
+            'volume': sum(stats['volume'] for stats in symbols.values()),
+            'fees': sum(stats['fees'] for stats in symbols.values()),
+            'loss': sum(stats['loss'] for stats in symbols.values()),
+        }
+
+    def get_position(self, symbol):
+        """
+        获取账本记录的持仓
+
+        Args:
+            symbol: 交易对符号
+
+        Returns:
+            tuple: (持仓数量, 持仓成本)
+        """
+        with self.lock:
+            quantity, cost = self.positions.get(symbol, (0.0, 0.0))
+        return quantity, cost
+
+    def total_loss(self):
+        """所有日期累计的已结算损耗（USDT）"""
+        with self.lock:
+            return sum(self.loss_totals.values())
+
+    def total_loss_by_symbol(self):
+        """
+        所有日期累计的已结算损耗，按代币细分
+
+        Returns:
+            dict: {交易对符号: 损耗（USDT）}
+        """
+        with self.lock:
+            return dict(self.loss_totals)
@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日志索引模块
+Log Index Module for Binance Auto Trade System
+
+日志写入线程写入每条日志时同时记录索引，保存在日期目录下的两个文件中:
+    order_index.txt  订单ID → 日志文件和偏移量
+    time_index.txt   分钟（和代币ID）→ 日志文件中的偏移量范围
+查询订单或时间段时只读取索引和命中的几行日志，不需要逐行搜索几周的日志文件。
+交易日志（trade_journal）的偏移量按未压缩的内容计算，压缩后仍然可以查询。
+
+用法:
+    python log_index.py order 153048420
+    python log_index.py window "2024-01-02 10:00" "2024-01-02 10:05" --symbol ALPHA_22
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import argparse
+from datetime import datetime, timedelta
+
+
+# 索引文件名
+ORDER_INDEX_FILE = "order_index.txt"
+TIME_INDEX_FILE = "time_index.txt"
+ALL_KEY = "*"  # 时间索引中表示全部日志的键
+
+# 日志文本中的订单ID；交易对符号中的代币ID
+ORDER_ID_PATTERN = re.compile(r'(?:order_id[:：=]?\s*|订单\s*)(\d{6,})')
+SYMBOL_PATTERN = re.compile(r'ALPHA_\d+')
+# 文本日志行开头的时间
+LINE_TIME_PATTERN = re.compile(r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]')
+DATE_DIR_PATTERN = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def symbol_key(symbol):
+    """
+    把交易对符号转换为索引中的代币键
+
+    Args:
+        symbol: 交易对符号或ALPHA代币ID（如 "ALPHA_22USDT"、"ALPHA_22"）
+
+    Returns:
+        str: 代币键（如 "ALPHA_22"），无法识别时返回None
+    """
+    match = SYMBOL_PATTERN.search(symbol or '')
+    return match.group(0) if match else None
+
+
+def extract_order_ids(text):
+    """
+    提取文本日志中的订单ID（代币由写日志的调用方传入，日志文本中通常只有代币名称）
+
+    Args:
+        text: 日志文本
+
+    Returns:
+        set: 订单ID集合
+    """
+    return set(ORDER_ID_PATTERN.findall(text))
+
+
+class LogIndexer:
+    """日志索引记录类 - 只在日志写入线程中使用，生成待写入的索引行"""
+
+    def __init__(self):
+        """初始化日志索引记录器"""
+        self.pending = {}  # {(日期目录, 键, 文件): [分钟, 开始偏移量, 结束偏移量]}
+        self.lines = []    # 待写入的索引行 [(日期目录, 索引文件名, 行), ...]
+        self.latest_minute = 0
+
+    def add(self, date_str, path, offset, length, timestamp, order_ids=(), symbols=()):
+        """
+        记录一条日志的位置
+
+        Args:
+            date_str: 索引所在的日期目录名
+            path: 日志文件相对日志根目录的路径
+            offset: 日志在文件中的开始偏移量（字节）
+            length: 日志的长度（字节）
+            timestamp: 日志时间戳（秒）
+            order_ids: 日志涉及的订单ID
+            symbols: 日志涉及的代币键
+        """
+        for order_id in order_ids:
+            self.lines.append((date_str, ORDER_INDEX_FILE, f"{order_id}\t{timestamp:.3f}\t{path}\t{offset}\n"))
+
+        minute = int(timestamp // 60)
+        end = offset + length
+        for key in (ALL_KEY, *symbols):
+            pending_key = (date_str, key, path)
+            entry = self.pending.get(pending_key)
+            # 代币的范围只合并连续的日志，查询时范围内的日志都属于该代币
+            if entry is not None and entry[0] == minute and (key == ALL_KEY or entry[2] == offset):
+                entry[2] = end
+                continue
+            if entry is not None:
+                self.emit_range(pending_key, entry)
+            self.pending[pending_key] = [minute, offset, end]
+        self.latest_minute = max(self.latest_minute, minute)
+
+    def emit_range(self, pending_key, entry):
+        """生成一行时间索引"""
+        date_str, key, path = pending_key
+        minute, start, end = entry
+        self.lines.append((date_str, TIME_INDEX_FILE, f"{minute}\t{key}\t{path}\t{start}\t{end}\n"))
+
+    def drain(self, force=False):
+        """
+        取出待写入的索引行
+
+        Args:
+            force: 为True时当前分钟的范围也写出（默认只写出已经结束的分钟）
+
+        Returns:
+            list: [(日期目录, 索引文件名, 行), ...]
+        """
+        for pending_key, entry in list(self.pending.items()):
+            if force or entry[0] < self.latest_minute:
+                self.emit_range(pending_key, entry)
+                del self.pending[pending_key]
+        lines, self.lines = self.lines, []
+        return lines
+
+
+class LogSearch:
+    """日志查询类 - 按订单ID或时间段查询日志"""
+
+    def __init__(self, log_dir="log"):
+        """
+        初始化日志查询
+
+        Args:
+            log_dir: 日志根目录
+        """
+        self.log_dir = log_dir
+
+    def list_days(self):
+        """
+        列出有日志的日期
+
+        Returns:
+            list: 日期目录名列表（按日期排序）
+        """
+        if not os.path.isdir(self.log_dir):
+            return []
+        return sorted(name for name in os.listdir(self.log_dir) if DATE_DIR_PATTERN.match(name))
+
+    def find_order(self, order_id, days=None):
+        """
+        查询一个订单的全部日志
+
+        Args:
+            order_id: 订单ID
+            days: 只查询最近几天（默认全部）
+
+        Returns:
+            list: 按时间排序的日志 [{'time', 'file', 'offset', 'text'}, ...]
+        """
+        needle = f"\n{order_id}\t".encode('ascii')
+        locations = []
+        for date_str in self.list_days()[-days:] if days else self.list_days():
+            # 直接在整个索引文件（不解码）中查找，不逐行拆分
+            content = b"\n" + self.read_index(date_str, ORDER_INDEX_FILE)
+            position = content.find(needle)
+            while position != -1:
+                line_end = content.find(b"\n", position + 1)
+                if line_end == -1:
+                    break  # 写入中断留下的半行
+                _, timestamp, path, offset = content[position + 1:line_end].decode('utf-8').split("\t")
+                locations.append((float(timestamp), path, int(offset)))
+                position = content.find(needle, line_end)
+
+        results = []
+        for timestamp, path, offset in sorted(set(locations)):
+            text = self.read_range(path, offset, None)
+            if text is not None:
+                results.append({'time': timestamp, 'file': path, 'offset': offset, 'text': text})
+        return results
+
+    def find_window(self, start, end, symbol=None):
+        """
+        查询一个时间段的日志
+
+        Args:
+            start: 开始时间戳（含）
+            end: 结束时间戳（不含）
+            symbol: 只返回涉及该代币的日志（交易对符号或ALPHA代币ID）
+
+        Returns:
+            list: 按时间排序的日志 [{'time', 'file', 'offset', 'text'}, ...]
+        """
+        key = symbol_key(symbol) if symbol else ALL_KEY
+        if key is None:
+            return []
+        first_minute, last_minute = int(start // 60), int((end - 1e-6) // 60)
+
+        # 合并同一文件中的偏移量范围
+        ranges = {}
+        day = datetime.fromtimestamp(start).date()
+        while day <= datetime.fromtimestamp(end).date():
+            content = self.read_index(day.strftime('%Y-%m-%d'), TIME_INDEX_FILE).decode('utf-8', errors='replace')
+            for line in content.split("\n"):
+                parts = line.split("\t")
+                if len(parts) != 5 or parts[1] != key:
+                    continue
+                if first_minute <= int(parts[0]) <= last_minute:
+                    ranges.setdefault(parts[2], []).append((int(parts[3]), int(parts[4])))
+            day += timedelta(days=1)
+
+        results = []
+        for path, spans in ranges.items():
+            for range_start, range_end in merge_ranges(spans):
+                text = self.read_range(path, range_start, range_end)
+                if text is None:
+                    continue
+                offset = range_start
+                timestamp = None
+                for line in text.split('\n'):
+                    timestamp = line_time(line, timestamp)
+                    if line and timestamp is not None and start <= timestamp < end:
+                        results.append({'time': timestamp, 'file': path, 'offset': offset, 'text': line + '\n'})
+                    offset += len(line.encode('utf-8')) + 1
+        results.sort(key=lambda item: (item['time'], item['file'], item['offset']))
+        return results
+
+    def read_index(self, date_str, filename):
+        """读取索引文件的内容（bytes），不存在时返回空内容"""
+        try:
+            with open(os.path.join(self.log_dir, date_str, filename), 'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return b""
+
+    def read_range(self, path, start, end):
+        """
+        读取日志文件中的一段（文件已压缩时读取压缩文件）
+
+        Args:
+            path: 日志文件相对日志根目录的路径
+            start: 开始偏移量
+            end: 结束偏移量，为None时读取一行
+
+        Returns:
+            str: 日志文本，文件不存在返回None
+        """
+        full_path = os.path.join(self.log_dir, path)
+        try:
+            source = open(full_path, 'rb')
+        except FileNotFoundError:
+            try:
+                source = gzip.open(full_path + '.gz', 'rb')
+            except FileNotFoundError:
+                return None
+        with source:
+            source.seek(start)
+            data = source.readline() if end is None else source.read(end - start)
+        return data.decode('utf-8', errors='replace')
+
+
+def merge_ranges(spans):
+    """
+    合并重叠或相邻的偏移量范围
+
+    Args:
+        spans: [(开始, 结束), ...]
+
+    Returns:
+        list: 合并后按开始偏移量排序的范围
+    """
+    merged = []
+    for range_start, range_end in sorted(spans):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], range_end)
+        else:
+            merged.append([range_start, range_end])
+    return merged
+
+
+def line_time(line, previous=None):
+    """
+    获取日志行的时间戳
+
+    Args:
+        line: 文本日志行或交易日志的JSON行
+        previous: 上一行的时间戳（多行日志的后续行没有时间，沿用上一行）
+
+    Returns:
+        float: 时间戳
+    """
+    if line.startswith('{'):
+        try:
+            return float(json.loads(line)['ts'])
+        except (ValueError, KeyError, TypeError):
+            return previous
+    match = LINE_TIME_PATTERN.match(line)
+    if match:
+        return datetime.strptime(match.group(1), '%Y-%m-%d %H:%M:%S').timestamp()
+    return previous
+
+
+def parse_time(value):
+    """解析命令行中的时间（"YYYY-MM-DD HH:MM[:SS]"）"""
+    for time_format in ('%Y-%m-%d %H:%M:%S', '%Y-%m-%d %H:%M'):
+        try:
+            return datetime.strptime(value, time_format).timestamp()
+        except ValueError:
+            continue
+    raise argparse.ArgumentTypeError(f"无效的时间: {value}，格式为 \"YYYY-MM-DD HH:MM[:SS]\"")
+
+
+def main(argv=None):
+    """命令行入口：查询日志"""
+    parser = argparse.ArgumentParser(description="币安量化交易系统 - 日志查询")
+    parser.add_argument('--dir', default="log", help="日志根目录")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    order_parser = subparsers.add_parser('order', help="查询一个订单的全部日志")
+    order_parser.add_argument('order_id', help="订单ID")
+    order_parser.add_argument('--days', type=int, help="只查询最近几天")
+
+    window_parser = subparsers.add_parser('window', help="查询一个时间段的日志")
+    window_parser.add_argument('start', type=parse_time, help="开始时间，如 \"2024-01-02 10:00\"")
+    window_parser.add_argument('end', type=parse_time, help="结束时间")
+    window_parser.add_argument('--symbol', help="只输出涉及该代币的日志（如 ALPHA_22）")
+
+    args = parser.parse_args(argv)
+    search = LogSearch(args.dir)
+    if args.command == 'order':
+        results = search.find_order(args.order_id, args.days)
+    else:
+        results = search.find_window(args.start, args.end, args.symbol)
+
+    for item in results:
+        print(f"{item['file']}: {item['text'].rstrip()}")
+    print(f"共 {len(results)} 条", file=sys.stderr)
+    return 0 if results else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
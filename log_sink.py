@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+日志写入模块
+Log Sink Module for Binance Auto Trade System
+
+写日志的线程只把日志放进队列，由一个后台线程批量写入文件。
+后台线程保持日志文件一直打开，队列中攒够一批或等待超过刷新间隔时每个文件追加写入一次；
+日期变化时关闭前一天的文件，程序退出时把队列中剩余的日志全部写完。
+"""
+
+import os
+import time
+import queue
+import atexit
+import threading
+from datetime import datetime
+
+# 导入日志索引模块
+from log_index import LogIndexer, extract_order_ids, symbol_key
+
+
+# 默认设置
+DEFAULT_FLUSH_INTERVAL = 0.2  # 第一条日志进入队列后最多等待多久写入（秒）
+DEFAULT_BATCH_SIZE = 500      # 攒够多少条立即写入
+
+# 队列中的控制消息
+FLUSH = object()
+CLOSE = object()
+CALL = object()  # 在后台线程中执行一个函数（如写入交易日志）
+
+
+class LogSink:
+    """日志写入类 - 后台线程按日期目录批量写入日志文件"""
+
+    def __init__(self, log_dir, flush_interval=DEFAULT_FLUSH_INTERVAL, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        初始化日志写入器（后台线程在第一次写入时启动）
+
+        Args:
+            log_dir: 日志根目录，日志写入其中的 YYYY-MM-DD 子目录
+            flush_interval: 第一条日志进入队列后最多等待多久写入（秒）
+            batch_size: 攒够多少条立即写入
+        """
+        self.log_dir = log_dir
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self.handles = {}  # {文件路径: 打开的文件}
+        self.indexer = LogIndexer()
+        self.start_lock = threading.Lock()
+        self.thread = None
+        self.closed = False
+
+    def write(self, filename, now, text, symbol=None):
+        """
+        写入一条日志（只放入队列）
+
+        Args:
+            filename: 日期目录下的文件名，如 "system_running_log.txt"
+            now: 日志时间（datetime），决定写入哪一天的目录
+            text: 日志文本，或返回日志文本的函数（在后台线程中调用，格式化也不占用调用线程）
+            symbol: 日志涉及的交易对符号（记录到时间索引中）
+        """
+        if self.closed:
+            return
+        if self.thread is None:
+            self.start()
+        self.queue.put((filename, now, text, symbol))
+
+    def call(self, func):
+        """
+        在后台写入线程中按顺序执行一个函数（只放入队列）
+
+        Args:
+            func: 无参数函数，异常只打印到控制台
+        """
+        if self.closed:
+            return
+        if self.thread is None:
+            self.start()
+        self.queue.put((CALL, None, func, None))
+
+    def start(self):
+        """启动后台写入线程（已启动时不重复启动）"""
+        with self.start_lock:
+            if self.thread is None and not self.closed:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def flush(self, timeout=5.0):
+        """
+        等待队列中已有的日志全部写入文件
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 全部写入返回True
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return True
+        done = threading.Event()
+        self.queue.put((FLUSH, None, done, None))
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """
+        写完队列中的日志并关闭文件，之后的日志不再写入
+
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put((CLOSE, None, None, None))
+            self.thread.join(timeout)
+        self.closed = True
+
+    def run(self):
+        """后台写入循环"""
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1][0] not in (FLUSH, CLOSE):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self.write_batch(batch)
+            control, _, done, _ = batch[-1]
+            if control is FLUSH:
+                done.set()
+            elif control is CLOSE:
+                self.close_handles()
+                return
+
+    def write_batch(self, batch):
+        """
+        写入一批日志（只在后台线程中调用）
+
+        同一个文件的日志合并为一次追加写入，写入后由文件的实际位置推算每条日志的偏移量，
+        界面进程和交易引擎进程同时追加同一个文件时索引也指向正确的位置。
+
+        Args:
+            batch: [(文件名, 时间, 文本, 交易对符号), ...]，最后一条可能是控制消息，文件名为CALL时执行函数
+        """
+        pending = {}  # {(日期目录名, 文件名): [(编码后的日志, 时间戳, 订单ID, 代币键), ...]}
+        for filename, now, text, symbol in batch:
+            if filename is FLUSH or filename is CLOSE:
+                continue
+            try:
+                if filename is CALL:
+                    text()
+                    continue
+                data = text() if callable(text) else text
+                key = symbol_key(symbol)
+                pending.setdefault((now.strftime('%Y-%m-%d'), filename), []).append(
+                    (data.encode('utf-8'), now.timestamp(), extract_order_ids(data), [key] if key else []))
+            except Exception as e:
+                # 写入失败只打印到控制台，不影响程序运行
+                print(f"日志文件写入失败: {str(e)}")
+
+        for (date_str, filename), entries in pending.items():
+            try:
+                end = self.append(date_str, filename, b''.join(entry[0] for entry in entries))
+                if end is None:
+                    continue
+                # 记录索引
+                offset = end - sum(len(entry[0]) for entry in entries)
+                for data, timestamp, order_ids, symbols in entries:
+                    self.indexer.add(date_str, f"{date_str}/{filename}", offset, len(data),
+                                     timestamp, order_ids, symbols)
+                    offset += len(data)
+            except Exception as e:
+                print(f"日志文件写入失败: {str(e)}")
+
+        # 写入索引（已经结束的分钟；刷新或关闭时全部写入）
+        force = batch[-1][0] in (FLUSH, CLOSE)
+        for date_str, filename, line in self.indexer.drain(force):
+            try:
+                self.append(date_str, filename, line.encode('utf-8'))
+            except Exception as e:
+                print(f"日志索引写入失败: {str(e)}")
+
+    def append(self, date_str, filename, data):
+        """
+        把数据一次追加到文件末尾（只在后台线程中调用）
+
+        Args:
+            date_str: 日期目录名
+            filename: 文件名
+            data: 要写入的字节
+
+        Returns:
+            int: 写入后数据末尾在文件中的位置，日志根目录已被删除时返回None
+        """
+        handle = self.get_handle(date_str, filename)
+        if handle is None:
+            return None
+        # 无缓冲的追加写入是一次系统调用，其他进程的写入不会插在中间；
+        # 写入后文件位置就是这段数据的末尾
+        view = memoryview(data)
+        while view:
+            view = view[handle.write(view):]
+        return handle.tell()
+
+    def add_index(self, path, offset, length, timestamp, order_ids=(), symbols=()):
+        """
+        记录日志根目录下其他文件（如交易日志）中一条日志的位置（只在后台线程中调用）
+
+        Args:
+            path: 文件路径
+            offset: 日志在文件中的开始偏移量（字节）
+            length: 日志的长度（字节）
+            timestamp: 日志时间戳（秒），决定索引写入哪一天的目录
+            order_ids: 日志涉及的订单ID
+            symbols: 日志涉及的代币键
+        """
+        date_str = datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+        relative = os.path.relpath(path, self.log_dir).replace(os.sep, '/')
+        self.indexer.add(date_str, relative, offset, length, timestamp, order_ids, symbols)
+
+    def get_handle(self, date_str, filename):
+        """
+        获取日志文件的打开句柄，进入新的一天时关闭前一天的文件
+
+        Args:
+            date_str: 日期目录名
+            filename: 文件名
+
+        Returns:
+            file: 打开的文件，日志根目录已被删除时返回None
+        """
+        path = os.path.join(self.log_dir, date_str, filename)
+        handle = self.handles.get(path)
+        if handle is not None:
+            return handle
+
+        date_dir = os.path.dirname(path)
+        if not os.path.isdir(date_dir):
+            if not os.path.isdir(self.log_dir):
+                return None  # 日志根目录已被删除（如临时目录），不重新创建
+            os.makedirs(date_dir, exist_ok=True)
+
+        # 日期变化：关闭其他日期目录中的文件
+        for open_path in [p for p in self.handles if os.path.dirname(p) != date_dir]:
+            self.handles.pop(open_path).close()
+
+        # 二进制无缓冲追加，索引中的偏移量与文件中的字节位置一致
+        handle = open(path, 'ab', buffering=0)
+        self.handles[path] = handle
+        return handle
+
+    def close_handles(self):
+        """关闭所有打开的文件"""
+        for handle in self.handles.values():
+            try:
+                handle.close()
+            except Exception:
+                pass
+        self.handles.clear()
+
+
+# 每个日志目录一个写入器（同一目录的多个Logger共用，避免同一文件被多个句柄交错写入）
+_sinks = {}
+_sinks_lock = threading.Lock()
+
+
+def get_log_sink(log_dir):
+    """
+    获取日志目录对应的写入器
+
+    Args:
+        log_dir: 日志根目录
+
+    Returns:
+        LogSink: 写入器
+    """
+    key = os.path.abspath(log_dir)
+    with _sinks_lock:
+        sink = _sinks.get(key)
+        if sink is None or sink.closed:
+            sink = LogSink(key)
+            _sinks[key] = sink
+        return sink
+
+
+def close_all_sinks():
+    """程序退出时写完所有日志"""
+    with _sinks_lock:
+        sinks = list(_sinks.values())
+    for sink in sinks:
+        sink.close()
+
+
+atexit.register(close_all_sinks)
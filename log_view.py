@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+界面日志显示模块
+Log View Module for Binance Auto Trade System
+
+任何线程记录日志时只把日志行放进有界的环形缓冲区（deque.append 本身是线程安全的，不需要加锁），
+界面线程按固定帧间隔一次取出全部新日志，一次插入控件，再按行号删除超出上限的旧行。
+每条日志的开销与控件中已有的内容无关，工作线程也不再直接操作tkinter控件。
+"""
+
+from collections import deque
+
+
+# 默认设置
+DEFAULT_MAX_LINES = 100         # 控件中最多保留的日志行数
+DEFAULT_FRAME_INTERVAL_MS = 100  # 界面刷新日志的间隔（毫秒）
+
+
+class LogView:
+    """界面日志显示类 - 环形缓冲区加界面线程定时批量刷新"""
+
+    def __init__(self, widget, max_lines=DEFAULT_MAX_LINES, frame_interval_ms=DEFAULT_FRAME_INTERVAL_MS):
+        """
+        初始化界面日志显示
+
+        Args:
+            widget: 文本控件（需支持 insert/delete/see/after）
+            max_lines: 控件中最多保留的日志行数
+            frame_interval_ms: 界面刷新日志的间隔（毫秒）
+        """
+        self.widget = widget
+        self.max_lines = max_lines
+        self.frame_interval_ms = frame_interval_ms
+        # 待显示的日志行；一帧内超过上限时最旧的直接丢弃（反正显示不下）
+        self.pending = deque(maxlen=max_lines)
+        self.line_count = 0  # 控件中当前的行数
+        self.running = False
+
+    def append(self, log_msg):
+        """
+        添加一行日志（任何线程都可以调用）
+
+        Args:
+            log_msg: 已带时间戳的日志行
+        """
+        self.pending.append(log_msg)
+
+    def start(self):
+        """开始定时刷新（在界面线程中调用）"""
+        if not self.running:
+            self.running = True
+            self.widget.after(self.frame_interval_ms, self.refresh)
+
+    def stop(self):
+        """停止定时刷新"""
+        self.running = False
+
+    def refresh(self):
+        """取出全部新日志并显示，然后安排下一帧（在界面线程中调用）"""
+        if not self.running:
+            return
+        try:
+            self.drain()
+        except Exception as e:
+            print(f"GUI日志显示失败: {str(e)}")
+        self.widget.after(self.frame_interval_ms, self.refresh)
+
+    def drain(self):
+        """
+        把缓冲区中的日志一次插入控件，并按行号删除超出上限的旧行
+
+        Returns:
+            int: 本次显示的日志行数
+        """
+        lines = []
+        while True:
+            try:
+                lines.append(self.pending.popleft())
+            except IndexError:
+                break
+        if not lines:
+            return 0
+
+        self.widget.insert('end', ''.join(lines))
+        self.line_count += sum(line.count('\n') for line in lines)
+        excess = self.line_count - self.max_lines
+        if excess > 0:
+            self.widget.delete('1.0', f'{excess + 1}.0')
+            self.line_count -= excess
+        self.widget.see('end')
+        return len(lines)
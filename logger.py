@@ -6,87 +6,283 @@ Logger Module for Binance Auto Trade System
 """
 
 import os
-import json
-from datetime import datetime
-import tkinter as tk
+import threading
+
+# 导入时钟模块
+from clock import get_clock
+# 导入日志写入模块
+from log_sink import get_log_sink
+# 导入界面日志显示模块
+from log_view import LogView
+# 导入交易日志模块
+from trade_journal import get_trade_journal, make_order_event
+# 导入日志索引模块
+from log_index import symbol_key
+# 导入交易历史模块
+from trade_history import get_trade_history, HISTORY_FILE
+
+
+# 日志级别
+DEBUG = 10
+INFO = 20
+WARNING = 30
+ERROR = 40
+LEVEL_NAMES = {DEBUG: 'DEBUG', INFO: 'INFO', WARNING: 'WARNING', ERROR: 'ERROR'}
+LEVEL_VALUES = {name: level for level, name in LEVEL_NAMES.items()}
+
+# 日志级别设置的环境变量，格式如 "INFO" 或 "INFO,trading_engine=DEBUG"（模块名=级别，逗号分隔）
+LOG_LEVEL_ENV = 'BINANCE_LOG_LEVEL'
+DEFAULT_LOG_LEVEL = 'INFO'
+
+
+def parse_level_spec(spec):
+    """
+    解析日志级别设置
+
+    Args:
+        spec: 级别设置字符串，如 "INFO,order_handler=DEBUG"
+
+    Returns:
+        tuple: (默认级别, {模块名: 级别})，级别名无效时抛出 ValueError
+    """
+    default_level = LEVEL_VALUES[DEFAULT_LOG_LEVEL]
+    module_levels = {}
+    for part in (spec or '').split(','):
+        part = part.strip()
+        if not part:
+            continue
+        module, _, name = part.rpartition('=')
+        level = LEVEL_VALUES.get(name.strip().upper())
+        if level is None:
+            raise ValueError(f"未知的日志级别: {name}，可选: {', '.join(LEVEL_VALUES)}")
+        if module:
+            module_levels[module.strip()] = level
+        else:
+            default_level = level
+    return default_level, module_levels
 
 
 class Logger:
-    """日志管理类 - 负责系统运行日志和交易详情日志的记录"""
+    """日志管理类 - 负责系统运行日志和交易详情日志的记录（文件由后台线程批量写入）"""
     
-    def __init__(self, log_dir="log", log_widget=None):
+    def __init__(self, log_dir="log", log_widget=None, clock=None):
         """
         初始化日志管理器
         
         Args:
             log_dir: 日志文件存储目录，默认为 "log"
             log_widget: tkinter的文本控件（可选），用于在GUI界面显示日志
+            clock: 时钟对象（默认全局时钟），日志时间戳和日期目录按该时钟计算
         """
         self.log_dir = log_dir
-        self.log_widget = log_widget
+        self.log_widget = None
+        self.log_view = None  # 界面日志显示（环形缓冲区，界面线程定时刷新）
+        self.clock = clock or get_clock()
+        self.listener = None  # 日志转发回调（交易引擎子进程中使用）
+        self.forwarder = None  # 日志文件写入回调（界面进程把日志交给交易引擎进程写入）
+        
+        # 日志级别（默认读取环境变量）和各级别的日志条数
+        self.level, self.module_levels = INFO, {}
+        self.set_levels(os.environ.get(LOG_LEVEL_ENV, DEFAULT_LOG_LEVEL))
+        self.counts_lock = threading.Lock()
+        self.level_counts = {level: 0 for level in LEVEL_NAMES}   # 已输出的条数
+        self.suppressed_counts = {level: 0 for level in LEVEL_NAMES}  # 低于阈值未输出的条数
         
         # 创建日志目录
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
+        
+        # 日志文件写入器（同一目录的Logger共用一个后台线程）
+        self.sink = get_log_sink(self.log_dir)
+        # 交易日志（只在写入器的后台线程中写入）
+        self.journal = get_trade_journal(os.path.join(self.log_dir, 'trade_journal'))
+        # 交易历史数据库（下单事件在写入交易日志时一并记录）
+        self.history = get_trade_history(os.path.join(self.log_dir, HISTORY_FILE))
+        
+        if log_widget is not None:
+            self.set_log_widget(log_widget)
     
     def set_log_widget(self, log_widget):
         """
-        设置日志显示控件
+        设置日志显示控件（在界面线程中调用）
         
         Args:
             log_widget: tkinter的scrolledtext.ScrolledText控件
         """
+        if self.log_view is not None:
+            self.log_view.stop()
         self.log_widget = log_widget
+        self.log_view = LogView(log_widget)
+        self.log_view.start()
+    
+    def set_listener(self, listener):
+        """
+        设置日志转发回调，设置后日志行交给回调处理而不再显示到控件或控制台
+        
+        Args:
+            listener: 接收一行日志文本的函数
+        """
+        self.listener = listener
     
-    def log_message(self, message):
+    def set_forwarder(self, forwarder):
         """
-        添加日志消息 - 同时记录到控制台、GUI界面和文件
+        设置日志文件写入回调，设置后日志照常显示，但不再写入本进程的日志文件
+        （交易引擎在独立进程中运行时，界面进程的日志由引擎进程写入，同一个文件只有一个写入者）
+        
+        Args:
+            forwarder: 接收 (文件名, 时间, 日志文本, 交易对符号) 的函数
+        """
+        self.forwarder = forwarder
+    
+    def set_levels(self, spec):
+        """
+        设置日志级别
+        
+        Args:
+            spec: 级别设置字符串，如 "INFO" 或 "INFO,trading_engine=DEBUG"（无效时保留原设置并打印提示）
+        """
+        try:
+            self.level, self.module_levels = parse_level_spec(spec)
+        except ValueError as e:
+            print(f"日志级别设置无效: {e}")
+    
+    def is_enabled(self, level, module=None):
+        """
+        判断某个级别的日志是否输出
+        
+        Args:
+            level: 日志级别
+            module: 模块名（有单独阈值时使用模块阈值）
+            
+        Returns:
+            bool: 输出返回True
+        """
+        return level >= self.module_levels.get(module, self.level)
+    
+    def log(self, level, message, *args, module=None, symbol=None):
+        """
+        按级别记录日志；未达到阈值时不格式化消息，直接返回
+        
+        Args:
+            level: 日志级别
+            message: 日志消息；有args时为 % 格式字符串，也可以是返回消息的函数（都只在输出时格式化）
+            *args: 格式化参数
+            module: 模块名
+            symbol: 日志涉及的交易对符号
+        """
+        if level < self.module_levels.get(module, self.level):
+            with self.counts_lock:
+                self.suppressed_counts[level] = self.suppressed_counts.get(level, 0) + 1
+            return
+        
+        if args:
+            message = message % args
+        elif callable(message):
+            message = message()
+        if level == DEBUG:
+            message = f"[DEBUG] {message}"
+        self.write_message(level, message, symbol)
+    
+    def debug(self, message, *args, module=None, symbol=None):
+        """
+        记录调试日志（默认不输出，格式化推迟到确定输出时）
+        
+        Args:
+            message: % 格式字符串或返回消息的函数
+            *args: 格式化参数
+            module: 模块名
+            symbol: 日志涉及的交易对符号
+        """
+        self.log(DEBUG, message, *args, module=module, symbol=symbol)
+    
+    def get_level_counts(self):
+        """
+        获取各级别的日志条数
+        
+        Returns:
+            dict: {级别名: (已输出条数, 未输出条数)}
+        """
+        with self.counts_lock:
+            return {name: (self.level_counts.get(level, 0), self.suppressed_counts.get(level, 0))
+                    for level, name in LEVEL_NAMES.items()}
+    
+    def log_message(self, message, module=None, symbol=None):
+        """
+        添加日志消息 - 同时记录到控制台、GUI界面和文件（INFO级别）
         
         Args:
             message: 要记录的日志消息
+            module: 模块名（用于按模块设置级别）
+            symbol: 日志涉及的交易对符号（写入时间索引，可按代币查询）
+        """
+        if INFO < self.module_levels.get(module, self.level):
+            with self.counts_lock:
+                self.suppressed_counts[INFO] += 1
+            return
+        self.write_message(INFO, message, symbol)
+    
+    def write_message(self, level, message, symbol=None):
+        """
+        输出一条已格式化的日志
+        
+        Args:
+            level: 日志级别（用于计数）
+            message: 日志消息
+            symbol: 日志涉及的交易对符号
         """
-        now = datetime.now()
+        with self.counts_lock:
+            self.level_counts[level] = self.level_counts.get(level, 0) + 1
+        
+        now = self.clock.now()
         timestamp = now.strftime("%H:%M:%S")
         log_msg = f"[{timestamp}] {message}\n"
         
-        # 1. 显示到GUI界面
-        if self.log_widget:
+        # 1. 显示到GUI界面（或转发给界面进程）
+        self.display_message(log_msg)
+        
+        # 2. 写入到日志文件（只放入队列，由后台线程写入）
+        self.write_file("system_running_log.txt", now, f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] {message}\n", symbol)
+    
+    def write_file(self, filename, now, text, symbol=None):
+        """
+        写入一行日志到日期目录下的文件（设置了写入回调时交给回调）
+        
+        Args:
+            filename: 文件名
+            now: 日志时间（datetime）
+            text: 日志文本
+            symbol: 日志涉及的交易对符号
+        """
+        if self.forwarder:
+            try:
+                self.forwarder(filename, now, text, symbol)
+            except Exception as e:
+                print(f"日志转发失败: {str(e)}")
+        else:
+            self.sink.write(filename, now, text, symbol)
+    
+    def display_message(self, log_msg):
+        """
+        只显示日志行，不写入文件（也用于显示交易引擎进程转发来的日志）
+        
+        Args:
+            log_msg: 已带时间戳的日志行
+        """
+        if self.listener:
             try:
-                self.log_widget.insert(tk.END, log_msg)
-                self.log_widget.see(tk.END)
-                
-                # 限制日志行数，避免内存占用过大
-                lines = self.log_widget.get("1.0", tk.END).count('\n')
-                if lines > 100:
-                    self.log_widget.delete("1.0", "10.0")
+                self.listener(log_msg)
             except Exception as e:
-                print(f"GUI日志显示失败: {str(e)}")
+                print(f"日志转发失败: {str(e)}")
+        elif self.log_view:
+            # 只放入缓冲区，由界面线程批量显示
+            self.log_view.append(log_msg)
         else:
             # 如果没有GUI控件，打印到控制台
             print(log_msg.strip())
-        
-        # 2. 写入到日志文件
-        try:
-            # 创建日期目录
-            date_str = now.strftime("%Y-%m-%d")
-            date_dir = os.path.join(self.log_dir, date_str)
-            if not os.path.exists(date_dir):
-                os.makedirs(date_dir)
-            
-            # 日志文件路径
-            log_file = os.path.join(date_dir, "system_running_log.txt")
-            
-            # 追加模式写入日志
-            with open(log_file, 'a', encoding='utf-8') as f:
-                full_timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{full_timestamp}] {message}\n")
-        except Exception as e:
-            # 如果写入文件失败，只打印到控制台，不影响程序运行
-            print(f"日志文件写入失败: {str(e)}")
     
     def log_trade_detail(self, trade_detail):
         """
-        记录交易详情到文件
+        记录交易详情到交易日志（JSONL，每个下单事件一行，见 trade_journal 模块）
         
         Args:
             trade_detail: 交易详情字典，包含以下字段：
@@ -98,52 +294,27 @@ class Logger:
                 - custom_quantity: 自定义数量（可选）
                 - order_id: 订单ID（可选）
                 - error: 错误信息（可选）
-                - request_params: 请求参数（可选）
+                - request_params: 请求参数（可选，请求头不写入日志）
                 - response: 响应信息（可选）
         """
-        try:
-            # 创建日期目录
-            date_str = datetime.now().strftime('%Y-%m-%d')
-            date_dir = os.path.join(self.log_dir, date_str)
-            if not os.path.exists(date_dir):
-                os.makedirs(date_dir)
-            
-            # 交易详情日志文件路径
-            trade_log_file = os.path.join(date_dir, "trade_detail_log.txt")
-            
-            with open(trade_log_file, 'a', encoding='utf-8') as f:
-                f.write(f"\n{'=' * 80}\n")
-                f.write(f"时间: {trade_detail.get('timestamp', 'N/A')}\n")
-                f.write(f"代币: {trade_detail.get('symbol', 'N/A')}\n")
-                f.write(f"方向: {trade_detail.get('side', 'N/A')}\n")
-                f.write(f"价格: {trade_detail.get('price', 'N/A')}\n")
-                f.write(f"自定义数量: {trade_detail.get('custom_quantity', 'None')}\n")
-                f.write(f"状态: {trade_detail.get('status', 'N/A')}\n")
-                
-                if 'order_id' in trade_detail:
-                    f.write(f"订单ID: {trade_detail['order_id']}\n")
-                
-                if 'error' in trade_detail:
-                    f.write(f"错误信息: {trade_detail['error']}\n")
-                
-                if 'request_params' in trade_detail:
-                    f.write(f"请求参数:\n")
-                    f.write(f"  URL: {trade_detail['request_params'].get('url', 'N/A')}\n")
-                    if 'payload' in trade_detail['request_params']:
-                        f.write(f"  Payload: {json.dumps(trade_detail['request_params']['payload'], indent=2, ensure_ascii=False)}\n")
-                
-                if 'response' in trade_detail:
-                    f.write(f"响应信息:\n")
-                    f.write(f"  状态码: {trade_detail['response'].get('status_code', 'N/A')}\n")
-                    if 'json' in trade_detail['response']:
-                        f.write(f"  响应数据: {json.dumps(trade_detail['response']['json'], indent=2, ensure_ascii=False)}\n")
-                    elif 'text' in trade_detail['response']:
-                        f.write(f"  响应文本: {trade_detail['response']['text']}\n")
-                
-                f.write(f"{'=' * 80}\n")
-                
-        except Exception as e:
-            print(f"写入交易详情失败: {e}")
+        # 转换和写入都在后台线程中进行
+        timestamp = self.clock.time()
+        self.sink.call(lambda: self.write_journal(make_order_event(trade_detail, timestamp)))
+    
+    def write_journal(self, event):
+        """
+        写入一条交易日志并记录索引和交易历史（在日志写入线程中调用）
+        
+        Args:
+            event: 交易日志事件
+        """
+        self.history.record_order(event)
+        location = self.journal.append(event)
+        if location is None:
+            return
+        order_ids = [event['order_id']] if event.get('order_id') else []
+        key = symbol_key(event.get('symbol'))
+        self.sink.add_index(*location, event['ts'], order_ids, [key] if key else [])
     
     def log_error(self, error_message):
         """
@@ -152,25 +323,21 @@ class Logger:
         Args:
             error_message: 错误消息
         """
-        try:
-            # 同时记录到系统日志
-            self.log_message(f"[ERROR] {error_message}")
-            
-            # 创建日期目录
-            date_str = datetime.now().strftime('%Y-%m-%d')
-            date_dir = os.path.join(self.log_dir, date_str)
-            if not os.path.exists(date_dir):
-                os.makedirs(date_dir)
-            
-            # 错误日志文件路径
-            error_log_file = os.path.join(date_dir, "error_log.txt")
-            
-            with open(error_log_file, 'a', encoding='utf-8') as f:
-                timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                f.write(f"[{timestamp}] {error_message}\n")
-                
-        except Exception as e:
-            print(f"写入错误日志失败: {e}")
+        # 同时记录到系统日志
+        self.write_message(ERROR, f"[ERROR] {error_message}")
+        
+        now = self.clock.now()
+        self.write_file("error_log.txt", now, f"[{now.strftime('%Y-%m-%d %H:%M:%S')}] {error_message}\n")
+    
+    def flush(self):
+        """等待已记录的日志全部写入文件"""
+        self.sink.flush()
+    
+    def close(self):
+        """写完已记录的日志并关闭日志文件（程序退出时也会自动执行）"""
+        self.sink.close()
+        self.journal.close()
+        self.history.close()
 
 
 # 创建全局日志实例（可选）
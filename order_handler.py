@@ -5,7 +5,6 @@
 Order Handler Module for Binance Auto Trade System
 """
 
-import time
 import random
 
 
@@ -22,8 +21,42 @@ class OrderHandler:
         self.trader = trader
         # 直接引用API实例，避免跨模块调用
         self.api = trader.api
-    
-    def handle_order_status(self, symbol, order_id, display_name, side, check_count=0, max_checks=5):
+        # 时钟（真实时间或离线回放的虚拟时间）
+        self.clock = trader.clock
+
+    def record_buy_fill(self, symbol, executed_qty, cum_quote, order_id=None):
+        """
+        累计买单成交（代币数据原子更新），并记入成交账本和交易历史
+
+        Args:
+            order_id: 订单ID（记入交易历史，用于统计成交延迟）
+
+        Returns:
+            tuple: (原份额, 新份额, 原买单成交额, 新买单成交额)
+        """
+        result = self.trader.tokens.add_buy_fill(symbol, executed_qty, cum_quote)
+        self.trader.fill_ledger.record_fill(symbol, "BUY", executed_qty, cum_quote)
+        self.trader.history.record_fill(self.clock.time(), symbol, "BUY", executed_qty, cum_quote, order_id)
+        return result
+
+    def record_sell_fill(self, symbol, executed_qty, cum_quote, order_id=None, reduce_quantity=False):
+        """
+        累计卖单成交额（代币数据原子更新），并记入成交账本和交易历史
+
+        Args:
+            order_id: 订单ID（记入交易历史，用于统计成交延迟）
+            reduce_quantity: 是否同时从持有份额中减去已成交的份额（部分成交后重试剩余份额时使用）
+
+        Returns:
+            tuple: (原卖单成交额, 新卖单成交额, 原份额, 新份额)
+        """
+        sold_quantity = executed_qty if reduce_quantity else 0.0
+        result = self.trader.tokens.add_sell_fill(symbol, cum_quote, sold_quantity)
+        self.trader.fill_ledger.record_fill(symbol, "SELL", executed_qty, cum_quote)
+        self.trader.history.record_fill(self.clock.time(), symbol, "SELL", executed_qty, cum_quote, order_id)
+        return result
+
+    def handle_order_status(self, symbol, order_id, display_name, side, check_count=0, max_checks=None):
         """
         递归检查订单状态
         
@@ -33,30 +66,34 @@ class OrderHandler:
             display_name: 显示名称
             side: 订单方向（"BUY" 或 "SELL"）
             check_count: 当前检查次数
-            max_checks: 最大检查次数
+            max_checks: 最大检查次数（默认使用交易参数 status_check_limit）
             
         Returns:
             bool: 订单成交返回True，否则返回False
         """
+        if max_checks is None:
+            max_checks = self.trader.trading_params['status_check_limit']
+        
         # 检查自动交易状态
         if not self.trader.auto_trading.get(symbol, False):
-            self.trader.log_message(f"{display_name} 自动交易已停止")
+            self.trader.log_message(f"{display_name} 自动交易已停止", symbol=symbol)
             return False
 
         # 等待随机时间
-        time.sleep(random.uniform(1, 2))
+        self.clock.sleep(random.uniform(*self.trader.trading_params['poll_interval']))
 
         # 检查订单状态
         try:
             order_status = self.api.check_single_order_filled(order_id)
-            self.trader.log_message(f"{display_name} 检查{side}单状态: {order_status}, 检查次数: {check_count + 1}")
+            self.trader.log_debug("%s 检查%s单状态: %s, 检查次数: %d",
+                                  display_name, side, order_status, check_count + 1, module='order_handler', symbol=symbol)
         except Exception as e:
-            self.trader.log_message(f"{display_name} 检查{side}单状态失败: {e}")
-            time.sleep(random.uniform(0, 1))
+            self.trader.log_message(f"{display_name} 检查{side}单状态失败: {e}", symbol=symbol)
+            self.clock.sleep(random.uniform(0, 1))
             return False
 
         if order_status == "FILLED":
-            self.trader.log_message(f"{display_name} {side}单已成交")
+            self.trader.log_message(f"{display_name} {side}单已成交", symbol=symbol)
             # 获取订单详情
             order_details = self.api.get_order_details()
             if order_details:
@@ -65,46 +102,38 @@ class OrderHandler:
                     executed_qty = float(order_details.get('executedQty', 0))
                     cum_quote = float(order_details.get('cumQuote', '0'))
                     
-                    # 保存买单份额
-                    current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                    new_total_quantity = current_quantity + executed_qty
-                    self.trader.tokens[symbol]['last_buy_quantity'] = new_total_quantity
-                    
-                    # 保存买单成交额
-                    current_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                    new_total_amount = current_buy_amount + cum_quote
-                    self.trader.tokens[symbol]['last_buy_amount'] = new_total_amount
+                    # 累计买单份额和成交额
+                    current_quantity, new_total_quantity, current_buy_amount, new_total_amount = self.record_buy_fill(symbol, executed_qty, cum_quote, order_id)
                     
-                    self.trader.log_message(f"买单成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT")
+                    self.trader.log_message(f"买单成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT", symbol=symbol)
                 # 卖单成交时累加成交额
                 elif side == "SELL" and symbol in self.trader.tokens:
+                    executed_qty = float(order_details.get('executedQty', 0))
                     cum_quote = float(order_details.get('cumQuote', '0'))
                     formatted_amount = f"{cum_quote:.2f}"
                     
                     # 累计卖单成交额（统计到token数据中）
-                    current_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                    new_total_sell_amount = current_sell_amount + cum_quote
-                    self.trader.tokens[symbol]['last_sell_amount'] = new_total_sell_amount
+                    current_sell_amount, new_total_sell_amount, _, _ = self.record_sell_fill(symbol, executed_qty, cum_quote, order_id)
                     
                     # 同时累计到全局变量（用于兼容性）
                     self.trader.current_sell_amount += cum_quote
                     
-                    self.trader.log_message(f"卖单成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT")
+                    self.trader.log_message(f"卖单成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT", symbol=symbol)
             else:
-                self.trader.log_message(f"无法获取订单详情，跳过保存{side}单信息")
+                self.trader.log_message(f"无法获取订单详情，跳过保存{side}单信息", symbol=symbol)
             return True
         elif order_status == "PARTIALLY_FILLED":
-            self.trader.log_message(f"{display_name} {side}单部分成交，开始处理剩余份额")
+            self.trader.log_message(f"{display_name} {side}单部分成交，开始处理剩余份额", symbol=symbol)
             try:
                 # 先查询5次，每次间隔1-2秒
                 for i in range(5):
-                    self.trader.log_message(f"{display_name} 第{i+1}次查询部分成交状态...")
-                    time.sleep(random.uniform(1, 2))
+                    self.trader.log_message(f"{display_name} 第{i+1}次查询部分成交状态...", symbol=symbol)
+                    self.clock.sleep(random.uniform(*self.trader.trading_params['poll_interval']))
                     
                     # 重新检查订单状态
                     new_status = self.api.check_single_order_filled(order_id)
                     if new_status == "FILLED":
-                        self.trader.log_message(f"{display_name} 第{i+1}次查询：{side}单已完全成交")
+                        self.trader.log_message(f"{display_name} 第{i+1}次查询：{side}单已完全成交", symbol=symbol)
                         
                         # 获取订单详情并保存份额和成交额
                         order_details = self.api.get_order_details()
@@ -113,34 +142,25 @@ class OrderHandler:
                                 executed_qty = float(order_details.get('executedQty', 0))
                                 cum_quote = float(order_details.get('cumQuote', '0'))
                                 
-                                # 保存买单份额
-                                current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                                new_total_quantity = current_quantity + executed_qty
-                                self.trader.tokens[symbol]['last_buy_quantity'] = new_total_quantity
+                                # 累计买单份额和成交额
+                                current_quantity, new_total_quantity, current_buy_amount, new_total_amount = self.record_buy_fill(symbol, executed_qty, cum_quote, order_id)
                                 
-                                # 保存买单成交额
-                                current_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                                new_total_amount = current_buy_amount + cum_quote
-                                self.trader.tokens[symbol]['last_buy_amount'] = new_total_amount
-                                
-                                self.trader.log_message(f"买单完全成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT")
+                                self.trader.log_message(f"买单完全成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT", symbol=symbol)
                             elif side == "SELL" and symbol in self.trader.tokens:
                                 executed_qty = float(order_details.get('executedQty', 0))
                                 cum_quote = float(order_details.get('cumQuote', '0'))
                                 
                                 # 累计卖单成交额
-                                current_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                                new_total_sell_amount = current_sell_amount + cum_quote
-                                self.trader.tokens[symbol]['last_sell_amount'] = new_total_sell_amount
+                                current_sell_amount, new_total_sell_amount, _, _ = self.record_sell_fill(symbol, executed_qty, cum_quote, order_id)
                                 
                                 # 同时累计到全局变量（用于兼容性）
                                 self.trader.current_sell_amount += cum_quote
                                 
-                                self.trader.log_message(f"卖单完全成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT")
+                                self.trader.log_message(f"卖单完全成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT", symbol=symbol)
                         
                         return True
                     elif new_status != "PARTIALLY_FILLED":
-                        self.trader.log_message(f"{display_name} 第{i+1}次查询：{side}单状态变为 {new_status}")
+                        self.trader.log_message(f"{display_name} 第{i+1}次查询：{side}单状态变为 {new_status}", symbol=symbol)
                         # 如果不是部分成交，按其他状态处理
                         if new_status == "CANCELED":
                             return self.handle_canceled_order(symbol, side, display_name, order_id)
@@ -151,16 +171,16 @@ class OrderHandler:
                             return result
                 
                 # 5次查询后仍然是部分成交，取消订单
-                self.trader.log_message(f"{display_name} 5次查询后仍为部分成交，取消订单")
+                self.trader.log_message(f"{display_name} 5次查询后仍为部分成交，取消订单", symbol=symbol)
                 self.api.cancel_all_orders()
-                time.sleep(2)  # 等待取消生效
+                self.clock.sleep(2)  # 等待取消生效
                 
                 # Double check订单状态
                 final_status = self.api.check_single_order_filled(order_id)
-                self.trader.log_message(f"{display_name} Double check: {side}单状态为 {final_status}")
+                self.trader.log_message(f"{display_name} Double check: {side}单状态为 {final_status}", symbol=symbol)
                 
                 if final_status == "FILLED":
-                    self.trader.log_message(f"{display_name} 取消后{side}单已完全成交")
+                    self.trader.log_message(f"{display_name} 取消后{side}单已完全成交", symbol=symbol)
                     
                     # 获取订单详情并保存份额和成交额
                     order_details = self.api.get_order_details()
@@ -169,30 +189,21 @@ class OrderHandler:
                             executed_qty = float(order_details.get('executedQty', 0))
                             cum_quote = float(order_details.get('cumQuote', '0'))
                             
-                            # 保存买单份额
-                            current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                            new_total_quantity = current_quantity + executed_qty
-                            self.trader.tokens[symbol]['last_buy_quantity'] = new_total_quantity
-                            
-                            # 保存买单成交额
-                            current_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                            new_total_amount = current_buy_amount + cum_quote
-                            self.trader.tokens[symbol]['last_buy_amount'] = new_total_amount
+                            # 累计买单份额和成交额
+                            current_quantity, new_total_quantity, current_buy_amount, new_total_amount = self.record_buy_fill(symbol, executed_qty, cum_quote, order_id)
                             
-                            self.trader.log_message(f"取消后买单已完全成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT")
+                            self.trader.log_message(f"取消后买单已完全成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT", symbol=symbol)
                         elif side == "SELL" and symbol in self.trader.tokens:
                             executed_qty = float(order_details.get('executedQty', 0))
                             cum_quote = float(order_details.get('cumQuote', '0'))
                             
                             # 累计卖单成交额
-                            current_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                            new_total_sell_amount = current_sell_amount + cum_quote
-                            self.trader.tokens[symbol]['last_sell_amount'] = new_total_sell_amount
+                            current_sell_amount, new_total_sell_amount, _, _ = self.record_sell_fill(symbol, executed_qty, cum_quote, order_id)
                             
                             # 同时累计到全局变量（用于兼容性）
                             self.trader.current_sell_amount += cum_quote
                             
-                            self.trader.log_message(f"取消后卖单已完全成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT")
+                            self.trader.log_message(f"取消后卖单已完全成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT", symbol=symbol)
                     
                     return True
                 elif final_status == "CANCELED":
@@ -203,64 +214,50 @@ class OrderHandler:
                         executed_qty = float(canceled_order_info.get('executedQty', 0))
                         remaining_qty = orig_qty - executed_qty
                         
-                        self.trader.log_message(f"{display_name} 已取消订单详情:")
-                        self.trader.log_message(f"  - 原始数量: {orig_qty}")
-                        self.trader.log_message(f"  - 已成交数量: {executed_qty}")
-                        self.trader.log_message(f"  - 剩余数量: {remaining_qty}")
+                        self.trader.log_message(f"{display_name} 已取消订单详情:", symbol=symbol)
+                        self.trader.log_message(f"  - 原始数量: {orig_qty}", symbol=symbol)
+                        self.trader.log_message(f"  - 已成交数量: {executed_qty}", symbol=symbol)
+                        self.trader.log_message(f"  - 剩余数量: {remaining_qty}", symbol=symbol)
                         
                         if remaining_qty > 0:
                             # 只有部分成交才累计已成交的份额和成交额
                             if side == "BUY" and symbol in self.trader.tokens:
-                                # 累计买单份额
-                                current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                                new_total_quantity = current_quantity + executed_qty
-                                self.trader.tokens[symbol]['last_buy_quantity'] = new_total_quantity
-                                
-                                # 累计买单成交额
                                 cum_quote = float(canceled_order_info.get('cumQuote', '0'))
-                                current_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                                new_total_amount = current_buy_amount + cum_quote
-                                self.trader.tokens[symbol]['last_buy_amount'] = new_total_amount
+                                # 累计买单份额和成交额
+                                current_quantity, new_total_quantity, current_buy_amount, new_total_amount = self.record_buy_fill(symbol, executed_qty, cum_quote, order_id)
                                 
-                                self.trader.log_message(f"累计部分成交份额: {current_quantity} + {executed_qty} = {new_total_quantity}，累计买单成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT")
+                                self.trader.log_message(f"累计部分成交份额: {current_quantity} + {executed_qty} = {new_total_quantity}，累计买单成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT", symbol=symbol)
                             
                             elif side == "SELL" and symbol in self.trader.tokens:
-                                # 累计卖单成交额
                                 cum_quote = float(canceled_order_info.get('cumQuote', '0'))
-                                current_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                                new_total_sell_amount = current_sell_amount + cum_quote
-                                self.trader.tokens[symbol]['last_sell_amount'] = new_total_sell_amount
+                                # 累计卖单成交额，同时减去已成交的份额
+                                current_sell_amount, new_total_sell_amount, current_quantity, new_quantity = self.record_sell_fill(symbol, executed_qty, cum_quote, order_id, reduce_quantity=True)
                                 
                                 # 同时累计到全局变量（用于兼容性）
                                 self.trader.current_sell_amount += cum_quote
                                 
-                                # 更新剩余份额：减去已成交的份额
-                                current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                                new_quantity = current_quantity - executed_qty
-                                self.trader.tokens[symbol]['last_buy_quantity'] = new_quantity
-                                
-                                self.trader.log_message(f"累计卖单部分成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT")
-                                self.trader.log_message(f"更新剩余份额: {current_quantity} - {executed_qty} = {new_quantity}")
+                                self.trader.log_message(f"累计卖单部分成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT", symbol=symbol)
+                                self.trader.log_message(f"更新剩余份额: {current_quantity} - {executed_qty} = {new_quantity}", symbol=symbol)
                             
                             return self.retry_order_with_remaining_qty(symbol, side, display_name, remaining_qty)
                         else:
-                            self.trader.log_message(f"{display_name} 没有剩余份额需要处理")
+                            self.trader.log_message(f"{display_name} 没有剩余份额需要处理", symbol=symbol)
                             return True
                     else:
-                        self.trader.log_message(f"{display_name} 无法获取已取消订单详情")
+                        self.trader.log_message(f"{display_name} 无法获取已取消订单详情", symbol=symbol)
                         result = self.retry_order_with_new_price(order_id, symbol, side, display_name)
                         if side == "BUY":
                             return result
                         return result
                 else:
-                    self.trader.log_message(f"{display_name} 取消后{side}单状态异常: {final_status}")
+                    self.trader.log_message(f"{display_name} 取消后{side}单状态异常: {final_status}", symbol=symbol)
                     result = self.retry_order_with_new_price(order_id, symbol, side, display_name)
                     if side == "BUY":
                         return result
                     return result
                     
             except Exception as e:
-                self.trader.log_message(f"{display_name} 处理部分成交失败: {e}")
+                self.trader.log_message(f"{display_name} 处理部分成交失败: {e}", symbol=symbol)
                 result = self.retry_order_with_new_price(order_id, symbol, side, display_name)
                 if side == "BUY":
                     return result
@@ -268,19 +265,19 @@ class OrderHandler:
         else:
             # 未成交，检查次数是否达到上限
             if check_count + 1 < max_checks:
-                self.trader.log_message(f"{display_name} {side}单尚未成交，2秒后继续检查")
+                self.trader.log_message(f"{display_name} {side}单尚未成交，2秒后继续检查", symbol=symbol)
                 return self.handle_order_status(symbol, order_id, display_name, side, check_count + 1, max_checks)
             else:
-                self.trader.log_message(f"{display_name} {side}单约10秒未成交，取消订单")
+                self.trader.log_message(f"{display_name} {side}单约10秒未成交，取消订单", symbol=symbol)
                 try:
                     self.api.cancel_all_orders()
                     # 取消后等待2秒，然后双重检查订单状态
-                    time.sleep(2)
-                    self.trader.log_message(f"{display_name} 取消后双重检查订单状态")
+                    self.clock.sleep(2)
+                    self.trader.log_message(f"{display_name} 取消后双重检查订单状态", symbol=symbol)
                     final_status = self.api.check_single_order_filled(order_id)
                     
                     if final_status == 'FILLED':
-                        self.trader.log_message(f"{display_name} Double check: {side}单已成交，继续流程")
+                        self.trader.log_message(f"{display_name} Double check: {side}单已成交，继续流程", symbol=symbol)
                         
                         # 获取订单详情并保存份额和成交额
                         order_details = self.api.get_order_details()
@@ -289,30 +286,21 @@ class OrderHandler:
                                 executed_qty = float(order_details.get('executedQty', 0))
                                 cum_quote = float(order_details.get('cumQuote', '0'))
                                 
-                                # 保存买单份额
-                                current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                                new_total_quantity = current_quantity + executed_qty
-                                self.trader.tokens[symbol]['last_buy_quantity'] = new_total_quantity
-                                
-                                # 保存买单成交额
-                                current_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                                new_total_amount = current_buy_amount + cum_quote
-                                self.trader.tokens[symbol]['last_buy_amount'] = new_total_amount
+                                # 累计买单份额和成交额
+                                current_quantity, new_total_quantity, current_buy_amount, new_total_amount = self.record_buy_fill(symbol, executed_qty, cum_quote, order_id)
                                 
-                                self.trader.log_message(f"Double check: 买单已成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT")
+                                self.trader.log_message(f"Double check: 买单已成交，保存份额: {current_quantity} + {executed_qty} = {new_total_quantity}，保存成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT", symbol=symbol)
                             elif side == "SELL" and symbol in self.trader.tokens:
                                 executed_qty = float(order_details.get('executedQty', 0))
                                 cum_quote = float(order_details.get('cumQuote', '0'))
                                 
                                 # 累计卖单成交额
-                                current_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                                new_total_sell_amount = current_sell_amount + cum_quote
-                                self.trader.tokens[symbol]['last_sell_amount'] = new_total_sell_amount
+                                current_sell_amount, new_total_sell_amount, _, _ = self.record_sell_fill(symbol, executed_qty, cum_quote, order_id)
                                 
                                 # 同时累计到全局变量（用于兼容性）
                                 self.trader.current_sell_amount += cum_quote
                                 
-                                self.trader.log_message(f"Double check: 卖单已成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT")
+                                self.trader.log_message(f"Double check: 卖单已成交，保存成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT", symbol=symbol)
                         
                         return True
                     elif final_status == 'CANCELED':
@@ -325,40 +313,33 @@ class OrderHandler:
                                 cum_quote = float(canceled_order_info.get('cumQuote', '0'))
                                 remaining_qty = orig_qty - executed_qty
                                 
-                                self.trader.log_message(f"{display_name} Double check: 买单已取消订单详情:")
-                                self.trader.log_message(f"  - 原始数量: {orig_qty}")
-                                self.trader.log_message(f"  - 已成交数量: {executed_qty}")
-                                self.trader.log_message(f"  - 成交金额: {cum_quote:.2f} USDT")
-                                self.trader.log_message(f"  - 剩余数量: {remaining_qty}")
+                                self.trader.log_message(f"{display_name} Double check: 买单已取消订单详情:", symbol=symbol)
+                                self.trader.log_message(f"  - 原始数量: {orig_qty}", symbol=symbol)
+                                self.trader.log_message(f"  - 已成交数量: {executed_qty}", symbol=symbol)
+                                self.trader.log_message(f"  - 成交金额: {cum_quote:.2f} USDT", symbol=symbol)
+                                self.trader.log_message(f"  - 剩余数量: {remaining_qty}", symbol=symbol)
                                 
                                 # 如果有部分成交，累计已成交的份额和成交额
                                 if executed_qty > 0 and cum_quote > 0:
                                     if symbol in self.trader.tokens:
-                                        # 累计买单份额
-                                        current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                                        new_total_quantity = current_quantity + executed_qty
-                                        self.trader.tokens[symbol]['last_buy_quantity'] = new_total_quantity
+                                        # 累计买单份额和成交额
+                                        current_quantity, new_total_quantity, current_buy_amount, new_total_amount = self.record_buy_fill(symbol, executed_qty, cum_quote, order_id)
                                         
-                                        # 累计买单成交额
-                                        current_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                                        new_total_amount = current_buy_amount + cum_quote
-                                        self.trader.tokens[symbol]['last_buy_amount'] = new_total_amount
-                                        
-                                        self.trader.log_message(f"累计部分成交份额: {current_quantity} + {executed_qty} = {new_total_quantity}，累计买单成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT")
+                                        self.trader.log_message(f"累计部分成交份额: {current_quantity} + {executed_qty} = {new_total_quantity}，累计买单成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT", symbol=symbol)
                                     
                                     # 如果有剩余数量，继续重试
                                     if remaining_qty > 0:
-                                        self.trader.log_message(f"{display_name} 检测到部分成交，继续重试剩余数量: {remaining_qty}")
+                                        self.trader.log_message(f"{display_name} 检测到部分成交，继续重试剩余数量: {remaining_qty}", symbol=symbol)
                                         return self.retry_order_with_remaining_qty(symbol, side, display_name, remaining_qty)
                                     else:
-                                        self.trader.log_message(f"{display_name} 所有份额已成交，继续流程")
+                                        self.trader.log_message(f"{display_name} 所有份额已成交，继续流程", symbol=symbol)
                                         return True
                                 else:
                                     # 没有部分成交，退出当前交易循环
-                                    self.trader.log_message(f"{display_name} Double check: 买单状态为 {final_status}，5次查询后仍未成交，退出当前交易循环")
+                                    self.trader.log_message(f"{display_name} Double check: 买单状态为 {final_status}，5次查询后仍未成交，退出当前交易循环", symbol=symbol)
                                     return False
                             else:
-                                self.trader.log_message(f"{display_name} Double check: 无法获取订单详情，退出当前交易循环")
+                                self.trader.log_message(f"{display_name} Double check: 无法获取订单详情，退出当前交易循环", symbol=symbol)
                                 return False
                         else:
                             # 卖单被取消，检查是否有部分成交
@@ -369,55 +350,48 @@ class OrderHandler:
                                 cum_quote = float(canceled_order_info.get('cumQuote', '0'))
                                 remaining_qty = orig_qty - executed_qty
                                 
-                                self.trader.log_message(f"{display_name} Double check: 卖单已取消订单详情:")
-                                self.trader.log_message(f"  - 原始数量: {orig_qty}")
-                                self.trader.log_message(f"  - 已成交数量: {executed_qty}")
-                                self.trader.log_message(f"  - 成交金额: {cum_quote:.2f} USDT")
-                                self.trader.log_message(f"  - 剩余数量: {remaining_qty}")
+                                self.trader.log_message(f"{display_name} Double check: 卖单已取消订单详情:", symbol=symbol)
+                                self.trader.log_message(f"  - 原始数量: {orig_qty}", symbol=symbol)
+                                self.trader.log_message(f"  - 已成交数量: {executed_qty}", symbol=symbol)
+                                self.trader.log_message(f"  - 成交金额: {cum_quote:.2f} USDT", symbol=symbol)
+                                self.trader.log_message(f"  - 剩余数量: {remaining_qty}", symbol=symbol)
                                 
                                 # 如果有部分成交，累计已成交的成交额，并更新剩余份额
                                 if executed_qty > 0 and cum_quote > 0:
                                     if symbol in self.trader.tokens:
-                                        # 累计卖单成交额
-                                        current_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                                        new_total_sell_amount = current_sell_amount + cum_quote
-                                        self.trader.tokens[symbol]['last_sell_amount'] = new_total_sell_amount
+                                        # 累计卖单成交额，同时减去已成交的份额
+                                        current_sell_amount, new_total_sell_amount, current_quantity, new_quantity = self.record_sell_fill(symbol, executed_qty, cum_quote, order_id, reduce_quantity=True)
                                         
                                         # 同时累计到全局变量（用于兼容性）
                                         self.trader.current_sell_amount += cum_quote
                                         
-                                        # 更新剩余份额：减去已成交的份额
-                                        current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                                        new_quantity = current_quantity - executed_qty
-                                        self.trader.tokens[symbol]['last_buy_quantity'] = new_quantity
-                                        
-                                        self.trader.log_message(f"累计卖单部分成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT")
-                                        self.trader.log_message(f"更新剩余份额: {current_quantity} - {executed_qty} = {new_quantity}")
+                                        self.trader.log_message(f"累计卖单部分成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT", symbol=symbol)
+                                        self.trader.log_message(f"更新剩余份额: {current_quantity} - {executed_qty} = {new_quantity}", symbol=symbol)
                                     
                                     # 如果有剩余数量，继续重试
                                     if remaining_qty > 0:
-                                        self.trader.log_message(f"{display_name} 检测到部分成交，继续重试剩余数量: {remaining_qty}")
+                                        self.trader.log_message(f"{display_name} 检测到部分成交，继续重试剩余数量: {remaining_qty}", symbol=symbol)
                                         return self.retry_order_with_remaining_qty(symbol, side, display_name, remaining_qty)
                                     else:
-                                        self.trader.log_message(f"{display_name} 所有份额已成交，继续流程")
+                                        self.trader.log_message(f"{display_name} 所有份额已成交，继续流程", symbol=symbol)
                                         return True
                             
                             # 没有部分成交或无法获取订单详情，继续重试
-                            self.trader.log_message(f"{display_name} Double check: 卖单状态为 {final_status}，继续重试")
+                            self.trader.log_message(f"{display_name} Double check: 卖单状态为 {final_status}，继续重试", symbol=symbol)
                     else:
                         # 其他状态
                         if side == "BUY":
-                            self.trader.log_message(f"{display_name} Double check: 买单状态为 {final_status}，5次查询后仍未成交，退出当前交易循环")
+                            self.trader.log_message(f"{display_name} Double check: 买单状态为 {final_status}，5次查询后仍未成交，退出当前交易循环", symbol=symbol)
                             return False
                         # 卖单继续重试
-                        self.trader.log_message(f"{display_name} Double check: 卖单状态为 {final_status}，继续重试")
+                        self.trader.log_message(f"{display_name} Double check: 卖单状态为 {final_status}，继续重试", symbol=symbol)
                         
                 except Exception as e:
-                    self.trader.log_message(f"{display_name} 取消{side}单失败: {e}")
+                    self.trader.log_message(f"{display_name} 取消{side}单失败: {e}", symbol=symbol)
                     result = self.retry_order_with_new_price(order_id, symbol, side, display_name)
                     # 如果是买单且切换了代币，根据返回值决定是否继续
                     if side == "BUY":
-                        self.trader.log_message(f"{display_name} 买单取消失败，退出当前交易循环")
+                        self.trader.log_message(f"{display_name} 买单取消失败，退出当前交易循环", symbol=symbol)
                         return False
                     # 卖单继续重试
                     return self.retry_order_with_new_price(order_id, symbol, side, display_name)
@@ -447,24 +421,24 @@ class OrderHandler:
                     if symbol in self.trader.tokens:
                         current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
                         if current_quantity > 0:
-                            self.trader.log_message(f"{display_name} 检测到部分成交份额 {current_quantity}，不切换代币")
+                            self.trader.log_message(f"{display_name} 检测到部分成交份额 {current_quantity}，不切换代币", symbol=symbol)
                             return False  # 不切换代币，返回False表示重试失败但不切换
                     
-                    self.trader.log_message(f"{display_name} 无法获取最新价格，尝试更换代币")
+                    self.trader.log_message(f"{display_name} 无法获取最新价格，尝试更换代币", symbol=symbol)
                     return self.switch_to_better_token(symbol, display_name)
                 else:
-                    self.trader.log_message(f"{display_name} 无法获取最新价格，卖单重试失败")
+                    self.trader.log_message(f"{display_name} 无法获取最新价格，卖单重试失败", symbol=symbol)
                     return False
             
             latest_price = float(price_data['price'])
             
             # 根据订单方向调整价格以提高撮合优先级
             if side == "BUY":
-                price_data['price'] = latest_price + 0.0000001  # 买单价格提高0.0000001
-                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，买单调整后价格: {price_data['price']}")
+                price_data['price'] = latest_price + self.trader.trading_params['reprice_offset']  # 买单价格提高0.0000001
+                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，买单调整后价格: {price_data['price']}", symbol=symbol)
             else:  # SELL
-                price_data['price'] = latest_price - 0.0000001  # 卖单价格降低0.0000001
-                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，卖单调整后价格: {price_data['price']}")
+                price_data['price'] = latest_price - self.trader.trading_params['reprice_offset']  # 卖单价格降低0.0000001
+                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，卖单调整后价格: {price_data['price']}", symbol=symbol)
             
             # 重新下单
             new_order_id = self.trader.trading_engine.place_single_order(symbol, price_data['price'], side)
@@ -477,13 +451,13 @@ class OrderHandler:
                     if symbol in self.trader.tokens:
                         current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
                         if current_quantity > 0:
-                            self.trader.log_message(f"{display_name} 检测到部分成交份额 {current_quantity}，不切换代币")
+                            self.trader.log_message(f"{display_name} 检测到部分成交份额 {current_quantity}，不切换代币", symbol=symbol)
                             return False  # 不切换代币，返回False表示重试失败但不切换
                     
-                    self.trader.log_message(f"{display_name} 重新下单失败，尝试更换代币")
+                    self.trader.log_message(f"{display_name} 重新下单失败，尝试更换代币", symbol=symbol)
                     return self.switch_to_better_token(symbol, display_name)
                 else:
-                    self.trader.log_message(f"{display_name} 重新下单失败，卖单重试失败")
+                    self.trader.log_message(f"{display_name} 重新下单失败，卖单重试失败", symbol=symbol)
                     return False
                 
         except Exception as e:
@@ -492,13 +466,13 @@ class OrderHandler:
                 if symbol in self.trader.tokens:
                     current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
                     if current_quantity > 0:
-                        self.trader.log_message(f"{display_name} 检测到部分成交份额 {current_quantity}，不切换代币")
+                        self.trader.log_message(f"{display_name} 检测到部分成交份额 {current_quantity}，不切换代币", symbol=symbol)
                         return False  # 不切换代币，返回False表示重试失败但不切换
                 
-                self.trader.log_message(f"重新下单失败: {str(e)}，尝试更换代币")
+                self.trader.log_message(f"重新下单失败: {str(e)}，尝试更换代币", symbol=symbol)
                 return self.switch_to_better_token(symbol, display_name)
             else:
-                self.trader.log_message(f"重新下单失败: {str(e)}，卖单重试失败")
+                self.trader.log_message(f"重新下单失败: {str(e)}，卖单重试失败", symbol=symbol)
                 return False
 
     def switch_to_better_token(self, current_symbol, current_display_name):
@@ -513,19 +487,19 @@ class OrderHandler:
             bool: 返回False表示当前交易失败
         """
         try:
-            self.trader.log_message(f"尝试买单失败，代币可能当前不稳定，重新开始流程")
+            self.trader.log_message(f"尝试买单失败，代币可能当前不稳定，重新开始流程", symbol=current_symbol)
             
             # 停止当前代币的自动交易
             self.trader.auto_trading[current_symbol] = False
             if current_symbol in self.trader.tokens:
                 self.trader.tokens[current_symbol]['auto_trading'] = False
             
-            self.trader.log_message(f"{current_display_name} 已停止交易，将在下一次循环中重新获取新代币")
+            self.trader.log_message(f"{current_display_name} 已停止交易，将在下一次循环中重新获取新代币", symbol=current_symbol)
             
             return False  # 返回False表示当前交易失败，但不会影响整体交易流程
             
         except Exception as e:
-            self.trader.log_message(f"停止当前代币交易失败: {str(e)}")
+            self.trader.log_message(f"停止当前代币交易失败: {str(e)}", symbol=current_symbol)
             return False
 
     def retry_order_with_remaining_qty(self, symbol, side, display_name, remaining_qty):
@@ -545,7 +519,7 @@ class OrderHandler:
             # 获取最新价格
             price_data = self.trader.get_token_price(symbol)
             if not price_data or 'price' not in price_data:
-                self.trader.log_message(f"{display_name} 无法获取最新价格，取消交易")
+                self.trader.log_message(f"{display_name} 无法获取最新价格，取消交易", symbol=symbol)
                 return False
             
             latest_price = float(price_data['price'])
@@ -553,10 +527,10 @@ class OrderHandler:
             # 根据订单方向调整价格以提高撮合优先级
             if side == "BUY":
                 adjusted_price = latest_price + 0.00000001  # 买单价格提高0.00000001
-                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，买单调整后价格: {adjusted_price}")
+                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，买单调整后价格: {adjusted_price}", symbol=symbol)
             else:  # SELL
                 adjusted_price = latest_price - 0.00000001  # 卖单价格降低0.00000001
-                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，卖单调整后价格: {adjusted_price}")
+                self.trader.log_message(f"{display_name} 获取最新价格: {latest_price}，卖单调整后价格: {adjusted_price}", symbol=symbol)
             
             # 使用剩余份额重新下单
             new_order_id = self.trader.trading_engine.place_single_order(symbol, adjusted_price, side, custom_quantity=remaining_qty)
@@ -567,7 +541,7 @@ class OrderHandler:
                 return False
                 
         except Exception as e:
-            self.trader.log_message(f"使用剩余份额重新下单失败: {str(e)}")
+            self.trader.log_message(f"使用剩余份额重新下单失败: {str(e)}", symbol=symbol)
             return False
 
     def handle_canceled_order(self, symbol, side, display_name, order_id):
@@ -591,58 +565,44 @@ class OrderHandler:
                 executed_qty = float(canceled_order_info.get('executedQty', 0))
                 remaining_qty = orig_qty - executed_qty
                 
-                self.trader.log_message(f"{display_name} 已取消订单详情:")
-                self.trader.log_message(f"  - 原始数量: {orig_qty}")
-                self.trader.log_message(f"  - 已成交数量: {executed_qty}")
-                self.trader.log_message(f"  - 剩余数量: {remaining_qty}")
+                self.trader.log_message(f"{display_name} 已取消订单详情:", symbol=symbol)
+                self.trader.log_message(f"  - 原始数量: {orig_qty}", symbol=symbol)
+                self.trader.log_message(f"  - 已成交数量: {executed_qty}", symbol=symbol)
+                self.trader.log_message(f"  - 剩余数量: {remaining_qty}", symbol=symbol)
                 
                 # 如果有部分成交，累计已成交的份额和成交额
                 if executed_qty > 0:
                     cum_quote = float(canceled_order_info.get('cumQuote', '0'))
                     
                     if side == "BUY" and symbol in self.trader.tokens:
-                        # 累计买单份额
-                        current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                        new_total_quantity = current_quantity + executed_qty
-                        self.trader.tokens[symbol]['last_buy_quantity'] = new_total_quantity
-                        
-                        # 累计买单成交额
-                        current_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                        new_total_amount = current_buy_amount + cum_quote
-                        self.trader.tokens[symbol]['last_buy_amount'] = new_total_amount
+                        # 累计买单份额和成交额
+                        current_quantity, new_total_quantity, current_buy_amount, new_total_amount = self.record_buy_fill(symbol, executed_qty, cum_quote, order_id)
                         
-                        self.trader.log_message(f"累计部分成交份额: {current_quantity} + {executed_qty} = {new_total_quantity}，累计买单成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT")
+                        self.trader.log_message(f"累计部分成交份额: {current_quantity} + {executed_qty} = {new_total_quantity}，累计买单成交额: {current_buy_amount:.2f} + {cum_quote:.2f} = {new_total_amount:.2f} USDT", symbol=symbol)
                     
                     elif side == "SELL" and symbol in self.trader.tokens:
-                        # 累计卖单成交额
-                        current_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                        new_total_sell_amount = current_sell_amount + cum_quote
-                        self.trader.tokens[symbol]['last_sell_amount'] = new_total_sell_amount
+                        # 累计卖单成交额，同时减去已成交的份额
+                        current_sell_amount, new_total_sell_amount, current_quantity, new_quantity = self.record_sell_fill(symbol, executed_qty, cum_quote, order_id, reduce_quantity=True)
                         
                         # 同时累计到全局变量（用于兼容性）
                         self.trader.current_sell_amount += cum_quote
                         
-                        # 更新剩余份额：减去已成交的份额
-                        current_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                        new_quantity = current_quantity - executed_qty
-                        self.trader.tokens[symbol]['last_buy_quantity'] = new_quantity
-                        
-                        self.trader.log_message(f"累计卖单部分成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT")
-                        self.trader.log_message(f"更新剩余份额: {current_quantity} - {executed_qty} = {new_quantity}")
+                        self.trader.log_message(f"累计卖单部分成交额: {current_sell_amount:.2f} + {cum_quote:.2f} = {new_total_sell_amount:.2f} USDT", symbol=symbol)
+                        self.trader.log_message(f"更新剩余份额: {current_quantity} - {executed_qty} = {new_quantity}", symbol=symbol)
                 
                 if remaining_qty > 0:
                     return self.retry_order_with_remaining_qty(symbol, side, display_name, remaining_qty)
                 else:
-                    self.trader.log_message(f"{display_name} 没有剩余份额需要处理")
+                    self.trader.log_message(f"{display_name} 没有剩余份额需要处理", symbol=symbol)
                     return True
             else:
-                self.trader.log_message(f"{display_name} 无法获取已取消订单详情")
+                self.trader.log_message(f"{display_name} 无法获取已取消订单详情", symbol=symbol)
                 result = self.retry_order_with_new_price(order_id, symbol, side, display_name)
                 if side == "BUY":
                     return result
                 return result
         except Exception as e:
-            self.trader.log_message(f"{display_name} 处理已取消订单失败: {e}")
+            self.trader.log_message(f"{display_name} 处理已取消订单失败: {e}", symbol=symbol)
             result = self.retry_order_with_new_price(order_id, symbol, side, display_name)
             if side == "BUY":
                 return result
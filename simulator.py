@@ -0,0 +1,677 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+离线回放模拟器
+Offline Replay Simulator for Binance Auto Trade System
+
+用录制的聚合成交（agg-trades）数据回放4倍自动交易：TradingEngine 和 OrderHandler 的代码不变，
+只把API换成按录制成交撮合的模拟交易所、把时钟换成虚拟时钟。一天的数据几秒内即可回放完，
+输出成交延迟、改价次数、滑点损耗和每小时成交额，用于离线搜索交易参数，而不是用真金白银调参。
+
+用法示例:
+    python simulator.py record --symbols ALPHA_22USDT,ALPHA_9USDT --duration 3600 --output trades.json
+    python simulator.py replay trades.json --count 16
+    python simulator.py replay trades.json --param poll_interval=0.5:1.0 --grid max_spread=0.1,0.2,0.5
+
+--param/--grid 的参数名见 trading_engine.DEFAULT_TRADING_PARAMS，区间参数用冒号分隔（如 1.0:2.0）。
+
+录制文件格式（与agg-trades接口字段相同）:
+    {"ALPHA_9USDT": [{"a": 1, "p": "0.5", "q": "100", "T": 毫秒时间戳, "m": true}, ...], ...}
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import bisect
+import argparse
+import tempfile
+import itertools
+import threading
+
+# 导入日志模块
+from logger import Logger
+# 导入币安API模块（复用订单数量和价格的计算规则）
+from binance_api import BinanceAPI
+# 导入Alpha123稳定度数据模块
+from alpha123 import Alpha123Client
+# 导入订单处理模块
+from order_handler import OrderHandler
+# 导入交易引擎模块
+from trading_engine import TradingEngine, DEFAULT_TRADING_PARAMS
+# 导入交易核心模块
+from trader_core import TraderCore
+# 导入全局清仓模块
+from cleanup_orchestrator import CleanupOrchestrator
+# 导入候选代币校验模块
+from candidate_validator import CandidateValidator
+# 导入时钟模块
+from clock import VirtualClock
+# 导入交易统计字段
+from trade_statistics import LOSS
+
+
+# 模拟交易所默认设置
+DEFAULT_EXCHANGE_SETTINGS = {
+    'api_latency': 0.1,          # 每次API调用的耗时（秒）
+    'fee_rate': 0.0001,          # 手续费率（与下单数量计算中的手续费一致）
+    'participation': 1.0,        # 挂单能吃到的对手成交量比例
+    'initial_balance': 10000.0,  # 初始USDT资金
+    'stability_window': 60.0,    # 计算价差基点的成交窗口（秒）
+}
+
+# 订单剩余数量小于该值视为完全成交
+QUANTITY_EPSILON = 1e-9
+
+
+class TradeSeries:
+    """单个代币的成交序列（按时间排序）"""
+
+    def __init__(self, trades):
+        """
+        初始化成交序列
+
+        Args:
+            trades: agg-trades格式的成交列表
+        """
+        rows = sorted((float(t['T']) / 1000.0, float(t['p']), float(t['q'])) for t in trades)
+        self.times = [row[0] for row in rows]
+        self.prices = [row[1] for row in rows]
+        self.quantities = [row[2] for row in rows]
+
+    def last_index(self, timestamp):
+        """返回时间不晚于timestamp的最后一条成交的下标，没有返回-1"""
+        return bisect.bisect_right(self.times, timestamp) - 1
+
+
+def load_agg_trades(path):
+    """
+    读取录制的聚合成交数据
+
+    Args:
+        path: 录制文件路径
+
+    Returns:
+        dict: {交易对符号: TradeSeries}
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        raw = json.load(f)
+    return {symbol: TradeSeries(trades) for symbol, trades in raw.items() if trades}
+
+
+def record_agg_trades(api, symbols, duration, output, interval=1.0, limit=100):
+    """
+    轮询agg-trades接口录制成交数据（Ctrl+C可提前结束，已录制的数据照常保存）
+
+    Args:
+        api: BinanceAPI实例（公开接口，无需认证信息）
+        symbols: 交易对符号列表，如 ["ALPHA_22USDT"]
+        duration: 录制时长（秒）
+        output: 输出文件路径
+        interval: 轮询间隔（秒）
+        limit: 每次获取的成交条数
+
+    Returns:
+        dict: {交易对符号: 成交列表}
+    """
+    recorded = {symbol: [] for symbol in symbols}
+    last_ids = {}
+    deadline = time.time() + duration
+    try:
+        while time.time() < deadline:
+            for symbol in symbols:
+                trades = api.get_agg_trades(symbol, limit=limit) or []
+                for trade in sorted(trades, key=lambda t: t.get('a', 0)):
+                    if trade.get('a', 0) > last_ids.get(symbol, -1):
+                        recorded[symbol].append(trade)
+                        last_ids[symbol] = trade.get('a', 0)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("录制被中断，保存已录制的数据")
+    finally:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(recorded, f)
+        print(f"已录制 {sum(len(trades) for trades in recorded.values())} 条成交到 {output}")
+    return recorded
+
+
+class SimulatedExchange:
+    """
+    模拟交易所类 - 实现交易引擎用到的BinanceAPI方法，按录制的成交撮合订单
+
+    撮合规则：挂单只和下单之后的录制成交撮合，买单遇到成交价<=挂单价、卖单遇到成交价>=挂单价时，
+    按对手成交量（乘以participation）成交，成交价为挂单价。录制数据结束后，
+    按最后成交价不变处理，能与最后成交价撮合的挂单全部成交。
+    """
+
+    def __init__(self, series, clock, logger, settings=None):
+        """
+        初始化模拟交易所
+
+        Args:
+            series: {交易对符号: TradeSeries}
+            clock: 虚拟时钟
+            logger: Logger实例
+            settings: 覆盖 DEFAULT_EXCHANGE_SETTINGS 的设置
+        """
+        self.series = series
+        self.clock = clock
+        self.logger = logger
+        self.settings = dict(DEFAULT_EXCHANGE_SETTINGS)
+        self.settings.update(settings or {})
+
+        self.lock = threading.Lock()
+        self.orders = []  # 全部订单（按下单顺序）
+        self.open_orders = []  # 未结束的订单
+        self.order_ids = itertools.count(1)
+        self.rejected_orders = 0
+
+        self.cash = float(self.settings['initial_balance'])
+        self.holdings = {}  # {交易对符号: 持有数量}
+
+    def simulate_latency(self):
+        """模拟一次API调用的耗时"""
+        self.clock.sleep(self.settings['api_latency'])
+
+    def last_price(self, symbol):
+        """当前虚拟时间的最新成交价，没有成交返回None"""
+        trades = self.series.get(symbol)
+        if not trades:
+            return None
+        index = trades.last_index(self.clock.time())
+        return trades.prices[index] if index >= 0 else None
+
+    # ==================== 撮合 ====================
+
+    def match(self):
+        """用上次撮合以来的录制成交撮合所有挂单（需持有锁）"""
+        now = self.clock.time()
+        still_open = []
+        for order in self.open_orders:
+            self.match_order(order, now)
+            if order['status'] in ('NEW', 'PARTIALLY_FILLED'):
+                still_open.append(order)
+        self.open_orders = still_open
+
+    def match_order(self, order, now):
+        """撮合单个挂单"""
+        trades = self.series[order['symbol']]
+        start = bisect.bisect_right(trades.times, order['matched_until'])
+        end = bisect.bisect_right(trades.times, now)
+
+        fills = [(trades.times[i], trades.prices[i], trades.quantities[i] * self.settings['participation'])
+                 for i in range(start, end)]
+        # 录制数据结束后按最后成交价不变处理
+        if trades.times and now > trades.times[-1]:
+            fills.append((now, trades.prices[-1], float('inf')))
+        order['matched_until'] = now
+
+        for trade_time, trade_price, trade_quantity in fills:
+            if order['side'] == 'BUY' and trade_price > order['price']:
+                continue
+            if order['side'] == 'SELL' and trade_price < order['price']:
+                continue
+            self.fill(order, min(order['origQty'] - order['executedQty'], trade_quantity))
+            if order['origQty'] - order['executedQty'] <= QUANTITY_EPSILON:
+                order['status'] = 'FILLED'
+                order['filled_at'] = trade_time
+                return
+            order['status'] = 'PARTIALLY_FILLED'
+
+    def fill(self, order, quantity):
+        """记录成交并更新资金和持仓"""
+        quote = quantity * order['price']
+        order['executedQty'] += quantity
+        order['cumQuote'] += quote
+
+        fee_rate = self.settings['fee_rate']
+        symbol = order['symbol']
+        if order['side'] == 'BUY':
+            self.cash -= quote
+            self.holdings[symbol] = self.holdings.get(symbol, 0.0) + quantity * (1 - fee_rate)
+        else:
+            self.holdings[symbol] = self.holdings.get(symbol, 0.0) - quantity
+            self.cash += quote * (1 - fee_rate)
+
+    def latest_history_order(self):
+        """订单历史中最新的一条（与真实接口一致，未成交的挂单不在订单历史中）"""
+        for order in reversed(self.orders):
+            if order['status'] != 'NEW':
+                return order
+        return None
+
+    @staticmethod
+    def order_record(order):
+        """把内部订单转换为订单历史接口的格式（数值为字符串）"""
+        return {
+            'orderId': order['orderId'],
+            'symbol': order['symbol'],
+            'side': order['side'],
+            'status': order['status'],
+            'price': str(order['price']),
+            'origQty': str(order['origQty']),
+            'executedQty': str(order['executedQty']),
+            'cumQuote': str(order['cumQuote']),
+        }
+
+    def reject(self, side, reason):
+        """记录下单失败"""
+        self.rejected_orders += 1
+        self.logger.log_message(f"{side}单下单失败: {reason}")
+        return None
+
+    # ==================== BinanceAPI接口 ====================
+
+    def get_token_price(self, symbol):
+        """获取当前虚拟时间的最新成交价"""
+        self.simulate_latency()
+        trades = self.series.get(symbol)
+        index = trades.last_index(self.clock.time()) if trades else -1
+        if index < 0:
+            return None
+        return {
+            'price': str(trades.prices[index]),
+            'quantity': str(trades.quantities[index]),
+            'timestamp': int(trades.times[index] * 1000),
+            'trade_id': index,
+            'is_buyer_maker': False
+        }
+
+    def get_agg_trades(self, symbol, limit=1):
+        """获取当前虚拟时间之前最近的录制成交（agg-trades格式，最新的在前）"""
+        self.simulate_latency()
+        trades = self.series.get(symbol)
+        if not trades:
+            return []
+        end = trades.last_index(self.clock.time()) + 1
+        return [
+            {'a': i, 'p': str(trades.prices[i]), 'q': str(trades.quantities[i]),
+             'T': int(trades.times[i] * 1000), 'm': False}
+            for i in range(end - 1, max(0, end - limit) - 1, -1)
+        ]
+
+    def get_token_24h_stats(self, symbol):
+        """与真实接口一致，不支持24小时统计"""
+        return None
+
+    def place_single_order(self, symbol, price, side, custom_quantity=None, last_buy_quantity=0):
+        """下单，返回订单ID，失败返回None"""
+        self.simulate_latency()
+        price = BinanceAPI.format_price(float(price))
+        quantity = BinanceAPI.calculate_order_quantity(symbol, price, side, custom_quantity, last_buy_quantity)
+        quantity = BinanceAPI.format_quantity(symbol, quantity)
+
+        with self.lock:
+            self.match()
+            if symbol not in self.series or quantity <= 0 or price <= 0:
+                return self.reject(side, f"无效的订单 {symbol} 价格 {price} 数量 {quantity}")
+
+            reserved = [order['origQty'] - order['executedQty'] for order in self.open_orders
+                        if order['symbol'] == symbol and order['side'] == side]
+            if side == 'SELL' and quantity > self.holdings.get(symbol, 0.0) - sum(reserved) + QUANTITY_EPSILON:
+                return self.reject(side, f"可用余额不足，持有 {self.holdings.get(symbol, 0.0)}，卖出 {quantity}")
+            if side == 'BUY' and quantity * price > self.cash:
+                return self.reject(side, f"可用资金不足，资金 {self.cash:.2f} USDT")
+
+            order = {
+                'orderId': str(next(self.order_ids)),
+                'symbol': symbol,
+                'side': side,
+                'price': price,
+                'origQty': quantity,
+                'executedQty': 0.0,
+                'cumQuote': 0.0,
+                'status': 'NEW',
+                'placed_at': self.clock.time(),
+                'matched_until': self.clock.time(),
+                'filled_at': None,
+            }
+            self.orders.append(order)
+            self.open_orders.append(order)
+            return order['orderId']
+
+    def check_single_order_filled(self, order_id):
+        """检查订单状态，订单不是订单历史中最新的一条时返回None（与真实接口一致）"""
+        self.simulate_latency()
+        with self.lock:
+            self.match()
+            order = self.latest_history_order()
+            if order and order['orderId'] == str(order_id):
+                return order['status']
+            return None
+
+    def get_order_details(self, order_id=None):
+        """获取订单历史中最新一条订单的详情"""
+        self.simulate_latency()
+        with self.lock:
+            self.match()
+            order = self.latest_history_order()
+            return self.order_record(order) if order else None
+
+    def get_order_history(self, rows=20):
+        """获取订单历史中最新的rows条订单（最新的在前）"""
+        self.simulate_latency()
+        with self.lock:
+            self.match()
+            history = [order for order in reversed(self.orders) if order['status'] != 'NEW'][:rows]
+            return [self.order_record(order) for order in history]
+
+    def cancel_all_orders(self):
+        """取消所有挂单"""
+        self.simulate_latency()
+        with self.lock:
+            self.match()
+            for order in self.open_orders:
+                order['status'] = 'CANCELED'
+            self.open_orders = []
+        return True
+
+    def get_token_balance(self, symbol):
+        """获取代币持有数量（symbol为不带USDT的代币符号，如 "ALPHA_9"）"""
+        self.simulate_latency()
+        with self.lock:
+            self.match()
+            return self.holdings.get(f"{symbol}USDT", 0.0)
+
+    def get_funding_balance(self):
+        """获取USDT资金"""
+        self.simulate_latency()
+        with self.lock:
+            self.match()
+            return self.cash
+
+
+class SimulatedStabilityClient(Alpha123Client):
+    """模拟稳定度数据客户端 - 用录制成交在窗口内的价格波动计算价差基点"""
+
+    def __init__(self, exchange, logger=None, alpha_id_map=None):
+        """
+        初始化模拟稳定度数据客户端
+
+        Args:
+            exchange: SimulatedExchange实例
+            logger: Logger实例
+            alpha_id_map: ALPHA代币ID映射字典
+        """
+        super().__init__(logger=logger, alpha_id_map=alpha_id_map)
+        self.exchange = exchange
+
+    def fetch_stability_data(self):
+        """
+        生成当前虚拟时间的稳定度数据（按价差基点升序）
+
+        Returns:
+            list: 与 Alpha123Client.parse_stability_feed 相同格式的记录列表
+        """
+        now = self.exchange.clock.time()
+        window = self.exchange.settings['stability_window']
+        stability_data = []
+        for symbol, trades in self.exchange.series.items():
+            start = bisect.bisect_left(trades.times, now - window)
+            end = bisect.bisect_right(trades.times, now)
+            if end - start < 2:
+                continue
+
+            prices = trades.prices[start:end]
+            last_price = prices[-1]
+            spread = (max(prices) - min(prices)) / last_price * 10000 if last_price > 0 else float('inf')
+            stability_data.append({
+                'project': symbol[:-len('USDT')],
+                'stability': '稳定',
+                'stability_status': 'green:stable',
+                'price': last_price,
+                'remaining_days': 1.0,
+                'spread': round(spread, 4)
+            })
+
+        stability_data.sort(key=lambda item: item['spread'])
+        return stability_data
+
+
+class SimulationTrader(TraderCore):
+    """回放交易核心类 - 使用模拟交易所和虚拟时钟，其余逻辑与实盘完全相同"""
+
+    def __init__(self, series, work_dir, params=None, exchange_settings=None, verbose=False):
+        """
+        初始化回放交易核心
+
+        Args:
+            series: {交易对符号: TradeSeries}
+            work_dir: 配置和日志的临时目录
+            params: 覆盖 DEFAULT_TRADING_PARAMS 的交易参数
+            exchange_settings: 覆盖 DEFAULT_EXCHANGE_SETTINGS 的模拟交易所设置
+            verbose: 是否在控制台输出交易日志
+        """
+        settings = dict(DEFAULT_EXCHANGE_SETTINGS)
+        settings.update(exchange_settings or {})
+
+        # 从最早成交之后一个稳定度窗口开始回放，到最后一条成交结束
+        self.start_time = min(trades.times[0] for trades in series.values()) + settings['stability_window']
+        self.end_time = max(trades.times[-1] for trades in series.values())
+        self.finished_at = self.start_time
+
+        super().__init__(
+            config_file=os.path.join(work_dir, "config.json"),
+            log_dir=os.path.join(work_dir, "log"),
+            clock=VirtualClock(self.start_time)
+        )
+        if not verbose:
+            self.logger.set_listener(lambda log_msg: None)
+        self.trading_params.update(params or {})
+
+        # 模拟交易所替换真实API（模拟交易所不校验认证信息）
+        self.csrf_token = self.cookie = "simulation"
+        self.api = SimulatedExchange(series, self.clock, self.logger, settings)
+        self.config_manager.daily_initial_balance = self.api.cash
+
+        # 交易组件（不加载alphaIdMap.json，代币名称直接使用ALPHA ID）
+        self.alpha_id_map = {symbol[:-len('USDT')]: symbol[:-len('USDT')] for symbol in series}
+        self.alpha123_client = SimulatedStabilityClient(self.api, logger=self.logger, alpha_id_map=self.alpha_id_map)
+        self.order_handler = OrderHandler(self)
+        self.trading_engine = TradingEngine(self)
+        self.cleanup_orchestrator = CleanupOrchestrator(self)
+        self.candidate_validator = CandidateValidator(self)
+
+        # 回放不保存配置（统计计数会频繁写配置文件）
+        self.config_manager.save_config = lambda: None
+
+        # 回放跨过午夜时今日统计会归零，累计前几天的损耗用于回放结果
+        self.previous_days_loss = 0.0
+        self.statistics.add_rollover_listener(self.on_replay_rollover)
+
+    def on_replay_rollover(self, previous_date, previous):
+        """回放跨天时累计前一天的损耗"""
+        self.previous_days_loss += previous[LOSS]
+
+
+def run_simulation(series, params=None, exchange_settings=None, count=None, seed=0, verbose=False):
+    """
+    回放一次4倍自动交易
+
+    Args:
+        series: {交易对符号: TradeSeries}
+        params: 交易参数
+        exchange_settings: 模拟交易所设置
+        count: 计划交易次数（默认一直交易到录制数据结束）
+        seed: 随机数种子（等待时间的随机部分）
+        verbose: 是否在控制台输出交易日志
+
+    Returns:
+        dict: 回放结果，字段见 build_report
+    """
+    random.seed(seed)
+    with tempfile.TemporaryDirectory() as work_dir:
+        trader = SimulationTrader(series, work_dir, params, exchange_settings, verbose)
+        clock = trader.clock
+        started = time.time()
+
+        def drive():
+            trader.trading_4x_active = True
+            trader.trading_engine.run_4x_trading(count or sys.maxsize)
+            trader.finished_at = clock.time()
+
+        def stop_at_end():
+            # 录制数据结束后不再开始新一轮交易
+            while trader.trading_4x_active and clock.time() < trader.end_time:
+                clock.sleep(min(60.0, trader.end_time - clock.time()))
+            trader.trading_4x_active = False
+
+        with clock.paused():
+            threads = [clock.start_thread(drive), clock.start_thread(stop_at_end)]
+        for thread in threads:
+            thread.join()
+
+        report = build_report(trader, time.time() - started)
+        # 临时目录删除前写完日志
+        trader.logger.close()
+        return report
+
+
+def build_report(trader, wall_seconds):
+    """
+    统计回放结果
+
+    Args:
+        trader: 回放完成的 SimulationTrader
+        wall_seconds: 回放实际耗时（秒）
+
+    Returns:
+        dict: 回放结果
+            - simulated_hours: 回放的交易时长（小时）
+            - round_trips: 完成的买卖次数（完全成交的卖单数）
+            - orders / filled_orders / rejected_orders: 订单数、完全成交的订单数、下单失败次数
+            - reprice_count: 未完全成交即被取消的订单数（每次取消后都会改价重下或放弃）
+            - fill_latency_avg / p50 / p90 / max: 从下单到完全成交的时间（秒）
+            - volume / volume_per_hour: 买卖成交额合计及每小时成交额（USDT）
+            - slippage_loss: 初始资金 - 当前资金 - 剩余持仓市值（含手续费）
+            - ledger_loss: 交易核心按成交账本（及对账）统计的损耗（跨天时累计各天），应与 slippage_loss 接近
+    """
+    exchange = trader.api
+    orders = exchange.orders
+    simulated_hours = max(trader.finished_at - trader.start_time, 1e-9) / 3600
+
+    latencies = sorted(order['filled_at'] - order['placed_at'] for order in orders if order['status'] == 'FILLED')
+    buy_quote = sum(order['cumQuote'] for order in orders if order['side'] == 'BUY')
+    sell_quote = sum(order['cumQuote'] for order in orders if order['side'] == 'SELL')
+    holdings_value = sum(quantity * (exchange.last_price(symbol) or 0.0) for symbol, quantity in exchange.holdings.items())
+
+    def percentile(ratio):
+        return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))] if latencies else 0.0
+
+    return {
+        'simulated_hours': simulated_hours,
+        'wall_seconds': wall_seconds,
+        'round_trips': sum(1 for order in orders if order['side'] == 'SELL' and order['status'] == 'FILLED'),
+        'orders': len(orders),
+        'filled_orders': len(latencies),
+        'rejected_orders': exchange.rejected_orders,
+        'reprice_count': sum(1 for order in orders if order['status'] == 'CANCELED'),
+        'fill_latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+        'fill_latency_p50': percentile(0.5),
+        'fill_latency_p90': percentile(0.9),
+        'fill_latency_max': latencies[-1] if latencies else 0.0,
+        'volume': buy_quote + sell_quote,
+        'volume_per_hour': (buy_quote + sell_quote) / simulated_hours,
+        'slippage_loss': exchange.settings['initial_balance'] - exchange.cash - holdings_value,
+        'ledger_loss': trader.previous_days_loss + trader.daily_trade_loss,
+    }
+
+
+def format_report(report):
+    """把回放结果格式化为多行文本"""
+    return "\n".join([
+        f"回放时长: {report['simulated_hours']:.2f} 小时（实际用时 {report['wall_seconds']:.1f} 秒）",
+        f"完成买卖: {report['round_trips']} 次，订单 {report['orders']} 个，完全成交 {report['filled_orders']} 个，"
+        f"改价 {report['reprice_count']} 次，下单失败 {report['rejected_orders']} 次",
+        f"成交延迟: 平均 {report['fill_latency_avg']:.1f} 秒，中位数 {report['fill_latency_p50']:.1f} 秒，"
+        f"P90 {report['fill_latency_p90']:.1f} 秒，最长 {report['fill_latency_max']:.1f} 秒",
+        f"成交额: {report['volume']:.2f} USDT，每小时 {report['volume_per_hour']:.2f} USDT",
+        f"滑点损耗: {report['slippage_loss']:.4f} USDT（成交账本统计 {report['ledger_loss']:.4f} USDT）",
+    ])
+
+
+def parse_param(text):
+    """
+    解析 key=value 形式的交易参数
+
+    Args:
+        text: 如 "max_spread=0.3" 或 "poll_interval=0.5:1.0"
+
+    Returns:
+        tuple: (参数名, 值)，参数名无效时抛出 argparse.ArgumentTypeError
+    """
+    key, _, value = text.partition('=')
+    key = key.strip()
+    if key not in DEFAULT_TRADING_PARAMS:
+        raise argparse.ArgumentTypeError(f"未知的交易参数: {key}，可选: {', '.join(DEFAULT_TRADING_PARAMS)}")
+
+    default = DEFAULT_TRADING_PARAMS[key]
+    try:
+        if isinstance(default, tuple):
+            return key, tuple(float(part) for part in value.split(':'))
+        if isinstance(default, int):
+            return key, int(value)
+        return key, float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"交易参数 {key} 的值无效: {value}")
+
+
+def parse_grid(text):
+    """
+    解析 key=v1,v2,... 形式的参数搜索范围
+
+    Returns:
+        tuple: (参数名, 值列表)
+    """
+    key, _, values = text.partition('=')
+    return key.strip(), [parse_param(f"{key}={value}")[1] for value in values.split(',')]
+
+
+def main(argv=None):
+    """主函数"""
+    parser = argparse.ArgumentParser(description="币安量化交易系统 - 离线回放模拟器")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help="录制聚合成交数据")
+    record_parser.add_argument('--symbols', required=True, help="交易对符号，逗号分隔，如 ALPHA_22USDT,ALPHA_9USDT")
+    record_parser.add_argument('--duration', type=float, default=3600, help="录制时长（秒）")
+    record_parser.add_argument('--interval', type=float, default=1.0, help="轮询间隔（秒）")
+    record_parser.add_argument('--output', required=True, help="输出文件")
+
+    replay_parser = subparsers.add_parser('replay', help="回放4倍自动交易")
+    replay_parser.add_argument('trades_file', help="录制的成交数据文件")
+    replay_parser.add_argument('--count', type=int, help="计划交易次数（默认交易到数据结束）")
+    replay_parser.add_argument('--param', type=parse_param, action='append', default=[], help="交易参数，如 max_spread=0.3")
+    replay_parser.add_argument('--grid', type=parse_grid, action='append', default=[], help="参数搜索范围，如 max_spread=0.1,0.2")
+    replay_parser.add_argument('--latency', type=float, help="模拟API耗时（秒）")
+    replay_parser.add_argument('--seed', type=int, default=0, help="随机数种子")
+    replay_parser.add_argument('--verbose', action='store_true', help="输出交易日志")
+    args = parser.parse_args(argv)
+
+    if args.command == 'record':
+        symbols = [symbol.strip().upper() for symbol in args.symbols.split(',') if symbol.strip()]
+        record_agg_trades(BinanceAPI(logger=Logger()), symbols, args.duration, args.output, args.interval)
+        return 0
+
+    series = load_agg_trades(args.trades_file)
+    if not series:
+        print(f"{args.trades_file} 中没有成交数据")
+        return 1
+
+    exchange_settings = {'api_latency': args.latency} if args.latency is not None else None
+    base_params = dict(args.param)
+    grid_keys = [key for key, _ in args.grid]
+    for values in itertools.product(*[values for _, values in args.grid]):
+        params = dict(base_params)
+        params.update(zip(grid_keys, values))
+        report = run_simulation(series, params, exchange_settings, args.count, args.seed, args.verbose)
+        if grid_keys:
+            print(f"参数: {', '.join(f'{key}={params[key]}' for key in grid_keys)}")
+        print(format_report(report))
+        print()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
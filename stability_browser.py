@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+稳定度页面浏览器模块
+Stability Page Browser Module for Binance Auto Trade System
+
+稳定度数据接口不可用时，用无头Chrome读取稳定度看板页面作为备用。
+浏览器在第一次使用时启动并一直停留在稳定度页面，之后每次只重新读取页面中的表格；
+使用次数达到上限或页面内存增长过多时重启浏览器，解析结果在有效期内直接复用。
+Selenium 和 BeautifulSoup 只在这里按需导入。
+"""
+
+import atexit
+import threading
+
+# 导入时钟模块
+from clock import get_clock
+
+
+# 稳定度看板页面
+STABILITY_PAGE_URL = "https://alpha123.uk/zh/stability.html"
+
+# 默认设置
+DEFAULT_MAX_USES = 100          # 浏览器读取多少次后重启
+DEFAULT_MAX_HEAP_MB = 300       # 页面JS堆内存超过多少MB后重启
+DEFAULT_CACHE_TTL = 30.0        # 解析结果的有效期（秒）
+DEFAULT_RESTART_BACKOFF = 60.0  # 浏览器启动失败后多久内不再尝试（秒）
+PAGE_LOAD_TIMEOUT = 10          # 等待表格数据加载的最长时间（秒）
+
+
+def parse_stability_table(page_source):
+    """
+    解析稳定度看板页面中的表格
+
+    Args:
+        page_source: 页面HTML
+
+    Returns:
+        list: 稳定度记录（与 Alpha123Client.parse_stability_feed 的字段相同，页面上没有价差基点）
+    """
+    from bs4 import BeautifulSoup
+
+    # 导入放在函数内，避免与 alpha123 循环导入
+    from alpha123 import to_number, STABILITY_SPREAD_UNKNOWN
+
+    stability_data = []
+    table = BeautifulSoup(page_source, 'html.parser').find('table')
+    if not table:
+        return stability_data
+
+    for row in table.find_all('tr')[1:]:  # 跳过表头
+        cells = row.find_all('td')
+        if len(cells) < 4:
+            continue
+
+        project = cells[0].get_text(strip=True)
+        # 跳过"加载中..."行
+        if project == "加载中..." or not project:
+            continue
+
+        # 确定稳定度状态（先判断"不稳定"，它也包含"稳定"两个字）
+        stability_text = cells[1].get_text(strip=True)
+        stability = "未知"
+        if "不稳定" in stability_text:
+            stability = "不稳定"
+        elif "一般" in stability_text:
+            stability = "一般"
+        elif "稳定" in stability_text:
+            stability = "稳定"
+
+        stability_data.append({
+            'project': project,
+            'stability': stability,
+            'stability_status': '',  # 页面上没有原始st值
+            'price': to_number(cells[2].get_text(strip=True)),
+            'remaining_days': to_number(cells[3].get_text(strip=True)),
+            'spread': STABILITY_SPREAD_UNKNOWN
+        })
+    return stability_data
+
+
+class StabilityPageBrowser:
+    """稳定度页面浏览器类 - 常驻的无头Chrome，重复读取稳定度页面表格"""
+
+    def __init__(self, logger, clock=None, max_uses=DEFAULT_MAX_USES, max_heap_mb=DEFAULT_MAX_HEAP_MB,
+                 cache_ttl=DEFAULT_CACHE_TTL, restart_backoff=DEFAULT_RESTART_BACKOFF):
+        """
+        初始化稳定度页面浏览器（浏览器在第一次读取时才启动）
+
+        Args:
+            logger: Logger实例
+            clock: 时钟对象（默认全局时钟）
+            max_uses: 浏览器读取多少次后重启
+            max_heap_mb: 页面JS堆内存上限（MB），超过后重启
+            cache_ttl: 解析结果的有效期（秒）
+            restart_backoff: 浏览器启动失败后多久内不再尝试（秒）
+        """
+        self.logger = logger
+        self.clock = clock or get_clock()
+        self.max_uses = max_uses
+        self.max_heap_mb = max_heap_mb
+        self.cache_ttl = cache_ttl
+        self.restart_backoff = restart_backoff
+        self.lock = threading.Lock()
+        self.driver = None
+        self.uses = 0
+        self.cached = None  # (解析时间, 稳定度记录)
+        self.failed_at = None
+        atexit.register(self.close)
+
+    def read_stability_table(self):
+        """
+        读取稳定度页面表格（有效期内直接返回缓存）
+
+        Returns:
+            list: 稳定度记录，失败返回空列表
+        """
+        with self.lock:
+            now = self.clock.time()
+            if self.cached and now - self.cached[0] < self.cache_ttl:
+                return list(self.cached[1])
+            if self.failed_at is not None and now - self.failed_at < self.restart_backoff:
+                return []
+
+            try:
+                self.ensure_driver()
+                self.uses += 1
+                stability_data = parse_stability_table(self.driver.page_source)
+                if not stability_data:
+                    # 表格为空时重新加载一次页面
+                    self.load_page()
+                    stability_data = parse_stability_table(self.driver.page_source)
+            except Exception as e:
+                self.logger.log_message(f"Selenium读取稳定度页面失败: {str(e)}")
+                self.quit_driver()
+                self.failed_at = now
+                return []
+
+            self.failed_at = None
+            self.cached = (now, stability_data)
+            self.logger.log_message(f"通过Selenium获取了 {len(stability_data)} 个稳定度项目（浏览器第 {self.uses} 次读取）")
+            return list(stability_data)
+
+    def ensure_driver(self):
+        """确保浏览器已启动且无需重启（需持有锁）"""
+        if self.driver is not None:
+            reason = None
+            if self.uses >= self.max_uses:
+                reason = f"已读取 {self.uses} 次"
+            else:
+                heap_mb = self.get_heap_mb()
+                if heap_mb is not None and heap_mb > self.max_heap_mb:
+                    reason = f"页面内存 {heap_mb:.0f}MB"
+            if reason is None:
+                return
+            self.logger.log_message(f"重启稳定度页面浏览器（{reason}）")
+            self.quit_driver()
+
+        self.driver = self.start_driver()
+        self.uses = 0
+        self.load_page()
+
+    def start_driver(self):
+        """
+        启动无头Chrome
+
+        Returns:
+            WebDriver: 浏览器驱动
+        """
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+
+        chrome_options = Options()
+        chrome_options.add_argument('--headless')  # 无头模式
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-gpu')
+        chrome_options.add_argument('--window-size=1920,1080')
+        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36')
+        return webdriver.Chrome(options=chrome_options)
+
+    def load_page(self):
+        """打开（或重新加载）稳定度页面并等待表格数据加载完成"""
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+
+        self.driver.get(STABILITY_PAGE_URL)
+        try:
+            wait = WebDriverWait(self.driver, PAGE_LOAD_TIMEOUT)
+            wait.until(EC.presence_of_element_located((By.TAG_NAME, "table")))
+            # 等待数据加载（不是"加载中..."）
+            wait.until(lambda driver: "加载中" not in driver.page_source)
+        except Exception:
+            self.logger.log_message("等待数据加载超时")
+
+    def get_heap_mb(self):
+        """
+        获取页面JS堆内存
+
+        Returns:
+            float: 已使用的JS堆内存（MB），无法获取时返回None
+        """
+        try:
+            used = self.driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : null")
+        except Exception:
+            return None
+        return used / (1024 * 1024) if used else None
+
+    def quit_driver(self):
+        """关闭浏览器（需持有锁或在退出时调用）"""
+        driver, self.driver = self.driver, None
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    def close(self):
+        """程序退出时关闭浏览器"""
+        self.quit_driver()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+稳定度数据后台刷新模块
+Stability Feed Refresher Module for Binance Auto Trade System
+
+一个后台线程按固定间隔请求稳定度数据接口，把解析后的数据保存为带获取时间的只读快照。
+4倍交易选币、常驻代币和稳定度看板都读取同一个快照，读取时不发请求。
+请求带上次返回的 ETag/Last-Modified，数据未变化时不重新解析；数据变化时通知回调（如稳定度历史存储）。
+接口不可用且没有接口数据时，改为读取稳定度页面（StabilityPageBrowser）。
+"""
+
+import threading
+from collections import namedtuple
+from types import MappingProxyType
+
+# 导入时钟模块
+from clock import get_clock
+
+
+# 默认刷新间隔（秒）
+DEFAULT_REFRESH_INTERVAL = 5.0
+
+# 稳定度数据快照
+#   items: 只读的稳定度数据元组（元素格式与 Alpha123Client.fetch_stability_data 相同）
+#   fetched_at: 最近一次成功请求的时间戳（数据未变化也会更新）
+#   changed_at: 数据最近一次变化的时间戳
+#   version: 数据版本号，每次数据变化加1
+StabilitySnapshot = namedtuple('StabilitySnapshot', ['items', 'fetched_at', 'changed_at', 'version'])
+
+
+class StabilityFeed:
+    """稳定度数据刷新类 - 后台刷新稳定度数据，提供无需请求的只读快照"""
+
+    def __init__(self, client, clock=None, interval=DEFAULT_REFRESH_INTERVAL):
+        """
+        初始化稳定度数据刷新器
+
+        Args:
+            client: Alpha123Client实例，负责请求和解析
+            clock: 时钟对象（默认全局时钟）
+            interval: 刷新间隔（秒）
+        """
+        self.client = client
+        self.clock = clock or get_clock()
+        self.interval = interval
+        self.snapshot = None
+        self.validators = {}  # 上次请求返回的校验信息，用于条件请求
+        self.from_page = False  # 当前快照是否来自备用的稳定度页面
+        self.refresh_lock = threading.Lock()
+        self.listeners = []  # 数据变化时调用的回调函数
+        self.thread = None
+        self.running = False
+
+    def add_listener(self, callback):
+        """
+        注册数据变化回调（在刷新线程中调用，参数为新的快照）
+
+        Args:
+            callback: 回调函数
+        """
+        self.listeners.append(callback)
+
+    def start(self):
+        """启动后台刷新线程（已启动时不重复启动）"""
+        with self.refresh_lock:
+            if self.running:
+                return
+            self.running = True
+        self.thread = self.clock.start_thread(self.refresh_loop)
+
+    def stop(self):
+        """停止后台刷新（当前这次等待结束后退出）"""
+        self.running = False
+
+    def refresh_loop(self):
+        """后台刷新循环"""
+        while self.running:
+            self.refresh()
+            self.clock.sleep(self.interval)
+
+    def refresh(self):
+        """
+        请求一次稳定度数据并更新快照，数据有变化时通知回调
+
+        Returns:
+            bool: 数据有变化返回True
+        """
+        with self.refresh_lock:
+            snapshot = self.update_snapshot()
+        if snapshot is None:
+            return False
+
+        for callback in list(self.listeners):
+            try:
+                callback(snapshot)
+            except Exception as e:
+                self.client.logger.log_message(f"稳定度数据回调失败: {str(e)}")
+        return True
+
+    def update_snapshot(self):
+        """
+        请求稳定度数据并更新快照（需持有刷新锁）
+
+        Returns:
+            StabilitySnapshot: 数据有变化时返回新快照，否则返回None
+        """
+        try:
+            items, self.validators = self.client.fetch_stability_feed(self.validators)
+        except Exception as e:
+            self.client.logger.log_message(f"刷新稳定度数据失败: {str(e)}")
+            if self.snapshot is not None and not self.from_page:
+                return None  # 保留接口数据的旧快照，下次刷新再试
+            # 没有接口数据时读取稳定度页面（备用浏览器常驻，结果有缓存，不会每次重新启动）
+            items = self.client.fetch_stability_data_selenium()
+            if not items:
+                return None
+            self.from_page = True
+            self.validators = {}  # 接口恢复后需要完整获取一次
+        else:
+            self.from_page = False
+
+        now = self.clock.time()
+        previous = self.snapshot
+        # 接口返回未修改，或内容与上次相同（稳定度页面没有条件请求，每次都返回完整数据）
+        if previous is not None and (items is None or [dict(item) for item in previous.items] == list(items)):
+            # 数据未变化，只更新获取时间
+            self.snapshot = previous._replace(fetched_at=now)
+            return None
+
+        frozen = tuple(MappingProxyType(dict(item)) for item in (items or ()))
+        version = previous.version + 1 if previous else 1
+        self.snapshot = StabilitySnapshot(frozen, now, now, version)
+        return self.snapshot
+
+    def get_snapshot(self):
+        """
+        获取最新快照；首次读取时同步请求一次并启动后台刷新
+
+        Returns:
+            StabilitySnapshot: 最新快照，从未获取成功时返回None
+        """
+        snapshot = self.snapshot
+        if snapshot is None and not self.running:
+            self.refresh()
+            self.start()
+            snapshot = self.snapshot
+        return snapshot
+
+    def get_items(self):
+        """
+        获取最新的稳定度数据
+
+        Returns:
+            tuple: 只读的稳定度数据，从未获取成功时返回空元组
+        """
+        snapshot = self.get_snapshot()
+        return snapshot.items if snapshot else ()
@@ -0,0 +1,306 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+稳定度历史数据模块
+Stability History Store Module for Binance Auto Trade System
+
+每次稳定度数据变化时，把所有代币的 (时间, 代币ID, 稳定度代码, 价差基点, 4倍天数, 价格)
+追加到按天分割的定长二进制文件中。记录按时间顺序写入，区间查询用二分查找定位，
+不需要重新下载数据就能统计某个代币一段时间内稳定的时间占比和价差中位数。
+
+用法:
+    python stability_history.py summary ALPHA_22 --hours 24
+    python stability_history.py dump --hours 1 --token ALPHA_22
+"""
+
+import os
+import sys
+import math
+import struct
+import argparse
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta
+
+# 导入时钟模块
+from clock import get_clock
+
+# 导入稳定度数据常量
+from alpha123 import STABILITY_SPREAD_UNKNOWN
+
+
+# 默认存储目录（位于日志目录下）
+DEFAULT_HISTORY_DIR = os.path.join("log", "stability_history")
+
+# 定长记录格式（小端、无填充）: 时间(float64) 代币ID(uint32) 稳定度代码(uint8) 价差基点(float32) 4倍天数(float32) 价格(float64)
+RECORD_STRUCT = struct.Struct('<dIBffd')
+RECORD_SIZE = RECORD_STRUCT.size
+TIME_STRUCT = struct.Struct('<d')
+
+# 稳定度代码
+ST_UNKNOWN = 0
+ST_STABLE = 1
+ST_MODERATE = 2
+ST_UNSTABLE = 3
+STABILITY_CODES = {"稳定": ST_STABLE, "一般": ST_MODERATE, "不稳定": ST_UNSTABLE}
+
+# 历史记录
+StabilityRecord = namedtuple('StabilityRecord', ['time', 'token_id', 'st_code', 'spread', 'remaining_days', 'price'])
+
+
+def alpha_token_id(alpha_id):
+    """
+    把ALPHA代币ID转换为数字ID
+
+    Args:
+        alpha_id: ALPHA代币ID（如 "ALPHA_22"）
+
+    Returns:
+        int: 数字ID，无法转换时返回None
+    """
+    if not alpha_id:
+        return None
+    try:
+        return int(str(alpha_id).rsplit('_', 1)[-1])
+    except ValueError:
+        return None
+
+
+class StabilityHistory:
+    """稳定度历史存储类 - 按天分割的定长二进制时间序列"""
+
+    def __init__(self, directory=DEFAULT_HISTORY_DIR, clock=None):
+        """
+        初始化稳定度历史存储
+
+        Args:
+            directory: 存储目录（每天一个 YYYYMMDD.bin 文件）
+            clock: 时钟对象（默认全局时钟）
+        """
+        self.directory = directory
+        self.clock = clock or get_clock()
+        self.lock = threading.Lock()
+
+    def day_path(self, day):
+        """
+        获取某天的数据文件路径
+
+        Args:
+            day: date对象
+
+        Returns:
+            str: 文件路径
+        """
+        return os.path.join(self.directory, day.strftime('%Y%m%d') + '.bin')
+
+    def append_snapshot(self, items, alpha_id_map, timestamp=None):
+        """
+        追加一份稳定度数据
+
+        Args:
+            items: 稳定度记录（Alpha123Client.parse_stability_feed 的输出）
+            alpha_id_map: 项目名到ALPHA代币ID的映射，没有ID的项目不记录
+            timestamp: 数据时间（默认当前时间）
+
+        Returns:
+            int: 写入的记录数
+        """
+        if timestamp is None:
+            timestamp = self.clock.time()
+
+        chunks = []
+        for item in items:
+            token_id = alpha_token_id(alpha_id_map.get(item['project']))
+            if token_id is None:
+                continue
+            spread = item['spread']
+            if spread >= STABILITY_SPREAD_UNKNOWN:
+                spread = math.nan  # 价差未知
+            chunks.append(RECORD_STRUCT.pack(
+                timestamp, token_id, STABILITY_CODES.get(item['stability'], ST_UNKNOWN),
+                spread, item['remaining_days'], item['price']
+            ))
+        if not chunks:
+            return 0
+
+        path = self.day_path(datetime.fromtimestamp(timestamp).date())
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(path, 'ab') as f:
+                # 上次写入中断留下的半条记录直接截掉，保证记录对齐
+                size = f.tell()
+                if size % RECORD_SIZE:
+                    f.truncate(size - size % RECORD_SIZE)
+                f.write(b''.join(chunks))
+        return len(chunks)
+
+    def read_day(self, day, start, end):
+        """
+        读取某天文件中时间在 [start, end) 内的记录
+
+        Args:
+            day: date对象
+            start: 开始时间戳
+            end: 结束时间戳
+
+        Returns:
+            list: StabilityRecord列表
+        """
+        path = self.day_path(day)
+        if not os.path.exists(path):
+            return []
+
+        with open(path, 'rb') as f:
+            count = os.path.getsize(path) // RECORD_SIZE
+
+            def time_at(index):
+                f.seek(index * RECORD_SIZE)
+                return TIME_STRUCT.unpack(f.read(TIME_STRUCT.size))[0]
+
+            # 二分查找第一个 time >= start 的记录
+            low, high = 0, count
+            while low < high:
+                middle = (low + high) // 2
+                if time_at(middle) < start:
+                    low = middle + 1
+                else:
+                    high = middle
+
+            f.seek(low * RECORD_SIZE)
+            data = f.read((count - low) * RECORD_SIZE)
+
+        records = []
+        for values in RECORD_STRUCT.iter_unpack(data):
+            if values[0] >= end:
+                break
+            records.append(StabilityRecord(*values))
+        return records
+
+    def query(self, start, end, token_id=None):
+        """
+        区间查询
+
+        Args:
+            start: 开始时间戳
+            end: 结束时间戳（不含）
+            token_id: 只返回该代币的记录（数字ID或ALPHA代币ID，默认全部）
+
+        Returns:
+            list: 按时间排序的StabilityRecord列表
+        """
+        if isinstance(token_id, str):
+            token_id = alpha_token_id(token_id)
+        if end <= start:
+            return []
+
+        records = []
+        day = datetime.fromtimestamp(start).date()
+        last_day = datetime.fromtimestamp(end).date()
+        while day <= last_day:
+            records.extend(self.read_day(day, start, end))
+            day += timedelta(days=1)
+
+        if token_id is not None:
+            records = [record for record in records if record.token_id == token_id]
+        return records
+
+    def summarize(self, token_id, window, now=None):
+        """
+        统计某个代币最近一段时间的稳定度
+
+        每条记录的值一直持续到该代币的下一条记录（最后一条持续到当前时间），按持续时间加权。
+
+        Args:
+            token_id: 数字ID或ALPHA代币ID
+            window: 统计窗口（秒）
+            now: 窗口结束时间（默认当前时间）
+
+        Returns:
+            dict: {samples, stable_fraction, median_spread, last}，窗口内没有记录时返回None
+        """
+        if now is None:
+            now = self.clock.time()
+        records = self.query(now - window, now, token_id)
+        if not records:
+            return None
+
+        stable_time = 0.0
+        total_time = 0.0
+        spreads = []
+        for record, following in zip(records, records[1:] + [None]):
+            duration = (following.time if following else now) - record.time
+            total_time += duration
+            if record.st_code == ST_STABLE:
+                stable_time += duration
+            if not math.isnan(record.spread):
+                spreads.append((record.spread, duration))
+
+        return {
+            'samples': len(records),
+            'stable_fraction': stable_time / total_time if total_time > 0 else (1.0 if records[-1].st_code == ST_STABLE else 0.0),
+            'median_spread': weighted_median(spreads),
+            'last': records[-1]
+        }
+
+
+def weighted_median(values):
+    """
+    按持续时间加权的中位数
+
+    Args:
+        values: [(值, 权重), ...]
+
+    Returns:
+        float: 中位数，没有数据时返回None
+    """
+    if not values:
+        return None
+    values = sorted(values)
+    total = sum(weight for _, weight in values)
+    if total <= 0:
+        return values[len(values) // 2][0]
+    accumulated = 0.0
+    for value, weight in values:
+        accumulated += weight
+        if accumulated >= total / 2:
+            return value
+    return values[-1][0]
+
+
+def main(argv=None):
+    """命令行入口：查看稳定度历史"""
+    parser = argparse.ArgumentParser(description="币安量化交易系统 - 稳定度历史")
+    parser.add_argument('--dir', default=DEFAULT_HISTORY_DIR, help="存储目录")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    summary_parser = subparsers.add_parser('summary', help="统计代币最近一段时间的稳定度")
+    summary_parser.add_argument('token', help="ALPHA代币ID（如 ALPHA_22）")
+    summary_parser.add_argument('--hours', type=float, default=24.0, help="统计窗口（小时）")
+
+    dump_parser = subparsers.add_parser('dump', help="输出最近一段时间的记录")
+    dump_parser.add_argument('--hours', type=float, default=1.0, help="时间范围（小时）")
+    dump_parser.add_argument('--token', help="只输出该代币（如 ALPHA_22）")
+
+    args = parser.parse_args(argv)
+    history = StabilityHistory(args.dir)
+
+    if args.command == 'summary':
+        summary = history.summarize(args.token, args.hours * 3600)
+        if summary is None:
+            print(f"{args.token} 最近 {args.hours:g} 小时没有记录")
+            return 1
+        median = summary['median_spread']
+        print(f"{args.token} 最近 {args.hours:g} 小时: {summary['samples']} 条记录，"
+              f"稳定时间占比 {summary['stable_fraction']:.1%}，"
+              f"价差基点中位数 {'未知' if median is None else f'{median:.4f}'}")
+        return 0
+
+    now = history.clock.time()
+    for record in history.query(now - args.hours * 3600, now, args.token):
+        print(f"{datetime.fromtimestamp(record.time):%Y-%m-%d %H:%M:%S} ALPHA_{record.token_id} "
+              f"st={record.st_code} spr={record.spread:.4f} md={record.remaining_days:g} price={record.price:g}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代币符号解析模块
+Symbol Resolver Module for Binance Auto Trade System
+
+在内存中保存代币名称到ALPHA代币ID的正向映射和反向映射，启动时直接读取 alphaIdMap.json，
+文件不是当天的则在后台更新。新上线的代币增量合并到映射中；找不到的名称在一段时间内记为未命中，
+输错代币名称不会每次都重新下载完整的代币列表。
+"""
+
+import os
+import json
+import threading
+from datetime import datetime
+
+# 导入时钟模块
+from clock import get_clock
+
+
+# 默认设置
+DEFAULT_MAP_FILE = 'alphaIdMap.json'
+DEFAULT_MAP = {"KOGE": "ALPHA_22"}  # 无法获取代币列表时使用的映射
+DEFAULT_MISS_TTL = 300.0            # 未命中的名称在多久内不再触发更新（秒）
+DEFAULT_CHECK_INTERVAL = 3600.0     # 后台检查映射是否需要更新的间隔（秒）
+
+
+class SymbolResolver:
+    """代币符号解析类 - 内存中的正反向映射、未命中缓存和增量更新"""
+
+    def __init__(self, api, logger, clock=None, map_file=DEFAULT_MAP_FILE,
+                 miss_ttl=DEFAULT_MISS_TTL, check_interval=DEFAULT_CHECK_INTERVAL):
+        """
+        初始化代币符号解析器
+
+        Args:
+            api: BinanceAPI实例（获取代币列表）
+            logger: Logger实例
+            clock: 时钟对象（默认全局时钟）
+            map_file: 映射文件路径
+            miss_ttl: 未命中的名称在多久内不再触发更新（秒）
+            check_interval: 后台检查映射是否需要更新的间隔（秒）
+        """
+        self.api = api
+        self.logger = logger
+        self.clock = clock or get_clock()
+        self.map_file = map_file
+        self.miss_ttl = miss_ttl
+        self.check_interval = check_interval
+
+        # 映射只整体替换不原地修改，读取时不需要加锁
+        self.forward = {}   # {代币名称: ALPHA代币ID}
+        self.reverse = {}   # {ALPHA代币ID: 代币名称}
+        self.misses = {}    # {代币名称: 未命中时间}
+        self.updated_on = None  # 映射最近一次更新的日期
+        self.refresh_lock = threading.Lock()
+        self.listeners = []
+        self.thread = None
+
+    def add_listener(self, callback):
+        """
+        注册映射变化回调（参数为新的正向映射）
+
+        Args:
+            callback: 回调函数
+        """
+        self.listeners.append(callback)
+
+    def load(self):
+        """
+        加载映射：有映射文件时直接读取（不是当天的在后台更新），没有时同步从API获取
+
+        Returns:
+            dict: 正向映射
+        """
+        if os.path.exists(self.map_file):
+            try:
+                with open(self.map_file, 'r', encoding='utf-8') as f:
+                    alpha_id_map = json.load(f)
+                self.updated_on = datetime.fromtimestamp(os.path.getmtime(self.map_file)).date()
+                self.set_map(alpha_id_map)
+                self.logger.log_message(f"✅ 已加载Alpha ID映射，包含 {len(alpha_id_map)} 个代币（文件日期: {self.updated_on}）")
+            except Exception as e:
+                self.logger.log_message(f"加载Alpha ID映射文件失败: {e}")
+
+        if not self.forward:
+            try:
+                self.refresh()
+            except Exception as e:
+                self.logger.log_message(f"从API获取代币列表失败: {e}，使用默认映射")
+                self.set_map(DEFAULT_MAP)
+
+        self.start()
+        return self.forward
+
+    def start(self):
+        """启动后台更新线程（已启动时不重复启动）"""
+        if self.thread is None:
+            self.thread = self.clock.start_thread(self.refresh_loop)
+
+    def refresh_loop(self):
+        """后台更新循环：映射不是当天的时更新一次"""
+        while True:
+            if self.updated_on != self.clock.now().date():
+                try:
+                    self.refresh()
+                except Exception as e:
+                    self.logger.log_message(f"后台更新Alpha ID映射失败: {e}")
+            self.clock.sleep(self.check_interval)
+
+    def refresh(self):
+        """
+        从API获取代币列表，把新代币增量合并到映射中，有变化时写入文件
+
+        Returns:
+            dict: 更新后的正向映射，获取失败时抛出异常
+        """
+        with self.refresh_lock:
+            token_data = self.api.get_binance_token_list()
+            latest = self.api.create_alpha_id_map(token_data)
+
+            current = self.forward
+            changed = {name: alpha_id for name, alpha_id in latest.items() if current.get(name) != alpha_id}
+            self.updated_on = self.clock.now().date()
+            if not changed:
+                if os.path.exists(self.map_file):
+                    os.utime(self.map_file)  # 记录今天已检查过
+                return current
+
+            merged = dict(current)
+            merged.update(changed)
+            self.save(merged)
+            self.set_map(merged)
+            self.misses = {name: missed_at for name, missed_at in self.misses.items() if name not in merged}
+            self.logger.log_message(f"Alpha ID映射已更新: 新增或变化 {len(changed)} 个代币，共 {len(merged)} 个")
+
+        for callback in list(self.listeners):
+            try:
+                callback(merged)
+            except Exception as e:
+                self.logger.log_message(f"Alpha ID映射回调失败: {e}")
+        return merged
+
+    def set_map(self, alpha_id_map):
+        """替换内存中的正反向映射"""
+        self.forward = dict(alpha_id_map)
+        self.reverse = {alpha_id: name for name, alpha_id in self.forward.items()}
+
+    def save(self, alpha_id_map):
+        """先写临时文件再替换，避免写入中断留下不完整的映射文件"""
+        temp_file = self.map_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            json.dump(alpha_id_map, f, indent=2, ensure_ascii=False)
+        os.replace(temp_file, self.map_file)
+
+    def resolve(self, name):
+        """
+        把代币名称解析为ALPHA代币ID（找不到时更新一次代币列表，最近未命中过的名称不再更新）
+
+        Args:
+            name: 代币名称，如 "KOGE"
+
+        Returns:
+            str: ALPHA代币ID（如 "ALPHA_22"），找不到返回None
+        """
+        name = name.strip().upper()
+        alpha_id = self.forward.get(name)
+        if alpha_id:
+            return alpha_id
+
+        now = self.clock.time()
+        missed_at = self.misses.get(name)
+        if missed_at is not None and now - missed_at < self.miss_ttl:
+            self.logger.log_message(f"代币 {name} 最近已确认不存在，不重新获取代币列表")
+            return None
+
+        self.logger.log_message(f"未找到代币 {name} 的ALPHA ID，尝试更新代币列表...")
+        try:
+            alpha_id = self.refresh().get(name)
+        except Exception as e:
+            self.logger.log_message(f"更新Alpha ID映射失败: {e}")
+            return None
+
+        if not alpha_id:
+            self.misses[name] = now
+        return alpha_id
+
+    def name_for(self, alpha_id):
+        """
+        反查ALPHA代币ID对应的代币名称
+
+        Args:
+            alpha_id: ALPHA代币ID（如 "ALPHA_195"）
+
+        Returns:
+            str: 代币名称，找不到返回None
+        """
+        return self.reverse.get(alpha_id)
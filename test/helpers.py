@@ -0,0 +1,13 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试共用的辅助对象（时钟使用 clock.VirtualClock）
+Shared Test Helpers
+"""
+
+
+class SilentLogger:
+    """不输出的日志对象"""
+
+    def log_message(self, message, module=None, symbol=None):
+        pass
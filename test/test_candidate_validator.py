@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试4倍交易选币前的候选代币实时校验（并发请求最近成交）
+Test Candidate Validator
+"""
+
+import sys
+import os
+import time
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alpha123 import Alpha123Client
+from candidate_validator import CandidateValidator, measure_trades
+from trading_engine import DEFAULT_TRADING_PARAMS
+from clock import RealClock
+from helpers import SilentLogger
+
+
+# 稳定度数据：AAA价差最小，其次BBB、CCC、DDD
+ITEMS = [{'n': f'{name}/USDT', 'p': 1.0, 'st': 'green:stable', 'md': 5, 'spr': spread}
+         for name, spread in (('AAA', 0.01), ('BBB', 0.02), ('CCC', 0.03), ('DDD', 0.04))]
+
+REQUEST_LATENCY = 0.2
+
+
+class FakeAPI:
+    """按代币返回预设最近成交的接口（每次请求耗时REQUEST_LATENCY）"""
+
+    def __init__(self, now):
+        self.now = now
+        self.requested = []
+
+    def trades(self, prices, interval):
+        """生成以当前时间结束、间隔interval秒的成交"""
+        count = len(prices)
+        return [{'a': i, 'p': str(price), 'q': '1', 'T': int((self.now - (count - 1 - i) * interval) * 1000), 'm': False}
+                for i, price in enumerate(prices)]
+
+    def get_agg_trades(self, symbol, limit=1):
+        self.requested.append(symbol)
+        time.sleep(REQUEST_LATENCY)
+        if symbol == 'ALPHA_1USDT':
+            return self.trades([1.0], 600)             # 10分钟才1笔，已停止成交
+        if symbol == 'ALPHA_2USDT':
+            return self.trades([1.05] * 20, 2)         # 价格偏离稳定度数据5%
+        if symbol == 'ALPHA_3USDT':
+            return self.trades([1.0, 1.001] * 10, 2)   # 正常成交
+        return self.trades([1.0] * 20, 2)
+
+
+class FakeTrader:
+    """校验器需要的交易核心属性"""
+
+    def __init__(self):
+        self.clock = RealClock()
+        self.trading_params = dict(DEFAULT_TRADING_PARAMS)
+        self.api = FakeAPI(self.clock.time())
+        self.alpha123_client = Alpha123Client(
+            logger=SilentLogger(),
+            alpha_id_map={'AAA': 'ALPHA_1', 'BBB': 'ALPHA_2', 'CCC': 'ALPHA_3', 'DDD': 'ALPHA_4'}
+        )
+        self.alpha123_client.fetch_stability_data = lambda: self.alpha123_client.parse_stability_feed({'items': ITEMS})
+        self.logs = []
+
+    def log_message(self, message):
+        self.logs.append(message)
+
+
+def test_select_first_live_candidate():
+    """测试跳过已停止成交和价格偏离的代币，并发请求耗时约等于一次请求"""
+    trader = FakeTrader()
+    validator = CandidateValidator(trader)
+
+    started = time.perf_counter()
+    token = validator.select(max_spread=0.2)
+    elapsed = time.perf_counter() - started
+    print(f"选中代币: {token}，耗时 {elapsed:.2f} 秒")
+    for message in trader.logs:
+        print(f"  {message}")
+
+    assert token['symbol'] == 'ALPHA_3USDT'
+    assert sorted(trader.api.requested) == ['ALPHA_1USDT', 'ALPHA_2USDT', 'ALPHA_3USDT']
+    assert elapsed < REQUEST_LATENCY * 2, "候选代币应并发校验"
+
+    # 排除后只剩一个候选，且不合格
+    assert validator.select(max_spread=0.2, exclude={'ALPHA_3USDT', 'ALPHA_4USDT'}) is None
+
+    # 关闭校验时直接返回排名第一的代币
+    trader.trading_params['validate_top_k'] = 0
+    assert validator.select(max_spread=0.2)['symbol'] == 'ALPHA_1USDT'
+
+
+def test_measure_trades():
+    """测试成交频率、最新价和振幅的计算"""
+    trades = [{'T': 100000, 'p': '1.0'}, {'T': 110000, 'p': '1.02'}, {'T': 118000, 'p': '1.01'}, {'T': 50000, 'p': '9'}]
+    metrics = measure_trades(trades, now=120.0, window=60.0)
+    assert metrics['trade_rate'] == 3 / 60.0
+    assert metrics['last_price'] == 1.01
+    assert abs(metrics['volatility'] - 0.02 / 1.01) < 1e-12
+    assert measure_trades(trades, now=1000.0, window=60.0) is None
+
+
+if __name__ == "__main__":
+    test_select_first_live_candidate()
+    test_measure_trades()
+    print("测试完成")
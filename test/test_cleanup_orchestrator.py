@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试全局清仓（并发下单、统一查询成交状态）
+Test Cleanup Orchestrator
+"""
+
+import sys
+import os
+import tempfile
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from simulator import TradeSeries, SimulationTrader
+
+
+SYMBOLS = ('ALPHA_1USDT', 'ALPHA_2USDT', 'ALPHA_3USDT', 'ALPHA_4USDT')
+
+
+def make_series():
+    """生成价格不变、每秒一条成交的合成数据"""
+    series = {}
+    for symbol in SYMBOLS:
+        trades = [{'a': i, 'p': '1.0', 'q': '100000', 'T': 1700000000000 + i * 1000, 'm': False} for i in range(600)]
+        series[symbol] = TradeSeries(trades)
+    return series
+
+
+def test_flatten_all_positions_concurrently():
+    """测试所有持仓同时清仓，总耗时约等于单笔卖单耗时"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trader = SimulationTrader(make_series(), tmp_dir)
+        for symbol in SYMBOLS:
+            trader.api.holdings[symbol] = 1000.0
+            trader.tokens[symbol] = trader.new_token_record(symbol[:-4], 1.0)
+            trader.tokens[symbol]['last_buy_quantity'] = 1000.0
+        positions = [(symbol, symbol[:-4], 1000.0) for symbol in SYMBOLS]
+
+        results = []
+        thread = trader.clock.start_thread(lambda: results.append(trader.cleanup_orchestrator.flatten(positions)))
+        thread.join(timeout=30)
+
+        result = results[0]
+        print(f"清仓结果: {result}")
+        assert sorted(result['flattened']) == sorted(SYMBOLS)
+        assert result['failed'] == []
+        # 逐个清仓时每个代币至少需要一次查询间隔（1-2秒）加1秒等待
+        assert result['time_to_flat'] < 5
+        for symbol in SYMBOLS:
+            assert trader.tokens[symbol]['last_buy_quantity'] == 0
+            assert trader.api.holdings[symbol] < 1
+        assert trader.fill_ledger.get_daily_summary()['volume'] > 3900
+
+
+if __name__ == "__main__":
+    test_flatten_all_positions_concurrently()
+    print("测试完成")
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试交易核心使用注入的时钟
+Test Injected Clock in Trader Core
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import VirtualClock, RealClock, get_clock
+from trader_core import TraderCore
+
+
+class ScheduledTrader(TraderCore):
+    """记录定时交易触发时间的交易核心（不下单）"""
+
+    def __init__(self, tmp_dir, clock):
+        super().__init__(
+            config_file=os.path.join(tmp_dir, "config.json"),
+            log_dir=os.path.join(tmp_dir, "log"),
+            clock=clock
+        )
+        self.logger.set_listener(lambda log_msg: None)
+        self.started_at = []
+
+    def begin_4x_trading(self, trading_count):
+        self.started_at.append((self.clock.now(), trading_count))
+        self.scheduled_trading_enabled = False
+        return True
+
+
+def test_components_share_injected_clock():
+    """测试日志、配置和API使用交易核心的时钟，未注入时使用全局真实时钟"""
+    clock = VirtualClock(start_time=datetime(2024, 1, 2, 8, 0).timestamp())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trader = ScheduledTrader(tmp_dir, clock)
+        assert trader.logger.clock is clock
+        assert trader.config_manager.clock is clock
+        assert trader.api.clock is clock
+
+        trader.log_message("虚拟时间日志")
+        trader.logger.flush()  # 日志文件由后台线程写入
+        assert os.path.isdir(os.path.join(tmp_dir, "log", "2024-01-02"))
+
+    assert isinstance(get_clock(), RealClock)
+
+
+def test_scheduled_trading_fast_forward():
+    """测试定时交易在虚拟时间到达设定时间时触发，实际几乎不耗时"""
+    clock = VirtualClock(start_time=datetime(2024, 1, 2, 8, 0, 30).timestamp())
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trader = ScheduledTrader(tmp_dir, clock)
+
+        started = time.time()
+        trader.configure_scheduled_trading(True, hour=9, minute=30, trading_count=4)
+        trader.scheduled_trading_thread.join(timeout=10)
+
+        print(f"触发记录: {trader.started_at}，实际用时 {time.time() - started:.2f} 秒")
+        assert not trader.scheduled_trading_thread.is_alive()
+        assert len(trader.started_at) == 1
+        triggered_at, trading_count = trader.started_at[0]
+        assert (triggered_at.hour, triggered_at.minute) == (9, 30)
+        assert trading_count == 4
+        assert time.time() - started < 5
+
+
+if __name__ == "__main__":
+    test_components_share_injected_clock()
+    test_scheduled_trading_fast_forward()
+    print("测试完成")
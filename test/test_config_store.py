@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试配置文件防抖写入（合并多次保存、原子替换、退出前写入）
+Test Config Store
+"""
+
+import sys
+import os
+import json
+import time
+import tempfile
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config_store import DebouncedWriter, write_json_atomic
+from config_manager import ConfigManager
+
+
+def test_debounced_writes_are_coalesced():
+    """测试防抖间隔内的多次保存合并为一次写入，写入的是最新数据"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "config.json")
+        state = {'count': 0}
+        writer = DebouncedWriter(path, lambda: dict(state), debounce=0.1)
+
+        started = time.perf_counter()
+        for i in range(1000):
+            state['count'] = i + 1
+            writer.schedule()
+        elapsed = (time.perf_counter() - started) / 1000
+        print(f"每次保存耗时: {elapsed * 1e6:.1f} 微秒")
+        assert elapsed < 0.0005
+
+        time.sleep(0.4)
+        print(f"实际写入次数: {writer.write_count}")
+        assert 1 <= writer.write_count <= 2
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == {'count': 1000}
+        assert not os.path.exists(path + '.tmp')
+
+        # 关闭时立即写入未写入的修改
+        state['count'] = 2000
+        writer.schedule()
+        assert writer.close()
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == {'count': 2000}
+
+
+def test_failed_write_keeps_old_file():
+    """测试写入失败时原文件保持不变，修改保留到下次写入"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "config.json")
+        write_json_atomic(path, {'csrf_token': 'old'})
+
+        writer = DebouncedWriter(path, lambda: {'bad': object()}, debounce=10.0)
+        writer.schedule()
+        assert not writer.flush()
+        assert writer.dirty and not os.path.exists(path + '.tmp')
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == {'csrf_token': 'old'}
+
+        writer.snapshot = lambda: {'csrf_token': 'new'}
+        assert writer.close()
+        with open(path, encoding='utf-8') as f:
+            assert json.load(f) == {'csrf_token': 'new'}
+
+
+def test_config_manager_flush():
+    """测试ConfigManager保存后退出前写入，重新加载得到相同数据"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        config_file = os.path.join(tmp_dir, "config.json")
+        manager = ConfigManager(config_file=config_file)
+        manager.load_config()
+        manager.set_credentials("token", "cookie")
+        for _ in range(50):
+            manager.update_trade_amount(10.0)
+            manager.increment_trade_count()
+        assert manager.flush_config()
+
+        reloaded = ConfigManager(config_file=config_file)
+        reloaded.load_config()
+        assert reloaded.csrf_token == "token" and reloaded.cookie == "cookie"
+        assert reloaded.daily_total_amount == 500.0 and reloaded.daily_completed_trades == 50
+
+
+if __name__ == "__main__":
+    test_debounced_writes_are_coalesced()
+    test_failed_write_keeps_old_file()
+    test_config_manager_flush()
+    print("测试完成")
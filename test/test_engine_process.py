@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试交易引擎进程的消息协议
+Test Engine Process Message Protocol
+"""
+
+import sys
+import os
+import queue
+import tempfile
+from datetime import datetime
+from types import MappingProxyType
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from engine_process import EngineHost
+from stability_feed import StabilitySnapshot
+
+
+def drain(event_queue):
+    """取出队列中的全部事件"""
+    events = []
+    while True:
+        try:
+            events.append(event_queue.get_nowait())
+        except queue.Empty:
+            return events
+
+
+def create_host(tmp_dir):
+    """创建使用临时配置和日志目录的交易引擎宿主"""
+    event_queue = queue.Queue()
+    host = EngineHost(
+        event_queue,
+        config_file=os.path.join(tmp_dir, "config.json"),
+        log_dir=os.path.join(tmp_dir, "log")
+    )
+    return host, event_queue
+
+
+def test_commands_produce_coalesced_events():
+    """测试命令执行后合并发送变化的代币，统计只发送变化字段"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        host, event_queue = create_host(tmp_dir)
+
+        host.execute('set_token_price', ('ALPHA_22USDT', 1.5, 'KOGE'))
+        host.execute('set_token_trade_count', ('ALPHA_22USDT', 3))
+        host.publish(force=True)
+
+        events = drain(event_queue)
+        kinds = [kind for kind, _ in events]
+        print(f"事件类型: {kinds}")
+        assert kinds.count('tokens') == 1
+        assert 'log' in kinds
+        tokens, removed = [payload for kind, payload in events if kind == 'tokens'][0]
+        assert tokens['ALPHA_22USDT']['price'] == 1.5
+        assert tokens['ALPHA_22USDT']['trade_count'] == 3
+        assert removed == []
+        stats = [payload for kind, payload in events if kind == 'stats'][0]
+        assert stats['daily_completed_trades'] == 0
+
+        # 只发送价格变化的代币和删除的代币
+        host.execute('set_token_price', ('ALPHA_9USDT', 0.5, 'ZKJ'))
+        host.publish(force=True)
+        drain(event_queue)
+        host.execute('set_token_price', ('ALPHA_9USDT', 0.6, 'ZKJ'))
+        host.execute('remove_token', ('ALPHA_22USDT',))
+        host.publish(force=True)
+        events = drain(event_queue)
+        print(f"代币变化事件: {[payload for kind, payload in events if kind == 'tokens']}")
+        tokens, removed = [payload for kind, payload in events if kind == 'tokens'][0]
+        assert list(tokens) == ['ALPHA_9USDT'] and tokens['ALPHA_9USDT']['price'] == 0.6
+        assert removed == ['ALPHA_22USDT']
+
+        # 统计变化只发送变化的字段
+        host.daily_completed_trades = 5
+        host.notify_statistics_changed()
+        host.publish(force=True)
+        events = drain(event_queue)
+        print(f"统计变化事件: {events}")
+        assert ('stats', {'daily_completed_trades': 5}) in events
+
+
+class FakeFeed:
+    """返回固定快照的稳定度数据刷新对象"""
+
+    def __init__(self, items, fetched_at):
+        self.snapshot = StabilitySnapshot(tuple(MappingProxyType(item) for item in items), fetched_at, fetched_at, 1)
+        self.refreshes = 0
+
+    def refresh(self):
+        self.refreshes += 1
+        return False
+
+    def get_snapshot(self):
+        return self.snapshot
+
+
+def test_gui_requests_run_in_engine():
+    """测试界面进程的代币ID查询、稳定度看板和日志写入都由引擎进程执行"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        host, event_queue = create_host(tmp_dir)
+        host.resolve_alpha_id = {'KOGE': 'ALPHA_22'}.get
+        host.get_token_price = lambda symbol: {'price': '48.0'}
+        host.stability_feed = FakeFeed([{'project': 'KOGE', 'stability': '稳定', 'price': '48.0'}], 1700000000.0)
+
+        host.execute('add_token_by_name', ('KOGE',))
+        host.execute('add_token_by_name', ('NOPE',))
+        host.execute('refresh_stability', ())
+        for thread in host.command_threads:
+            thread.join(5)
+        host.publish(force=True)
+
+        events = drain(event_queue)
+        print(f"事件类型: {[kind for kind, _ in events]}")
+        assert host.tokens['ALPHA_22USDT']['price'] == 48.0
+        assert any(kind == 'error' and 'NOPE' in payload[1] for kind, payload in events)
+        assert ('stability', ([{'project': 'KOGE', 'stability': '稳定', 'price': '48.0'}], 1700000000.0)) in events
+        assert host.stability_feed.refreshes == 1
+
+        # 界面进程转发的日志行由引擎进程写入文件，不再显示
+        now = datetime(2024, 1, 2, 10, 0)
+        host.execute('write_log', ('system_running_log.txt', now, "[2024-01-02 10:00:00] 界面日志\n"))
+        host.logger.close()
+        with open(os.path.join(tmp_dir, "log", "2024-01-02", "system_running_log.txt"), encoding='utf-8') as f:
+            assert f.read() == "[2024-01-02 10:00:00] 界面日志\n"
+        assert drain(event_queue) == []
+
+
+def test_unknown_command_and_shutdown():
+    """测试未知命令只记录日志，shutdown命令在空闲时退出命令循环"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        host, event_queue = create_host(tmp_dir)
+
+        command_queue = queue.Queue()
+        command_queue.put(('start_trading_now', ()))
+        command_queue.put(('shutdown', ()))
+        host.serve(command_queue)
+
+        events = drain(event_queue)
+        logs = [payload for kind, payload in events if kind == 'log']
+        print(f"日志: {logs}")
+        assert any('未知的交易引擎命令' in line for line in logs)
+        assert events[-1] == ('exited', None)
+
+        # 退出后不再接受命令
+        host.execute('remove_token', ('ALPHA_22USDT',))
+        assert any('忽略命令' in payload for kind, payload in drain(event_queue) if kind == 'log')
+
+
+if __name__ == "__main__":
+    test_commands_produce_coalesced_events()
+    test_gui_requests_run_in_engine()
+    test_unknown_command_and_shutdown()
+    print("测试完成")
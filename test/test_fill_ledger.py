@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试成交账本和损耗统计
+Test Fill Ledger and Loss Accounting
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fill_ledger import FillLedger
+from trader_core import TraderCore
+from clock import VirtualClock
+
+
+class BalanceAPI:
+    """记录资金账户余额请求次数的API"""
+
+    def __init__(self, balance):
+        self.balance = balance
+        self.balance_calls = 0
+
+    def get_funding_balance(self):
+        self.balance_calls += 1
+        return self.balance
+
+
+def test_round_trip_loss_across_days():
+    """测试跨天的买卖按平均成本结算，损耗计入卖出当天"""
+    clock = VirtualClock(datetime(2024, 1, 1, 23, 59, 50).timestamp())
+    ledger = FillLedger(clock=clock, fee_rate=0.0001)
+
+    ledger.record_fill('ALPHA_1USDT', 'BUY', 2000, 1000.0)
+    clock.current_time = datetime(2024, 1, 2, 0, 0, 10).timestamp()
+    ledger.record_fill('ALPHA_1USDT', 'SELL', 1999.8, 999.5)
+
+    day1 = ledger.get_daily_summary('2024-01-01')
+    day2 = ledger.get_daily_summary('2024-01-02')
+    print(f"第一天: {day1}，第二天: {day2}")
+
+    expected_loss = 1000.0 - 999.5 * (1 - 0.0001)
+    assert day1['loss'] == 0.0
+    assert abs(day2['loss'] - expected_loss) < 1e-9
+    assert abs(ledger.total_loss() - expected_loss) < 1e-9
+    assert day1['volume'] == 1000.0 and day2['volume'] == 999.5
+    assert ledger.get_position('ALPHA_1USDT')[0] < 1e-9
+
+
+def test_sell_beyond_known_position():
+    """测试卖出账本之外的持仓时只结算有记录的部分"""
+    ledger = FillLedger(clock=VirtualClock(datetime(2024, 1, 1, 12, 0).timestamp()), fee_rate=0.0)
+    ledger.record_fill('ALPHA_2USDT', 'BUY', 100, 100.0)
+    ledger.record_fill('ALPHA_2USDT', 'SELL', 200, 190.0)
+
+    print(f"累计损耗: {ledger.total_loss()}")
+    assert abs(ledger.total_loss() - 5.0) < 1e-9
+
+
+def test_old_days_pruned():
+    """测试按天统计只保留最近几天，累计损耗不受影响"""
+    clock = VirtualClock(datetime(2024, 1, 1, 12, 0).timestamp())
+    ledger = FillLedger(clock=clock, fee_rate=0.0, keep_days=2)
+    for day in range(1, 6):
+        clock.current_time = datetime(2024, 1, day, 12, 0).timestamp()
+        ledger.record_fill('ALPHA_1USDT', 'BUY', 100, 100.0)
+        ledger.record_fill('ALPHA_1USDT', 'SELL', 100, 99.0)
+
+    print(f"保留的日期: {sorted(ledger.days)}")
+    assert sorted(ledger.days) == ['2024-01-04', '2024-01-05']
+    assert ledger.get_daily_summary('2024-01-01')['fills'] == 0
+    assert abs(ledger.get_daily_summary()['loss'] - 1.0) < 1e-9
+    assert abs(ledger.total_loss() - 5.0) < 1e-9
+    assert abs(ledger.total_loss_by_symbol()['ALPHA_1USDT'] - 5.0) < 1e-9
+
+
+def test_loss_updates_without_balance_requests():
+    """测试买卖完成后从账本更新损耗不请求余额，对账时以余额为准"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trader = TraderCore(
+            config_file=os.path.join(tmp_dir, "config.json"),
+            log_dir=os.path.join(tmp_dir, "log")
+        )
+        trader.logger.set_listener(lambda log_msg: None)
+        trader.api = BalanceAPI(9998.0)
+        trader.config_manager.daily_initial_balance = 10000.0
+
+        trader.fill_ledger.record_fill('ALPHA_1USDT', 'BUY', 2000, 1000.0)
+        trader.fill_ledger.record_fill('ALPHA_1USDT', 'SELL', 1999.8, 999.0)
+        trader.update_loss_from_ledger()
+        ledger_loss = trader.daily_trade_loss
+        print(f"账本损耗: {ledger_loss:.4f} USDT，余额请求次数: {trader.api.balance_calls}")
+        assert trader.api.balance_calls == 0
+        assert abs(ledger_loss - trader.fill_ledger.total_loss()) < 1e-9
+
+        # 对账后以余额计算的损耗为准，之后的账本损耗在此基础上累加
+        assert trader.reconcile_balance() == 2.0
+        assert trader.api.balance_calls == 1
+        trader.fill_ledger.record_fill('ALPHA_1USDT', 'BUY', 2000, 1000.0)
+        trader.fill_ledger.record_fill('ALPHA_1USDT', 'SELL', 1999.8, 999.0)
+        trader.update_loss_from_ledger()
+        assert abs(trader.daily_trade_loss - (2.0 + ledger_loss)) < 1e-9
+
+
+if __name__ == "__main__":
+    test_round_trip_loss_across_days()
+    test_sell_beyond_known_position()
+    test_old_days_pruned()
+    test_loss_updates_without_balance_requests()
+    print("测试完成")
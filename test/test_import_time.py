@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试程序启动时的导入耗时（重量级依赖不能在启动时导入）
+Test Startup Import Budget
+"""
+
+import sys
+import os
+import subprocess
+
+# 项目根目录
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 启动时导入的入口模块
+STARTUP_MODULES = ('binance_trader', 'trading_daemon', 'engine_process')
+
+# 只在备用的页面抓取中使用，启动时不能导入
+LAZY_MODULES = ('selenium', 'bs4')
+
+# 单个入口模块的导入耗时上限（秒），留有余量以适应较慢的机器
+IMPORT_BUDGET = 1.0
+
+
+def measure_import(module):
+    """
+    在新的解释器中导入模块
+
+    Args:
+        module: 模块名
+
+    Returns:
+        tuple: (导入耗时秒数, 已加载的重量级依赖列表)
+    """
+    code = (
+        "import sys\n"
+        f"import {module}\n"
+        f"print(','.join(name for name in {LAZY_MODULES!r} if name in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT_DIR, capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    # -X importtime 的输出格式: "import time: 自身耗时 | 累计耗时 | 模块名"（微秒）
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module:
+            cumulative = int(parts[1])
+    loaded = [name for name in result.stdout.strip().split(',') if name]
+    return cumulative / 1e6, loaded
+
+
+def test_startup_import_budget():
+    """测试入口模块不导入Selenium和BeautifulSoup，导入耗时在预算内"""
+    for module in STARTUP_MODULES:
+        elapsed, loaded = measure_import(module)
+        print(f"{module}: 导入耗时 {elapsed * 1000:.0f} 毫秒，重量级依赖: {loaded or '无'}")
+        assert not loaded, f"{module} 启动时导入了 {loaded}"
+        assert elapsed < IMPORT_BUDGET, f"{module} 导入耗时 {elapsed:.2f} 秒超过预算 {IMPORT_BUDGET} 秒"
+
+
+if __name__ == "__main__":
+    test_startup_import_budget()
+    print("测试完成")
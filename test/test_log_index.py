@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试日志索引（写日志时记录订单ID和分钟索引，按订单或时间段查询）
+Test Log Index
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import VirtualClock
+from logger import Logger
+from log_index import LogIndexer, LogSearch, extract_order_ids, merge_ranges
+
+
+def test_extract_order_ids_and_ranges():
+    """测试从日志文本中提取订单ID，以及分钟范围的生成"""
+    assert extract_order_ids("KOGE 买单下单成功，order_id: 153048420，价格为: 0.05") == {'153048420'}
+    assert extract_order_ids("订单 153048421 成交，成交额: 20 USDT") == {'153048421'}
+    assert extract_order_ids("价格为: 0.0512345") == set()
+    assert merge_ranges([(10, 20), (0, 5), (5, 8), (15, 30)]) == [[0, 8], [10, 30]]
+
+    indexer = LogIndexer()
+    indexer.add("2024-01-01", "2024-01-01/a.txt", 0, 10, 60.0)
+    indexer.add("2024-01-01", "2024-01-01/a.txt", 10, 10, 90.0)
+    assert indexer.drain() == []  # 当前分钟还没结束
+    indexer.add("2024-01-01", "2024-01-01/a.txt", 20, 10, 120.0)
+    assert indexer.drain() == [("2024-01-01", "time_index.txt", "1\t*\t2024-01-01/a.txt\t0\t20\n")]
+    assert indexer.drain(force=True) == [("2024-01-01", "time_index.txt", "2\t*\t2024-01-01/a.txt\t20\t30\n")]
+
+    # 代币的范围只合并连续的日志，中间有其他代币的日志时分成两段
+    indexer.add("2024-01-01", "2024-01-01/a.txt", 30, 10, 180.0, symbols=['ALPHA_22'])
+    indexer.add("2024-01-01", "2024-01-01/a.txt", 40, 10, 181.0, symbols=['ALPHA_22'])
+    indexer.add("2024-01-01", "2024-01-01/a.txt", 50, 10, 182.0, symbols=['ALPHA_9'])
+    indexer.add("2024-01-01", "2024-01-01/a.txt", 60, 10, 183.0, symbols=['ALPHA_22'])
+    assert sorted(line for _, _, line in indexer.drain(force=True)) == sorted([
+        "3\t*\t2024-01-01/a.txt\t30\t70\n",
+        "3\tALPHA_22\t2024-01-01/a.txt\t30\t50\n",
+        "3\tALPHA_22\t2024-01-01/a.txt\t60\t70\n",
+        "3\tALPHA_9\t2024-01-01/a.txt\t50\t60\n",
+    ])
+
+
+def test_search_order_and_window():
+    """测试跨天、跨文件（包括已压缩的交易日志）按订单和时间段查询"""
+    with tempfile.TemporaryDirectory() as log_dir:
+        start = datetime(2024, 1, 1, 23, 58, 0).timestamp()
+        clock = VirtualClock(start)
+        logger = Logger(log_dir=log_dir, clock=clock)
+        logger.set_listener(lambda log_msg: None)
+
+        for i in range(300):
+            clock.current_time = start + i  # 跨过午夜
+            order_id = 100000000 + i
+            # 实际的交易日志以代币名称开头，交易对符号由调用方传入
+            symbol, name = ('ALPHA_22USDT', 'KOGE') if i % 3 == 0 else ('ALPHA_9USDT', 'B2')
+            logger.log_message(f"第 {i} 条 {name} 买单下单成功，order_id: {order_id}，价格为: 0.05", symbol=symbol)
+            if i % 50 == 0:
+                logger.log_trade_detail({'symbol': symbol, 'side': 'BUY', 'price': 0.05,
+                                         'status': 'success', 'order_id': order_id})
+        logger.flush()
+
+        # 第一天的交易日志在日期变化时已压缩，仍能按偏移量查询
+        journal_dir = os.path.join(log_dir, "trade_journal")
+        logger.close()
+        print(f"交易日志: {sorted(os.listdir(journal_dir))}")
+        assert sorted(os.listdir(journal_dir)) == ['trades-20240101-001.jsonl.gz', 'trades-20240102-001.jsonl']
+
+        search = LogSearch(log_dir)
+        assert search.list_days() == ['2024-01-01', '2024-01-02']
+        results = search.find_order(100000050)
+        print(f"订单日志: {[(item['file'], item['text'][:40]) for item in results]}")
+        assert len(results) == 2
+        assert any(item['file'].startswith('trade_journal/') and '"order_id":"100000050"' in item['text']
+                   for item in results)
+        assert "第 50 条" in results[0]['text'] or "第 50 条" in results[1]['text']
+        assert search.find_order(999) == []
+
+        # 跨午夜的时间段
+        window = search.find_window(start + 100, start + 160)
+        texts = [item['text'] for item in window if item['file'].endswith('system_running_log.txt')]
+        assert len(texts) == 60 and "第 100 条" in texts[0] and "第 159 条" in texts[-1]
+        assert len(window) == 62  # 加上第100条和第150条的交易日志
+
+        window = search.find_window(start + 100, start + 160, symbol='ALPHA_22USDT')
+        ids = [int(item['text'].split("第 ")[1].split(" ")[0]) for item in window if item['text'].startswith('[')]
+        assert ids == [i for i in range(100, 160) if i % 3 == 0]
+        assert all('KOGE' in item['text'] or 'ALPHA_22' in item['text'] for item in window)
+        assert len(window) == len(ids) + 1  # 加上第150条的交易日志
+
+
+if __name__ == "__main__":
+    test_extract_order_ids_and_ranges()
+    test_search_order_and_window()
+    print("测试完成")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试日志级别（按模块设置阈值、未输出的日志不格式化、各级别计数）
+Test Log Levels
+"""
+
+import sys
+import os
+import tempfile
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import logger as logger_module
+from logger import Logger, parse_level_spec, DEBUG, INFO, ERROR
+
+
+class CountingValue:
+    """记录被格式化次数的参数"""
+
+    def __init__(self):
+        self.formatted = 0
+
+    def __str__(self):
+        self.formatted += 1
+        return "值"
+
+
+def test_parse_level_spec():
+    """测试级别设置的解析"""
+    assert parse_level_spec("") == (INFO, {})
+    assert parse_level_spec("debug") == (DEBUG, {})
+    assert parse_level_spec("ERROR, order_handler=DEBUG") == (ERROR, {'order_handler': DEBUG})
+    try:
+        parse_level_spec("VERBOSE")
+        assert False, "无效级别应抛出ValueError"
+    except ValueError:
+        pass
+
+
+def test_deferred_formatting_and_counts():
+    """测试未输出的调试日志不格式化，模块阈值单独生效"""
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger = Logger(log_dir=log_dir)
+        lines = []
+        logger.set_listener(lines.append)
+        logger.set_levels("INFO,order_handler=DEBUG")
+
+        value = CountingValue()
+        for _ in range(1000):
+            logger.debug("检查订单状态: %s", value, module='trading_engine')
+        assert value.formatted == 0 and not lines
+
+        logger.debug("检查订单状态: %s", value, module='order_handler')
+        logger.log_message("普通日志")
+        logger.log_error("错误")
+        assert value.formatted == 1
+        assert [line.split('] ', 1)[1].strip() for line in lines] == ["[DEBUG] 检查订单状态: 值", "普通日志", "[ERROR] 错误"]
+
+        # 关闭INFO后普通日志也不输出
+        logger.set_levels("ERROR")
+        logger.log_message("不输出")
+        assert len(lines) == 3
+
+        counts = logger.get_level_counts()
+        print(f"日志计数: {counts}")
+        assert counts['DEBUG'] == (1, 1000)
+        assert counts['INFO'] == (1, 1)
+        assert counts['ERROR'] == (1, 0)
+        logger.close()
+
+
+def test_env_level():
+    """测试默认级别读取环境变量"""
+    original = os.environ.get(logger_module.LOG_LEVEL_ENV)
+    os.environ[logger_module.LOG_LEVEL_ENV] = "DEBUG"
+    try:
+        with tempfile.TemporaryDirectory() as log_dir:
+            logger = Logger(log_dir=log_dir)
+            assert logger.is_enabled(DEBUG, module='trading_engine')
+            logger.close()
+    finally:
+        if original is None:
+            del os.environ[logger_module.LOG_LEVEL_ENV]
+        else:
+            os.environ[logger_module.LOG_LEVEL_ENV] = original
+
+
+if __name__ == "__main__":
+    test_parse_level_spec()
+    test_deferred_formatting_and_counts()
+    test_env_level()
+    print("测试完成")
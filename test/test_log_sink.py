@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试后台批量日志写入（队列写入、按日期切换文件、退出时写完）
+Test Log Sink
+"""
+
+import sys
+import os
+import time
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_sink import LogSink
+from logger import Logger
+from trade_journal import iter_events
+from log_index import LogSearch
+
+
+def test_batched_write_and_rollover():
+    """测试日志批量写入、日期变化时切换目录并关闭前一天的文件"""
+    with tempfile.TemporaryDirectory() as log_dir:
+        sink = LogSink(log_dir, flush_interval=0.05)
+        day1 = datetime(2024, 1, 1, 23, 59, 59)
+        day2 = datetime(2024, 1, 2, 0, 0, 1)
+
+        for i in range(3):
+            sink.write("system_running_log.txt", day1, f"第一天 {i}\n")
+        sink.write("trade_detail_log.txt", day1, lambda: "延迟格式化\n")
+        assert sink.flush()
+        assert len([path for path in sink.handles if not path.endswith("index.txt")]) == 2
+
+        sink.write("system_running_log.txt", day2, "第二天\n")
+        sink.close()
+        assert not sink.handles
+
+        with open(os.path.join(log_dir, "2024-01-01", "system_running_log.txt"), encoding='utf-8') as f:
+            assert f.read() == "第一天 0\n第一天 1\n第一天 2\n"
+        with open(os.path.join(log_dir, "2024-01-01", "trade_detail_log.txt"), encoding='utf-8') as f:
+            assert f.read() == "延迟格式化\n"
+        with open(os.path.join(log_dir, "2024-01-02", "system_running_log.txt"), encoding='utf-8') as f:
+            assert f.read() == "第二天\n"
+
+        # 关闭后的日志不再写入
+        sink.write("system_running_log.txt", day2, "关闭后\n")
+        assert sink.queue.empty()
+
+
+def test_two_sinks_share_one_file():
+    """测试两个进程的写入器交替追加同一个文件时，订单索引仍指向各自的日志"""
+    with tempfile.TemporaryDirectory() as log_dir:
+        gui_sink = LogSink(log_dir, flush_interval=0.01)
+        engine_sink = LogSink(log_dir, flush_interval=0.01)
+        now = datetime(2024, 1, 1, 12, 0, 0)
+
+        for i in range(20):
+            sink = gui_sink if i % 2 == 0 else engine_sink
+            sink.write("system_running_log.txt", now, f"第 {i} 条 ALPHA_22USDT 买单下单成功，order_id: {1234500 + i}\n")
+            assert sink.flush()
+        gui_sink.close()
+        engine_sink.close()
+
+        search = LogSearch(log_dir)
+        for i in range(20):
+            results = search.find_order(1234500 + i)
+            assert len(results) == 1, results
+            assert results[0]['text'].startswith(f"第 {i} 条") and str(1234500 + i) in results[0]['text']
+
+
+def test_logger_forwards_file_lines():
+    """测试设置写入回调后日志照常显示，文件行交给回调而不写入本进程的文件"""
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger = Logger(log_dir=log_dir)
+        shown, forwarded = [], []
+        logger.set_listener(shown.append)
+        logger.set_forwarder(lambda filename, now, text, symbol: forwarded.append((filename, text)))
+
+        logger.log_message("界面日志")
+        logger.log_error("界面错误")
+        logger.close()
+
+        print(f"转发的日志: {forwarded}")
+        assert len(shown) == 2
+        assert [filename for filename, _ in forwarded] == ["system_running_log.txt", "system_running_log.txt", "error_log.txt"]
+        assert forwarded[0][1].endswith("] 界面日志\n")
+        assert LogSearch(log_dir).list_days() == []
+
+
+def test_logger_call_cost():
+    """测试记录日志的线程只把日志放入队列"""
+    with tempfile.TemporaryDirectory() as log_dir:
+        logger = Logger(log_dir=log_dir)
+        logger.set_listener(lambda log_msg: None)
+
+        count = 2000
+        started = time.perf_counter()
+        for i in range(count):
+            logger.log_message(f"日志 {i}")
+        elapsed = (time.perf_counter() - started) / count
+        logger.log_error("错误")
+        logger.log_trade_detail({'symbol': 'ALPHA_1USDT', 'side': 'BUY', 'request_params': {'payload': {'a': 1}}})
+        logger.close()
+        print(f"每条日志耗时: {elapsed * 1e6:.1f} 微秒")
+
+        date_dir = os.path.join(log_dir, LogSearch(log_dir).list_days()[0])
+        with open(os.path.join(date_dir, "system_running_log.txt"), encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        assert len(lines) == count + 1 and lines[-1].endswith("[ERROR] 错误")
+        events = list(iter_events(os.path.join(log_dir, "trade_journal")))
+        assert len(events) == 1 and events[0]['symbol'] == 'ALPHA_1USDT'
+        assert os.path.exists(os.path.join(date_dir, "error_log.txt"))
+        assert elapsed < 0.0005
+
+
+if __name__ == "__main__":
+    test_batched_write_and_rollover()
+    test_two_sinks_share_one_file()
+    test_logger_forwards_file_lines()
+    test_logger_call_cost()
+    print("测试完成")
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试界面日志显示（环形缓冲区、批量插入、按行号删除旧行）
+Test Log View
+"""
+
+import sys
+import os
+import time
+import threading
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from log_view import LogView
+
+
+class FakeTextWidget:
+    """模拟ScrolledText：按行保存文本，记录调用次数"""
+
+    def __init__(self):
+        self.lines = []
+        self.inserts = 0
+        self.scheduled = []
+
+    def insert(self, index, text):
+        self.inserts += 1
+        self.lines.extend(text.splitlines())
+
+    def delete(self, start, end):
+        # 只支持 "1.0" 到 "N.0"：删除前 N-1 行
+        del self.lines[:int(end.split('.')[0]) - 1]
+
+    def see(self, index):
+        pass
+
+    def after(self, ms, callback):
+        self.scheduled.append(callback)
+
+
+def test_batched_redraw_and_trim():
+    """测试多个线程写入后一帧内一次插入，超出上限的旧行按行号删除"""
+    widget = FakeTextWidget()
+    view = LogView(widget, max_lines=100)
+    view.start()
+    assert len(widget.scheduled) == 1
+
+    def worker(index):
+        for i in range(50):
+            view.append(f"[00:00:00] 线程{index} 日志{i}\n")
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # 缓冲区有界：只保留最新的100行
+    assert len(view.pending) == 100
+    widget.scheduled.pop()()
+    assert widget.inserts == 1
+    assert len(widget.lines) == 100 and view.line_count == 100
+    assert len(widget.scheduled) == 1  # 已安排下一帧
+
+    view.append("[00:00:01] 多行\n第二行\n")
+    view.drain()
+    print(f"控件行数: {len(widget.lines)}，最后两行: {widget.lines[-2:]}")
+    assert len(widget.lines) == 100 and widget.lines[-2:] == ["[00:00:01] 多行", "第二行"]
+
+    view.stop()
+    widget.scheduled.pop()()
+    assert not widget.scheduled
+
+
+def test_append_cost():
+    """测试工作线程添加日志的耗时与控件内容无关"""
+    view = LogView(FakeTextWidget(), max_lines=100)
+    started = time.perf_counter()
+    for i in range(100000):
+        view.append("[00:00:00] 日志\n")
+    elapsed = (time.perf_counter() - started) / 100000
+    print(f"每条日志耗时: {elapsed * 1e9:.0f} 纳秒")
+    assert elapsed < 0.00005
+
+
+if __name__ == "__main__":
+    test_batched_redraw_and_trim()
+    test_append_cost()
+    print("测试完成")
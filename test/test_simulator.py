@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试虚拟时钟和离线回放模拟器
+Test Virtual Clock and Offline Replay Simulator
+"""
+
+import sys
+import os
+import time
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import VirtualClock
+from simulator import TradeSeries, run_simulation
+
+
+def make_series(hours=3):
+    """生成两个代币来回波动的合成成交数据（每5秒一条）"""
+    series = {}
+    for symbol, base in (('ALPHA_1USDT', 0.5), ('ALPHA_2USDT', 2.0)):
+        trades = []
+        for i in range(int(hours * 3600 / 5)):
+            price = base * (1 + 0.000002 * (i % 4 - 1.5))
+            trades.append({'a': i, 'p': f"{price:.8f}", 'q': '100000', 'T': 1700000000000 + i * 5000, 'm': i % 2 == 0})
+        series[symbol] = TradeSeries(trades)
+    return series
+
+
+def test_virtual_clock_advances_without_waiting():
+    """测试虚拟时钟：线程sleep时虚拟时间前进，实际几乎不耗时"""
+    clock = VirtualClock(start_time=1000.0)
+    wake_times = []
+
+    def worker(seconds):
+        for _ in range(3):
+            clock.sleep(seconds)
+            wake_times.append((seconds, clock.time()))
+
+    started = time.time()
+    with clock.paused():
+        threads = [clock.start_thread(worker, args=(600,)), clock.start_thread(worker, args=(1800,))]
+    for thread in threads:
+        thread.join()
+
+    print(f"唤醒时间: {wake_times}")
+    assert clock.time() == 1000.0 + 3 * 1800
+    assert (1800, 1000.0 + 1800) in wake_times
+    assert time.time() - started < 2
+
+
+def test_virtual_clock_rejects_other_threads():
+    """测试非参与线程不能在虚拟时钟上sleep"""
+    clock = VirtualClock()
+    try:
+        clock.sleep(1)
+    except RuntimeError as e:
+        print(f"预期的错误: {e}")
+    else:
+        raise AssertionError("非参与线程sleep应该抛出RuntimeError")
+
+
+def test_replay_completes_round_trips():
+    """测试回放合成数据，完成计划交易次数并输出统计"""
+    started = time.time()
+    report = run_simulation(make_series(), count=3)
+    print(f"回放结果: {report}")
+
+    assert report['round_trips'] == 3
+    assert report['volume'] > 0
+    assert report['fill_latency_avg'] > 0
+    assert report['simulated_hours'] > 0
+    assert time.time() - started < 30
+
+
+if __name__ == "__main__":
+    test_virtual_clock_advances_without_waiting()
+    test_virtual_clock_rejects_other_threads()
+    test_replay_completes_round_trips()
+    print("测试完成")
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试备用的稳定度页面浏览器（常驻复用、定期重启、结果缓存）
+Test Stability Page Browser
+"""
+
+import sys
+import os
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stability_browser import StabilityPageBrowser, parse_stability_table
+from clock import VirtualClock
+from helpers import SilentLogger
+
+
+PAGE = """
+<table>
+  <tr><th>项目</th><th>稳定度</th><th>价格</th><th>4倍天数</th></tr>
+  <tr><td>KOGE</td><td>🟢 稳定</td><td>48.0</td><td>0</td></tr>
+  <tr><td>AAA</td><td>🔴 不稳定</td><td>0.5</td><td>10</td></tr>
+  <tr><td>加载中...</td><td></td><td></td><td></td></tr>
+</table>
+"""
+
+
+class FakeDriver:
+    """模拟浏览器驱动"""
+
+    def __init__(self):
+        self.page_source = PAGE
+        self.heap = 10 * 1024 * 1024
+        self.closed = False
+
+    def execute_script(self, script):
+        return self.heap
+
+    def quit(self):
+        self.closed = True
+
+
+class FakeBrowser(StabilityPageBrowser):
+    """不启动Chrome、记录启动次数的页面浏览器"""
+
+    def __init__(self, **settings):
+        super().__init__(SilentLogger(), clock=VirtualClock(), **settings)
+        self.drivers = []
+
+    def start_driver(self):
+        self.drivers.append(FakeDriver())
+        return self.drivers[-1]
+
+    def load_page(self):
+        pass
+
+
+def test_parse_table():
+    """测试页面表格解析为稳定度记录，"不稳定"不会被识别为"稳定\""""
+    records = parse_stability_table(PAGE)
+    print(f"解析结果: {records}")
+    assert [record['project'] for record in records] == ['KOGE', 'AAA']
+    assert records[1]['stability'] == '不稳定'
+    assert records[1]['price'] == 0.5 and records[1]['remaining_days'] == 10.0
+
+
+def test_browser_reused_and_recycled():
+    """测试浏览器只启动一次、有效期内复用结果，达到读取次数或内存上限后重启"""
+    browser = FakeBrowser(max_uses=3, max_heap_mb=100, cache_ttl=30.0)
+
+    assert len(browser.read_stability_table()) == 2
+    browser.clock.current_time += 10
+    browser.read_stability_table()  # 有效期内使用缓存
+    assert len(browser.drivers) == 1 and browser.uses == 1
+
+    for _ in range(2):
+        browser.clock.current_time += 31
+        browser.read_stability_table()
+    assert len(browser.drivers) == 1 and browser.uses == 3
+
+    # 第4次读取超过读取次数上限，重启浏览器
+    browser.clock.current_time += 31
+    browser.read_stability_table()
+    assert len(browser.drivers) == 2 and browser.drivers[0].closed
+
+    # 页面内存超过上限，重启浏览器
+    browser.drivers[-1].heap = 200 * 1024 * 1024
+    browser.clock.current_time += 31
+    browser.read_stability_table()
+    print(f"浏览器启动次数: {len(browser.drivers)}")
+    assert len(browser.drivers) == 3
+
+    browser.close()
+    assert browser.drivers[-1].closed
+
+
+if __name__ == "__main__":
+    test_parse_table()
+    test_browser_reused_and_recycled()
+    print("测试完成")
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试稳定度数据后台刷新（快照读取、条件请求）
+Test Stability Feed Refresher
+"""
+
+import sys
+import os
+import json
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import alpha123
+from alpha123 import Alpha123Client
+from stability_feed import StabilityFeed
+from clock import VirtualClock
+from helpers import SilentLogger
+
+
+FEED = {'items': [
+    {'n': 'KOGE/USDT', 'p': 48.0, 'st': 'green:stable', 'md': 30, 'spr': 0.01},
+    {'n': 'AAA/USDT', 'p': 0.5, 'st': 'green:stable', 'md': 10, 'spr': 0.05},
+]}
+
+
+class FakeResponse:
+    """模拟requests的响应"""
+
+    def __init__(self, status_code, body=b'', headers=None):
+        self.status_code = status_code
+        self.content = body
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class FakeServer:
+    """支持ETag的稳定度数据接口"""
+
+    def __init__(self):
+        self.body = json.dumps(FEED).encode()
+        self.etag = '"v1"'
+        self.requests = 0
+        self.fail = False
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests += 1
+        if self.fail:
+            return FakeResponse(500)
+        if headers.get('If-None-Match') == self.etag:
+            return FakeResponse(304)
+        return FakeResponse(200, self.body, {'ETag': self.etag})
+
+
+class CountingClient(Alpha123Client):
+    """记录解析次数的客户端"""
+
+    def __init__(self):
+        super().__init__(logger=SilentLogger(), alpha_id_map={'AAA': 'ALPHA_1'})
+        self.parse_count = 0
+
+    def parse_stability_feed(self, api_data):
+        self.parse_count += 1
+        return super().parse_stability_feed(api_data)
+
+
+def test_snapshot_and_conditional_refresh():
+    """测试数据未变化时不重新解析，消费方读取快照不发请求"""
+    server = FakeServer()
+    original_get = alpha123.requests.get
+    alpha123.requests.get = server.get
+    try:
+        clock = VirtualClock(1700000000.0)
+        client = CountingClient()
+        feed = StabilityFeed(client, clock=clock, interval=5.0)
+        feed.running = True  # 不启动后台线程，手动刷新
+        client.set_feed(feed)
+        changes = []
+        feed.add_listener(lambda snapshot: changes.append(snapshot.version))
+
+        assert feed.refresh() is True
+        first = feed.get_snapshot()
+        assert [item['project'] for item in first.items] == ['KOGE', 'AAA']
+
+        # 消费方只读快照
+        requests_before = server.requests
+        for _ in range(100):
+            stability_data = client.get_stability_data()
+        assert server.requests == requests_before
+        assert stability_data is first.items
+
+        # 数据未变化：只更新获取时间
+        clock.current_time += 5
+        assert feed.refresh() is False
+        second = feed.get_snapshot()
+        print(f"第一次: v{first.version} {first.fetched_at}，第二次: v{second.version} {second.fetched_at}")
+        assert client.parse_count == 1
+        assert second.version == first.version and second.items is first.items
+        assert second.fetched_at == first.fetched_at + 5
+
+        # 数据变化后重新解析
+        server.body = json.dumps({'items': FEED['items'][:1]}).encode()
+        server.etag = '"v2"'
+        assert feed.refresh() is True
+        assert feed.get_snapshot().version == first.version + 1
+        assert len(feed.get_items()) == 1
+        assert changes == [1, 2]  # 只在数据变化时通知
+
+        # 请求失败时保留旧快照
+        server.fail = True
+        assert feed.refresh() is False
+        assert len(feed.get_items()) == 1
+
+        try:
+            feed.get_items()[0]['project'] = 'BBB'
+            assert False, "快照应为只读"
+        except TypeError:
+            pass
+    finally:
+        alpha123.requests.get = original_get
+
+
+def test_page_fallback_unchanged():
+    """测试接口不可用时读取稳定度页面，页面数据未变化时不增加版本也不通知"""
+    server = FakeServer()
+    server.fail = True
+    original_get = alpha123.requests.get
+    alpha123.requests.get = server.get
+    try:
+        clock = VirtualClock(1700000000.0)
+        client = CountingClient()
+        page_items = client.parse_stability_feed(FEED)
+        client.fetch_stability_data_selenium = lambda: [dict(item) for item in page_items]
+        feed = StabilityFeed(client, clock=clock, interval=5.0)
+        feed.running = True  # 不启动后台线程，手动刷新
+        changes = []
+        feed.add_listener(lambda snapshot: changes.append(snapshot.version))
+
+        assert feed.refresh() is True
+        first = feed.get_snapshot()
+        assert feed.from_page and len(first.items) == 2
+
+        # 页面每次返回内容相同的新列表：只更新获取时间
+        clock.current_time += 5
+        assert feed.refresh() is False
+        second = feed.get_snapshot()
+        assert second.version == first.version and second.items is first.items
+        assert second.fetched_at == first.fetched_at + 5
+
+        # 页面数据变化时才增加版本并通知
+        page_items = page_items[:1]
+        assert feed.refresh() is True
+        assert feed.get_snapshot().version == first.version + 1
+        assert changes == [1, 2]
+    finally:
+        alpha123.requests.get = original_get
+
+
+if __name__ == "__main__":
+    test_snapshot_and_conditional_refresh()
+    test_page_fallback_unchanged()
+    print("测试完成")
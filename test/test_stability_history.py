@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试稳定度历史存储（定长记录、按天分割、区间查询和窗口统计）
+Test Stability History Store
+"""
+
+import sys
+import os
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from stability_history import StabilityHistory, RECORD_SIZE, ST_STABLE, ST_UNSTABLE
+from alpha123 import STABILITY_SPREAD_UNKNOWN
+
+
+ALPHA_ID_MAP = {'AAA': 'ALPHA_1', 'BBB': 'ALPHA_22'}
+
+
+def make_items(aaa_stability, aaa_spread):
+    """生成一份稳定度数据（CCC没有ALPHA代币ID，不记录）"""
+    return [
+        {'project': 'AAA', 'stability': aaa_stability, 'stability_status': '', 'price': 0.5, 'remaining_days': 10.0, 'spread': aaa_spread},
+        {'project': 'BBB', 'stability': '稳定', 'stability_status': '', 'price': 1.5, 'remaining_days': 3.0, 'spread': STABILITY_SPREAD_UNKNOWN},
+        {'project': 'CCC', 'stability': '稳定', 'stability_status': '', 'price': 2.0, 'remaining_days': 1.0, 'spread': 0.01},
+    ]
+
+
+def test_append_query_and_summary():
+    """测试追加、跨天区间查询和按持续时间加权的统计"""
+    with tempfile.TemporaryDirectory() as directory:
+        history = StabilityHistory(directory)
+        day_start = datetime(2024, 5, 1).timestamp()
+
+        # AAA: 0-600秒稳定（价差0.05），600-900秒不稳定（价差0.5），900秒起稳定（价差0.04）
+        assert history.append_snapshot(make_items('稳定', 0.05), ALPHA_ID_MAP, day_start) == 2
+        history.append_snapshot(make_items('不稳定', 0.5), ALPHA_ID_MAP, day_start + 600)
+        history.append_snapshot(make_items('稳定', 0.04), ALPHA_ID_MAP, day_start + 900)
+        # 第二天的文件
+        history.append_snapshot(make_items('稳定', 0.03), ALPHA_ID_MAP, day_start + 86400)
+
+        files = sorted(os.listdir(directory))
+        print(f"数据文件: {files}")
+        assert files == ['20240501.bin', '20240502.bin']
+        assert os.path.getsize(os.path.join(directory, files[0])) == 3 * 2 * RECORD_SIZE
+
+        records = history.query(day_start + 600, day_start + 901, 'ALPHA_1')
+        assert [record.st_code for record in records] == [ST_UNSTABLE, ST_STABLE]
+        assert abs(records[0].spread - 0.5) < 1e-6 and records[0].price == 0.5
+        assert len(history.query(day_start, day_start + 86401)) == 8
+        assert history.query(day_start + 100, day_start + 200) == []
+
+        summary = history.summarize('ALPHA_1', 1200, now=day_start + 1200)
+        print(f"AAA 最近20分钟: {summary}")
+        assert summary['samples'] == 3
+        assert abs(summary['stable_fraction'] - 900 / 1200) < 1e-9
+        assert abs(summary['median_spread'] - 0.05) < 1e-6
+
+        # 价差未知的代币没有中位数
+        bbb = history.summarize(22, 1200, now=day_start + 1200)
+        assert bbb['stable_fraction'] == 1.0 and bbb['median_spread'] is None
+        assert history.summarize('ALPHA_9', 1200, now=day_start + 1200) is None
+
+
+def test_torn_record_is_dropped():
+    """测试写入中断留下的半条记录不影响后续追加"""
+    with tempfile.TemporaryDirectory() as directory:
+        history = StabilityHistory(directory)
+        timestamp = datetime(2024, 5, 1, 12).timestamp()
+        history.append_snapshot(make_items('稳定', 0.05), ALPHA_ID_MAP, timestamp)
+
+        path = history.day_path(datetime(2024, 5, 1).date())
+        with open(path, 'ab') as f:
+            f.write(b'\x00' * 5)
+
+        history.append_snapshot(make_items('不稳定', 0.5), ALPHA_ID_MAP, timestamp + 60)
+        assert os.path.getsize(path) == 4 * RECORD_SIZE
+        records = history.query(timestamp, timestamp + 61, 'ALPHA_1')
+        assert [record.st_code for record in records] == [ST_STABLE, ST_UNSTABLE]
+
+
+if __name__ == "__main__":
+    test_append_query_and_summary()
+    test_torn_record_is_dropped()
+    print("测试完成")
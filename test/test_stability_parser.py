@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试稳定度数据解析（三种格式统一为数值记录）和选币
+Test Stability Feed Parser
+"""
+
+import sys
+import os
+import time
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alpha123 import Alpha123Client
+from helpers import SilentLogger
+
+
+NEW_ITEMS = [
+    {'n': 'AAA/USDT', 'p': '0.5', 'st': 'green:stable', 'md': 10, 'spr': '0.05'},
+    {'n': 'KOGE/USDT', 'p': 48.0, 'st': 'green:stable', 'md': 0, 'spr': 0.9},
+    {'n': 'BBB/USDT', 'p': 1.5, 'st': 'yellow:moderate', 'md': 3, 'spr': 0.01},
+    {'n': 'CCC/USDT', 'p': 2.0, 'st': 'green:stable', 'md': 0, 'spr': 0.02},
+    {'n': 'DDD/USDT', 'p': 3.0, 'st': 'green:stable', 'md': 5, 'spr': 'N/A'},
+]
+
+OLD_ITEMS = [
+    {'display': 'AAA/USDT', 'metrics': {'lastPrice': 0.5}, 'status': {'text': 'stable'}, 'multiplier_days': 10, 'spread': 0.05},
+    {'key': 'KOGE', 'metrics': {'lastPrice': 48.0}, 'status': {'text': 'stable'}, 'multiplier_days': 0},
+]
+
+
+class FixedFeedClient(Alpha123Client):
+    """使用固定稳定度数据的客户端"""
+
+    def __init__(self, stability_data):
+        super().__init__(logger=SilentLogger(), alpha_id_map={'AAA': 'ALPHA_1', 'BBB': 'ALPHA_2', 'CCC': 'ALPHA_3'})
+        self.stability_data = stability_data
+
+    def fetch_stability_data(self):
+        return self.stability_data
+
+
+def test_formats_normalized():
+    """测试三种格式解析为相同结构的数值记录"""
+    client = FixedFeedClient([])
+    wrapped = client.parse_stability_feed({'items': NEW_ITEMS})
+    listed = client.parse_stability_feed(NEW_ITEMS)
+    old = client.parse_stability_feed(OLD_ITEMS)
+
+    print(f"解析结果: {wrapped}")
+    assert wrapped == listed
+    # KOGE排第一，4倍天数为0的其他代币被过滤，其余按价差基点升序，无法解析的排最后
+    assert [item['project'] for item in wrapped] == ['KOGE', 'BBB', 'AAA', 'DDD']
+    aaa = wrapped[2]
+    assert aaa == {
+        'project': 'AAA', 'stability': '稳定', 'stability_status': 'green:stable',
+        'price': 0.5, 'remaining_days': 10.0, 'spread': 0.05
+    }
+    assert [item['project'] for item in old] == ['KOGE', 'AAA']
+    assert old[1]['price'] == 0.5 and old[1]['stability'] == '稳定'
+
+
+def test_top_token_uses_parsed_days():
+    """测试选币读取解析后的4倍天数，KOGE价差基点较大时不影响其他代币"""
+    client = FixedFeedClient([])
+    client.stability_data = client.parse_stability_feed({'items': NEW_ITEMS})
+
+    top = client.get_top_stability_token(max_spread=0.2)
+    print(f"选中代币: {top}")
+    assert top == {'symbol': 'ALPHA_1USDT', 'display_name': 'AAA', 'price': 0.5, 'stability': '稳定', 'spread': 0.05}
+    assert client.get_top_stability_token(max_spread=0.05) is None
+
+
+def test_candidate_index():
+    """测试候选索引每份数据只构建一次，支持排除和前K个查询"""
+    items = [{'n': f'T{i}/USDT', 'p': 1.0, 'st': 'green:stable', 'md': 5, 'spr': i / 100} for i in range(30)]
+    client = FixedFeedClient([])
+    client.alpha_id_map = {f'T{i}': f'ALPHA_{i}' for i in range(30)}
+    client.stability_data = client.parse_stability_feed({'items': items})
+
+    index = client.get_candidate_index(max_spread=0.2)
+    assert client.get_candidate_index(max_spread=0.2) is index
+    assert client.get_candidate_index(max_spread=0.1) is not index
+    assert len(index) == 20
+    assert index.rank('ALPHA_3USDT') == 3 and index.rank('ALPHA_25USDT') is None
+
+    locked = {'ALPHA_0USDT', 'ALPHA_2USDT'}
+    assert index.next_best(locked)['symbol'] == 'ALPHA_1USDT'
+    assert [c['symbol'] for c in index.top(3, locked)] == ['ALPHA_1USDT', 'ALPHA_3USDT', 'ALPHA_4USDT']
+    assert client.get_top_stability_token(max_spread=0.2, exclude=locked)['symbol'] == 'ALPHA_1USDT'
+
+    # 数据更新后重新构建
+    client.stability_data = client.parse_stability_feed({'items': items[5:]})
+    assert client.get_candidate_index(max_spread=0.2).next_best()['symbol'] == 'ALPHA_5USDT'
+
+
+def test_ranking_speed():
+    """测试同一份数据重复选币的耗时"""
+    items = [{'n': f'T{i}/USDT', 'p': 1.0, 'st': 'red:unstable', 'md': 5, 'spr': i / 10000} for i in range(2000)]
+    client = FixedFeedClient([])
+    client.stability_data = client.parse_stability_feed({'items': items})
+
+    started = time.perf_counter()
+    for _ in range(100):
+        client.get_top_stability_token(max_spread=0.2)
+    elapsed = (time.perf_counter() - started) / 100
+    print(f"2000个项目选币平均耗时: {elapsed * 1e6:.1f} 微秒")
+    assert elapsed < 0.001  # 候选索引只在数据变化时构建
+
+
+if __name__ == "__main__":
+    test_formats_normalized()
+    test_top_token_uses_parsed_days()
+    test_candidate_index()
+    test_ranking_speed()
+    print("测试完成")
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试代币符号解析（内存映射、未命中缓存、增量更新）
+Test Symbol Resolver
+"""
+
+import sys
+import os
+import json
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from symbol_resolver import SymbolResolver
+from binance_api import BinanceAPI
+from clock import VirtualClock
+from helpers import SilentLogger
+
+
+class FakeTokenListAPI:
+    """返回可修改代币列表的接口，记录下载次数"""
+
+    def __init__(self, tokens):
+        self.tokens = dict(tokens)
+        self.downloads = 0
+
+    def get_binance_token_list(self):
+        self.downloads += 1
+        return {'success': True, 'data': [{'symbol': name, 'alphaId': alpha_id} for name, alpha_id in self.tokens.items()]}
+
+    def create_alpha_id_map(self, token_list_data):
+        return BinanceAPI.create_alpha_id_map(None, token_list_data)
+
+
+def test_resolve_with_negative_cache_and_merge():
+    """测试未命中缓存避免重复下载，新代币增量合并并写入文件"""
+    with tempfile.TemporaryDirectory() as directory:
+        map_file = os.path.join(directory, 'alphaIdMap.json')
+        with open(map_file, 'w', encoding='utf-8') as f:
+            json.dump({'KOGE': 'ALPHA_22', 'OLD': 'ALPHA_5'}, f)
+
+        clock = VirtualClock(datetime.now().timestamp())
+        api = FakeTokenListAPI({'KOGE': 'ALPHA_22', 'ZKJ': 'ALPHA_9'})
+        resolver = SymbolResolver(api, SilentLogger(), clock=clock, map_file=map_file, miss_ttl=300)
+        resolver.thread = True  # 不启动后台线程，手动推进时间
+        changes = []
+        resolver.add_listener(changes.append)
+
+        # 当天的文件直接加载，不下载
+        assert resolver.load() == {'KOGE': 'ALPHA_22', 'OLD': 'ALPHA_5'}
+        assert api.downloads == 0
+        assert resolver.resolve(' koge ') == 'ALPHA_22'
+        assert resolver.name_for('ALPHA_22') == 'KOGE'
+
+        # 未命中时下载一次并增量合并（下架的OLD保留）
+        assert resolver.resolve('ZKJ') == 'ALPHA_9'
+        assert api.downloads == 1
+        assert resolver.forward == {'KOGE': 'ALPHA_22', 'OLD': 'ALPHA_5', 'ZKJ': 'ALPHA_9'}
+        assert resolver.name_for('ALPHA_9') == 'ZKJ'
+        assert changes == [resolver.forward]
+        with open(map_file, 'r', encoding='utf-8') as f:
+            assert json.load(f) == resolver.forward
+
+        # 输错的名称在有效期内只下载一次
+        for _ in range(5):
+            assert resolver.resolve('KOGEE') is None
+        print(f"代币列表下载次数: {api.downloads}")
+        assert api.downloads == 2
+
+        # 有效期过后新上线的代币可以找到
+        api.tokens['KOGEE'] = 'ALPHA_99'
+        clock.current_time += 301
+        assert resolver.resolve('KOGEE') == 'ALPHA_99'
+        assert api.downloads == 3
+
+        # 代币列表没有变化时不通知、不重写映射
+        assert resolver.refresh() is resolver.forward
+        assert len(changes) == 2
+
+
+def test_missing_file_downloads_once():
+    """测试没有映射文件时同步下载，下载失败时使用默认映射"""
+    with tempfile.TemporaryDirectory() as directory:
+        map_file = os.path.join(directory, 'alphaIdMap.json')
+        clock = VirtualClock(datetime.now().timestamp())
+        api = FakeTokenListAPI({'KOGE': 'ALPHA_22'})
+        resolver = SymbolResolver(api, SilentLogger(), clock=clock, map_file=map_file)
+        resolver.thread = True  # 不启动后台线程
+        assert resolver.load() == {'KOGE': 'ALPHA_22'}
+        assert api.downloads == 1 and os.path.exists(map_file)
+
+        class FailingAPI(FakeTokenListAPI):
+            def get_binance_token_list(self):
+                raise Exception("网络错误")
+
+        fallback = SymbolResolver(FailingAPI({}), SilentLogger(), clock=clock, map_file=os.path.join(directory, 'none.json'))
+        fallback.thread = True
+        assert fallback.load() == {'KOGE': 'ALPHA_22'}
+        assert fallback.resolve('ZKJ') is None
+
+
+if __name__ == "__main__":
+    test_resolve_with_negative_cache_and_merge()
+    test_missing_file_downloads_once()
+    print("测试完成")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试代币状态存储（并发成交累计、只读快照、变化记录）
+Test Token State Store
+"""
+
+import sys
+import os
+import threading
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from token_store import TokenStore
+
+
+def test_concurrent_fill_accounting():
+    """测试多个线程同时累计成交时份额和成交额不丢失"""
+    store = TokenStore()
+    store['ALPHA_1USDT'] = {'display_name': 'AAA', 'price': 1.0}
+
+    def fill():
+        for _ in range(2000):
+            store.add_buy_fill('ALPHA_1USDT', 1.0, 0.5)
+            store.add_sell_fill('ALPHA_1USDT', 0.25, sold_quantity=0.5)
+
+    threads = [threading.Thread(target=fill) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    record = store['ALPHA_1USDT']
+    print(f"份额: {record['last_buy_quantity']}，买单成交额: {record['last_buy_amount']}，卖单成交额: {record['last_sell_amount']}")
+    assert record['last_buy_quantity'] == 8000.0
+    assert record['last_buy_amount'] == 8000.0
+    assert record['last_sell_amount'] == 4000.0
+
+    assert store.reset_round_trip('ALPHA_1USDT') == (8000.0, 8000.0, 4000.0)
+    assert store['ALPHA_1USDT']['last_buy_quantity'] == 0.0
+    assert store.reset_round_trip('ALPHA_2USDT') is None
+
+
+def test_snapshot_is_read_only_copy():
+    """测试快照只读、写入后重建，且不含界面对象等未知字段"""
+    store = TokenStore()
+    store['ALPHA_1USDT'] = {'display_name': 'AAA', 'price': 1.0, 'widgets': {'button': object()}}
+
+    snapshot = store.snapshot()
+    assert store.snapshot() is snapshot  # 没有写入时复用同一个快照
+    assert 'widgets' not in snapshot['ALPHA_1USDT']
+
+    store['ALPHA_1USDT']['price'] = 2.0
+    store['ALPHA_2USDT'] = {'display_name': 'BBB'}
+    assert snapshot['ALPHA_1USDT']['price'] == 1.0
+    assert 'ALPHA_2USDT' not in snapshot
+    assert store.snapshot()['ALPHA_1USDT']['price'] == 2.0
+
+    try:
+        snapshot['ALPHA_1USDT']['price'] = 3.0
+        assert False, "快照应为只读"
+    except TypeError:
+        pass
+
+    try:
+        store['ALPHA_1USDT']['row_ref'] = object()
+        assert False, "代币记录不应保存界面对象"
+    except KeyError:
+        pass
+
+
+def test_drain_changes():
+    """测试只取出上次取出后写入和删除的代币，另一个存储应用变化后内容一致"""
+    store = TokenStore()
+    mirror = TokenStore()
+    store.update({'ALPHA_1USDT': {'display_name': 'AAA'}, 'ALPHA_2USDT': {'display_name': 'BBB'}})
+    mirror.apply_changes(*store.drain_changes())
+    assert store.drain_changes() == ({}, [])
+
+    store['ALPHA_1USDT']['price'] = 2.0
+    store.add_buy_fill('ALPHA_1USDT', 1.0, 2.0)
+    removed_record = store.pop('ALPHA_2USDT')
+    removed_record['price'] = 3.0  # 已删除的记录被写入不算变化
+    changed, removed = store.drain_changes()
+    print(f"变化: {changed}，删除: {removed}")
+    assert list(changed) == ['ALPHA_1USDT'] and changed['ALPHA_1USDT']['last_buy_amount'] == 2.0
+    assert removed == ['ALPHA_2USDT']
+
+    mirror.apply_changes(changed, removed)
+    assert dict(mirror.snapshot()) == dict(store.snapshot())
+
+    store.replace_all({'ALPHA_3USDT': {'display_name': 'CCC'}})
+    changed, removed = store.drain_changes()
+    assert list(changed) == ['ALPHA_3USDT'] and removed == ['ALPHA_1USDT']
+
+
+if __name__ == "__main__":
+    test_concurrent_fill_accounting()
+    test_snapshot_is_read_only_copy()
+    test_drain_changes()
+    print("测试完成")
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试代币表格数据模型（筛选、排序、可见区域和滚动位置）
+Test Token Table
+"""
+
+import sys
+import os
+import time
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from token_table import TokenTableModel, get_row_values
+
+
+def make_tokens(count):
+    """生成测试用的代币快照"""
+    return {
+        f"ALPHA_{i}USDT": {
+            'price': float(count - i),
+            'display_name': f"TOKEN{i}",
+            'last_update': datetime(2024, 1, 2, 10, 0, i % 60),
+            'trade_count': i % 5 + 1,
+            'trade_amount': 0.0,
+            'auto_trading': i == 3,
+        }
+        for i in range(count)
+    }
+
+
+def test_visible_window_and_scroll():
+    """测试只取出可见区域的代币，滚动位置限制在有效范围内"""
+    model = TokenTableModel()
+    model.set_visible_count(20)
+    model.set_data(make_tokens(700))
+
+    rows = model.visible_rows()
+    assert len(rows) == 20 and rows[0][0] == "ALPHA_0USDT"
+    assert rows[3][1] == get_row_values("ALPHA_3USDT", make_tokens(700)["ALPHA_3USDT"])
+
+    model.scroll_by(50)
+    assert model.visible_rows()[0][0] == "ALPHA_50USDT"
+    model.scroll_to(1.0)
+    assert model.first == 680 and model.scroll_fraction() == (680 / 700, 1.0)
+    model.scroll_by(-1000)
+    assert model.first == 0
+
+    # 代币减少后滚动位置回到有效范围
+    model.scroll_to(1.0)
+    model.set_data(make_tokens(30))
+    assert model.first == 10 and len(model.visible_rows()) == 20
+
+
+def test_sort_and_filter():
+    """测试排序和筛选在数据模型中完成"""
+    model = TokenTableModel()
+    model.set_visible_count(10)
+    model.set_data(make_tokens(100))
+
+    model.set_sort(1)  # 按价格升序
+    assert model.visible_rows()[0][0] == "ALPHA_99USDT"
+    model.set_sort(1)  # 再次点击切换为降序
+    assert model.visible_rows()[0][0] == "ALPHA_0USDT"
+    model.set_sort(5)
+    assert model.symbols[-1] == "ALPHA_3USDT"
+
+    # 还没有更新过的代币（更新时间为None）也可以按更新时间排序
+    tokens = make_tokens(3)
+    tokens['ALPHA_1USDT']['last_update'] = None
+    model.set_data(tokens)
+    model.set_sort(2)
+    assert model.symbols[0] == "ALPHA_1USDT"
+    model.set_data(make_tokens(100))
+
+    model.set_filter("token1")
+    print(f"筛选结果: {len(model)} 个")
+    assert len(model) == 11 and all("1" in symbol for symbol in model.symbols)
+    model.set_filter("alpha_42")
+    assert model.symbols == ["ALPHA_42USDT"]
+    model.set_filter("")
+    assert len(model) == 100
+
+
+def test_refresh_cost_is_flat():
+    """测试每次刷新只计算可见行，耗时与代币数量基本无关"""
+    model = TokenTableModel()
+    model.set_visible_count(20)
+    tokens = make_tokens(700)
+
+    started = time.perf_counter()
+    for _ in range(100):
+        model.set_data(tokens)
+        model.visible_rows()
+    elapsed = (time.perf_counter() - started) / 100
+    print(f"700个代币每次刷新耗时: {elapsed * 1000:.2f} 毫秒")
+    assert elapsed < 0.01
+
+
+if __name__ == "__main__":
+    test_visible_window_and_scroll()
+    test_sort_and_filter()
+    test_refresh_cost_is_flat()
+    print("测试完成")
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试交易历史数据库（批量写入、跨天保留统计、分析查询）
+Test Trade History
+"""
+
+import sys
+import os
+import time
+import sqlite3
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import VirtualClock
+from trade_history import TradeHistory, HISTORY_FILE
+
+
+def test_batched_writes_and_queries():
+    """测试记录只放入队列，后台批量写入后分析查询在毫秒级完成"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        history = TradeHistory(os.path.join(tmp_dir, HISTORY_FILE))
+        start = datetime(2024, 1, 2, 0, 0).timestamp()
+
+        count = 20000
+        started = time.perf_counter()
+        for i in range(count):
+            ts = start + i * 30
+            symbol = f"ALPHA_{i % 3}USDT"
+            side = "BUY" if i % 2 == 0 else "SELL"
+            history.record_order({'ts': ts, 'order_id': 1000 + i, 'symbol': symbol, 'side': side,
+                                  'price': '0.5', 'quantity': '2000', 'status': 'success'})
+            history.record_fill(ts + (i % 7), symbol, side, 2000, 1000.0, order_id=1000 + i)
+        elapsed = (time.perf_counter() - started) / (count * 2)
+        print(f"每条记录耗时: {elapsed * 1e6:.1f} 微秒")
+        assert elapsed < 0.0005
+
+        assert history.flush(30.0)
+        history.record_daily('2024-01-02', {'daily_total_amount': 100.0, 'daily_trade_loss': 3.0, 'daily_completed_trades': 2},
+                             {'ALPHA_1USDT': {'daily_total_amount': 60.0, 'daily_trade_loss': 2.0, 'daily_completed_trades': 1},
+                              'ALPHA_2USDT': {'daily_total_amount': 40.0, 'daily_trade_loss': 1.0, 'daily_completed_trades': 1}})
+        history.close()
+
+        started = time.perf_counter()
+        hours = history.volume_per_hour('2024-01-02', '2024-01-02')
+        losses = history.loss_per_token()
+        latency = history.fill_latency(symbol='ALPHA_1USDT')
+        query_ms = (time.perf_counter() - started) * 1000
+        print(f"查询耗时: {query_ms:.1f} 毫秒，延迟分布: {latency}")
+
+        assert len(hours) == 24 and hours[0][0] == '2024-01-02 00:00' and hours[0][1] == 120 * 1000.0
+        assert losses == [('ALPHA_1USDT', 2.0, 60.0, 1), ('ALPHA_2USDT', 1.0, 40.0, 1)]
+        assert latency['count'] == len(range(1, count, 3)) and latency['max'] == 6.0
+        assert sum(latency['histogram'].values()) == latency['count']
+        assert history.daily_history() == [('2024-01-02', 100.0, 3.0, 2)]
+        assert query_ms < 200
+
+        # 日期、代币和订单ID都有索引
+        connection = sqlite3.connect(history.path)
+        indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        connection.close()
+        assert {'idx_orders_order_id', 'idx_fills_date', 'idx_fills_symbol', 'idx_round_trips_date'} <= indexes
+
+
+def test_trader_keeps_history_across_rollover():
+    """测试交易核心记录完成的买卖，跨天归零前的统计保留在交易历史中"""
+    from trader_core import TraderCore
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        clock = VirtualClock(datetime(2024, 1, 2, 23, 50).timestamp())
+        trader = TraderCore(
+            config_file=os.path.join(tmp_dir, "config.json"),
+            log_dir=os.path.join(tmp_dir, "log"),
+            clock=clock
+        )
+        trader.logger.set_listener(lambda log_msg: None)
+
+        trader.config_manager.update_trade_amount(4120.0, 'ALPHA_22USDT')
+        trader.increment_daily_trade_count('ALPHA_22USDT')
+        trader.record_round_trip('ALPHA_22USDT', 111, 222, 2000.0, 1000.0, 999.0)
+
+        clock.current_time = datetime(2024, 1, 3, 0, 0, 5).timestamp()
+        assert trader.daily_completed_trades == 0
+        trader.logger.close()
+
+        history = trader.history
+        print(f"每天的统计: {history.daily_history()}")
+        assert history.daily_history() == [('2024-01-02', 4120.0, 0.0, 1)]
+        assert history.loss_per_token() == [('ALPHA_22USDT', 0.0, 4120.0, 1)]
+        assert history.query("SELECT symbol, buy_order_id, sell_order_id FROM round_trips") == [('ALPHA_22USDT', '111', '222')]
+
+
+if __name__ == "__main__":
+    test_batched_writes_and_queries()
+    test_trader_keeps_history_across_rollover()
+    print("测试完成")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试交易日志（JSONL格式、按天和大小切分、后台压缩、逐行读取）
+Test Trade Journal
+"""
+
+import sys
+import os
+import json
+import tempfile
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from trade_journal import TradeJournal, JOURNAL_FIELDS, make_order_event, iter_events
+
+
+def make_detail(order_id, status='success'):
+    """构造 place_single_order 格式的交易详情"""
+    return {
+        'timestamp': '2024-01-01 10:00:00',
+        'symbol': 'ALPHA_22USDT' if order_id % 2 else 'ALPHA_1USDT',
+        'side': 'BUY',
+        'price': 0.05,
+        'custom_quantity': None,
+        'status': status,
+        'order_id': order_id,
+        'request_params': {
+            'url': 'https://www.binance.com/bapi/defi/v1/private/alpha-trade/order/place',
+            'headers': {'csrftoken': 'secret', 'cookie': 'secret'},
+            'payload': {'baseAsset': 'ALPHA_22', 'quantity': 40, 'price': 0.05},
+        },
+        'response': {'status_code': 200, 'headers': {}, 'text': '{}', 'json': {'code': '000000', 'data': order_id}},
+    }
+
+
+def test_event_schema():
+    """测试事件字段固定且不包含请求头"""
+    event = make_order_event(make_detail(7), 1704074400.0)
+    print(f"事件: {event}")
+    assert tuple(event) == JOURNAL_FIELDS
+    assert event['order_id'] == '7' and event['quantity'] == 40 and event['http_status'] == 200
+    assert 'secret' not in json.dumps(event)
+
+    event = make_order_event({'symbol': 'ALPHA_1USDT', 'status': 'exception', 'error': '超时'}, 1704074400.0)
+    assert tuple(event) == JOURNAL_FIELDS and event['response'] is None and event['order_id'] is None
+
+
+def test_rotation_compression_and_reader():
+    """测试按大小和天切分、旧文件压缩后仍能按顺序读取"""
+    with tempfile.TemporaryDirectory() as log_dir:
+        directory = os.path.join(log_dir, "trade_journal")
+        journal = TradeJournal(directory, max_bytes=2000)
+        day1 = datetime(2024, 1, 1, 10, 0, 0).timestamp()
+        day2 = datetime(2024, 1, 2, 10, 0, 0).timestamp()
+
+        for i in range(20):
+            journal.append(make_order_event(make_detail(i), day1 + i))
+        for i in range(20, 25):
+            journal.append(make_order_event(make_detail(i), day2 + i))
+        journal.close()
+
+        names = sorted(os.listdir(directory))
+        print(f"文件: {names}")
+        assert all(name.endswith('.jsonl.gz') for name in names if '20240101' in name)
+        assert len([name for name in names if '20240101' in name]) > 1
+        assert names[-1] == 'trades-20240102-001.jsonl'
+        for name in names:
+            with open(os.path.join(directory, name), 'rb') as f:
+                size = len(f.read())
+            assert name.endswith('.gz') or size <= 2000
+
+        events = list(iter_events(directory))
+        assert [event['order_id'] for event in events] == [str(i) for i in range(25)]
+        assert len(list(iter_events(directory, start=day2))) == 5
+        assert len(list(iter_events(directory, end=day1 + 10))) == 10
+        assert [event['order_id'] for event in iter_events(directory, symbol='ALPHA_1USDT', start=day2)] == ['20', '22', '24']
+        assert [event['order_id'] for event in iter_events(directory, order_id=13)] == ['13']
+
+        # 重新打开后继续写入当天最后一个文件，写入中断留下的半行被跳过
+        with open(os.path.join(directory, names[-1]), 'ab') as f:
+            f.write(b'{"v":1,"ts":')
+        journal = TradeJournal(directory, max_bytes=2000)
+        journal.append(make_order_event(make_detail(25), day2 + 25))
+        journal.close()
+        assert [event['order_id'] for event in iter_events(directory, start=day2)][-1] == '25'
+        assert sorted(os.listdir(directory)) == names
+
+
+if __name__ == "__main__":
+    test_event_schema()
+    test_rotation_compression_and_reader()
+    print("测试完成")
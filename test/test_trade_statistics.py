@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试交易统计（并发累加、按代币细分、跨天归零）
+Test Trade Statistics
+"""
+
+import sys
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+# 添加父目录到路径，以便导入模块
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from clock import VirtualClock
+from trade_statistics import TradeStatistics, AMOUNT, LOSS, TRADES
+from config_manager import ConfigManager
+
+
+def test_concurrent_updates():
+    """测试多个线程同时累加不会丢失数据，并按代币细分"""
+    statistics = TradeStatistics(clock=VirtualClock(datetime(2024, 1, 2, 10, 0).timestamp()))
+
+    def worker(symbol):
+        for _ in range(2000):
+            statistics.add_amount(1.0, symbol)
+            statistics.add_loss(0.5, symbol)
+            statistics.increment_trades(symbol)
+
+    threads = [threading.Thread(target=worker, args=(f"ALPHA_{i % 4}USDT",)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    snapshot = statistics.snapshot()
+    print(f"统计快照: {snapshot}")
+    assert snapshot[AMOUNT] == 16000.0 and snapshot[LOSS] == 8000.0 and snapshot[TRADES] == 16000
+    symbols = statistics.symbol_snapshot()
+    assert len(symbols) == 4
+    assert symbols['ALPHA_0USDT'] == {AMOUNT: 4000.0, LOSS: 2000.0, TRADES: 4000}
+
+
+def test_rollover_resets_and_notifies():
+    """测试跨过午夜时归零并调用跨天回调，恢复前一天的数据时立即归零"""
+    clock = VirtualClock(datetime(2024, 1, 2, 23, 59).timestamp())
+    statistics = TradeStatistics(clock=clock)
+    events = []
+    statistics.add_rollover_listener(lambda date, previous: events.append((date, previous)))
+
+    statistics.add_amount(4120.0, 'ALPHA_22USDT')
+    statistics.increment_trades('ALPHA_22USDT')
+    assert statistics.check_rollover() is False
+
+    clock.current_time = datetime(2024, 1, 3, 0, 0, 1).timestamp()
+    assert statistics.get(AMOUNT) == 0.0
+    assert statistics.get_date() == '2024-01-03'
+    assert statistics.symbol_snapshot() == {}
+    print(f"跨天回调: {events}")
+    assert len(events) == 1
+    assert events[0][0] == '2024-01-02' and events[0][1][AMOUNT] == 4120.0 and events[0][1][TRADES] == 1
+
+    # 恢复今天的数据保留，恢复前一天的数据归零
+    assert statistics.restore('2024-01-03', 100.0, 1.0, 2) is False
+    assert statistics.get(TRADES) == 2
+    assert statistics.restore('2024-01-01', 100.0, 1.0, 2) is True
+    assert statistics.get(TRADES) == 0
+    assert len(events) == 2
+
+
+def test_mirror_does_not_roll_over():
+    """测试镜像统计（界面进程）跨过午夜时不归零、不调用跨天回调，只接收写入的数值"""
+    clock = VirtualClock(datetime(2024, 1, 2, 23, 59).timestamp())
+    statistics = TradeStatistics(clock=clock)
+    events = []
+    statistics.add_rollover_listener(lambda date, previous: events.append((date, previous)))
+    statistics.set_mirror()
+
+    statistics.set_value(AMOUNT, 4120.0)
+    clock.current_time = datetime(2024, 1, 3, 0, 0, 1).timestamp()
+    assert statistics.get(AMOUNT) == 4120.0
+    assert statistics.restore('2024-01-01', 100.0, 1.0, 2) is False
+    assert events == []
+
+    # 交易引擎跨天归零后发来的数值
+    statistics.set_value(AMOUNT, 0.0)
+    assert statistics.snapshot()[AMOUNT] == 0.0
+
+
+def test_config_manager_and_trader_share_statistics():
+    """测试配置管理器和交易核心读写同一份统计数据，并写入配置文件"""
+    from trader_core import TraderCore
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        trader = TraderCore(
+            config_file=os.path.join(tmp_dir, "config.json"),
+            log_dir=os.path.join(tmp_dir, "log")
+        )
+        trader.logger.set_listener(lambda log_msg: None)
+        trader.alarm_played_today = True
+
+        trader.config_manager.update_trade_amount(1030.0, 'ALPHA_1USDT')
+        trader.increment_daily_trade_count('ALPHA_1USDT')
+        trader.daily_trade_loss = 1.5
+        assert trader.daily_total_amount == trader.config_manager.daily_total_amount == 1030.0
+        assert trader.config_manager.daily_completed_trades == 1
+        assert trader.config_manager.daily_trade_loss == 1.5
+        assert trader.get_statistics_snapshot()['daily_completed_trades'] == 1
+
+        trader.config_manager.flush_config()
+        reloaded = ConfigManager(config_file=os.path.join(tmp_dir, "config.json"))
+        reloaded.load_config()
+        assert reloaded.daily_total_amount == 1030.0 and reloaded.daily_completed_trades == 1
+
+        # 跨天时统计数据归零，闹钟标志同时重置
+        trader.statistics.restore('2000-01-01', 1030.0, 1.5, 1)
+        assert trader.daily_completed_trades == 0
+        assert trader.alarm_played_today is False
+        trader.logger.close()
+
+
+if __name__ == "__main__":
+    test_concurrent_updates()
+    test_rollover_resets_and_notifies()
+    test_mirror_does_not_roll_over()
+    test_config_manager_and_trader_share_statistics()
+    print("测试完成")
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+测试无界面交易守护进程
+Test Headless Trading Daemon
+"""
+
+import sys
+import os
+import json
+import subprocess
+import tempfile
+
+# 添加父目录到路径，以便导入模块
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+from trading_daemon import load_settings, DEFAULT_SETTINGS
+
+
+def test_daemon_does_not_import_tkinter():
+    """测试守护进程及交易引擎模块不会导入tkinter"""
+    code = (
+        "import sys, trading_daemon, trading_engine, order_handler, logger; "
+        "print('tkinter' in sys.modules)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT_DIR, capture_output=True, text=True)
+    print(f"导入结果: {result.stdout.strip()} {result.stderr.strip()}")
+    assert result.returncode == 0
+    assert result.stdout.strip() == "False"
+
+
+def test_load_settings_priority():
+    """测试设置合并顺序：默认值 < 配置文件 < 命令行"""
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        daemon_config = os.path.join(tmp_dir, "daemon.json")
+        with open(daemon_config, 'w', encoding='utf-8') as f:
+            json.dump({'mode': 'scheduled', 'schedule': '09:30', 'count': 8}, f)
+
+        settings = load_settings(['--daemon-config', daemon_config, '--count', '4', '--symbols', 'KOGE,ZKJ'])
+        print(f"合并后的设置: {settings}")
+
+        assert settings['mode'] == 'scheduled'
+        assert settings['schedule'] == '09:30'
+        assert settings['count'] == 4
+        assert settings['symbols'] == ['KOGE', 'ZKJ']
+        assert settings['log_dir'] == DEFAULT_SETTINGS['log_dir']
+
+
+if __name__ == "__main__":
+    test_daemon_does_not_import_tkinter()
+    test_load_settings_priority()
+    print("测试完成")
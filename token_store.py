@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代币状态存储模块
+Token State Store Module for Binance Auto Trade System
+
+代币数据会被界面回调、多个自动交易线程、订单处理器和清仓线程同时读写。
+所有写操作都在存储的锁内完成，成交累计（份额、买单成交额、卖单成交额）用原子方法一次更新；
+每次写入后作废快照，读取方拿到的是按需重建的只读快照，读取时不需要加锁。
+存储同时记录写入过和删除的代币，交易引擎进程只把变化的部分发送给界面进程。
+界面对象（输入框、按钮、行控件）不放在这里，由界面自己保存。
+"""
+
+import threading
+from types import MappingProxyType
+
+
+# 代币数据字段及默认值（顺序即快照中的字段顺序）
+TOKEN_FIELDS = (
+    ('price', 0.0),
+    ('last_update', None),
+    ('display_name', ''),
+    ('trade_count', 1),
+    ('trade_amount', 0.0),
+    ('auto_trading', False),
+    ('change_24h', 0.0),
+    ('last_buy_quantity', 0.0),  # 累计买单份额
+    ('last_buy_amount', 0.0),  # 累计买单成交额
+    ('last_sell_amount', 0.0),  # 累计卖单成交额
+)
+
+FIELD_NAMES = tuple(name for name, _ in TOKEN_FIELDS)
+
+
+class TokenRecord:
+    """
+    单个代币的数据记录（固定字段，__slots__ 存储）
+
+    兼容原来的字典写法（record['price']、record.get('price')），
+    通过下标的写入会经过所属存储的锁并作废快照。
+    """
+
+    __slots__ = FIELD_NAMES + ('_store', '_symbol')
+
+    def __init__(self, store=None, symbol=None, **fields):
+        self._store = store
+        self._symbol = symbol
+        for name, default in TOKEN_FIELDS:
+            setattr(self, name, fields.get(name, default))
+
+    def __getitem__(self, key):
+        if key not in FIELD_NAMES:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in FIELD_NAMES:
+            raise KeyError(key)
+        if self._store is None:
+            setattr(self, key, value)
+            return
+        with self._store.lock:
+            setattr(self, key, value)
+            self._store.invalidate(self._symbol)
+
+    def __contains__(self, key):
+        return key in FIELD_NAMES
+
+    def __iter__(self):
+        return iter(FIELD_NAMES)
+
+    def get(self, key, default=None):
+        """读取字段，未知字段返回默认值"""
+        if key not in FIELD_NAMES:
+            return default
+        return getattr(self, key)
+
+    def keys(self):
+        return FIELD_NAMES
+
+    def items(self):
+        return [(name, getattr(self, name)) for name in FIELD_NAMES]
+
+    def to_dict(self):
+        """转换为普通字典"""
+        return {name: getattr(self, name) for name in FIELD_NAMES}
+
+
+class TokenStore:
+    """代币状态存储类 - 加锁写入、原子成交累计、无锁读取的只读快照"""
+
+    def __init__(self):
+        """初始化代币状态存储"""
+        self.lock = threading.RLock()
+        self.records = {}  # {交易对符号: TokenRecord}
+        self._snapshot = None  # 缓存的只读快照，写入后置为None
+        self.changed = set()  # 上次取出变化后写入过的交易对符号
+        self.removed = set()  # 上次取出变化后删除的交易对符号
+
+    def invalidate(self, symbol=None):
+        """
+        作废快照并记录写入过的代币（调用方需持有锁）
+
+        Args:
+            symbol: 写入的交易对符号
+        """
+        self._snapshot = None
+        if symbol in self.records:  # 已删除的记录被写入时不算变化
+            self.changed.add(symbol)
+            self.removed.discard(symbol)
+
+    def mark_removed(self, symbols):
+        """作废快照并记录删除的代币（调用方需持有锁）"""
+        self._snapshot = None
+        for symbol in symbols:
+            self.changed.discard(symbol)
+            self.removed.add(symbol)
+
+    def make_record(self, symbol, data):
+        """把字典或记录转换为属于本存储的记录（忽略界面对象等未知字段）"""
+        if isinstance(data, TokenRecord):
+            data = data.to_dict()
+        return TokenRecord(self, symbol, **{name: data[name] for name in FIELD_NAMES if name in data})
+
+    # ==================== 字典兼容接口 ====================
+
+    def __contains__(self, symbol):
+        return symbol in self.records
+
+    def __getitem__(self, symbol):
+        return self.records[symbol]
+
+    def __setitem__(self, symbol, data):
+        record = self.make_record(symbol, data)
+        with self.lock:
+            self.records[symbol] = record
+            self.invalidate(symbol)
+
+    def __delitem__(self, symbol):
+        with self.lock:
+            del self.records[symbol]
+            self.mark_removed([symbol])
+
+    def __len__(self):
+        return len(self.records)
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def get(self, symbol, default=None):
+        return self.records.get(symbol, default)
+
+    def keys(self):
+        with self.lock:
+            return list(self.records)
+
+    def values(self):
+        with self.lock:
+            return list(self.records.values())
+
+    def items(self):
+        """返回 (交易对符号, 记录) 列表，遍历期间其他线程增删代币不会出错"""
+        with self.lock:
+            return list(self.records.items())
+
+    def pop(self, symbol, default=None):
+        with self.lock:
+            if symbol not in self.records:
+                return default
+            record = self.records.pop(symbol)
+            self.mark_removed([symbol])
+            return record
+
+    def clear(self):
+        with self.lock:
+            self.mark_removed(list(self.records))
+            self.records.clear()
+
+    def update(self, tokens):
+        """批量写入 {交易对符号: 代币数据}"""
+        records = {symbol: self.make_record(symbol, data) for symbol, data in tokens.items()}
+        with self.lock:
+            self.records.update(records)
+            for symbol in records:
+                self.invalidate(symbol)
+
+    def replace_all(self, tokens):
+        """用 {交易对符号: 代币数据} 整体替换存储内容（如加载常驻代币）"""
+        records = {symbol: self.make_record(symbol, data) for symbol, data in tokens.items()}
+        with self.lock:
+            self.mark_removed([symbol for symbol in self.records if symbol not in records])
+            self.records = records
+            for symbol in records:
+                self.invalidate(symbol)
+
+    def apply_changes(self, changed, removed):
+        """
+        应用另一个存储取出的变化（界面进程收到交易引擎进程发来的代币变化时调用）
+
+        Args:
+            changed: {交易对符号: 代币数据}，写入过的代币的最新数据
+            removed: 删除的交易对符号列表
+        """
+        records = {symbol: self.make_record(symbol, data) for symbol, data in changed.items()}
+        with self.lock:
+            for symbol in removed:
+                self.records.pop(symbol, None)
+            self.mark_removed(removed)
+            self.records.update(records)
+            for symbol in records:
+                self.invalidate(symbol)
+
+    def drain_changes(self):
+        """
+        取出上次取出之后的变化（交易引擎进程合并发送给界面进程）
+
+        Returns:
+            tuple: ({交易对符号: 代币数据字典}, [删除的交易对符号])，没有变化时都为空
+        """
+        with self.lock:
+            changed = {symbol: self.records[symbol].to_dict() for symbol in self.changed if symbol in self.records}
+            removed = sorted(self.removed)
+            self.changed = set()
+            self.removed = set()
+        return changed, removed
+
+    # ==================== 原子更新 ====================
+
+    def set_fields(self, symbol, **fields):
+        """
+        同时更新一个代币的多个字段
+
+        Args:
+            symbol: 交易对符号
+            **fields: 字段名和新值
+
+        Returns:
+            bool: 代币存在返回True
+        """
+        with self.lock:
+            record = self.records.get(symbol)
+            if record is None:
+                return False
+            for key, value in fields.items():
+                if key not in FIELD_NAMES:
+                    raise KeyError(key)
+                setattr(record, key, value)
+            self.invalidate(symbol)
+            return True
+
+    def add_buy_fill(self, symbol, quantity, quote):
+        """
+        累计一笔买单成交的份额和成交额
+
+        Args:
+            symbol: 交易对符号
+            quantity: 成交数量
+            quote: 成交额（USDT）
+
+        Returns:
+            tuple: (原份额, 新份额, 原买单成交额, 新买单成交额)
+        """
+        with self.lock:
+            record = self.records[symbol]
+            old_quantity = record.last_buy_quantity
+            old_amount = record.last_buy_amount
+            record.last_buy_quantity = old_quantity + quantity
+            record.last_buy_amount = old_amount + quote
+            self.invalidate(symbol)
+            return old_quantity, record.last_buy_quantity, old_amount, record.last_buy_amount
+
+    def add_sell_fill(self, symbol, quote, sold_quantity=0.0):
+        """
+        累计一笔卖单成交额，并可同时从持有份额中扣除已卖出的数量
+
+        Args:
+            symbol: 交易对符号
+            quote: 成交额（USDT）
+            sold_quantity: 要从持有份额中扣除的数量（默认不扣除）
+
+        Returns:
+            tuple: (原卖单成交额, 新卖单成交额, 原份额, 新份额)
+        """
+        with self.lock:
+            record = self.records[symbol]
+            old_amount = record.last_sell_amount
+            old_quantity = record.last_buy_quantity
+            record.last_sell_amount = old_amount + quote
+            record.last_buy_quantity = old_quantity - sold_quantity
+            self.invalidate(symbol)
+            return old_amount, record.last_sell_amount, old_quantity, record.last_buy_quantity
+
+    def reset_round_trip(self, symbol):
+        """
+        清空一轮买卖累计的份额和成交额
+
+        Args:
+            symbol: 交易对符号
+
+        Returns:
+            tuple: 清空前的 (买单份额, 买单成交额, 卖单成交额)，代币不存在返回None
+        """
+        with self.lock:
+            record = self.records.get(symbol)
+            if record is None:
+                return None
+            previous = (record.last_buy_quantity, record.last_buy_amount, record.last_sell_amount)
+            record.last_buy_quantity = 0.0
+            record.last_buy_amount = 0.0
+            record.last_sell_amount = 0.0
+            self.invalidate(symbol)
+            return previous
+
+    # ==================== 快照 ====================
+
+    def snapshot(self):
+        """
+        获取只读快照（写入时复制：没有新的写入时重复返回同一个快照）
+
+        Returns:
+            MappingProxyType: {交易对符号: 只读的代币数据}
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+
+        with self.lock:
+            if self._snapshot is None:
+                self._snapshot = MappingProxyType({
+                    symbol: MappingProxyType(record.to_dict())
+                    for symbol, record in self.records.items()
+                })
+            return self._snapshot
@@ -0,0 +1,453 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+代币表格模块
+Token Table Module for Binance Auto Trade System
+
+主界面的代币表格只为可见区域创建行组件（行数由表格高度决定，与代币数量无关），
+滚动时把同一批行组件重新绑定到其他代币，只修改发生变化的字段。
+排序、筛选和滚动位置都在数据模型（TokenTableModel）中计算，不需要为不可见的代币创建组件，
+监控10个还是700个代币，组件数量和每次刷新的耗时都基本不变。
+"""
+
+import math
+import tkinter as tk
+from datetime import datetime
+from tkinter import ttk
+
+
+# 表格列（标题、宽度）
+COLUMNS = [
+    ('代币', 120),
+    ('最新价格 (USDT)', 200),
+    ('更新时间', 120),
+    ('交易次数', 100),
+    ('成交额 (USDT)', 120),
+    ('自动交易', 100),
+]
+ROW_HEIGHT = 30  # 行高（像素）
+
+# 各列的排序键（参数为交易对符号和代币数据）
+SORT_KEYS = [
+    lambda symbol, data: data.get('display_name', symbol).lower(),
+    lambda symbol, data: data.get('price', 0.0),
+    lambda symbol, data: data.get('last_update') or datetime.min,  # 还没有更新过的代币排在最前
+    lambda symbol, data: data.get('trade_count', 1),
+    lambda symbol, data: data.get('trade_amount', 0.0),
+    lambda symbol, data: data.get('auto_trading', False),
+]
+
+
+def get_row_values(symbol, data):
+    """
+    计算表格行显示的内容
+
+    Args:
+        symbol: 交易对符号
+        data: 代币数据
+
+    Returns:
+        tuple: (代币名称, 价格文本, 更新时间, 交易次数, 成交额, 是否自动交易)
+    """
+    last_update = data.get('last_update')
+    # 在价格文本后添加可点击的刷新标识
+    return (
+        data.get('display_name', symbol),
+        f"${data.get('price', 0.0):.8f} 🔄",
+        last_update.strftime("%H:%M:%S") if last_update else "",
+        data.get('trade_count', 1),
+        data.get('trade_amount', 0.0),
+        data.get('auto_trading', False),
+    )
+
+
+def get_auto_button_style(auto_trading):
+    """
+    获取自动交易按钮的文字和颜色
+
+    Returns:
+        tuple: (按钮文字, 背景颜色)
+    """
+    if auto_trading:
+        return "停止", '#e74c3c'
+    return "开始", '#27ae60'
+
+
+class TokenTableModel:
+    """代币表格数据模型 - 筛选、排序和滚动位置（不涉及界面组件）"""
+
+    def __init__(self):
+        """初始化数据模型"""
+        self.data = {}          # 最近一次的代币快照 {交易对符号: 代币数据}
+        self.symbols = []       # 筛选、排序后的交易对符号
+        self.filter_text = ""
+        self.sort_column = None  # 排序列（None表示按添加顺序）
+        self.sort_reverse = False
+        self.first = 0          # 第一行可见的代币在 symbols 中的位置
+        self.visible_count = 0  # 可见区域能显示的行数
+
+    def __len__(self):
+        return len(self.symbols)
+
+    def set_data(self, tokens):
+        """
+        更新代币数据并重新筛选、排序
+
+        Args:
+            tokens: 代币快照 {交易对符号: 代币数据}
+        """
+        self.data = tokens
+        self.apply()
+
+    def set_filter(self, text):
+        """
+        设置筛选文字（匹配代币名称或交易对符号，不区分大小写）
+
+        Args:
+            text: 筛选文字，空字符串表示显示全部
+        """
+        self.filter_text = text.strip().lower()
+        self.first = 0
+        self.apply()
+
+    def set_sort(self, column):
+        """
+        按某一列排序（回到第一行），再次选择同一列时切换升序/降序
+
+        Args:
+            column: 列序号（见 COLUMNS）
+        """
+        if self.sort_column == column:
+            self.sort_reverse = not self.sort_reverse
+        else:
+            self.sort_column = column
+            self.sort_reverse = False
+        self.first = 0
+        self.apply()
+
+    def apply(self):
+        """按当前的筛选和排序条件生成显示顺序"""
+        symbols = list(self.data)
+        if self.filter_text:
+            symbols = [symbol for symbol in symbols
+                       if self.filter_text in symbol.lower()
+                       or self.filter_text in str(self.data[symbol].get('display_name', '')).lower()]
+        if self.sort_column is not None:
+            sort_key = SORT_KEYS[self.sort_column]
+            symbols.sort(key=lambda symbol: sort_key(symbol, self.data[symbol]), reverse=self.sort_reverse)
+        self.symbols = symbols
+        self.clamp()
+
+    def set_visible_count(self, count):
+        """设置可见区域能显示的行数"""
+        self.visible_count = max(0, count)
+        self.clamp()
+
+    def clamp(self):
+        """保证滚动位置在有效范围内（最后一页填满可见区域）"""
+        self.first = max(0, min(self.first, len(self.symbols) - self.visible_count))
+
+    def scroll_to(self, fraction):
+        """
+        滚动到指定位置
+
+        Args:
+            fraction: 0到1之间的比例（滚动条的位置）
+        """
+        self.first = int(round(fraction * len(self.symbols)))
+        self.clamp()
+
+    def scroll_by(self, rows):
+        """
+        滚动若干行
+
+        Args:
+            rows: 行数（负数向上）
+        """
+        self.first += rows
+        self.clamp()
+
+    def scroll_fraction(self):
+        """
+        获取滚动条的显示范围
+
+        Returns:
+            tuple: (开始比例, 结束比例)
+        """
+        if not self.symbols:
+            return 0.0, 1.0
+        total = len(self.symbols)
+        return self.first / total, min(1.0, (self.first + self.visible_count) / total)
+
+    def visible_rows(self):
+        """
+        获取可见区域中的代币
+
+        Returns:
+            list: [(交易对符号, 显示内容), ...]，最多 visible_count 个
+        """
+        return [(symbol, get_row_values(symbol, self.data[symbol]))
+                for symbol in self.symbols[self.first:self.first + self.visible_count]]
+
+
+class TokenRow:
+    """表格行类 - 一组可重复使用的行组件，滚动时绑定到不同的代币"""
+
+    def __init__(self, table):
+        """
+        创建行组件（绑定代币时才放到可见区域）
+
+        Args:
+            table: 所属的 TokenTable
+        """
+        self.table = table
+        self.trader = table.trader
+        self.symbol = None
+        self.values = None
+        self.editing_symbol = None  # 输入框获得焦点时绑定的代币（提交时使用，避免滚动后提交到其他代币）
+
+        self.frame = tk.Frame(table.body, bg='white', height=ROW_HEIGHT)
+        widths = [width for _, width in COLUMNS]
+        x = [sum(widths[:i]) for i in range(len(widths))]
+
+        # 代币名称
+        self.token_label = tk.Label(self.frame, bg='white', font=('Arial', 9))
+        self.token_label.place(x=x[0], y=0, width=widths[0], height=ROW_HEIGHT)
+
+        # 价格（可点击）
+        self.price_label = tk.Label(self.frame, bg='white', font=('Arial', 9), cursor='hand2')
+        self.price_label.place(x=x[1], y=0, width=widths[1], height=ROW_HEIGHT)
+        self.price_label.bind('<Button-1>', lambda e: self.symbol and self.trader.refresh_single_token(self.symbol))
+
+        # 更新时间
+        self.time_label = tk.Label(self.frame, bg='white', font=('Arial', 9))
+        self.time_label.place(x=x[2], y=0, width=widths[2], height=ROW_HEIGHT)
+
+        # 交易次数输入框
+        self.count_entry = tk.Entry(self.frame, width=8, font=('Arial', 9), justify='center')
+        self.count_entry.place(x=x[3], y=2, width=widths[3] - 4, height=26)
+        self.bind_entry(self.count_entry, self.trader.update_trade_count_from_entry)
+
+        # 成交额输入框
+        self.amount_entry = tk.Entry(self.frame, width=10, font=('Arial', 9), justify='center')
+        self.amount_entry.place(x=x[4], y=2, width=widths[4] - 4, height=26)
+        self.bind_entry(self.amount_entry, self.trader.update_trade_amount_from_entry)
+
+        # 自动交易按钮（添加按钮按下效果）
+        self.auto_button = tk.Button(self.frame, width=6, font=('Arial', 9, 'bold'), fg='white', relief='raised', bd=2)
+        self.auto_button.place(x=x[5], y=2, width=widths[5] - 4, height=26)
+        self.auto_button.bind('<Button-1>', lambda e: self.trader.on_button_press(self.auto_button))
+        self.auto_button.bind('<ButtonRelease-1>', lambda e: self.symbol and self.trader.on_button_release(self.auto_button, self.symbol))
+
+        for widget in (self.frame, self.token_label, self.price_label, self.time_label, self.auto_button):
+            table.bind_scroll(widget)
+
+    def bind_entry(self, entry, submit):
+        """绑定输入框的提交事件（回车或失去焦点）"""
+        def on_focus_in(event):
+            self.editing_symbol = self.symbol
+
+        def on_return(event):
+            if self.editing_symbol:
+                submit(self.editing_symbol, entry.get())
+
+        def on_focus_out(event):
+            on_return(event)
+            self.editing_symbol = None
+
+        entry.bind('<FocusIn>', on_focus_in)
+        entry.bind('<Return>', on_return)
+        entry.bind('<FocusOut>', on_focus_out)
+
+    def show(self, symbol, values):
+        """
+        显示一个代币，只修改发生变化的组件
+
+        Args:
+            symbol: 交易对符号
+            values: get_row_values 返回的显示内容
+        """
+        previous = self.values or (None,) * len(values)
+        rebound = symbol != self.symbol
+        if rebound and self.editing_symbol:
+            # 正在编辑的输入框滚出可见区域：先提交到原来的代币
+            focused = self.frame.focus_get()
+            for entry, submit in ((self.count_entry, self.trader.update_trade_count_from_entry),
+                                  (self.amount_entry, self.trader.update_trade_amount_from_entry)):
+                if entry is focused:
+                    submit(self.editing_symbol, entry.get())
+            self.editing_symbol = None
+            self.table.body.focus_set()
+        if not rebound and values == previous:
+            return
+
+        display_name, price_text, last_update, trade_count, trade_amount, auto_trading = values
+        if display_name != previous[0]:
+            self.token_label.config(text=display_name)
+        if price_text != previous[1]:
+            self.price_label.config(text=price_text)
+        if last_update != previous[2]:
+            self.time_label.config(text=last_update)
+
+        # 用户正在编辑的输入框不覆盖，保留上次显示的值，下次刷新时再比较
+        focused = None if rebound else self.frame.focus_get()
+        if trade_count != previous[3]:
+            if self.count_entry is focused:
+                trade_count = previous[3]
+            else:
+                set_entry_text(self.count_entry, str(trade_count))
+        if trade_amount != previous[4]:
+            if self.amount_entry is focused:
+                trade_amount = previous[4]
+            else:
+                set_entry_text(self.amount_entry, f"{trade_amount:.2f}")
+
+        if auto_trading != previous[5]:
+            button_text, button_color = get_auto_button_style(auto_trading)
+            self.auto_button.config(text=button_text, bg=button_color)
+
+        self.symbol = symbol
+        self.values = (display_name, price_text, last_update, trade_count, trade_amount, auto_trading)
+
+    def hide(self):
+        """不显示任何代币（可见区域比代币多时）"""
+        if self.symbol is not None:
+            self.frame.place_forget()
+            self.symbol = None
+            self.values = None
+
+    def place(self, index):
+        """放到可见区域中的指定位置"""
+        self.frame.place(x=0, y=index * ROW_HEIGHT, relwidth=1.0, height=ROW_HEIGHT)
+
+
+def set_entry_text(entry, text):
+    """替换输入框的内容"""
+    entry.delete(0, 'end')
+    entry.insert(0, text)
+
+
+class TokenTable:
+    """代币表格类 - 只为可见区域创建行组件，滚动时重复使用"""
+
+    def __init__(self, parent, trader):
+        """
+        创建表头、筛选框和表格区域
+
+        Args:
+            parent: 父容器
+            trader: BinanceTrader实例（行组件的事件回调）
+        """
+        self.trader = trader
+        self.model = TokenTableModel()
+        self.rows = []  # 行组件池，数量等于可见行数
+
+        # 筛选框
+        filter_frame = tk.Frame(parent, bg='#f0f0f0')
+        filter_frame.pack(fill='x')
+        tk.Label(filter_frame, text="筛选:", bg='#f0f0f0', font=('Arial', 9)).pack(side='left')
+        self.filter_var = tk.StringVar()
+        self.filter_entry = tk.Entry(filter_frame, textvariable=self.filter_var, width=20, font=('Arial', 9))
+        self.filter_entry.pack(side='left', padx=5)
+        self.filter_entry.bind('<KeyRelease>', lambda e: self.set_filter(self.filter_var.get()))
+        self.count_label = tk.Label(filter_frame, text="", bg='#f0f0f0', fg='#7f8c8d', font=('Arial', 9))
+        self.count_label.pack(side='left')
+
+        # 表头（点击排序）
+        header_frame = tk.Frame(parent, bg='#e0e0e0', height=ROW_HEIGHT)
+        header_frame.pack(fill='x')
+        header_frame.pack_propagate(False)
+        self.header_labels = []
+        x = 0
+        for column, (header, width) in enumerate(COLUMNS):
+            label = tk.Label(header_frame, text=header, bg='#e0e0e0', font=('Arial', 10, 'bold'), cursor='hand2')
+            label.place(x=x, y=0, width=width, height=ROW_HEIGHT)
+            label.bind('<Button-1>', lambda e, column=column: self.set_sort(column))
+            self.header_labels.append(label)
+            x += width
+
+        # 表格内容区域和滚动条（滚动条直接控制数据模型的滚动位置）
+        content_frame = tk.Frame(parent, bg='white')
+        content_frame.pack(fill='both', expand=True)
+        self.scrollbar = ttk.Scrollbar(content_frame, orient='vertical', command=self.on_scrollbar)
+        self.scrollbar.pack(side='right', fill='y')
+        self.body = tk.Frame(content_frame, bg='white')
+        self.body.pack(side='left', fill='both', expand=True)
+        self.body.bind('<Configure>', self.on_resize)
+        self.bind_scroll(self.body)
+
+    def bind_scroll(self, widget):
+        """绑定鼠标滚轮（Windows/macOS 使用 MouseWheel，Linux 使用 Button-4/5）"""
+        widget.bind('<MouseWheel>', lambda e: self.scroll(-1 if e.delta > 0 else 1, 'units'))
+        widget.bind('<Button-4>', lambda e: self.scroll(-1, 'units'))
+        widget.bind('<Button-5>', lambda e: self.scroll(1, 'units'))
+
+    def refresh(self, tokens):
+        """
+        用新的代币快照刷新表格（只更新可见行中发生变化的字段）
+
+        Args:
+            tokens: 代币快照 {交易对符号: 代币数据}
+        """
+        self.model.set_data(tokens)
+        self.render()
+
+    def render(self):
+        """把可见区域中的代币绑定到行组件"""
+        visible = self.model.visible_rows()
+        for index, row in enumerate(self.rows):
+            if index < len(visible):
+                if row.symbol is None:
+                    row.place(index)
+                row.show(*visible[index])
+            else:
+                row.hide()
+        self.scrollbar.set(*self.model.scroll_fraction())
+        total = len(self.model.data)
+        shown = len(self.model)
+        self.count_label.config(text=f"{shown}/{total}" if shown != total else f"共 {total} 个")
+
+    def on_resize(self, event):
+        """表格高度变化时调整行组件数量"""
+        count = max(1, math.ceil(event.height / ROW_HEIGHT))
+        while len(self.rows) < count:
+            self.rows.append(TokenRow(self))
+        while len(self.rows) > count:
+            self.rows.pop().frame.destroy()
+        self.model.set_visible_count(count)
+        self.render()
+
+    def on_scrollbar(self, action, value, unit=None):
+        """滚动条事件（'moveto' 比例，或 'scroll' 数量 单位）"""
+        if action == 'moveto':
+            self.model.scroll_to(float(value))
+            self.render()
+        else:
+            self.scroll(int(value), unit)
+
+    def scroll(self, amount, unit):
+        """
+        滚动表格
+
+        Args:
+            amount: 数量（负数向上）
+            unit: 'units' 按行，'pages' 按页
+        """
+        rows = amount * max(1, self.model.visible_count - 1) if unit == 'pages' else amount * 3
+        self.model.scroll_by(rows)
+        self.render()
+
+    def set_filter(self, text):
+        """设置筛选文字并刷新"""
+        self.model.set_filter(text)
+        self.render()
+
+    def set_sort(self, column):
+        """按某一列排序并刷新，表头显示排序方向"""
+        self.model.set_sort(column)
+        for index, label in enumerate(self.header_labels):
+            text = COLUMNS[index][0]
+            if index == self.model.sort_column:
+                text += " ▼" if self.model.sort_reverse else " ▲"
+            label.config(text=text)
+        self.render()
@@ -0,0 +1,528 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+交易历史模块
+Trade History Module for Binance Auto Trade System
+
+下单、成交、完成的买卖和每天的统计数据保存在SQLite数据库（WAL模式）中，
+config.json 跨天归零后历史数据仍然保留，多天的分析不需要再从文本日志中提取。
+交易线程只把记录放进队列，由后台线程按批写入（一批一个事务）；
+表按日期、代币和订单ID建立索引，查询使用单独的只读连接，不影响写入。
+
+数据表:
+    orders       下单事件（每次下单请求一行，含失败的请求）
+    fills        检测到的成交（每次累计成交一行）
+    round_trips  完成的买卖（一买一卖）
+    daily_stats  每天的交易总额、损耗和完成次数（symbol 为 "*" 的行是当天合计）
+
+用法:
+    python trade_history.py volume --start 2024-01-01 --end 2024-01-07
+    python trade_history.py loss --start 2024-01-01
+    python trade_history.py latency --symbol ALPHA_22USDT
+    python trade_history.py daily
+"""
+
+import os
+import sys
+import time
+import queue
+import atexit
+import sqlite3
+import argparse
+import threading
+from datetime import datetime
+
+
+# 默认设置
+HISTORY_FILE = "trade_history.db"
+DEFAULT_FLUSH_INTERVAL = 0.5  # 第一条记录进入队列后最多等待多久写入（秒）
+DEFAULT_BATCH_SIZE = 1000     # 攒够多少条立即写入
+ALL_SYMBOLS = "*"             # daily_stats 中表示当天合计的代币
+
+# 成交延迟分布的区间上限（秒）
+LATENCY_BUCKETS = (1, 2, 5, 10, 30, 60)
+
+# 队列中的控制消息
+FLUSH = object()
+CLOSE = object()
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS orders (
+    ts REAL NOT NULL,
+    date TEXT NOT NULL,
+    order_id TEXT,
+    symbol TEXT,
+    side TEXT,
+    price REAL,
+    quantity REAL,
+    status TEXT,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_orders_order_id ON orders (order_id);
+CREATE INDEX IF NOT EXISTS idx_orders_date ON orders (date);
+CREATE INDEX IF NOT EXISTS idx_orders_symbol ON orders (symbol, date);
+
+CREATE TABLE IF NOT EXISTS fills (
+    ts REAL NOT NULL,
+    date TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    side TEXT NOT NULL,
+    order_id TEXT,
+    quantity REAL NOT NULL,
+    quote REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_fills_order_id ON fills (order_id);
+CREATE INDEX IF NOT EXISTS idx_fills_date ON fills (date);
+CREATE INDEX IF NOT EXISTS idx_fills_symbol ON fills (symbol, date);
+
+CREATE TABLE IF NOT EXISTS round_trips (
+    ts REAL NOT NULL,
+    date TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    buy_order_id TEXT,
+    sell_order_id TEXT,
+    quantity REAL,
+    buy_quote REAL,
+    sell_quote REAL
+);
+CREATE INDEX IF NOT EXISTS idx_round_trips_date ON round_trips (date);
+CREATE INDEX IF NOT EXISTS idx_round_trips_symbol ON round_trips (symbol, date);
+
+CREATE TABLE IF NOT EXISTS daily_stats (
+    date TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    total_amount REAL NOT NULL,
+    trade_loss REAL NOT NULL,
+    completed_trades INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (date, symbol)
+);
+"""
+
+ORDER_SQL = "INSERT INTO orders (ts, date, order_id, symbol, side, price, quantity, status, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+FILL_SQL = "INSERT INTO fills (ts, date, symbol, side, order_id, quantity, quote) VALUES (?, ?, ?, ?, ?, ?, ?)"
+ROUND_TRIP_SQL = ("INSERT INTO round_trips (ts, date, symbol, buy_order_id, sell_order_id, quantity, buy_quote, sell_quote) "
+                  "VALUES (?, ?, ?, ?, ?, ?, ?, ?)")
+DAILY_SQL = ("INSERT OR REPLACE INTO daily_stats (date, symbol, total_amount, trade_loss, completed_trades, updated_at) "
+             "VALUES (?, ?, ?, ?, ?, ?)")
+
+
+def date_of(timestamp):
+    """时间戳所属日期 YYYY-MM-DD（本地时间，与日志目录一致）"""
+    return datetime.fromtimestamp(timestamp).strftime('%Y-%m-%d')
+
+
+def to_float(value):
+    """转换为浮点数，无法转换时返回None"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def date_filter(start_date=None, end_date=None, symbol=None, prefix=""):
+    """
+    生成按日期和代币过滤的WHERE条件（使用日期和代币索引）
+
+    Args:
+        start_date: 开始日期 YYYY-MM-DD（含）
+        end_date: 结束日期 YYYY-MM-DD（含）
+        symbol: 交易对符号
+        prefix: 列名前缀（如 "o."）
+
+    Returns:
+        tuple: (WHERE子句（无条件时为空字符串）, 参数列表)
+    """
+    conditions, params = [], []
+    if start_date:
+        conditions.append(f"{prefix}date >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append(f"{prefix}date <= ?")
+        params.append(end_date)
+    if symbol:
+        conditions.append(f"{prefix}symbol = ?")
+        params.append(symbol)
+    return (" WHERE " + " AND ".join(conditions)) if conditions else "", params
+
+
+class TradeHistory:
+    """交易历史类 - 后台线程批量写入SQLite，查询使用只读连接"""
+
+    def __init__(self, path, flush_interval=DEFAULT_FLUSH_INTERVAL, batch_size=DEFAULT_BATCH_SIZE):
+        """
+        初始化交易历史（后台线程和数据库文件在第一次记录时创建）
+
+        Args:
+            path: 数据库文件路径
+            flush_interval: 第一条记录进入队列后最多等待多久写入（秒）
+            batch_size: 攒够多少条立即写入
+        """
+        self.path = path
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.queue = queue.SimpleQueue()
+        self.start_lock = threading.Lock()
+        self.thread = None
+        self.closed = False
+        self.write_count = 0  # 已写入的记录数
+
+    # ==================== 记录（只放入队列） ====================
+
+    def put(self, sql, params):
+        """放入一条待写入的记录"""
+        if self.closed:
+            return
+        if self.thread is None:
+            self.start()
+        self.queue.put((sql, params))
+
+    def record_order(self, event):
+        """
+        记录一次下单请求
+
+        Args:
+            event: 交易日志事件（字段见 trade_journal.JOURNAL_FIELDS）
+        """
+        order_id = event.get('order_id')
+        self.put(ORDER_SQL, (
+            event['ts'], date_of(event['ts']), str(order_id) if order_id else None,
+            event.get('symbol'), event.get('side'), to_float(event.get('price')),
+            to_float(event.get('custom_quantity') or event.get('quantity')),
+            event.get('status'), event.get('error'),
+        ))
+
+    def record_fill(self, timestamp, symbol, side, quantity, quote, order_id=None):
+        """
+        记录一次检测到的成交
+
+        Args:
+            timestamp: 检测到成交的时间戳
+            symbol: 交易对符号
+            side: 订单方向（BUY/SELL）
+            quantity: 成交数量
+            quote: 成交额（USDT）
+            order_id: 订单ID（可选）
+        """
+        quantity, quote = float(quantity or 0), float(quote or 0)
+        if quantity <= 0 or quote <= 0:
+            return
+        self.put(FILL_SQL, (timestamp, date_of(timestamp), symbol, side,
+                            str(order_id) if order_id else None, quantity, quote))
+
+    def record_round_trip(self, timestamp, symbol, buy_order_id, sell_order_id, quantity, buy_quote, sell_quote):
+        """
+        记录一次完成的买卖
+
+        Args:
+            timestamp: 完成时间戳
+            symbol: 交易对符号
+            buy_order_id: 买单ID
+            sell_order_id: 卖单ID
+            quantity: 买入份额
+            buy_quote: 买单成交额（USDT）
+            sell_quote: 卖单成交额（USDT）
+        """
+        self.put(ROUND_TRIP_SQL, (timestamp, date_of(timestamp), symbol,
+                                  str(buy_order_id) if buy_order_id else None,
+                                  str(sell_order_id) if sell_order_id else None,
+                                  quantity, buy_quote, sell_quote))
+
+    def record_daily(self, date, totals, symbols=None, timestamp=None):
+        """
+        记录（覆盖）某一天的统计数据
+
+        Args:
+            date: 日期 YYYY-MM-DD
+            totals: 当天合计 {daily_total_amount, daily_trade_loss, daily_completed_trades}
+            symbols: 按代币细分的统计 {交易对符号: 同样字段}
+            timestamp: 更新时间戳（默认当前时间）
+        """
+        updated_at = timestamp if timestamp is not None else time.time()
+        for symbol, stats in [(ALL_SYMBOLS, totals)] + list((symbols or {}).items()):
+            self.put(DAILY_SQL, (date, symbol, stats['daily_total_amount'], stats['daily_trade_loss'],
+                                 stats['daily_completed_trades'], updated_at))
+
+    # ==================== 后台写入 ====================
+
+    def start(self):
+        """启动后台写入线程（已启动时不重复启动）"""
+        with self.start_lock:
+            if self.thread is None and not self.closed:
+                self.thread = threading.Thread(target=self.run, daemon=True)
+                self.thread.start()
+
+    def run(self):
+        """后台写入循环：攒一批记录在一个事务中写入"""
+        connection = None
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while len(batch) < self.batch_size and batch[-1][0] not in (FLUSH, CLOSE):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            records = [item for item in batch if item[0] not in (FLUSH, CLOSE)]
+            if records:
+                if connection is None:
+                    connection = self.connect()
+                if connection is not None:
+                    self.write_batch(connection, records)
+
+            control, done = batch[-1]
+            if control is FLUSH:
+                done.set()
+            elif control is CLOSE:
+                if connection is not None:
+                    connection.close()
+                return
+
+    def connect(self):
+        """
+        打开写入连接并创建数据表（只在后台线程中调用）
+
+        Returns:
+            sqlite3.Connection: 连接，所在目录已被删除或打开失败时返回None
+        """
+        if not os.path.isdir(os.path.dirname(os.path.abspath(self.path))):
+            return None
+        try:
+            connection = sqlite3.connect(self.path)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+            return connection
+        except sqlite3.Error as e:
+            print(f"打开交易历史数据库失败: {str(e)}")
+            return None
+
+    def write_batch(self, connection, records):
+        """
+        在一个事务中写入一批记录，相同语句的连续记录合并为一次 executemany
+
+        Args:
+            connection: 写入连接
+            records: [(SQL, 参数), ...]
+        """
+        try:
+            with connection:
+                start = 0
+                while start < len(records):
+                    sql = records[start][0]
+                    end = start
+                    while end < len(records) and records[end][0] == sql:
+                        end += 1
+                    connection.executemany(sql, [params for _, params in records[start:end]])
+                    start = end
+            self.write_count += len(records)
+        except sqlite3.Error as e:
+            print(f"写入交易历史失败: {str(e)}")
+
+    def flush(self, timeout=5.0):
+        """
+        等待队列中已有的记录全部写入
+
+        Args:
+            timeout: 最长等待时间（秒）
+
+        Returns:
+            bool: 全部写入返回True
+        """
+        if self.thread is None or not self.thread.is_alive():
+            return True
+        done = threading.Event()
+        self.queue.put((FLUSH, done))
+        return done.wait(timeout)
+
+    def close(self, timeout=5.0):
+        """
+        写完队列中的记录并关闭数据库，之后的记录不再写入
+
+        Args:
+            timeout: 最长等待时间（秒）
+        """
+        if self.thread is not None and self.thread.is_alive():
+            self.queue.put((CLOSE, None))
+            self.thread.join(timeout)
+        self.closed = True
+
+    # ==================== 查询 ====================
+
+    def query(self, sql, params=()):
+        """
+        使用只读连接执行查询（不等待也不阻塞后台写入）
+
+        Returns:
+            list: 结果行，数据库不存在时返回空列表
+        """
+        if not os.path.exists(self.path):
+            return []
+        connection = sqlite3.connect(f"file:{os.path.abspath(self.path)}?mode=ro", uri=True)
+        try:
+            return connection.execute(sql, params).fetchall()
+        except sqlite3.OperationalError:
+            return []  # 数据表尚未创建
+        finally:
+            connection.close()
+
+    def volume_per_hour(self, start_date=None, end_date=None, symbol=None):
+        """
+        按小时统计成交额
+
+        Args:
+            start_date: 开始日期 YYYY-MM-DD（含）
+            end_date: 结束日期 YYYY-MM-DD（含）
+            symbol: 只统计该交易对
+
+        Returns:
+            list: [(小时 "YYYY-MM-DD HH:00", 成交额, 成交次数), ...]，按时间排序
+        """
+        where, params = date_filter(start_date, end_date, symbol)
+        return self.query(
+            "SELECT strftime('%Y-%m-%d %H:00', ts, 'unixepoch', 'localtime') AS hour, SUM(quote), COUNT(*) "
+            f"FROM fills{where} GROUP BY hour ORDER BY hour", params)
+
+    def loss_per_token(self, start_date=None, end_date=None):
+        """
+        按代币统计损耗（来自每天的统计数据，与界面显示的今日损耗一致）
+
+        Args:
+            start_date: 开始日期 YYYY-MM-DD（含）
+            end_date: 结束日期 YYYY-MM-DD（含）
+
+        Returns:
+            list: [(交易对符号, 损耗, 交易总额, 完成次数), ...]，按损耗从高到低排序
+        """
+        where, params = date_filter(start_date, end_date)
+        where += (" AND" if where else " WHERE") + " symbol != ?"
+        return self.query(
+            "SELECT symbol, SUM(trade_loss), SUM(total_amount), SUM(completed_trades) "
+            f"FROM daily_stats{where} GROUP BY symbol ORDER BY SUM(trade_loss) DESC", params + [ALL_SYMBOLS])
+
+    def fill_latency(self, start_date=None, end_date=None, symbol=None, buckets=LATENCY_BUCKETS):
+        """
+        统计从下单到检测到最后一次成交的时间分布
+
+        Args:
+            start_date: 开始日期 YYYY-MM-DD（含）
+            end_date: 结束日期 YYYY-MM-DD（含）
+            symbol: 只统计该交易对
+            buckets: 分布区间的上限（秒）
+
+        Returns:
+            dict: count, avg, p50, p90, p99, max（秒）和 histogram {区间: 订单数}
+        """
+        where, params = date_filter(start_date, end_date, symbol, prefix="o.")
+        where += (" AND" if where else " WHERE") + " o.status = 'success'"
+        rows = self.query(
+            "SELECT MAX(f.ts) - o.ts FROM orders o JOIN fills f ON f.order_id = o.order_id"
+            f"{where} GROUP BY o.order_id", params)
+        latencies = sorted(max(0.0, row[0]) for row in rows)
+
+        histogram, lower = {}, 0
+        for upper in buckets:
+            histogram[f"{lower}-{upper}s"] = sum(1 for value in latencies if lower <= value < upper)
+            lower = upper
+        histogram[f">={lower}s"] = sum(1 for value in latencies if value >= lower)
+
+        def percentile(ratio):
+            return latencies[min(len(latencies) - 1, int(len(latencies) * ratio))] if latencies else 0.0
+
+        return {
+            'count': len(latencies),
+            'avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50': percentile(0.5),
+            'p90': percentile(0.9),
+            'p99': percentile(0.99),
+            'max': latencies[-1] if latencies else 0.0,
+            'histogram': histogram,
+        }
+
+    def daily_history(self, start_date=None, end_date=None):
+        """
+        获取每天的合计统计
+
+        Returns:
+            list: [(日期, 交易总额, 损耗, 完成次数), ...]，按日期排序
+        """
+        where, params = date_filter(start_date, end_date)
+        where += (" AND" if where else " WHERE") + " symbol = ?"
+        return self.query(
+            f"SELECT date, total_amount, trade_loss, completed_trades FROM daily_stats{where} ORDER BY date",
+            params + [ALL_SYMBOLS])
+
+
+# 每个数据库文件一个交易历史（同一目录的多个Logger共用一个后台线程）
+_histories = {}
+_histories_lock = threading.Lock()
+
+
+def get_trade_history(path):
+    """
+    获取数据库文件对应的交易历史
+
+    Args:
+        path: 数据库文件路径
+
+    Returns:
+        TradeHistory: 交易历史
+    """
+    key = os.path.abspath(path)
+    with _histories_lock:
+        history = _histories.get(key)
+        if history is None or history.closed:
+            history = TradeHistory(key)
+            _histories[key] = history
+        return history
+
+
+def close_all_histories():
+    """程序退出时写完所有记录"""
+    with _histories_lock:
+        histories = list(_histories.values())
+    for history in histories:
+        history.close()
+
+
+atexit.register(close_all_histories)
+
+
+def main(argv=None):
+    """命令行入口：查询交易历史"""
+    parser = argparse.ArgumentParser(description="币安量化交易系统 - 交易历史分析")
+    parser.add_argument('--db', default=os.path.join("log", HISTORY_FILE), help="数据库文件路径")
+    parser.add_argument('command', choices=('volume', 'loss', 'latency', 'daily'),
+                        help="volume: 每小时成交额，loss: 按代币统计损耗，latency: 成交延迟分布，daily: 每天的统计")
+    parser.add_argument('--start', help="开始日期，如 2024-01-01")
+    parser.add_argument('--end', help="结束日期，如 2024-01-07")
+    parser.add_argument('--symbol', help="交易对符号（volume / latency）")
+    args = parser.parse_args(argv)
+
+    history = TradeHistory(args.db)
+    started = time.perf_counter()
+    if args.command == 'volume':
+        for hour, volume, fills in history.volume_per_hour(args.start, args.end, args.symbol):
+            print(f"{hour}  成交额 {volume:.2f} USDT  成交 {fills} 次")
+    elif args.command == 'loss':
+        for symbol, loss, amount, trades in history.loss_per_token(args.start, args.end):
+            print(f"{symbol}  损耗 {loss:.4f} USDT  交易总额 {amount:.2f} USDT  完成 {trades} 次")
+    elif args.command == 'latency':
+        result = history.fill_latency(args.start, args.end, args.symbol)
+        print(f"订单数 {result['count']}，平均 {result['avg']:.1f} 秒，中位数 {result['p50']:.1f} 秒，"
+              f"P90 {result['p90']:.1f} 秒，P99 {result['p99']:.1f} 秒，最长 {result['max']:.1f} 秒")
+        for label, count in result['histogram'].items():
+            print(f"  {label}: {count}")
+    else:
+        for date, amount, loss, trades in history.daily_history(args.start, args.end):
+            print(f"{date}  交易总额 {amount:.2f} USDT  损耗 {loss:.4f} USDT  完成 {trades} 次")
+    print(f"查询耗时 {(time.perf_counter() - started) * 1000:.1f} 毫秒", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+交易日志（JSONL）模块
+Trade Journal Module for Binance Auto Trade System
+
+每个下单事件写成一行紧凑的JSON（字段固定，见 JOURNAL_FIELDS），只追加不修改。
+文件按天或按大小切分为 trades-YYYYMMDD-NNN.jsonl，切分后旧文件在后台压缩为 .jsonl.gz。
+iter_events 逐行读取（包括已压缩的文件），不会把整个文件读入内存。
+
+用法:
+    python trade_journal.py --date 2024-01-02 --symbol ALPHA_22USDT
+    python trade_journal.py --order-id 153048420
+"""
+
+import os
+import re
+import sys
+import gzip
+import json
+import shutil
+import argparse
+import threading
+from datetime import datetime
+
+
+# 默认设置
+DEFAULT_JOURNAL_DIR = os.path.join("log", "trade_journal")
+DEFAULT_MAX_BYTES = 10 * 1024 * 1024  # 单个文件超过该大小后切分
+JOURNAL_VERSION = 1
+MAX_RESPONSE_TEXT = 2000  # 非JSON响应文本最多保留的字符数
+
+# 事件字段（每行都包含全部字段，没有的值为null）
+JOURNAL_FIELDS = (
+    'v',                # 格式版本
+    'ts',               # 时间戳（秒）
+    'event',            # 事件类型，下单为 "order"
+    'symbol',           # 交易对符号
+    'side',             # BUY / SELL
+    'price',            # 下单价格
+    'quantity',         # 下单数量
+    'custom_quantity',  # 自定义数量
+    'status',           # started / success / failed / http_error / exception
+    'order_id',         # 订单ID
+    'error',            # 错误信息
+    'http_status',      # HTTP状态码
+    'payload',          # 请求体（不含请求头，避免记录认证信息）
+    'response',         # 响应JSON（非JSON时为截断的响应文本）
+)
+
+# 文件名: trades-日期-序号.jsonl(.gz)
+SEGMENT_PATTERN = re.compile(r'^trades-(\d{8})-(\d{3})\.jsonl(\.gz)?$')
+
+
+def make_order_event(trade_detail, timestamp):
+    """
+    把 BinanceAPI.place_single_order 的交易详情转换为日志事件
+
+    Args:
+        trade_detail: 交易详情字典（字段见 Logger.log_trade_detail）
+        timestamp: 事件时间戳（秒）
+
+    Returns:
+        dict: 字段与 JOURNAL_FIELDS 一致的事件
+    """
+    request_params = trade_detail.get('request_params') or {}
+    payload = request_params.get('payload')
+    response = trade_detail.get('response') or {}
+    if 'json' in response:
+        response_body = response['json']
+    elif response.get('text') is not None:
+        response_body = response['text'][:MAX_RESPONSE_TEXT]
+    else:
+        response_body = None
+
+    order_id = trade_detail.get('order_id')
+    return {
+        'v': JOURNAL_VERSION,
+        'ts': timestamp,
+        'event': 'order',
+        'symbol': trade_detail.get('symbol'),
+        'side': trade_detail.get('side'),
+        'price': trade_detail.get('price'),
+        'quantity': payload.get('quantity') if isinstance(payload, dict) else None,
+        'custom_quantity': trade_detail.get('custom_quantity'),
+        'status': trade_detail.get('status'),
+        'order_id': str(order_id) if order_id is not None else None,
+        'error': trade_detail.get('error'),
+        'http_status': response.get('status_code'),
+        'payload': payload,
+        'response': response_body,
+    }
+
+
+class TradeJournal:
+    """交易日志类 - 追加写入JSONL，按天或大小切分，后台压缩旧文件"""
+
+    def __init__(self, directory=DEFAULT_JOURNAL_DIR, max_bytes=DEFAULT_MAX_BYTES, compress=True):
+        """
+        初始化交易日志（第一次写入时才打开文件）
+
+        Args:
+            directory: 存储目录
+            max_bytes: 单个文件超过该大小后切分
+            compress: 是否压缩切分后的旧文件
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.lock = threading.Lock()
+        self.handle = None
+        self.segment = None  # (日期, 序号)
+        self.size = 0
+        self.compress_threads = []
+
+    def append(self, event):
+        """
+        追加一个事件
+
+        Args:
+            event: 字段与 JOURNAL_FIELDS 一致的事件字典
+
+        Returns:
+            tuple: (文件路径, 偏移量, 长度)，用于记录索引；未写入时返回None
+        """
+        line = json.dumps(event, ensure_ascii=False, separators=(',', ':'), default=str) + '\n'
+        data = line.encode('utf-8')
+        day = datetime.fromtimestamp(event['ts']).strftime('%Y%m%d')
+
+        with self.lock:
+            if self.handle is None or self.segment[0] != day or self.size + len(data) > self.max_bytes and self.size > 0:
+                if not self.rotate(day):
+                    return None
+            offset = self.size
+            self.handle.write(data)
+            self.handle.flush()
+            self.size += len(data)
+            return self.segment_path(*self.segment), offset, len(data)
+
+    def rotate(self, day):
+        """
+        关闭当前文件并打开新文件（调用时已持有锁）
+
+        Args:
+            day: 新事件的日期（YYYYMMDD）
+
+        Returns:
+            bool: 上级目录已被删除（如临时日志目录）时不重新创建，返回False
+        """
+        if not os.path.isdir(self.directory):
+            if not os.path.isdir(os.path.dirname(self.directory) or '.'):
+                return False
+            os.makedirs(self.directory, exist_ok=True)
+        previous = None
+        if self.handle is not None:
+            previous = self.segment_path(*self.segment)
+            self.handle.close()
+            self.handle = None
+
+        if previous and self.segment[0] == day:
+            # 当前文件已写满，序号加1
+            index = self.segment[1] + 1
+        else:
+            # 新的一天或刚启动：继续使用当天最后一个未压缩且未写满的文件
+            index = 1
+            for name_day, name_index, compressed in self.list_segments():
+                if name_day == day:
+                    index = max(index, name_index + (1 if compressed else 0))
+            path = self.segment_path(day, index)
+            if os.path.exists(path) and os.path.getsize(path) >= self.max_bytes:
+                index += 1
+        path = self.segment_path(day, index)
+
+        self.handle = open(path, 'ab')
+        self.segment = (day, index)
+        self.size = self.handle.tell()
+        if self.size > 0 and not ends_with_newline(path):
+            # 上次写入中断留下半行，先换行，读取时跳过这半行
+            self.handle.write(b'\n')
+            self.size += 1
+
+        if self.compress:
+            # 压缩切分下来的文件，以及之前几天留下的未压缩文件（当天的可能正被其他进程写入）
+            stale = [self.segment_path(d, i) for d, i, compressed in self.list_segments()
+                     if not compressed and d < day]
+            if previous and previous not in stale and os.path.exists(previous):
+                stale.append(previous)
+            if stale:
+                thread = threading.Thread(target=compress_segments, args=(stale,), daemon=True)
+                thread.start()
+                self.compress_threads = [t for t in self.compress_threads if t.is_alive()] + [thread]
+        return True
+
+    def list_segments(self):
+        """
+        列出已有的文件
+
+        Returns:
+            list: [(日期, 序号, 是否已压缩), ...]
+        """
+        segments = []
+        if not os.path.isdir(self.directory):
+            return segments
+        for name in os.listdir(self.directory):
+            match = SEGMENT_PATTERN.match(name)
+            if match:
+                segments.append((match.group(1), int(match.group(2)), bool(match.group(3))))
+        return sorted(segments)
+
+    def segment_path(self, day, index):
+        """获取未压缩文件的路径"""
+        return os.path.join(self.directory, f"trades-{day}-{index:03d}.jsonl")
+
+    def close(self, timeout=10.0):
+        """
+        关闭当前文件并等待后台压缩完成
+
+        Args:
+            timeout: 等待压缩的最长时间（秒）
+        """
+        with self.lock:
+            if self.handle is not None:
+                self.handle.close()
+                self.handle = None
+        for thread in self.compress_threads:
+            thread.join(timeout)
+
+
+def ends_with_newline(path):
+    """判断文件最后一个字节是否为换行符"""
+    with open(path, 'rb') as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def compress_segments(paths):
+    """
+    把文件压缩为 .gz（先写临时文件再替换，压缩完成后删除原文件）
+
+    Args:
+        paths: 未压缩文件路径列表
+    """
+    for path in paths:
+        try:
+            temp_path = path + '.gz.tmp'
+            with open(path, 'rb') as source, gzip.open(temp_path, 'wb') as target:
+                shutil.copyfileobj(source, target)
+            os.replace(temp_path, path + '.gz')
+            os.remove(path)
+        except FileNotFoundError:
+            pass  # 已被其他线程压缩
+        except Exception as e:
+            print(f"压缩交易日志失败: {path}: {e}")
+
+
+def iter_events(directory=DEFAULT_JOURNAL_DIR, start=None, end=None, symbol=None, order_id=None):
+    """
+    按时间顺序逐行读取事件（包括已压缩的文件）
+
+    Args:
+        directory: 存储目录
+        start: 开始时间戳（含，默认不限）
+        end: 结束时间戳（不含，默认不限）
+        symbol: 只返回该交易对的事件
+        order_id: 只返回该订单的事件
+
+    Yields:
+        dict: 事件
+    """
+    if not os.path.isdir(directory):
+        return
+    start_day = datetime.fromtimestamp(start).strftime('%Y%m%d') if start is not None else None
+    end_day = datetime.fromtimestamp(end).strftime('%Y%m%d') if end is not None else None
+    order_id = str(order_id) if order_id is not None else None
+
+    segments = {}
+    for name in os.listdir(directory):
+        match = SEGMENT_PATTERN.match(name)
+        if match:
+            segments[(match.group(1), int(match.group(2)))] = name
+
+    for (day, _), name in sorted(segments.items()):
+        # 按文件名中的日期跳过范围之外的文件
+        if start_day and day < start_day or end_day and day > end_day:
+            continue
+        for event in read_segment(os.path.join(directory, name)):
+            if start is not None and event['ts'] < start or end is not None and event['ts'] >= end:
+                continue
+            if symbol and event.get('symbol') != symbol:
+                continue
+            if order_id and event.get('order_id') != order_id:
+                continue
+            yield event
+
+
+def read_segment(path):
+    """
+    逐行读取一个文件（读取时文件刚好被压缩的，改读压缩后的文件）
+
+    Args:
+        path: 文件路径
+
+    Yields:
+        dict: 事件（无法解析的行跳过，如写入中断留下的半行）
+    """
+    try:
+        source = gzip.open(path, 'rt', encoding='utf-8') if path.endswith('.gz') else open(path, 'r', encoding='utf-8')
+    except FileNotFoundError:
+        if path.endswith('.gz') or not os.path.exists(path + '.gz'):
+            return
+        source = gzip.open(path + '.gz', 'rt', encoding='utf-8')
+
+    with source:
+        for line in source:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+# 每个目录一个交易日志（同一目录的多个Logger共用）
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def get_trade_journal(directory=DEFAULT_JOURNAL_DIR):
+    """
+    获取目录对应的交易日志
+
+    Args:
+        directory: 存储目录
+
+    Returns:
+        TradeJournal: 交易日志
+    """
+    key = os.path.abspath(directory)
+    with _journals_lock:
+        journal = _journals.get(key)
+        if journal is None:
+            journal = TradeJournal(key)
+            _journals[key] = journal
+        return journal
+
+
+def main(argv=None):
+    """命令行入口：查询交易日志"""
+    parser = argparse.ArgumentParser(description="币安量化交易系统 - 交易日志查询")
+    parser.add_argument('--dir', default=DEFAULT_JOURNAL_DIR, help="存储目录")
+    parser.add_argument('--date', help="日期，如 2024-01-02")
+    parser.add_argument('--symbol', help="交易对符号，如 ALPHA_22USDT")
+    parser.add_argument('--order-id', help="订单ID")
+    args = parser.parse_args(argv)
+
+    start = end = None
+    if args.date:
+        start = datetime.strptime(args.date, '%Y-%m-%d').timestamp()
+        end = start + 86400
+    count = 0
+    for event in iter_events(args.dir, start, end, args.symbol, args.order_id):
+        print(json.dumps(event, ensure_ascii=False, separators=(',', ':')))
+        count += 1
+    print(f"共 {count} 条", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
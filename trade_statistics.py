@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+交易统计模块
+Trade Statistics Module for Binance Auto Trade System
+
+今日交易总额、交易损耗和完成次数只保存在这里一份，ConfigManager 和 TraderCore 的同名属性都读写这里，
+不会再出现两份数据不一致。所有修改在锁内完成（不会丢失并发的累加），同时按代币记录细分数据；
+快照在锁内复制，界面读到的总额、损耗和次数总是同一时刻的。
+每次修改和读取前检查日期，进入新的一天时归零并调用注册的跨天回调。
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+# 导入时钟模块
+from clock import get_clock
+
+
+# 统计字段（与 TraderCore.get_statistics_snapshot 的字段一致）
+AMOUNT = 'daily_total_amount'      # 今日交易总额
+LOSS = 'daily_trade_loss'          # 今日交易损耗
+TRADES = 'daily_completed_trades'  # 今日完成交易次数
+FIELDS = (AMOUNT, LOSS, TRADES)
+
+
+def new_totals():
+    """创建归零的统计数据"""
+    return {AMOUNT: 0.0, LOSS: 0.0, TRADES: 0}
+
+
+class TradeStatistics:
+    """交易统计类 - 线程安全的今日统计、按代币细分和跨天归零"""
+
+    def __init__(self, clock=None):
+        """
+        初始化交易统计（日期为今天，数据为0）
+
+        Args:
+            clock: 时钟对象（默认全局时钟），用于判断日期
+        """
+        self.clock = clock or get_clock()
+        self.lock = threading.Lock()
+        self.totals = new_totals()
+        self.symbols = {}  # {交易对符号: 统计数据}
+        self.listeners = []
+        self.date = None
+        self.rollover_at = 0.0  # 下一次跨天的时间戳
+        self.mirror = False  # 只镜像其他进程的统计（不自行跨天归零）
+        self.set_date(self.clock.now())
+
+    def set_date(self, now):
+        """设置统计日期和下一次跨天的时间（需持有锁或在初始化时调用）"""
+        self.date = now.strftime('%Y-%m-%d')
+        midnight = datetime(now.year, now.month, now.day) + timedelta(days=1)
+        self.rollover_at = midnight.timestamp()
+
+    def add_rollover_listener(self, callback):
+        """
+        注册跨天回调
+
+        Args:
+            callback: 回调函数，参数为 (前一天的日期, 前一天的统计快照)；前一天日期未知时为None，
+                      快照的 'symbols' 字段为前一天按代币细分的统计
+        """
+        self.listeners.append(callback)
+
+    def set_mirror(self):
+        """
+        只镜像其他进程的统计（交易引擎在独立进程中运行时界面进程调用）
+
+        之后不再自行跨天归零，也不调用跨天回调，数值全部由 set_value 写入；
+        跨天的日志、交易历史和初始资金只由交易引擎进程处理一次。
+        """
+        with self.lock:
+            self.mirror = True
+
+    def restore(self, date, amount=0.0, loss=0.0, trades=0):
+        """
+        恢复保存的统计数据（加载配置文件时调用），日期不是今天时立即跨天归零
+
+        Args:
+            date: 数据所属日期 YYYY-MM-DD（None表示未知）
+            amount: 交易总额
+            loss: 交易损耗
+            trades: 完成交易次数
+
+        Returns:
+            bool: 执行了跨天归零返回True
+        """
+        with self.lock:
+            self.totals = {AMOUNT: float(amount or 0.0), LOSS: float(loss or 0.0), TRADES: int(trades or 0)}
+            self.symbols = {}
+            self.date = date
+            self.rollover_at = 0.0  # 下一次检查时按当前日期判断
+        return self.check_rollover()
+
+    def check_rollover(self):
+        """
+        检查是否进入新的一天，是则归零并调用跨天回调
+
+        Returns:
+            bool: 执行了跨天归零返回True
+        """
+        if self.mirror or self.clock.time() < self.rollover_at:
+            return False
+
+        now = self.clock.now()
+        with self.lock:
+            today = now.strftime('%Y-%m-%d')
+            if today == self.date:
+                self.set_date(now)
+                return False
+            previous_date = self.date
+            previous = self.snapshot_locked()
+            previous['symbols'] = self.symbols
+            self.totals = new_totals()
+            self.symbols = {}
+            self.set_date(now)
+
+        for callback in list(self.listeners):
+            try:
+                callback(previous_date, previous)
+            except Exception as e:
+                print(f"跨天回调失败: {str(e)}")
+        return True
+
+    def add(self, field, value, symbol=None):
+        """
+        原子地累加一个统计字段
+
+        Args:
+            field: 统计字段（AMOUNT / LOSS / TRADES）
+            value: 增加的值
+            symbol: 交易对符号（同时累加到该代币的细分数据）
+
+        Returns:
+            累加后的今日总值
+        """
+        self.check_rollover()
+        with self.lock:
+            self.totals[field] += value
+            if symbol:
+                stats = self.symbols.setdefault(symbol, new_totals())
+                stats[field] += value
+            return self.totals[field]
+
+    def add_amount(self, amount, symbol=None):
+        """增加交易总额，返回今日总额"""
+        return self.add(AMOUNT, float(amount), symbol)
+
+    def add_loss(self, loss, symbol=None):
+        """增加交易损耗，返回今日损耗"""
+        return self.add(LOSS, float(loss), symbol)
+
+    def increment_trades(self, symbol=None):
+        """增加一次完成交易，返回今日次数"""
+        return self.add(TRADES, 1, symbol)
+
+    def set_value(self, field, value):
+        """
+        直接设置一个统计字段的今日总值（如资金账户对账后的损耗、界面进程收到的统计数据）
+
+        Args:
+            field: 统计字段
+            value: 新的值
+        """
+        self.check_rollover()
+        with self.lock:
+            self.totals[field] = value
+
+    def get(self, field):
+        """获取一个统计字段的今日总值"""
+        self.check_rollover()
+        return self.totals[field]
+
+    def get_date(self):
+        """获取统计所属日期 YYYY-MM-DD"""
+        self.check_rollover()
+        return self.date
+
+    def snapshot(self):
+        """
+        获取今日统计的一致快照
+
+        Returns:
+            dict: {daily_total_amount, daily_trade_loss, daily_completed_trades, date}
+        """
+        self.check_rollover()
+        with self.lock:
+            return self.snapshot_locked()
+
+    def snapshot_locked(self):
+        """复制今日统计（需持有锁）"""
+        snapshot = dict(self.totals)
+        snapshot['date'] = self.date
+        return snapshot
+
+    def symbol_snapshot(self):
+        """
+        获取按代币细分的今日统计
+
+        Returns:
+            dict: {交易对符号: {daily_total_amount, daily_trade_loss, daily_completed_trades}}
+        """
+        self.check_rollover()
+        with self.lock:
+            return {symbol: dict(stats) for symbol, stats in self.symbols.items()}
@@ -0,0 +1,1064 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+交易核心模块
+Trader Core Module for Binance Auto Trade System
+
+本模块不导入tkinter，负责交易状态、统计数据和交易线程的管理。
+GUI（BinanceTrader）和无界面守护进程（TradingDaemon）都继承TraderCore。
+"""
+
+import os
+import random
+import threading
+
+# 导入日志模块
+from logger import Logger
+# 导入币安API模块
+from binance_api import BinanceAPI
+# 导入Alpha123稳定度数据模块
+from alpha123 import Alpha123Client
+# 导入稳定度数据后台刷新模块
+from stability_feed import StabilityFeed
+# 导入稳定度历史模块
+from stability_history import StabilityHistory
+# 导入候选代币校验模块
+from candidate_validator import CandidateValidator
+# 导入代币符号解析模块
+from symbol_resolver import SymbolResolver
+# 导入订单处理模块
+from order_handler import OrderHandler
+# 导入配置管理模块
+from config_manager import ConfigManager
+# 导入交易统计字段
+from trade_statistics import AMOUNT, LOSS, TRADES
+# 导入成交账本模块
+from fill_ledger import FillLedger
+# 导入全局清仓模块
+from cleanup_orchestrator import CleanupOrchestrator
+# 导入代币状态存储模块
+from token_store import TokenStore
+# 导入交易引擎模块
+from trading_engine import TradingEngine, DEFAULT_TRADING_PARAMS
+# 导入时钟模块
+from clock import get_clock
+
+
+class TraderCore:
+    """交易核心类 - 负责交易状态、统计数据和交易线程管理（不依赖GUI）"""
+
+    def __init__(self, config_file="config.json", log_dir="log", clock=None):
+        """
+        初始化交易核心
+
+        Args:
+            config_file: 配置文件路径
+            log_dir: 日志目录
+            clock: 时钟对象（默认全局时钟，离线回放时传入虚拟时钟），日志、配置和API共用
+        """
+        # 时钟和交易参数（交易引擎和订单处理器共用）
+        self.clock = clock or get_clock()
+        self.trading_params = dict(DEFAULT_TRADING_PARAMS)
+
+        # 创建log文件夹并初始化日志管理器
+        self.log_dir = log_dir
+        if not os.path.exists(self.log_dir):
+            os.makedirs(self.log_dir)
+
+        # 初始化日志管理器（GUI控件稍后设置）
+        self.logger = Logger(log_dir=self.log_dir, clock=self.clock)
+
+        # 初始化配置管理器（先加载配置以获取认证信息）
+        self.config_manager = ConfigManager(config_file=config_file, logger=self.logger, clock=self.clock)
+        self.config_manager.load_config()
+
+        # 从配置管理器获取认证信息（保留本地引用以便快速访问）
+        self.csrf_token = self.config_manager.csrf_token
+        self.cookie = self.config_manager.cookie
+
+        # 币安ALPHA API基础URL
+        self.base_url = "https://www.binance.com/bapi/defi/v1/public/alpha-trade"
+
+        # 初始化币安API接口（直接传入认证信息）
+        self.api = BinanceAPI(
+            base_url=self.base_url,
+            csrf_token=self.csrf_token,
+            cookie=self.cookie,
+            logger=self.logger,
+            extra_headers=self.config_manager.extra_headers,
+            clock=self.clock
+        )
+
+        # 存储代币数据（线程安全，界面对象不放在这里）
+        self.tokens = TokenStore()
+
+        # 稳定度看板数据
+        self.stability_data = []
+
+        # 统计数据只保存在配置管理器的交易统计中（daily_* 属性直接读写它）
+        self.statistics = self.config_manager.statistics
+        # 交易历史数据库（成交、完成的买卖和每天的统计，后台线程写入）
+        self.history = self.logger.history
+
+        # 当前买卖交易跟踪
+        self.current_sell_amount = 0.0  # 当前买卖交易中卖单的总成交额
+
+        # 成交账本（每次买卖后据此更新损耗，资金账户余额只用于定时对账）
+        self.fill_ledger = FillLedger(clock=self.clock)
+        self.loss_lock = threading.Lock()
+        self.ledger_loss_applied = {}  # 已计入今日损耗的账本损耗 {交易对符号: 损耗}
+        self.last_balance_reconcile = self.clock.time()  # 上次对账时间
+
+        # 自动交易状态
+        self.auto_trading = {}  # 存储每个代币的自动交易状态
+        self.trading_threads = {}  # 存储交易线程
+
+        # 4倍自动交易状态
+        self.trading_4x_active = False  # 4倍自动交易是否激活
+        self.trading_4x_thread = None  # 4倍自动交易线程
+        self.trading_count = 16  # 4倍自动交易的默认计划次数
+
+        # 定时交易状态
+        self.scheduled_trading_enabled = False  # 定时交易是否启用
+        self.scheduled_trading_thread = None  # 定时交易检查线程
+        self.last_scheduled_date = None  # 上次执行定时交易的日期
+        self.scheduled_hour = None  # 定时交易的小时
+        self.scheduled_minute = None  # 定时交易的分钟
+
+        # 今日交易次数由 self.statistics 管理，跨天时重置闹钟标志
+        self.statistics.add_rollover_listener(self.on_daily_rollover)
+        self.alarm_played_today = False  # 今日是否已播放过闹钟
+        self.enable_alarm = False  # 是否启用超时闹钟
+
+        # 闹钟播放状态
+        self.alarm_is_playing = False  # 闹钟是否正在播放
+
+        # 交易成功标识
+        self.trade_success_flag = True  # 标识当前交易是否成功
+
+    def init_trading_components(self):
+        """初始化交易相关组件（Alpha ID映射、稳定度客户端、订单处理器、交易引擎、全局清仓器、候选代币校验器）"""
+        # 加载ALPHA代币ID映射
+        self.alpha_id_map = self.load_alpha_id_map()
+        self.api.symbol_resolver = self.symbol_resolver
+
+        # 初始化Alpha123稳定度数据客户端
+        self.alpha123_client = Alpha123Client(logger=self.logger, alpha_id_map=self.alpha_id_map)
+
+        # 稳定度数据后台刷新（首次读取时启动），选币和看板读取同一个快照
+        self.stability_feed = StabilityFeed(
+            self.alpha123_client,
+            clock=self.clock,
+            interval=self.trading_params['stability_refresh_interval']
+        )
+        self.alpha123_client.set_feed(self.stability_feed)
+
+        # 每次稳定度数据变化时追加到本地历史，选币和复盘可直接查询
+        self.stability_history = StabilityHistory(os.path.join(self.log_dir, 'stability_history'), clock=self.clock)
+        self.stability_feed.add_listener(self.record_stability_history)
+
+        # 初始化订单处理器
+        self.order_handler = OrderHandler(self)
+
+        # 初始化交易引擎
+        self.trading_engine = TradingEngine(self)
+
+        # 初始化全局清仓器
+        self.cleanup_orchestrator = CleanupOrchestrator(self)
+
+        # 初始化候选代币校验器（4倍交易选币前检查最近成交）
+        self.candidate_validator = CandidateValidator(self)
+
+    def record_stability_history(self, snapshot):
+        """
+        把新的稳定度快照追加到历史存储（在稳定度刷新线程中调用）
+
+        Args:
+            snapshot: StabilitySnapshot
+        """
+        self.stability_history.append_snapshot(snapshot.items, self.alpha123_client.alpha_id_map, snapshot.changed_at)
+
+    # ==================== 界面通知钩子 ====================
+    # 交易引擎只通过以下方法通知界面。无界面模式下它们只做日志或空操作，
+    # BinanceTrader 覆盖这些方法，把界面更新转交给tkinter主线程。
+
+    def run_on_ui(self, func):
+        """在界面线程中执行函数（无界面模式直接执行）"""
+        func()
+
+    def notify_tokens_changed(self):
+        """代币数据变化通知"""
+        pass
+
+    def notify_statistics_changed(self):
+        """统计数据变化通知"""
+        pass
+
+    def notify_4x_trading_started(self):
+        """4倍自动交易启动通知"""
+        pass
+
+    def notify_4x_trading_finished(self):
+        """4倍自动交易结束通知"""
+        pass
+
+    def notify_alarm(self):
+        """需要人工介入的提醒（无界面模式只记录日志）"""
+        self.log_message("🔔 需要人工处理：请检查交易状态")
+
+    def show_error(self, title, message):
+        """显示错误信息（无界面模式只记录日志）"""
+        self.log_message(f"[{title}] {message}")
+
+    def notify_stability_updated(self, items, fetched_at):
+        """
+        稳定度看板数据刷新通知
+
+        Args:
+            items: 稳定度数据列表
+            fetched_at: 获取时间戳（秒），从未获取成功时为None
+        """
+        pass
+
+    # ==================== 基础方法 ====================
+
+    def log_message(self, message, symbol=None):
+        """
+        添加日志消息 - 调用logger模块记录日志
+
+        Args:
+            message: 日志消息
+            symbol: 日志涉及的交易对符号（写入时间索引，可按代币查询）
+        """
+        self.logger.log_message(message, symbol=symbol)
+
+    def log_debug(self, message, *args, module=None, symbol=None):
+        """
+        添加调试日志（默认不输出，未输出时不格式化消息）
+
+        Args:
+            message: % 格式字符串
+            *args: 格式化参数
+            module: 模块名（用于按模块设置级别）
+            symbol: 日志涉及的交易对符号
+        """
+        self.logger.debug(message, *args, module=module, symbol=symbol)
+
+    def get_token_price(self, symbol, max_retries=5):
+        """
+        获取代币价格 - 调用API模块，带重试机制
+
+        Args:
+            symbol: 代币符号，如 "ALPHA_1USDT"
+            max_retries: 最大重试次数，默认5次
+
+        Returns:
+            dict: 包含价格和交易信息的字典，失败返回None
+        """
+        for attempt in range(max_retries):
+            result = self.api.get_token_price(symbol)
+            if result:
+                return result
+
+            # 如果获取失败且还有重试机会
+            if attempt < max_retries - 1:
+                self.log_message(f"获取 {symbol} 价格失败，第{attempt + 1}次重试")
+                self.clock.sleep(random.uniform(0.5, 1.5))
+
+        # 所有重试都失败
+        self.log_message(f"获取 {symbol} 价格失败，已重试{max_retries}次")
+        return None
+
+    def get_token_24h_stats(self, symbol):
+        """获取代币24小时统计 - 调用API模块"""
+        return self.api.get_token_24h_stats(symbol)
+
+    def new_token_record(self, display_name, price=0.0, trade_count=1):
+        """
+        创建新的代币数据记录
+
+        Args:
+            display_name: 显示名称
+            price: 初始价格
+            trade_count: 计划交易次数
+
+        Returns:
+            dict: 代币数据字典
+        """
+        return {
+            'price': price,
+            'last_update': self.clock.now(),
+            'display_name': display_name,
+            'trade_count': trade_count,
+            'trade_amount': 0.0,
+            'auto_trading': False,
+            'change_24h': 0.0,
+            'last_buy_quantity': 0.0,  # 存储上一个买单的份额
+            'last_buy_amount': 0.0,  # 存储上一个买单的成交额
+            'last_sell_amount': 0.0  # 存储上一个卖单的成交额
+        }
+
+    # ==================== Alpha ID映射 ====================
+
+    def load_alpha_id_map(self):
+        """
+        加载ALPHA代币ID映射（直接读取文件，不是当天的在后台更新，没有文件时从API获取）
+
+        Returns:
+            dict: 代币名称到ALPHA代币ID的映射
+        """
+        self.symbol_resolver = SymbolResolver(self.api, self.logger, clock=self.clock)
+        self.symbol_resolver.add_listener(self.apply_alpha_id_map)
+        return self.symbol_resolver.load()
+
+    def refresh_alpha_id_map(self):
+        """
+        强制从API更新Alpha ID映射（新代币增量合并）并保存到文件
+
+        Returns:
+            dict: 更新后的映射，失败时抛出异常
+        """
+        return self.symbol_resolver.refresh()
+
+    def apply_alpha_id_map(self, alpha_id_map):
+        """
+        映射更新后同步到交易核心和稳定度客户端
+
+        Args:
+            alpha_id_map: 新的映射
+        """
+        self.alpha_id_map = alpha_id_map
+        if hasattr(self, 'alpha123_client'):
+            self.alpha123_client.set_alpha_id_map(alpha_id_map)
+
+    def resolve_alpha_id(self, name):
+        """
+        把代币名称解析为ALPHA代币ID
+
+        Args:
+            name: 代币名称，如 "KOGE"
+
+        Returns:
+            str: ALPHA代币ID，找不到返回None
+        """
+        return self.symbol_resolver.resolve(name)
+
+    # ==================== 代币列表 ====================
+
+    def add_permanent_tokens_from_stability(self):
+        """从稳定度看板添加常驻代币"""
+        try:
+            # 获取稳定度看板数据
+            stability_data = self.alpha123_client.get_stability_data()
+            if not stability_data:
+                self.log_message("无法获取稳定度看板数据，将只添加KOGE代币")
+                self.add_koge_token()
+                return
+
+            added_count = 0
+            for item in stability_data:
+                project = item.get('project', '')
+                if not project:
+                    continue
+
+                # 查找对应的ALPHA ID
+                alpha_id = self.alpha_id_map.get(project)
+                if not alpha_id:
+                    continue
+
+                alpha_symbol = f"{alpha_id}USDT"
+
+                # 检查代币是否已在监控列表中
+                if alpha_symbol in self.tokens:
+                    continue
+
+                # 获取稳定度看板返回的价格
+                stability_price = float(item.get('price', 0))
+
+                # 添加代币到监控列表，直接使用稳定度看板的价格（稳定度看板没有24h变化数据）
+                self.tokens[alpha_symbol] = self.new_token_record(project, stability_price)
+                added_count += 1
+
+            # 更新表格显示
+            self.notify_tokens_changed()
+            self.log_message(f"已从稳定度看板添加 {added_count} 个常驻代币")
+
+        except Exception as e:
+            self.log_message(f"从稳定度看板添加常驻代币失败: {str(e)}")
+            # 如果失败，至少添加KOGE代币
+            self.add_koge_token()
+
+    def add_koge_token(self):
+        """添加常驻的KOGE代币（备用方法）"""
+        koge_symbol = "ALPHA_22USDT"  # KOGE的ALPHA ID
+        self.tokens[koge_symbol] = self.new_token_record('KOGE')
+        # 更新表格显示
+        self.notify_tokens_changed()
+        self.log_message("已添加常驻代币: KOGE (ALPHA_22USDT)")
+
+        # 立即获取KOGE的价格数据
+        self.fetch_koge_price()
+
+    def fetch_koge_price(self):
+        """获取KOGE代币的价格数据"""
+        def fetch_data():
+            koge_symbol = "ALPHA_22USDT"
+            price_data = self.get_token_price(koge_symbol)
+            if price_data:
+                price = float(price_data['price'])
+                self.run_on_ui(lambda: self.set_token_price(koge_symbol, price, 'KOGE'))
+                self.log_message(f"代币 KOGE ({koge_symbol}) 更新成功，价格: ${price:.8f}")
+            else:
+                self.log_message("获取KOGE价格失败（请先设置认证信息）")
+
+        self.clock.start_thread(fetch_data)
+
+    def set_token_price(self, symbol, price, display_name=None):
+        """
+        更新代币价格，代币不在监控列表中时新增
+
+        Args:
+            symbol: 交易对符号，如 "ALPHA_22USDT"
+            price: 最新价格
+            display_name: 显示名称
+        """
+        if symbol not in self.tokens:
+            self.tokens[symbol] = self.new_token_record(display_name or symbol, price)
+
+        self.tokens.set_fields(symbol, price=price, last_update=self.clock.now(), display_name=display_name or symbol)
+        self.notify_tokens_changed()
+
+    def set_token_trade_count(self, symbol, count):
+        """设置代币的计划交易次数"""
+        if symbol not in self.tokens:
+            return
+        self.tokens[symbol]['trade_count'] = count
+        self.log_message(f"{symbol} 交易次数设置为: {count}")
+        self.notify_tokens_changed()
+
+    def set_token_trade_amount(self, symbol, amount):
+        """设置代币的成交额"""
+        if symbol not in self.tokens:
+            return
+        self.tokens[symbol]['trade_amount'] = amount
+        display_name = self.tokens[symbol].get('display_name', symbol)
+        self.log_message(f"{display_name} 成交额设置为: {amount:.2f} USDT")
+        self.notify_tokens_changed()
+
+    def remove_token(self, symbol):
+        """从监控列表删除代币"""
+        self.auto_trading.pop(symbol, None)
+        self.trading_threads.pop(symbol, None)
+        token_data = self.tokens.pop(symbol, None)
+        if token_data is not None:
+            self.notify_tokens_changed()
+            self.log_message(f"已删除代币: {token_data.get('display_name', symbol)}")
+
+    def retain_tokens(self, stability_tokens):
+        """
+        清空代币列表，只保留稳定度看板中的代币（使用稳定度看板的价格）
+
+        Args:
+            stability_tokens: {交易对符号: {'price', 'display_name', 'change_24h'}}
+        """
+        permanent_tokens = {}
+        for symbol, stability_data in stability_tokens.items():
+            if symbol in self.tokens:
+                token_data = self.tokens[symbol]
+                permanent_tokens[symbol] = {
+                    'price': stability_data.get('price', token_data.get('price', 0.0)),
+                    'last_update': token_data.get('last_update', self.clock.now()),
+                    'display_name': stability_data.get('display_name', token_data.get('display_name', '')),
+                    'trade_count': 1,
+                    'trade_amount': 0.0,
+                    'auto_trading': False,
+                    'change_24h': stability_data.get('change_24h', 0.0),
+                    'last_buy_quantity': token_data.get('last_buy_quantity', 0.0),  # 保留上一个买单份额
+                    'last_buy_amount': token_data.get('last_buy_amount', 0.0),  # 保留上一个买单成交额
+                    'last_sell_amount': token_data.get('last_sell_amount', 0.0)  # 保留上一个卖单成交额
+                }
+
+        self.auto_trading.clear()
+        self.trading_threads.clear()
+
+        self.tokens.replace_all(permanent_tokens)
+
+        self.notify_tokens_changed()
+        self.log_message(f"已清空所有代币（保留了 {len(permanent_tokens)} 个稳定度看板代币）")
+
+    def retain_stability_tokens(self):
+        """清空代币列表，只保留当前稳定度看板中的代币（获取失败时至少保留KOGE）"""
+        stability_tokens = {}
+        try:
+            for item in self.alpha123_client.get_stability_data() or []:
+                project = item.get('project', '')
+                alpha_id = self.alpha_id_map.get(project) if project else None
+                if alpha_id:
+                    stability_tokens[f"{alpha_id}USDT"] = {
+                        'price': float(item.get('price', 0)),
+                        'display_name': project,
+                        'change_24h': 0.0
+                    }
+        except Exception as e:
+            self.log_message(f"获取稳定度看板代币列表失败: {str(e)}")
+            stability_tokens["ALPHA_22USDT"] = {
+                'price': 0.0,
+                'display_name': 'KOGE',
+                'change_24h': 0.0
+            }
+
+        self.retain_tokens(stability_tokens)
+
+    def add_token_by_name(self, name):
+        """
+        按代币名称添加代币到监控列表（查找ALPHA代币ID并获取价格，会阻塞，在后台线程中调用）
+
+        Args:
+            name: 代币名称，如 "KOGE"
+
+        Returns:
+            bool: 添加成功返回True
+        """
+        # 找不到时更新一次代币列表，最近确认不存在的名称不再更新
+        alpha_id = self.resolve_alpha_id(name)
+        if not alpha_id:
+            self.show_error("错误", f"未找到代币 {name} 的ALPHA ID，请检查代币名称是否正确")
+            return False
+
+        alpha_symbol = f"{alpha_id}USDT"
+        if alpha_symbol in self.tokens:
+            self.show_error("提示", f"代币 {name} ({alpha_symbol}) 已在监控列表中")
+            return False
+
+        self.log_message(f"正在添加代币: {name} -> {alpha_symbol}")
+        price_data = self.get_token_price(alpha_symbol)
+        if not price_data:
+            self.show_error("错误", f"无法获取代币 {name} 的信息，请检查代币名称是否正确")
+            return False
+
+        try:
+            price = float(price_data['price'])
+        except (ValueError, KeyError) as e:
+            self.log_message(f"解析 {alpha_symbol} 数据失败: {str(e)}")
+            return False
+        self.set_token_price(alpha_symbol, price, name)
+        self.log_message(f"代币 {name} ({alpha_symbol}) 添加成功，价格: ${price:.8f}")
+        return True
+
+    def refresh_stability(self):
+        """立即请求一次稳定度数据（数据未变化时不重新解析），把最新快照交给界面显示"""
+        self.stability_feed.refresh()
+        snapshot = self.stability_feed.get_snapshot()
+        if snapshot is None:
+            self.notify_stability_updated([], None)
+        else:
+            self.notify_stability_updated(snapshot.items, snapshot.fetched_at)
+
+    def toggle_auto_trading(self, symbol):
+        """切换代币的自动交易状态 - 调用交易引擎"""
+        self.trading_engine.toggle_auto_trading(symbol)
+
+    # ==================== 配置与统计 ====================
+
+    def set_credentials(self, csrf_token, cookie, extra_headers, save=True):
+        """
+        设置认证信息并重新创建API实例
+
+        Args:
+            csrf_token: CSRF令牌
+            cookie: Cookie字符串
+            extra_headers: 额外的 header 字段字典
+            save: 是否写入配置文件
+        """
+        self.config_manager.set_credentials(csrf_token, cookie, extra_headers, save=save)
+
+        # 更新本地认证信息
+        self.csrf_token = csrf_token
+        self.cookie = cookie
+        self.config_manager.extra_headers = extra_headers
+
+        # 重新创建API实例（使用新的认证信息）
+        self.api = BinanceAPI(
+            base_url=self.base_url,
+            csrf_token=self.csrf_token,
+            cookie=self.cookie,
+            logger=self.logger,
+            extra_headers=extra_headers,
+            clock=self.clock
+        )
+        if hasattr(self, 'symbol_resolver'):
+            self.api.symbol_resolver = self.symbol_resolver
+
+        # 更新依赖组件的API引用
+        if hasattr(self, 'trading_engine'):
+            self.trading_engine.api = self.api
+        if hasattr(self, 'order_handler'):
+            self.order_handler.api = self.api
+
+    # 统计数据属性（读写 self.statistics，与配置管理器共用一份）
+
+    @property
+    def daily_total_amount(self):
+        """今日交易总额"""
+        return self.statistics.get(AMOUNT)
+
+    @daily_total_amount.setter
+    def daily_total_amount(self, value):
+        self.statistics.set_value(AMOUNT, value)
+
+    @property
+    def daily_trade_loss(self):
+        """今日交易损耗"""
+        return self.statistics.get(LOSS)
+
+    @daily_trade_loss.setter
+    def daily_trade_loss(self, value):
+        self.statistics.set_value(LOSS, value)
+
+    @property
+    def daily_completed_trades(self):
+        """今日已完成交易次数"""
+        return self.statistics.get(TRADES)
+
+    @daily_completed_trades.setter
+    def daily_completed_trades(self, value):
+        self.statistics.set_value(TRADES, value)
+
+    @property
+    def last_trade_date(self):
+        """统计数据所属日期（总是今天）"""
+        return self.statistics.get_date()
+
+    def get_statistics_snapshot(self):
+        """
+        获取界面显示用的统计数据（总额、损耗和次数取自同一时刻）
+
+        Returns:
+            dict: 今日交易总额、损耗、完成次数、初始资金和结束资金
+        """
+        stats = self.statistics.snapshot()
+        return {
+            'daily_total_amount': stats[AMOUNT],
+            'daily_trade_loss': stats[LOSS],
+            'daily_completed_trades': stats[TRADES],
+            'daily_initial_balance': self.config_manager.daily_initial_balance,
+            'daily_end_balance': self.config_manager.daily_end_balance,
+        }
+
+    def apply_statistics(self, stats):
+        """
+        应用统计数据（界面进程收到交易引擎进程发来的统计变化时调用）
+
+        Args:
+            stats: get_statistics_snapshot() 返回字典的全部或部分字段
+        """
+        for key in ('daily_total_amount', 'daily_trade_loss', 'daily_completed_trades'):
+            if key in stats:
+                setattr(self, key, stats[key])
+        for key in ('daily_initial_balance', 'daily_end_balance'):
+            if key in stats:
+                setattr(self.config_manager, key, stats[key])
+
+    def save_config(self):
+        """保存配置文件 - 调用配置管理器"""
+        # 同步本地数据到配置管理器
+        self.config_manager.csrf_token = self.csrf_token
+        self.config_manager.cookie = self.cookie
+
+        # 保存配置
+        self.config_manager.save_config()
+
+    def update_trade_amount(self, symbol, price):
+        """更新成交额"""
+        try:
+            # 根据代币类型设置交易金额：KOGE使用1025，其他代币使用1030
+            trade_amount = 1025.0 if symbol == "ALPHA_22USDT" else 4120.0
+            # trade_amount = 1.0  # 测试模式：统一使用1 USDT
+            # 更新单个代币成交额
+            with self.tokens.lock:
+                current_amount = self.tokens[symbol].get('trade_amount', 0.0)
+                new_amount = current_amount + trade_amount
+                self.tokens[symbol]['trade_amount'] = new_amount
+
+            # 更新今日交易总额（配置管理器负责保存）
+            daily_total = self.config_manager.update_trade_amount(trade_amount, symbol)
+
+            # 更新界面
+            self.notify_tokens_changed()
+            self.notify_statistics_changed()
+
+            display_name = self.tokens[symbol].get('display_name', symbol)
+            self.log_message(f"{display_name} 成交额更新: {current_amount:.2f} -> {new_amount:.2f} USDT，今日总额: {daily_total:.2f} USDT")
+        except Exception as e:
+            self.log_message(f"更新成交额失败: {str(e)}")
+
+    def increment_daily_trade_count(self, symbol=None):
+        """
+        增加今日交易次数
+
+        Args:
+            symbol: 交易对符号（可选，同时计入该代币的统计）
+        """
+        count = self.config_manager.increment_trade_count(symbol)
+        self.notify_statistics_changed()
+        self.log_message(f"今日已完成交易次数: {count}")
+
+    def record_round_trip(self, symbol, buy_order_id, sell_order_id, quantity, buy_amount, sell_amount):
+        """
+        记录一次完成的买卖和当天最新的统计数据到交易历史（只放入队列，不等待磁盘）
+
+        Args:
+            symbol: 交易对符号
+            buy_order_id: 买单ID
+            sell_order_id: 卖单ID
+            quantity: 买入份额
+            buy_amount: 买单成交额（USDT）
+            sell_amount: 卖单成交额（USDT）
+        """
+        timestamp = self.clock.time()
+        self.history.record_round_trip(timestamp, symbol, buy_order_id, sell_order_id, quantity, buy_amount, sell_amount)
+        self.history.record_daily(self.statistics.get_date(), self.statistics.snapshot(),
+                                  self.statistics.symbol_snapshot(), timestamp)
+
+    def update_loss_from_ledger(self):
+        """根据成交账本更新今日损耗（每次买卖完成后调用，不请求资金账户余额），到达对账间隔时顺带对账"""
+        with self.loss_lock:
+            # 按代币计算账本损耗的增量，同时计入该代币的统计
+            trade_loss = 0.0
+            daily_loss = self.daily_trade_loss
+            for symbol, symbol_loss in self.fill_ledger.total_loss_by_symbol().items():
+                delta = symbol_loss - self.ledger_loss_applied.get(symbol, 0.0)
+                self.ledger_loss_applied[symbol] = symbol_loss
+                if delta:
+                    trade_loss += delta
+                    daily_loss = self.config_manager.update_trade_loss(delta, symbol)
+
+        self.notify_statistics_changed()
+        self.log_message(f"本次买卖损耗: {trade_loss:.4f} USDT，今日累计损耗: {daily_loss:.2f} USDT")
+
+        if self.clock.time() - self.last_balance_reconcile >= self.trading_params['balance_reconcile_interval']:
+            self.reconcile_balance()
+
+    def reconcile_balance(self):
+        """
+        获取资金账户余额与成交账本对账，以余额计算的损耗为准
+
+        Returns:
+            float: 对账后的今日损耗，失败返回None
+        """
+        self.last_balance_reconcile = self.clock.time()
+        try:
+            current_balance = self.api.get_funding_balance()
+            if current_balance is None:
+                self.log_message("获取资金账户余额失败，无法对账")
+                return None
+
+            with self.loss_lock:
+                ledger_loss = self.daily_trade_loss
+                loss = self.config_manager.update_loss_from_balance(current_balance)
+                if loss is None:
+                    return None
+                self.ledger_loss_applied = self.fill_ledger.total_loss_by_symbol()
+
+            self.log_message(f"资金账户对账: 账本损耗 {ledger_loss:.2f} USDT，余额损耗 {loss:.2f} USDT，差额 {loss - ledger_loss:.2f} USDT")
+            self.notify_statistics_changed()
+            return loss
+        except Exception as e:
+            self.log_message(f"资金账户对账异常: {str(e)}")
+            return None
+
+    def init_daily_balance(self):
+        """初始化当天初始资金"""
+        if not self.csrf_token or not self.cookie:
+            self.log_message("认证信息未设置，跳过获取初始资金")
+            return
+
+        # 检查是否已经设置过当天的初始资金
+        today = self.clock.now().strftime('%Y-%m-%d')
+        if (self.config_manager.daily_initial_balance is not None and
+            self.config_manager.last_trade_date == today):
+            self.log_message(f"当天初始资金已设置: {self.config_manager.daily_initial_balance} USDT")
+            return
+
+        # 在新线程中获取初始资金，避免阻塞调用方
+        def fetch_initial_balance():
+            try:
+                self.log_message("正在获取当天初始资金...")
+                balance = self.api.get_funding_balance()
+
+                if balance is not None:
+                    self.config_manager.set_daily_initial_balance(balance)
+                    self.log_message(f"✅ 当天初始资金已设置: {balance} USDT")
+                    # 更新显示
+                    self.notify_statistics_changed()
+                else:
+                    self.log_message("⚠️ 获取初始资金失败，请稍后重试")
+            except Exception as e:
+                self.log_message(f"获取初始资金异常: {str(e)}")
+
+        self.clock.start_thread(fetch_initial_balance)
+
+    def reset_daily_alarm_flag(self):
+        """重置每日闹钟标志（在每日重置时调用）"""
+        self.alarm_played_today = False
+        self.log_message("每日闹钟标志已重置")
+
+    def on_daily_rollover(self, previous_date, previous):
+        """
+        跨天回调：统计数据已归零，重置每日闹钟标志并刷新界面
+
+        Args:
+            previous_date: 前一天的日期（未知时为None）
+            previous: 前一天的统计快照
+        """
+        if previous_date:
+            self.log_message(f"{previous_date} 交易统计: 总额 {previous[AMOUNT]:.2f} USDT，"
+                             f"损耗 {previous[LOSS]:.2f} USDT，完成 {previous[TRADES]} 次")
+            # 前一天的最终统计写入交易历史（config.json 中的数据已归零）
+            self.history.record_daily(previous_date, previous, previous.get('symbols'), self.clock.time())
+        self.reset_daily_alarm_flag()
+        self.notify_statistics_changed()
+        # 前一天的初始资金已清空，重新获取今天的初始资金，资金账户对账才能继续
+        self.init_daily_balance()
+
+    # ==================== 4倍自动交易与定时交易 ====================
+
+    def begin_4x_trading(self, trading_count):
+        """
+        启动4倍自动交易线程
+
+        Args:
+            trading_count: 计划交易次数
+
+        Returns:
+            bool: 启动成功返回True
+        """
+        if trading_count <= 0:
+            self.log_message("交易次数必须大于0")
+            return False
+
+        if self.trading_4x_thread and self.trading_4x_thread.is_alive():
+            self.log_message("上一轮4倍自动交易尚未结束，请稍后再试")
+            return False
+
+        self.trading_4x_active = True
+        self.trading_4x_thread = self.clock.start_thread(self.trading_engine.run_4x_trading, args=(trading_count,))
+        self.notify_4x_trading_started()
+        return True
+
+    def stop_4x_trading(self):
+        """停止4倍自动交易（当前这一轮结束后退出）"""
+        self.trading_4x_active = False
+        self.log_message("4倍自动交易已停止")
+
+    def get_scheduled_time(self):
+        """
+        获取定时交易时间
+
+        Returns:
+            tuple: (小时, 分钟)，格式错误时抛出ValueError
+        """
+        return int(self.scheduled_hour), int(self.scheduled_minute)
+
+    def get_planned_trading_count(self):
+        """
+        获取计划的4倍交易次数
+
+        Returns:
+            int: 交易次数，格式错误时抛出ValueError
+        """
+        return int(self.trading_count)
+
+    def is_alarm_enabled(self):
+        """是否启用超时闹钟"""
+        return self.enable_alarm
+
+    def start_scheduled_trading_checker(self):
+        """启动定时交易检查线程"""
+        if self.scheduled_trading_thread and self.scheduled_trading_thread.is_alive():
+            return  # 如果已经在运行，不重复启动
+
+        self.scheduled_trading_thread = self.clock.start_thread(self.scheduled_trading_worker)
+
+    def scheduled_trading_worker(self):
+        """定时交易检查工作线程"""
+        while self.scheduled_trading_enabled:
+            try:
+                current_time = self.clock.now()
+                current_date = current_time.date()
+                current_hour = current_time.hour
+                current_minute = current_time.minute
+
+                # 获取设定的时间
+                try:
+                    scheduled_hour, scheduled_minute = self.get_scheduled_time()
+                except (TypeError, ValueError):
+                    self.log_message("定时交易时间格式错误，请检查输入")
+                    self.clock.sleep(60)  # 等待1分钟后重试
+                    continue
+
+                # 检查是否到达设定时间
+                if (current_hour == scheduled_hour and
+                    current_minute == scheduled_minute and
+                    self.last_scheduled_date != current_date and
+                    not self.trading_4x_active):
+
+                    # 执行定时交易
+                    self.last_scheduled_date = current_date
+                    self.log_message(f"到达定时交易时间 {scheduled_hour:02d}:{scheduled_minute:02d}，开始执行4倍自动交易")
+
+                    # 获取默认交易次数
+                    try:
+                        trading_count = self.get_planned_trading_count()
+                    except ValueError:
+                        trading_count = 8  # 默认8次
+
+                    # 在界面线程中执行交易
+                    self.run_on_ui(lambda: self.execute_scheduled_trading(trading_count))
+
+                # 检查超时提醒（超过设定时间30分钟）
+                self.check_timeout_alarm(current_hour, current_minute, scheduled_hour, scheduled_minute, current_date)
+
+                # 每分钟检查一次
+                self.clock.sleep(60)
+
+            except Exception as e:
+                self.log_message(f"定时交易检查出错: {str(e)}")
+                self.clock.sleep(60)  # 出错后等待1分钟再重试
+
+    def configure_scheduled_trading(self, enabled, hour=None, minute=None, trading_count=None, enable_alarm=False):
+        """
+        启用或禁用定时交易
+
+        Args:
+            enabled: 是否启用
+            hour: 每日执行的小时
+            minute: 每日执行的分钟
+            trading_count: 计划交易次数
+            enable_alarm: 是否启用超时闹钟
+        """
+        if not enabled:
+            # 线程无法强制停止，只能设置标志位让它自然结束
+            self.scheduled_trading_enabled = False
+            self.log_message("定时交易已禁用")
+            return
+
+        self.scheduled_hour = hour
+        self.scheduled_minute = minute
+        if trading_count is not None:
+            self.trading_count = trading_count
+        self.enable_alarm = enable_alarm
+        self.scheduled_trading_enabled = True
+        self.log_message("定时交易已启用")
+        self.start_scheduled_trading_checker()
+
+    def execute_scheduled_trading(self, trading_count):
+        """执行定时交易"""
+        try:
+            if self.begin_4x_trading(trading_count):
+                self.log_message(f"定时交易启动，计划交易 {trading_count} 次")
+        except Exception as e:
+            self.log_message(f"定时交易执行失败: {str(e)}")
+
+    def check_timeout_alarm(self, current_hour, current_minute, scheduled_hour, scheduled_minute, current_date):
+        """检查超时提醒"""
+        try:
+            # 计算当前时间与设定时间的差值（分钟）
+            current_time_minutes = current_hour * 60 + current_minute
+            scheduled_time_minutes = scheduled_hour * 60 + scheduled_minute
+
+            # 如果当前时间超过设定时间30分钟，但不超过1小时
+            if scheduled_time_minutes + 30 <= current_time_minutes < scheduled_time_minutes + 60:
+                # 检查今日是否已播放过闹钟
+                if not self.alarm_played_today:
+                    # 获取设定的交易次数
+                    try:
+                        expected_count = self.get_planned_trading_count()
+                    except ValueError:
+                        expected_count = 8
+
+                    # 如果实际交易次数不等于设定次数，且启用了闹钟，播放闹钟
+                    enable_alarm = self.is_alarm_enabled()
+                    if self.daily_completed_trades != expected_count and enable_alarm:
+                        self.notify_alarm()
+                        self.alarm_played_today = True
+                        self.log_message(f"⚠️ 超时警告：设定时间 {scheduled_hour:02d}:{scheduled_minute:02d} 已过30分钟，今日交易次数 {self.daily_completed_trades} 不等于设定次数 {expected_count}，播放闹钟提醒！")
+                    elif self.daily_completed_trades != expected_count and not enable_alarm:
+                        self.log_message(f"⚠️ 超时警告：设定时间 {scheduled_hour:02d}:{scheduled_minute:02d} 已过30分钟，今日交易次数 {self.daily_completed_trades} 不等于设定次数 {expected_count}，但闹钟未启用")
+                    else:
+                        self.log_message(f"今日交易次数已达到设定目标 {expected_count} 次，无需播放闹钟")
+            elif current_time_minutes >= scheduled_time_minutes + 60:
+                # 如果超过设定时间1小时，不再播放闹钟
+                if not self.alarm_played_today:
+                    try:
+                        expected_count = self.get_planned_trading_count()
+                    except ValueError:
+                        expected_count = 8
+
+                    if self.daily_completed_trades != expected_count:
+                        self.log_message(f"⚠️ 超时警告：设定时间 {scheduled_hour:02d}:{scheduled_minute:02d} 已过1小时，今日交易次数 {self.daily_completed_trades} 不等于设定次数 {expected_count}，但已超过闹钟提醒时限")
+                        self.alarm_played_today = True  # 标记为已处理，避免重复提醒
+
+        except Exception as e:
+            self.log_message(f"超时检查出错: {str(e)}")
+
+    # ==================== 全局清理 ====================
+
+    def cleanup_all_positions(self):
+        """取消所有未成交订单、卖出所有持仓并停止所有自动交易（阻塞执行，调用方负责放入线程）"""
+        try:
+            # 1. 取消所有未成交订单
+            self.log_message("正在取消所有未成交订单...")
+            cancel_success = self.api.cancel_all_orders()
+            if cancel_success:
+                self.log_message("✅ 已取消所有未成交订单")
+            else:
+                self.log_message("❌ 取消订单失败，继续执行清理...")
+
+            # 等待一下，确保订单取消生效
+            self.clock.sleep(2)
+
+            # 2. 清理所有持仓
+            tokens_with_holdings = []
+            for symbol, token_data in self.tokens.items():
+                last_buy_quantity = token_data.get('last_buy_quantity', 0)
+                if last_buy_quantity > 0:
+                    tokens_with_holdings.append((symbol, token_data, last_buy_quantity))
+
+            if tokens_with_holdings:
+                self.log_message(f"发现 {len(tokens_with_holdings)} 个代币有持仓，开始清仓...")
+
+                positions = []
+                for symbol, token_data, quantity in tokens_with_holdings:
+                    display_name = token_data.get('display_name', symbol)
+                    self.log_message(f"{display_name} 检测到持有份额: {quantity}，正在清仓卖出...")
+                    positions.append((symbol, display_name, quantity))
+
+                # 所有持仓同时下清仓卖单，统一查询成交状态
+                self.cleanup_orchestrator.flatten(positions)
+            else:
+                self.log_message("✅ 无持仓代币，无需清仓")
+
+            # 3. 停止所有自动交易
+            active_trading = []
+            for symbol in list(self.auto_trading.keys()):
+                if self.auto_trading.get(symbol, False):
+                    active_trading.append(symbol)
+
+            if active_trading:
+                self.log_message(f"停止 {len(active_trading)} 个代币的自动交易...")
+                for symbol in active_trading:
+                    self.auto_trading[symbol] = False
+                    if symbol in self.tokens:
+                        self.tokens[symbol]['auto_trading'] = False
+
+                # 更新UI
+                self.notify_tokens_changed()
+
+            self.log_message("✅ 取消所有订单并清理持仓完成")
+
+            # 清理后用资金账户余额对账一次
+            self.reconcile_balance()
+
+        except Exception as e:
+            self.log_message(f"❌ 清理过程中出现异常: {str(e)}")
@@ -0,0 +1,266 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+无界面交易守护进程
+Headless Trading Daemon for Binance Auto Trade System
+
+不导入tkinter，可在服务器上运行4倍自动交易、指定代币自动交易和定时交易。
+
+用法示例:
+    python trading_daemon.py --mode 4x --count 16
+    python trading_daemon.py --mode symbols --symbols KOGE,ZKJ --count 3
+    python trading_daemon.py --mode scheduled --schedule 09:30 --count 16
+    python trading_daemon.py --daemon-config daemon.json
+
+daemon.json 可包含与命令行参数同名的字段（命令行参数优先）:
+    {"mode": "4x", "count": 16, "symbols": ["KOGE"], "schedule": "09:30",
+     "enable_alarm": false, "config_file": "config.json", "log_dir": "log", "log_level": "INFO"}
+"""
+
+import sys
+import json
+import time
+import signal
+import argparse
+
+# 导入认证模块
+from auth import AuthManager
+# 导入交易核心模块
+from trader_core import TraderCore
+
+
+# 守护进程默认设置
+DEFAULT_SETTINGS = {
+    'mode': '4x',            # 运行模式: 4x / symbols / scheduled
+    'count': 16,             # 4倍交易次数，或每个指定代币的交易次数
+    'symbols': [],           # symbols模式下的代币名称列表（如 KOGE）
+    'schedule': None,        # scheduled模式下的每日执行时间 HH:MM
+    'enable_alarm': False,   # scheduled模式下是否启用超时提醒
+    'config_file': 'config.json',
+    'log_dir': 'log',
+    'log_level': None,       # 日志级别，如 "INFO,order_handler=DEBUG"（默认读取环境变量 BINANCE_LOG_LEVEL）
+}
+
+
+class TradingDaemon(TraderCore):
+    """无界面交易守护进程类 - 不依赖tkinter运行交易引擎"""
+
+    def __init__(self, settings):
+        """
+        初始化守护进程
+
+        Args:
+            settings: 设置字典，字段见 DEFAULT_SETTINGS
+        """
+        super().__init__(config_file=settings['config_file'], log_dir=settings['log_dir'])
+        self.settings = settings
+        if settings.get('log_level'):
+            self.logger.set_levels(settings['log_level'])
+        self.running = True
+
+        # 吞吐量统计的起点
+        self.started_at = None
+        self.start_completed_trades = self.daily_completed_trades
+        self.start_total_amount = self.daily_total_amount
+
+        self.init_trading_components()
+
+    def stop(self):
+        """停止所有交易（进行中的订单处理完当前步骤后退出）"""
+        self.running = False
+        self.scheduled_trading_enabled = False
+        self.trading_4x_active = False
+        for symbol in list(self.auto_trading.keys()):
+            self.auto_trading[symbol] = False
+
+    def resolve_symbol(self, name):
+        """
+        把代币名称解析为交易对符号
+
+        Args:
+            name: 代币名称，如 "KOGE"
+
+        Returns:
+            str: 交易对符号（如 "ALPHA_22USDT"），找不到返回None
+        """
+        alpha_id = self.resolve_alpha_id(name)
+        return f"{alpha_id}USDT" if alpha_id else None
+
+    def run(self):
+        """
+        按设置的模式运行，直到交易完成或收到停止信号
+
+        Returns:
+            int: 进程退出码
+        """
+        if not self.csrf_token or not self.cookie:
+            self.log_message("认证信息未设置，请先在GUI中设置认证信息或编辑配置文件")
+            return 1
+
+        self.started_at = self.clock.time()
+        self.init_daily_balance()
+
+        mode = self.settings['mode']
+        self.log_message(f"无界面交易守护进程启动，模式: {mode}")
+        try:
+            if mode == '4x':
+                self.run_4x()
+            elif mode == 'symbols':
+                self.run_symbols()
+            elif mode == 'scheduled':
+                self.run_scheduled()
+            else:
+                self.log_message(f"未知的运行模式: {mode}")
+                return 1
+        except KeyboardInterrupt:
+            self.log_message("收到中断信号，正在停止交易...")
+            self.stop()
+            self.wait_for_workers()
+        finally:
+            self.flatten_if_holding()
+            self.report_throughput()
+            self.config_manager.flush_config()
+        return 0
+
+    def run_4x(self):
+        """运行4倍自动交易并等待完成"""
+        if self.begin_4x_trading(int(self.settings['count'])):
+            self.wait_for_workers()
+
+    def run_symbols(self):
+        """对指定代币运行自动交易并等待全部完成"""
+        count = int(self.settings['count'])
+        for name in self.settings['symbols']:
+            symbol = self.resolve_symbol(name)
+            if not symbol:
+                self.log_message(f"跳过代币 {name}：未找到ALPHA ID")
+                continue
+
+            price_data = self.get_token_price(symbol)
+            if not price_data:
+                self.log_message(f"跳过代币 {name}：无法获取价格")
+                continue
+
+            self.tokens[symbol] = self.new_token_record(name.strip().upper(), float(price_data['price']), trade_count=count)
+            self.trading_engine.toggle_auto_trading(symbol)
+
+        self.wait_for_workers()
+
+    def run_scheduled(self):
+        """每天在设定时间运行4倍自动交易，直到收到停止信号"""
+        try:
+            hour_str, minute_str = str(self.settings['schedule']).split(':')
+            self.scheduled_hour = int(hour_str)
+            self.scheduled_minute = int(minute_str)
+        except ValueError:
+            self.log_message(f"定时交易时间格式错误: {self.settings['schedule']}，应为 HH:MM")
+            return
+
+        self.trading_count = int(self.settings['count'])
+        self.enable_alarm = bool(self.settings['enable_alarm'])
+        self.scheduled_trading_enabled = True
+        self.start_scheduled_trading_checker()
+        self.log_message(f"定时交易已启用，每天 {self.scheduled_hour:02d}:{self.scheduled_minute:02d} 执行 {self.trading_count} 次")
+
+        while self.running:
+            time.sleep(1)
+        self.wait_for_workers()
+
+    def wait_for_workers(self):
+        """等待4倍交易线程和所有代币交易线程结束"""
+        while True:
+            threads = list(self.trading_threads.values())
+            if self.trading_4x_thread:
+                threads.append(self.trading_4x_thread)
+            alive = [thread for thread in threads if thread.is_alive()]
+            if not alive:
+                return
+            alive[0].join(timeout=1)
+
+    def flatten_if_holding(self):
+        """停止后如仍有持仓，执行全局清仓"""
+        holding = [symbol for symbol, data in self.tokens.items() if data.get('last_buy_quantity', 0) > 0]
+        if holding:
+            self.log_message(f"停止后仍有 {len(holding)} 个代币持仓，执行全局清仓")
+            self.cleanup_all_positions()
+
+    def report_throughput(self):
+        """输出本次运行的吞吐量统计"""
+        if self.started_at is None:
+            return
+        elapsed = self.clock.time() - self.started_at
+        completed = max(0, self.daily_completed_trades - self.start_completed_trades)
+        volume = max(0.0, self.daily_total_amount - self.start_total_amount)
+        per_hour = completed * 3600 / elapsed if elapsed > 0 else 0.0
+        seconds_per_trade = elapsed / completed if completed else 0.0
+        self.log_message(
+            f"运行统计: 用时 {elapsed:.1f} 秒，完成买卖 {completed} 次，成交额 {volume:.2f} USDT，"
+            f"每小时 {per_hour:.1f} 次，平均每次 {seconds_per_trade:.1f} 秒"
+        )
+        counts = self.logger.get_level_counts()
+        self.log_message("日志统计: " + "，".join(
+            f"{name} {written} 条（未输出 {suppressed} 条）" for name, (written, suppressed) in counts.items()
+        ))
+
+
+def load_settings(argv=None):
+    """
+    合并默认设置、守护进程配置文件和命令行参数（优先级依次升高）
+
+    Args:
+        argv: 命令行参数列表（默认使用sys.argv）
+
+    Returns:
+        dict: 设置字典
+    """
+    parser = argparse.ArgumentParser(description="币安量化交易系统 - 无界面交易守护进程")
+    parser.add_argument('--daemon-config', help="守护进程配置文件（JSON）")
+    parser.add_argument('--mode', choices=['4x', 'symbols', 'scheduled'], help="运行模式")
+    parser.add_argument('--count', type=int, help="交易次数")
+    parser.add_argument('--symbols', help="symbols模式的代币名称，逗号分隔，如 KOGE,ZKJ")
+    parser.add_argument('--schedule', help="scheduled模式的每日执行时间，如 09:30")
+    parser.add_argument('--enable-alarm', action='store_true', default=None, help="启用定时交易超时提醒")
+    parser.add_argument('--config-file', help="认证和统计配置文件（默认 config.json）")
+    parser.add_argument('--log-dir', help="日志目录（默认 log）")
+    parser.add_argument('--log-level', help="日志级别，如 INFO 或 INFO,order_handler=DEBUG")
+    args = parser.parse_args(argv)
+
+    settings = dict(DEFAULT_SETTINGS)
+    if args.daemon_config:
+        with open(args.daemon_config, 'r', encoding='utf-8') as f:
+            settings.update(json.load(f))
+
+    overrides = {
+        'mode': args.mode,
+        'count': args.count,
+        'symbols': args.symbols.split(',') if args.symbols else None,
+        'schedule': args.schedule,
+        'enable_alarm': args.enable_alarm,
+        'config_file': args.config_file,
+        'log_dir': args.log_dir,
+        'log_level': args.log_level,
+    }
+    settings.update({key: value for key, value in overrides.items() if value is not None})
+    return settings
+
+
+def main(argv=None):
+    """主函数"""
+    settings = load_settings(argv)
+
+    # 进行MAC地址校验（不弹出对话框）
+    allowed, error_message = AuthManager().verify_mac_permission()
+    if not allowed:
+        print(f"无权限使用该软件: {error_message}")
+        return 1
+
+    daemon = TradingDaemon(settings)
+
+    # SIGTERM与Ctrl+C一样，让交易线程在当前步骤结束后退出
+    signal.signal(signal.SIGTERM, lambda signum, frame: daemon.stop())
+
+    return daemon.run()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,11 +5,30 @@
 Trading Engine Module for Binance Auto Trade System
 """
 
-import time
 import random
-import threading
-from datetime import datetime
-from tkinter import messagebox
+
+
+# 交易参数默认值（离线回放时可以整体替换，搜索更合适的参数组合）
+DEFAULT_TRADING_PARAMS = {
+    'buy_price_offset': 0.00001,     # 买单价格在最新成交价基础上的加价
+    'sell_price_offset': 0.00001,    # 卖单价格在最新成交价基础上的减价
+    'reprice_offset': 0.0000001,     # 订单超时取消后重新下单的价格调整
+    'order_retry_limit': 5,          # 下单失败的最大重试次数
+    'status_check_limit': 5,         # 订单状态的最大检查次数，超过后取消订单
+    'poll_interval': (1.0, 2.0),     # 检查订单状态和下单前的随机等待区间（秒）
+    'trade_interval': (10.0, 15.0),  # 4倍交易每轮之间的随机等待区间（秒）
+    'max_spread': 0.2,               # 4倍交易选币时允许的最大价差基点
+    'balance_reconcile_interval': 1800.0,  # 用资金账户余额校正成交账本损耗的最短间隔（秒）
+    'cleanup_concurrency': 4,        # 全局清仓时同时下单的最大线程数
+    'cleanup_stagger': 0.2,          # 全局清仓时相邻两个代币开始下单的间隔（秒）
+    'stability_refresh_interval': 5.0,  # 后台刷新稳定度数据的间隔（秒）
+    'validate_top_k': 3,             # 4倍交易选币时同时校验最近成交的候选代币数（0表示不校验）
+    'validation_window': 60.0,       # 校验候选代币时统计最近多少秒的成交
+    'validation_trade_limit': 100,   # 校验候选代币时获取的最近成交条数
+    'min_trade_rate': 0.05,          # 候选代币最近的成交频率下限（笔/秒）
+    'max_price_drift': 0.01,         # 候选代币最新成交价相对稳定度数据价格的最大偏离比例
+    'max_volatility': 0.005,         # 候选代币最近成交的最大价格振幅比例
+}
 
 
 class TradingEngine:
@@ -25,6 +44,8 @@ class TradingEngine:
         self.trader = trader
         # 直接引用API实例，避免跨模块调用
         self.api = trader.api
+        # 时钟（真实时间或离线回放的虚拟时间）
+        self.clock = trader.clock
     
     def place_single_order(self, symbol, price, side, custom_quantity=None):
         """
@@ -58,12 +79,16 @@ class TradingEngine:
         
         while self.trader.trading_4x_active and completed_trades < trading_count:
             try:
-                # 获取稳定度排名第一的代币
-                top_token = self.trader.alpha123_client.get_top_stability_token()
+                # 获取稳定度排名靠前且当前正常成交的代币（跳过正在自动交易的代币，避免切换掉它的交易）
+                locked = {locked_symbol for locked_symbol, active in list(self.trader.auto_trading.items()) if active}
+                top_token = self.trader.candidate_validator.select(
+                    max_spread=self.trader.trading_params['max_spread'],
+                    exclude=locked
+                )
                 
                 if not top_token:
                     self.trader.log_message("当前没有稳定高倍代币，等待15秒")
-                    time.sleep(15)
+                    self.clock.sleep(15)
                     continue
                 
                 symbol = top_token['symbol']
@@ -71,23 +96,12 @@ class TradingEngine:
                 price = top_token['price']
                 stability = top_token['stability']
                 
-                self.trader.log_message(f"选择代币: {display_name} ({symbol})，稳定度: {stability}，价格: ${price}")
+                self.trader.log_message(f"选择代币: {display_name} ({symbol})，稳定度: {stability}，价格: ${price}", symbol=symbol)
                 
                 # 执行一次买卖交易 - 直接调用toggle_auto_trading方法
                 # 临时设置代币到tokens中
                 if symbol not in self.trader.tokens:
-                    self.trader.tokens[symbol] = {
-                        'price': price,
-                        'last_update': datetime.now(),
-                        'display_name': display_name,
-                        'trade_count': 1,
-                        'trade_amount': 0.0,
-                        'auto_trading': False,
-                        'change_24h': 0.0,
-                        'last_buy_quantity': 0.0,  # 存储上一个买单的份额
-                        'last_buy_amount': 0.0,  # 存储上一个买单的成交额
-                        'last_sell_amount': 0.0  # 存储上一个卖单的成交额
-                    }
+                    self.trader.tokens[symbol] = self.trader.new_token_record(display_name, price)
                 
                 # 调用toggle_auto_trading开始单次交易
                 self.toggle_auto_trading(symbol, single_trade=True)
@@ -98,46 +112,34 @@ class TradingEngine:
                 # 只有交易成功才计数
                 if self.trader.trade_success_flag:
                     completed_trades += 1
-                    self.trader.log_message(f"4倍交易完成 {completed_trades}/{trading_count}")
-                    
-                    # 增加今日交易次数统计
-                    self.trader.increment_daily_trade_count()
+                    self.trader.log_message(f"4倍交易完成 {completed_trades}/{trading_count}", symbol=symbol)
                     
-                    # 计算本次买卖的损耗（买单成交额 - 卖单成交额）
-                    if symbol in self.trader.tokens:
-                        last_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                        last_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                        
-                        if last_buy_amount > 0 and last_sell_amount > 0:
-                            trade_loss = last_buy_amount - last_sell_amount
-                            self.trader.daily_trade_loss += trade_loss
-                            self.trader.log_message(f"4倍交易损耗: 买入 {last_buy_amount:.2f} USDT - 卖出 {last_sell_amount:.2f} USDT = 损耗 {trade_loss:.2f} USDT，累计损耗: {self.trader.daily_trade_loss:.2f} USDT")
-                            
-                            # 保存配置并更新损耗显示
-                            self.trader.save_config()
-                            self.trader.root.after(0, self.trader.update_daily_loss_display)
+                    # 增加今日交易次数统计（损耗已在交易线程中根据成交账本更新）
+                    self.trader.increment_daily_trade_count(symbol)
                     
                     # 重置当前卖单成交额
                     self.trader.current_sell_amount = 0.0
                 else:
-                    self.trader.log_message(f"4倍交易失败，不计入完成次数")
+                    self.trader.log_message(f"4倍交易失败，不计入完成次数", symbol=symbol)
                 
                 # 重置交易成功标识
                 self.trader.trade_success_flag = True
                 
                 # 交易间隔 - 每次交易完成后都等待10-15秒
-                wait_time = random.uniform(10, 15)
+                wait_time = random.uniform(*self.trader.trading_params['trade_interval'])
                 if completed_trades < trading_count:
                     self.trader.log_message(f"等待 {wait_time:.1f} 秒后获取下一个稳定高倍代币...")
-                time.sleep(wait_time)
+                self.clock.sleep(wait_time)
                     
             except Exception as e:
                 self.trader.log_message(f"4倍自动交易异常: {str(e)}")
-                time.sleep(5)
+                self.clock.sleep(5)
         
-        # 交易完成
+        # 交易完成，用资金账户余额对账一次
         self.trader.trading_4x_active = False
-        self.trader.root.after(0, lambda: self.trader.trading_4x_btn.config(text="4倍自动交易", bg='#27ae60'))
+        if completed_trades > 0:
+            self.trader.reconcile_balance()
+        self.trader.notify_4x_trading_finished()
         self.trader.log_message(f"4倍自动交易完成，共完成 {completed_trades} 次交易")
     
     def wait_for_single_trade_completion(self, symbol):
@@ -149,7 +151,7 @@ class TradingEngine:
         """
         # 等待自动交易状态变为False（表示交易完成）
         while self.trader.auto_trading.get(symbol, False):
-            time.sleep(1)
+            self.clock.sleep(1)
     
     def toggle_auto_trading(self, symbol, single_trade=False):
         """
@@ -163,7 +165,8 @@ class TradingEngine:
         
         # 添加调试信息
         current_status = self.trader.auto_trading.get(symbol, False)
-        self.trader.log_message(f"[DEBUG] {display_name} toggle_auto_trading 被调用，当前状态: {current_status}，单次交易: {single_trade}")
+        self.trader.log_debug("%s toggle_auto_trading 被调用，当前状态: %s，单次交易: %s",
+                              display_name, current_status, single_trade, module='trading_engine', symbol=symbol)
         
         if symbol in self.trader.auto_trading and self.trader.auto_trading[symbol]:
             # 停止自动交易
@@ -173,19 +176,19 @@ class TradingEngine:
                 # 这里可以添加停止线程的逻辑
                 pass
             
-            self.trader.log_message(f"{display_name} 自动交易停止中，正在清理持仓...")
+            self.trader.log_message(f"{display_name} 自动交易停止中，正在清理持仓...", symbol=symbol)
             
             # 执行停止清理逻辑
             self.stop_trading_cleanup(symbol, display_name)
             
-            self.trader.log_message(f"{display_name} 自动交易已停止")
+            self.trader.log_message(f"{display_name} 自动交易已停止", symbol=symbol)
             
             # 更新表格显示
-            self.trader.update_tree_view()
+            self.trader.notify_tokens_changed()
         else:
             # 开始自动交易
             if not self.trader.csrf_token or not self.trader.cookie:
-                messagebox.showerror("错误", "请先设置认证信息")
+                self.trader.show_error("错误", "请先设置认证信息")
                 return
             
             self.trader.auto_trading[symbol] = True
@@ -196,14 +199,13 @@ class TradingEngine:
                 self.trader.tokens[symbol]['trade_count'] = 1
             
             # 启动自动交易线程
-            thread = threading.Thread(target=self.auto_trade_worker, args=(symbol,), daemon=True)
+            thread = self.clock.start_thread(self.auto_trade_worker, args=(symbol,))
             self.trader.trading_threads[symbol] = thread
-            thread.start()
             
-            self.trader.log_message(f"{display_name} 自动交易已开始")
+            self.trader.log_message(f"{display_name} 自动交易已开始", symbol=symbol)
             
             # 更新表格显示
-            self.trader.update_tree_view()
+            self.trader.notify_tokens_changed()
     
     def stop_trading_cleanup(self, symbol, display_name):
         """
@@ -215,28 +217,28 @@ class TradingEngine:
         """
         try:
             # 1. 取消所有未成交的订单
-            self.trader.log_message(f"{display_name} 正在取消所有未成交订单...")
+            self.trader.log_message(f"{display_name} 正在取消所有未成交订单...", symbol=symbol)
             cancel_success = self.api.cancel_all_orders()
             if cancel_success:
-                self.trader.log_message(f"{display_name} 已取消所有未成交订单")
+                self.trader.log_message(f"{display_name} 已取消所有未成交订单", symbol=symbol)
             else:
-                self.trader.log_message(f"{display_name} 取消订单失败，继续执行清理...")
+                self.trader.log_message(f"{display_name} 取消订单失败，继续执行清理...", symbol=symbol)
             
             # 等待一下，确保订单取消生效
-            time.sleep(1)
+            self.clock.sleep(1)
             
             # 2. 检查是否持有代币，如果有则卖出
             last_buy_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0)
             if last_buy_quantity > 0:
-                self.trader.log_message(f"{display_name} 检测到持有份额: {last_buy_quantity}，正在清仓卖出...")
+                self.trader.log_message(f"{display_name} 检测到持有份额: {last_buy_quantity}，正在清仓卖出...", symbol=symbol)
                 
                 # 使用和正常交易一样的卖单逻辑
                 self.execute_cleanup_sell_order(symbol, display_name, last_buy_quantity)
             else:
-                self.trader.log_message(f"{display_name} 无持仓，无需清仓")
+                self.trader.log_message(f"{display_name} 无持仓，无需清仓", symbol=symbol)
                 
         except Exception as e:
-            self.trader.log_message(f"{display_name} 停止清理过程中出现异常: {str(e)}")
+            self.trader.log_message(f"{display_name} 停止清理过程中出现异常: {str(e)}", symbol=symbol)
     
     def execute_cleanup_sell_order(self, symbol, display_name, quantity, is_global_cleanup=False):
         """
@@ -249,65 +251,9 @@ class TradingEngine:
             is_global_cleanup: 是否为全局清理（不检查自动交易状态）
         """
         try:
-            # 获取当前价格
-            price_data = self.api.get_token_price(symbol)
-            if not price_data or not price_data.get('price'):
-                self.trader.log_message(f"{display_name} 无法获取当前价格，跳过清仓")
-                return
-            
-            sell_price = float(price_data['price'])
-            self.trader.log_message(f"{display_name} 获取到当前价格: {sell_price}")
-            
-            # 卖单重试逻辑（和正常交易一样）
-            max_sell_retries = 5
-            sell_retry_count = 0
-            sell_order_id = None
-            use_wallet_balance = False
-            
-            while sell_retry_count < max_sell_retries and not sell_order_id:
-                sell_price_adjusted = sell_price - (0.000001 * sell_retry_count)  # 每次重试降低价格
-                
-                # 如果是重试且之前失败过，使用钱包接口获取实际余额
-                if sell_retry_count > 0 and not use_wallet_balance:
-                    self.trader.log_message(f"{display_name} 清仓卖单失败，尝试从钱包接口获取实际持有份额")
-                    
-                    # 从symbol中提取代币符号（例如 "ALPHA_195USDT" -> "ALPHA_195"）
-                    token_symbol = symbol.replace('USDT', '')
-                    wallet_balance = self.api.get_token_balance(token_symbol)
-                    
-                    if wallet_balance > 0:
-                        # 更新数量为钱包实际余额
-                        old_quantity = quantity
-                        quantity = wallet_balance
-                        self.trader.tokens[symbol]['last_buy_quantity'] = wallet_balance
-                        self.trader.log_message(f"{display_name} 更新清仓数量: {old_quantity} -> {wallet_balance}（来自钱包接口）")
-                        use_wallet_balance = True
-                    else:
-                        self.trader.log_message(f"{display_name} 无法从钱包获取余额，继续使用系统计算的份额")
-                
-                self.trader.log_message(f"{display_name} 尝试清仓卖单，价格: {sell_price_adjusted}，数量: {quantity}")
-                sell_order_id = self.api.place_single_order(symbol, sell_price_adjusted, "SELL", None, quantity)
-                
-                if not sell_order_id:
-                    sell_retry_count += 1
-                    self.trader.log_message(f"{display_name} 清仓卖单下单失败（{sell_retry_count}/{max_sell_retries}），等待1秒后重试")
-                    
-                    if sell_retry_count >= max_sell_retries:
-                        self.trader.log_message(f"{display_name} 清仓卖单下单失败{max_sell_retries}次，停止清仓")
-                        return
-                    
-                    time.sleep(random.uniform(0, 1))
-                    # 重新获取最新价格
-                    price_data = self.api.get_token_price(symbol)
-                    if price_data and price_data.get('price'):
-                        sell_price = float(price_data['price'])
-                        self.trader.log_message(f"{display_name} 重新获取价格: {sell_price}")
-                    else:
-                        self.trader.log_message(f"{display_name} 重新获取价格失败，使用原价格")
+            sell_order_id = self.place_cleanup_sell_order(symbol, display_name, quantity)
             
             if sell_order_id:
-                self.trader.log_message(f"{display_name} 清仓卖单下单成功，order_id: {sell_order_id}，价格: {sell_price_adjusted}")
-                
                 # 根据是否为全局清理选择不同的订单状态检查逻辑
                 if is_global_cleanup:
                     # 全局清理：使用简化的状态检查（不检查自动交易状态）
@@ -318,16 +264,86 @@ class TradingEngine:
                 
                 if sell_filled:
                     # 清零持有份额
-                    self.trader.tokens[symbol]['last_buy_quantity'] = 0
-                    self.trader.tokens[symbol]['last_buy_amount'] = 0
-                    self.trader.log_message(f"{display_name} 清仓完成，已清零持有份额")
+                    self.trader.tokens.set_fields(symbol, last_buy_quantity=0, last_buy_amount=0)
+                    self.trader.log_message(f"{display_name} 清仓完成，已清零持有份额", symbol=symbol)
                 else:
-                    self.trader.log_message(f"{display_name} 清仓卖单未成交或被取消")
+                    self.trader.log_message(f"{display_name} 清仓卖单未成交或被取消", symbol=symbol)
             
         except Exception as e:
-            self.trader.log_message(f"{display_name} 执行清仓卖单异常: {str(e)}")
+            self.trader.log_message(f"{display_name} 执行清仓卖单异常: {str(e)}", symbol=symbol)
+    
+    def place_cleanup_sell_order(self, symbol, display_name, quantity):
+        """
+        下清仓卖单（失败时降价并改用钱包余额重试），不等待成交
+        
+        Args:
+            symbol: 交易对符号
+            display_name: 显示名称
+            quantity: 卖出数量
+            
+        Returns:
+            str: 订单ID，失败返回None
+        """
+        # 获取当前价格
+        price_data = self.api.get_token_price(symbol)
+        if not price_data or not price_data.get('price'):
+            self.trader.log_message(f"{display_name} 无法获取当前价格，跳过清仓", symbol=symbol)
+            return None
+        
+        sell_price = float(price_data['price'])
+        self.trader.log_message(f"{display_name} 获取到当前价格: {sell_price}", symbol=symbol)
+        
+        # 卖单重试逻辑（和正常交易一样）
+        max_sell_retries = 5
+        sell_retry_count = 0
+        sell_order_id = None
+        use_wallet_balance = False
+        
+        while sell_retry_count < max_sell_retries and not sell_order_id:
+            sell_price_adjusted = sell_price - (0.000001 * sell_retry_count)  # 每次重试降低价格
+            
+            # 如果是重试且之前失败过，使用钱包接口获取实际余额
+            if sell_retry_count > 0 and not use_wallet_balance:
+                self.trader.log_message(f"{display_name} 清仓卖单失败，尝试从钱包接口获取实际持有份额", symbol=symbol)
+                
+                # 从symbol中提取代币符号（例如 "ALPHA_195USDT" -> "ALPHA_195"）
+                token_symbol = symbol.replace('USDT', '')
+                wallet_balance = self.api.get_token_balance(token_symbol)
+                
+                if wallet_balance > 0:
+                    # 更新数量为钱包实际余额
+                    old_quantity = quantity
+                    quantity = wallet_balance
+                    self.trader.tokens[symbol]['last_buy_quantity'] = wallet_balance
+                    self.trader.log_message(f"{display_name} 更新清仓数量: {old_quantity} -> {wallet_balance}（来自钱包接口）", symbol=symbol)
+                    use_wallet_balance = True
+                else:
+                    self.trader.log_message(f"{display_name} 无法从钱包获取余额，继续使用系统计算的份额", symbol=symbol)
+            
+            self.trader.log_message(f"{display_name} 尝试清仓卖单，价格: {sell_price_adjusted}，数量: {quantity}", symbol=symbol)
+            sell_order_id = self.api.place_single_order(symbol, sell_price_adjusted, "SELL", None, quantity)
+            
+            if not sell_order_id:
+                sell_retry_count += 1
+                self.trader.log_message(f"{display_name} 清仓卖单下单失败（{sell_retry_count}/{max_sell_retries}），等待1秒后重试", symbol=symbol)
+                
+                if sell_retry_count >= max_sell_retries:
+                    self.trader.log_message(f"{display_name} 清仓卖单下单失败{max_sell_retries}次，停止清仓", symbol=symbol)
+                    return None
+                
+                self.clock.sleep(random.uniform(0, 1))
+                # 重新获取最新价格
+                price_data = self.api.get_token_price(symbol)
+                if price_data and price_data.get('price'):
+                    sell_price = float(price_data['price'])
+                    self.trader.log_message(f"{display_name} 重新获取价格: {sell_price}", symbol=symbol)
+                else:
+                    self.trader.log_message(f"{display_name} 重新获取价格失败，使用原价格", symbol=symbol)
+        
+        self.trader.log_message(f"{display_name} 清仓卖单下单成功，order_id: {sell_order_id}，价格: {sell_price_adjusted}", symbol=symbol)
+        return sell_order_id
     
-    def check_cleanup_order_status(self, order_id, display_name, side, check_count=0, max_checks=5):
+    def check_cleanup_order_status(self, order_id, display_name, side, check_count=0, max_checks=None):
         """
         检查清仓订单状态（简化版，不检查自动交易状态）
         
@@ -336,18 +352,22 @@ class TradingEngine:
             display_name: 显示名称
             side: 订单方向
             check_count: 当前检查次数
-            max_checks: 最大检查次数
+            max_checks: 最大检查次数（默认使用交易参数 status_check_limit）
             
         Returns:
             bool: 订单成交返回True，否则返回False
         """
+        if max_checks is None:
+            max_checks = self.trader.trading_params['status_check_limit']
+        
         try:
             # 等待随机时间（和正常流程一样）
-            time.sleep(random.uniform(1, 2))
+            self.clock.sleep(random.uniform(*self.trader.trading_params['poll_interval']))
             
             # 检查订单状态
             order_status = self.api.check_single_order_filled(order_id)
-            self.trader.log_message(f"{display_name} 检查清仓{side}单状态: {order_status}, 检查次数: {check_count + 1}")
+            self.trader.log_debug("%s 检查清仓%s单状态: %s, 检查次数: %d",
+                                  display_name, side, order_status, check_count + 1, module='trading_engine')
             
             if order_status == "FILLED":
                 self.trader.log_message(f"{display_name} 清仓{side}单已成交")
@@ -368,7 +388,7 @@ class TradingEngine:
                     try:
                         self.api.cancel_all_orders()
                         # 取消后等待2秒，然后双重检查订单状态
-                        time.sleep(2)
+                        self.clock.sleep(2)
                         self.trader.log_message(f"{display_name} 取消后双重检查清仓订单状态")
                         final_status = self.api.check_single_order_filled(order_id)
                         
@@ -386,22 +406,6 @@ class TradingEngine:
             self.trader.log_message(f"{display_name} 检查清仓订单状态异常: {str(e)}")
             return False
     
-    def update_loss_from_balance(self):
-        """从资金账户余额更新损耗"""
-        try:
-            current_balance = self.api.get_funding_balance()
-            if current_balance is not None:
-                loss = self.trader.config_manager.update_loss_from_balance(current_balance)
-                if loss is not None:
-                    self.trader.daily_trade_loss = loss  # 同步到trader对象
-                    # 更新损耗显示和结束余额显示
-                    self.trader.root.after(0, self.trader.update_daily_loss_display)
-                    self.trader.root.after(0, self.trader.update_daily_end_balance_display)
-            else:
-                self.trader.log_message("获取资金账户余额失败，无法更新损耗")
-        except Exception as e:
-            self.trader.log_message(f"更新损耗异常: {str(e)}")
-    
     def auto_trade_worker(self, symbol):
         """
         自动交易工作线程 - 单向交易模式
@@ -413,43 +417,45 @@ class TradingEngine:
         initial_trade_count = trade_count  # 保存初始计划的交易次数
         completed_trades = 0
         display_name = self.trader.tokens[symbol].get('display_name', symbol)
+        params = self.trader.trading_params
         
-        self.trader.log_message(f"{display_name} 开始自动交易，目标次数: {trade_count}")
+        self.trader.log_message(f"{display_name} 开始自动交易，目标次数: {trade_count}", symbol=symbol)
         
         # 开始自动交易
         while self.trader.auto_trading.get(symbol, False) and completed_trades < trade_count:
             try:
                 # 添加调试信息
-                self.trader.log_message(f"[DEBUG] {display_name} 进入交易循环，auto_trading状态: {self.trader.auto_trading.get(symbol, False)}")
+                self.trader.log_debug("%s 进入交易循环，auto_trading状态: %s",
+                                      display_name, self.trader.auto_trading.get(symbol, False), module='trading_engine', symbol=symbol)
                 
                 # 1. 获取价格（已内置重试机制）
                 price_data = self.trader.get_token_price(symbol)
                 if not price_data:
-                    self.trader.log_message(f"{display_name} 获取价格失败，跳过当前交易")
+                    self.trader.log_message(f"{display_name} 获取价格失败，跳过当前交易", symbol=symbol)
                     continue
                 
                 current_price = float(price_data['price'])
-                time.sleep(random.uniform(1, 2))
+                self.clock.sleep(random.uniform(*params['poll_interval']))
                 # 2. 下买单（重试机制，最多5次）- 使用最新价格+0.00000001提高撮合优先级
                 buy_order_id = None
                 buy_retry_count = 0
-                max_buy_retries = 5
+                max_buy_retries = params['order_retry_limit']
                 
                 while self.trader.auto_trading.get(symbol, False) and not buy_order_id and buy_retry_count < max_buy_retries:
-                    buy_price = current_price + 0.00001  # 买单价格提高0.000001
+                    buy_price = current_price + params['buy_price_offset']  # 买单价格提高0.000001
                     buy_order_id = self.place_single_order(symbol, buy_price, "BUY")
                     # buy_order_id = None
                     
                     if not buy_order_id:
                         buy_retry_count += 1
-                        self.trader.log_message(f"{display_name} 买单下单失败（{buy_retry_count}/{max_buy_retries}），等待1秒后重试")
+                        self.trader.log_message(f"{display_name} 买单下单失败（{buy_retry_count}/{max_buy_retries}），等待1秒后重试", symbol=symbol)
                         
                         if buy_retry_count >= max_buy_retries:
-                            self.trader.log_message(f"{display_name} 买单下单失败{max_buy_retries}次，退出当前交易循环")
+                            self.trader.log_message(f"{display_name} 买单下单失败{max_buy_retries}次，退出当前交易循环", symbol=symbol)
                             self.trader.trade_success_flag = False
                             break
                         
-                        time.sleep(random.uniform(0, 1))
+                        self.clock.sleep(random.uniform(0, 1))
                         # 重新获取价格
                         price_data = self.trader.get_token_price(symbol)
                         if price_data:
@@ -463,28 +469,29 @@ class TradingEngine:
                 if not self.trader.auto_trading.get(symbol, False):
                     break
                 
-                self.trader.log_message(f"{display_name} 买单下单成功，order_id: {buy_order_id}，价格为: {buy_price}")
+                self.trader.log_message(f"{display_name} 买单下单成功，order_id: {buy_order_id}，价格为: {buy_price}", symbol=symbol)
                 
                 # 3. 等待买单成交（使用递归方法处理）
-                self.trader.log_message(f"[DEBUG] {display_name} 开始等待买单成交，auto_trading状态: {self.trader.auto_trading.get(symbol, False)}")
+                self.trader.log_debug("%s 开始等待买单成交，auto_trading状态: %s",
+                                      display_name, self.trader.auto_trading.get(symbol, False), module='trading_engine', symbol=symbol)
                 buy_filled = self.trader.order_handler.handle_order_status(symbol, buy_order_id, display_name, "BUY")
                 
                 # 如果自动交易被停止，跳出外层循环
                 if not self.trader.auto_trading.get(symbol, False):
-                    self.trader.log_message(f"{display_name} 自动交易已停止，退出交易循环")
+                    self.trader.log_message(f"{display_name} 自动交易已停止，退出交易循环", symbol=symbol)
                     break
                 
                 # 如果买单失败，跳出外层循环
                 if not buy_filled:
                     self.trader.trade_success_flag = False  # 设置交易失败标识
-                    self.trader.log_message(f"{display_name} 买单失败，退出交易循环")
+                    self.trader.log_message(f"{display_name} 买单失败，退出交易循环", symbol=symbol)
                     break
                 
                 # 4. 获取最新价格（已内置重试机制）
                 price_data = self.trader.get_token_price(symbol)
                 if not price_data:
                     # 卖单时如果获取不到价格，使用买单价格
-                    self.trader.log_message(f"{display_name} 获取最新价格失败，使用买单价格作为卖单价格")
+                    self.trader.log_message(f"{display_name} 获取最新价格失败，使用买单价格作为卖单价格", symbol=symbol)
                     sell_price = buy_price
                 else:
                     sell_price = float(price_data['price'])
@@ -493,16 +500,16 @@ class TradingEngine:
                 # 重要：买单已成交，必须确保卖出，否则资金被占用无法进行下一次交易
                 sell_order_id = None
                 sell_retry_count = 0
-                max_sell_retries = 5
+                max_sell_retries = params['order_retry_limit']
                 use_wallet_balance = False  # 标记是否使用钱包接口获取的余额
-                time.sleep(random.uniform(1, 2))
+                self.clock.sleep(random.uniform(*params['poll_interval']))
                 
                 while self.trader.auto_trading.get(symbol, False) and not sell_order_id and sell_retry_count < max_sell_retries:
-                    sell_price_adjusted = sell_price - 0.00001  # 卖单价格降低0.000001
+                    sell_price_adjusted = sell_price - params['sell_price_offset']  # 卖单价格降低0.000001
                     
                     # 如果是重试且之前失败过，使用钱包接口获取实际余额
                     if sell_retry_count > 0 and not use_wallet_balance:
-                        self.trader.log_message(f"{display_name} 卖单失败，尝试从钱包接口获取实际持有份额")
+                        self.trader.log_message(f"{display_name} 卖单失败，尝试从钱包接口获取实际持有份额", symbol=symbol)
                         
                         # 从symbol中提取代币符号（例如 "ALPHA_195USDT" -> "ALPHA_195"）
                         token_symbol = symbol.replace('USDT', '')
@@ -512,32 +519,32 @@ class TradingEngine:
                             # 更新 last_buy_quantity 为钱包实际余额
                             old_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0)
                             self.trader.tokens[symbol]['last_buy_quantity'] = wallet_balance
-                            self.trader.log_message(f"{display_name} 更新持有份额: {old_quantity} -> {wallet_balance}（来自钱包接口）")
+                            self.trader.log_message(f"{display_name} 更新持有份额: {old_quantity} -> {wallet_balance}（来自钱包接口）", symbol=symbol)
                             use_wallet_balance = True
                         else:
-                            self.trader.log_message(f"{display_name} 无法从钱包获取余额，继续使用系统计算的份额")
+                            self.trader.log_message(f"{display_name} 无法从钱包获取余额，继续使用系统计算的份额", symbol=symbol)
                     
                     sell_order_id = self.place_single_order(symbol, sell_price_adjusted, "SELL")
                     
                     if not sell_order_id:
                         sell_retry_count += 1
-                        self.trader.log_message(f"{display_name} 卖单下单失败（{sell_retry_count}/{max_sell_retries}），等待1秒后重试")
+                        self.trader.log_message(f"{display_name} 卖单下单失败（{sell_retry_count}/{max_sell_retries}），等待1秒后重试", symbol=symbol)
                         
                         if sell_retry_count >= max_sell_retries:
-                            self.trader.log_message(f"{display_name} 卖单下单失败{max_sell_retries}次，触发闹钟提醒，退出当前交易循环")
+                            self.trader.log_message(f"{display_name} 卖单下单失败{max_sell_retries}次，触发闹钟提醒，退出当前交易循环", symbol=symbol)
                             self.trader.trade_success_flag = False
                             # 触发闹钟
-                            self.trader.root.after(0, self.trader.play_alarm)
+                            self.trader.notify_alarm()
                             break
                         
-                        time.sleep(random.uniform(0, 1))
+                        self.clock.sleep(random.uniform(0, 1))
                         # 重新获取最新价格（已内置重试机制）
                         price_data = self.trader.get_token_price(symbol)
                         if price_data:
                             sell_price = float(price_data['price'])
                         else:
                             # 如果无法获取价格，使用买单价格
-                            self.trader.log_message(f"{display_name} 重新获取价格失败，使用买单价格")
+                            self.trader.log_message(f"{display_name} 重新获取价格失败，使用买单价格", symbol=symbol)
                             sell_price = buy_price
                 
                 # 如果自动交易被停止，跳出外层循环
@@ -548,7 +555,7 @@ class TradingEngine:
                 if not sell_order_id:
                     break
                 
-                self.trader.log_message(f"{display_name} 卖单下单成功，order_id: {sell_order_id}，价格为: {sell_price_adjusted}")
+                self.trader.log_message(f"{display_name} 卖单下单成功，order_id: {sell_order_id}，价格为: {sell_price_adjusted}", symbol=symbol)
                 
                 # 6. 等待卖单成交（使用递归方法处理）
                 sell_filled = self.trader.order_handler.handle_order_status(symbol, sell_order_id, display_name, "SELL")
@@ -559,34 +566,32 @@ class TradingEngine:
                 
                 # 一次买卖完成
                 completed_trades += 1
-                self.trader.log_message(f"{display_name} 第 {completed_trades} 次买卖完成")
+                self.trader.log_message(f"{display_name} 第 {completed_trades} 次买卖完成", symbol=symbol)
                 
                 # 增加今日交易次数统计
-                self.trader.increment_daily_trade_count()
+                self.trader.increment_daily_trade_count(symbol)
                 
-                time.sleep(random.uniform(2, 3))
+                self.clock.sleep(random.uniform(2, 3))
                 
-                # 更新损耗：获取当前资金账户余额并计算损耗
-                self.update_loss_from_balance()
+                # 更新损耗：根据成交账本计算，不请求资金账户余额
+                self.trader.update_loss_from_ledger()
                 
                 # 清空累计的买单和卖单数据（买卖完成一轮后重置）
-                if symbol in self.trader.tokens:
-                    previous_quantity = self.trader.tokens[symbol].get('last_buy_quantity', 0.0)
-                    previous_buy_amount = self.trader.tokens[symbol].get('last_buy_amount', 0.0)
-                    previous_sell_amount = self.trader.tokens[symbol].get('last_sell_amount', 0.0)
-                    
-                    self.trader.tokens[symbol]['last_buy_quantity'] = 0.0
-                    self.trader.tokens[symbol]['last_buy_amount'] = 0.0
-                    self.trader.tokens[symbol]['last_sell_amount'] = 0.0
-                    
-                    self.trader.log_message(f"清空累计交易数据: 买单份额 {previous_quantity} -> 0.0, 买单成交额 {previous_buy_amount:.2f} -> 0.0 USDT, 卖单成交额 {previous_sell_amount:.2f} -> 0.0 USDT")
+                previous = self.trader.tokens.reset_round_trip(symbol)
+                if previous is not None:
+                    previous_quantity, previous_buy_amount, previous_sell_amount = previous
+                    self.trader.log_message(f"清空累计交易数据: 买单份额 {previous_quantity} -> 0.0, 买单成交额 {previous_buy_amount:.2f} -> 0.0 USDT, 卖单成交额 {previous_sell_amount:.2f} -> 0.0 USDT", symbol=symbol)
                 
                 # 更新成交额
                 self.trader.update_trade_amount(symbol, sell_price_adjusted)
                 
+                # 记录到交易历史
+                if previous is not None:
+                    self.trader.record_round_trip(symbol, buy_order_id, sell_order_id, *previous)
+                
             except Exception as e:
-                self.trader.log_message(f"{display_name} 自动交易出错: {str(e)}")
-                time.sleep(random.uniform(0, 1))
+                self.trader.log_message(f"{display_name} 自动交易出错: {str(e)}", symbol=symbol)
+                self.clock.sleep(random.uniform(0, 1))
         
         # 交易完成
         self.trader.auto_trading[symbol] = False
@@ -596,10 +601,10 @@ class TradingEngine:
         if completed_trades < initial_trade_count:
             remaining_trades = initial_trade_count - completed_trades
             self.trader.tokens[symbol]['trade_count'] = remaining_trades
-            self.trader.log_message(f"{display_name} 自动交易中途退出，已完成 {completed_trades}/{initial_trade_count} 次，剩余交易次数已更新为 {remaining_trades}")
+            self.trader.log_message(f"{display_name} 自动交易中途退出，已完成 {completed_trades}/{initial_trade_count} 次，剩余交易次数已更新为 {remaining_trades}", symbol=symbol)
         else:
-            self.trader.log_message(f"{display_name} 自动交易完成，共完成 {completed_trades} 次交易")
+            self.trader.log_message(f"{display_name} 自动交易完成，共完成 {completed_trades} 次交易", symbol=symbol)
         
         # 更新表格显示
-        self.trader.root.after(0, lambda: self.trader.update_tree_view())
+        self.trader.notify_tokens_changed()
 